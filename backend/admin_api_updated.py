@@ -28,13 +28,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# FastAPI 앱 생성
+from services.service_container import container, lifespan
+
+# FastAPI 앱 생성 (공유 풀/서비스는 lifespan에서 생성 및 정리)
 app = FastAPI(
     title="HEAL7 통합 관리자 API",
     description="모든 관리자 서비스를 통합한 단일 API 서버",
     version="5.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -56,6 +59,25 @@ async def health_check():
         "timestamp": datetime.now().isoformat()
     }
 
+# 데이터베이스 연결 풀 통계 API
+@app.get("/admin-api/health/db-pool")
+async def db_pool_stats():
+    from services.database_manager import db
+    from services.redis_manager import redis_pool
+    return {
+        "pool": db.stats(),
+        "redis_pool": redis_pool.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+# 서비스 컨테이너 상태 API (서비스별 초기화 비용)
+@app.get("/admin-api/health/services")
+async def service_container_stats():
+    return {
+        **container.stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
 # 기본 라우트
 @app.get("/")
 async def root():
@@ -160,8 +182,9 @@ try:
     app.include_router(survey_router, tags=["Survey Management"])
     logging.info("✅ 설문 관리 라우터 등록 완료")
 except ImportError as e:
-    logging.warning(f"⚠️ 설문 관리 라우터 임포트 실패: {e}")
-    logging.warning("사주 페이지에서 설문 API 호출 시 404 오류 발생 가능")
+    # 더미 서비스로 대신하지 않는다 - 설문 API 는 등록되지 않으므로 오류로 남김
+    logging.error(f"❌ 설문 관리 라우터 임포트 실패: {e}")
+    logging.error("사주 페이지에서 설문 API 호출 시 404 오류 발생")
 
 # 아카데미 관리 라우터 (신규)
 try:
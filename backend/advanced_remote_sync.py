@@ -4,15 +4,23 @@
 여러 방법을 시도하여 원격서버(43.200.203.115)의 데이터베이스를 442개 키워드로 동기화
 """
 
+import argparse
 import asyncio
 import aiohttp
 import json
+import os
 import sys
 import logging
+import random
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional, Set
 import time
 
+from services.sync_journal import SyncJournal, SyncRun, RUN_ABANDONED, RUN_COMPLETED, RUN_FAILED
+from services.sync_wire_format import (
+    SyncWireFormatError, compact_accept_header, is_compact_media_type, load_sync_payload
+)
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -20,10 +28,230 @@ logger = logging.getLogger(__name__)
 LOCAL_SERVER = "http://localhost:8001"
 REMOTE_SERVER = "https://admin.heal7.com"
 
+# 증분 동기화: 마지막으로 원격서버에 반영한 변경 피드 커서 저장 위치
+SYNC_CURSOR_FILE = os.getenv(
+    "SYNC_CURSOR_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".sync_cursor.json")
+)
+CHANGE_FEED_PAGE_SIZE = 5000
+
+# 내보내기 전송 형식: compact 면 컬럼형(msgpack/JSON)을 먼저 요청하고, json 이면 NDJSON 스트리밍만 사용
+SYNC_WIRE_FORMAT = os.getenv("SYNC_WIRE_FORMAT", "compact")
+
+# 푸시 엔진: 동시 요청 수, 요청당 항목 수, 재시도 설정
+PUSH_CONCURRENCY = int(os.getenv("SYNC_PUSH_CONCURRENCY", 8))
+PUSH_BATCH_SIZE = int(os.getenv("SYNC_PUSH_BATCH_SIZE", 100))
+PUSH_MAX_RETRIES = int(os.getenv("SYNC_PUSH_MAX_RETRIES", 5))
+PUSH_REQUEST_TIMEOUT = float(os.getenv("SYNC_PUSH_REQUEST_TIMEOUT", 30))
+PUSH_BACKOFF_BASE = 0.5
+PUSH_BACKOFF_MAX = 20.0
+
+# 작업 저널 실행 디렉토리에 남기는 산출물: 실행 시작 시점의 동기화 데이터 스냅샷, 수동 동기화 가이드
+SYNC_DATA_ARTIFACT = "sync_data.json"
+SYNC_GUIDE_ARTIFACT = "remote_sync_guide.md"
+
+# 다이제스트 비교: 루트/그룹/버킷 해시 경로, 내려받을 구역
+DIGEST_PATH = "/admin-api/bulk-sync/digest"
+DIGEST_SECTIONS = ("subcategories", "keywords", "dependencies")
+
+# 재시도할 응답 코드 (그 외 4xx 는 같은 요청을 다시 보내도 실패하므로 바로 실패 처리)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+async def gather_limited(aws, limit: int) -> List[Any]:
+    """동시 실행 수를 제한한 gather (결과 순서 유지)"""
+    semaphore = asyncio.Semaphore(limit)
+    
+    async def run(aw):
+        async with semaphore:
+            return await aw
+    
+    return await asyncio.gather(*(run(aw) for aw in aws))
+
+class PushRequestFailed(Exception):
+    """배치 요청 실패 (retryable 이면 백오프 후 재시도)"""
+
+    def __init__(self, message: str, retryable: bool, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더 (초 단위만 지원)"""
+    try:
+        return max(0.0, float(value)) if value else None
+    except ValueError:
+        return None
+
+class PushReport:
+    """푸시 진행/결과 집계"""
+
+    def __init__(self, label: str, total_items: int, total_batches: int):
+        self.label = label
+        self.total_items = total_items
+        self.total_batches = total_batches
+        self.pushed_items = 0
+        self.resumed_items = 0      # 이전 실행에서 이미 확인되어 건너뛴 항목
+        self.completed_batches = 0
+        self.retries = 0
+        self.failed_batches: List[Dict[str, Any]] = []
+        self.latencies_ms: List[float] = []
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def succeeded(self) -> bool:
+        """모든 항목이 확인되었고 실패한 배치가 없음"""
+        return self.pushed_items + self.resumed_items == self.total_items and not self.failed_batches
+
+    @property
+    def items_per_second(self) -> float:
+        return self.pushed_items / self.elapsed if self.elapsed > 0 else 0.0
+
+    def latency_percentile(self, q: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * q))], 1)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "label": self.label,
+            "items": self.total_items,
+            "pushed": self.pushed_items,
+            "resumed": self.resumed_items,
+            "failed_items": self.total_items - self.pushed_items - self.resumed_items,
+            "batches": self.total_batches,
+            "failed_batches": self.failed_batches,
+            "retries": self.retries,
+            "elapsed_s": round(self.elapsed, 3),
+            "items_per_s": round(self.items_per_second, 1),
+            "request_p50_ms": self.latency_percentile(0.5),
+            "request_p95_ms": self.latency_percentile(0.95),
+            "success": self.succeeded
+        }
+
+class KeywordPushEngine:
+    """원격서버 푸시 엔진
+    
+    항목을 batch_size 개씩 묶어 concurrency 개의 요청을 동시에 보낸다.
+    5xx/429/타임아웃/연결 오류는 지수 백오프(전체 지터)로 max_retries 번까지 재시도하고,
+    원격 쪽 반영은 upsert 라 같은 배치를 다시 보내도 안전하다.
+    """
+
+    def __init__(self, session: aiohttp.ClientSession, url: str,
+                 build_payload: Callable[[List[Dict[str, Any]]], Dict[str, Any]],
+                 concurrency: int = PUSH_CONCURRENCY, batch_size: int = PUSH_BATCH_SIZE,
+                 max_retries: int = PUSH_MAX_RETRIES, request_timeout: float = PUSH_REQUEST_TIMEOUT,
+                 backoff_base: float = PUSH_BACKOFF_BASE, backoff_max: float = PUSH_BACKOFF_MAX):
+        self.session = session
+        self.url = url
+        self.build_payload = build_payload
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_retries = max_retries
+        self.request_timeout = aiohttp.ClientTimeout(total=request_timeout)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+    
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """재시도 대기 시간 (Retry-After 가 있으면 우선)"""
+        if retry_after is not None:
+            return min(self.backoff_max, retry_after)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+    
+    async def _post_batch(self, batch: List[Dict[str, Any]]):
+        async with self.session.post(
+            self.url, json=self.build_payload(batch), timeout=self.request_timeout
+        ) as response:
+            if response.status < 300:
+                await response.read()
+                return
+            body = (await response.text())[:200]
+            raise PushRequestFailed(
+                f"HTTP {response.status} {body}",
+                response.status in RETRYABLE_STATUS,
+                parse_retry_after(response.headers.get("Retry-After"))
+            )
+    
+    async def _send(self, index: int, batch: List[Dict[str, Any]], report: PushReport) -> Optional[int]:
+        """배치 하나 전송 (성공하면 시도 횟수, 포기하면 None)"""
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                await self._post_batch(batch)
+                report.latencies_ms.append((time.perf_counter() - started) * 1000)
+                report.pushed_items += len(batch)
+                return attempt + 1
+            except PushRequestFailed as e:
+                error, retryable, retry_after = str(e), e.retryable, e.retry_after
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                error, retryable, retry_after = f"{type(e).__name__}: {e}", True, None
+            
+            if not retryable or attempt == self.max_retries:
+                logger.error(f"배치 {index} 푸시 실패 ({attempt + 1}회 시도): {error}")
+                report.failed_batches.append({"index": index, "items": len(batch), "attempts": attempt + 1, "error": error})
+                return None
+            
+            report.retries += 1
+            delay = self.backoff_delay(attempt, retry_after)
+            logger.warning(f"배치 {index} 재시도 {attempt + 1}/{self.max_retries} ({delay:.2f}s 후): {error}")
+            await asyncio.sleep(delay)
+    
+    def _log_progress(self, report: PushReport):
+        # 배치 진행률이 10% 단위를 넘을 때마다 기록
+        step = max(1, report.total_batches // 10)
+        if report.completed_batches % step == 0 or report.completed_batches == report.total_batches:
+            logger.info(
+                f"📦 {report.label} 푸시 {report.completed_batches}/{report.total_batches} 배치, "
+                f"{report.pushed_items + report.resumed_items}/{report.total_items}개 ({report.items_per_second:.0f}개/s, 재시도 {report.retries}회)"
+            )
+    
+    async def push(self, items: List[Dict[str, Any]], label: str = "items",
+                   skip_batches: Optional[Set[int]] = None,
+                   on_batch_acked: Optional[Callable[[int, List[Dict[str, Any]], int], None]] = None) -> PushReport:
+        """항목 전체 푸시 (실패한 배치는 보고서의 failed_batches 에 남김)
+        
+        skip_batches: 이전 실행에서 이미 확인된 배치 번호 (보내지 않음)
+        on_batch_acked(index, batch, attempts): 원격서버가 배치를 확인할 때마다 호출 (체크포인트 기록)
+        """
+        skip_batches = skip_batches or set()
+        batches = [items[start:start + self.batch_size] for start in range(0, len(items), self.batch_size)]
+        report = PushReport(label, len(items), len(batches))
+        queue: asyncio.Queue = asyncio.Queue()
+        for entry in enumerate(batches):
+            queue.put_nowait(entry)
+        
+        async def worker():
+            while not queue.empty():
+                index, batch = queue.get_nowait()
+                if index in skip_batches:
+                    report.resumed_items += len(batch)
+                else:
+                    attempts = await self._send(index, batch, report)
+                    if attempts and on_batch_acked:
+                        on_batch_acked(index, batch, attempts)
+                report.completed_batches += 1
+                self._log_progress(report)
+        
+        if skip_batches:
+            logger.info(f"♻️ {label}: 이전 실행에서 확인된 배치 {len(skip_batches)}개 건너뜀")
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(batches)))))
+        report.finished = time.perf_counter()
+        return report
+
 class RemoteSyncManager:
-    def __init__(self):
+    def __init__(self, journal: Optional[SyncJournal] = None):
         self.session = None
         self.sync_data = None
+        self.sync_etag = None
+        self.accept_compact = SYNC_WIRE_FORMAT == "compact"
+        self.cursor_file = SYNC_CURSOR_FILE
+        self.journal = journal or SyncJournal()
+        self.run: Optional[SyncRun] = None   # 진행 중인 저널 실행 (배치 체크포인트 기록 대상)
         
     async def __aenter__(self):
         self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=300))
@@ -32,37 +260,168 @@ class RemoteSyncManager:
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.session:
             await self.session.close()
+        self.journal.close()
+    
+    # ==================== 작업 저널 ====================
+    
+    async def run_journaled(self, mode: str, work: Callable[[], Any],
+                            resume_key: Optional[Dict[str, Any]] = None,
+                            params: Optional[Dict[str, Any]] = None,
+                            resume: bool = True, snapshot: bool = True) -> Dict[str, Any]:
+        """작업 저널에 실행을 기록하며 work() 실행
+    
+        snapshot 이면 실행 시작 시점의 동기화 데이터를 실행 디렉토리에 저장하고,
+        중단된 같은 실행(모드/재개 키)을 이어받을 때는 그 스냅샷을 그대로 써서 배치 경계를 맞춘다.
+        work() 는 {"success": bool, ...} 를 반환하고 배치 체크포인트는 self.run 에 기록한다.
+        예외(중단 포함)로 끝난 실행은 failed 로 남아 다음 실행이 이어받는다.
+        """
+        run = self.journal.start_run(
+            mode, resume_key, params, resume=resume and snapshot,
+            require_artifact=SYNC_DATA_ARTIFACT if snapshot else None
+        )
+        self.run = run
+        try:
+            if snapshot and run.resumed:
+                self.sync_data = run.load_artifact_json(SYNC_DATA_ARTIFACT)
+                if await self.local_data_changed(run.params.get("source_etag")):
+                    logger.warning(f"중단된 실행 {run.run_id} 이후 로컬 데이터가 바뀜 - 새 실행으로 시작")
+                    run.finish(RUN_ABANDONED, error="로컬 데이터 변경으로 이어받지 않음")
+                    run = self.run = self.journal.start_run(mode, resume_key, params, resume=False)
+                else:
+                    logger.info(f"♻️ 중단된 실행 {run.run_id} 이어받기 - 실행 시작 시점 데이터 스냅샷 사용")
+    
+            if snapshot and not run.resumed:
+                if not self.sync_data:
+                    await self.get_local_sync_data()
+                run.save_artifact(SYNC_DATA_ARTIFACT, self.sync_data)
+                run.update_params(source_etag=self.sync_etag)
+                logger.info(f"📝 동기화 실행 {run.run_id} 시작 ({mode})")
+    
+            result = await work()
+        except BaseException as e:
+            run.finish(RUN_FAILED, error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            self.run = None
+    
+        run.finish(RUN_COMPLETED if result.get("success") else RUN_FAILED, error=result.get("error"))
+        result["run_id"] = run.run_id
+        result["resumed"] = run.resumed
+        return result
+    
+    async def local_data_changed(self, etag: Optional[str]) -> bool:
+        """스냅샷을 받은 뒤 로컬 데이터가 바뀌었는지 (ETag 비교, 확인할 수 없으면 False)
+    
+        바뀌었으면 새로 받은 데이터가 self.sync_data 에 남는다.
+        """
+        if not etag:
+            return False
+        snapshot_data = self.sync_data
+        self.sync_etag = etag
+        try:
+            await self.get_local_sync_data()
+        except Exception as e:
+            logger.warning(f"로컬 데이터 변경 여부 확인 실패 - 스냅샷으로 계속: {e}")
+            return False
+        return self.sync_data is not snapshot_data
+    
+    async def push_checkpointed(self, engine: KeywordPushEngine, items: List[Dict[str, Any]],
+                                section: str) -> PushReport:
+        """진행 중인 저널 실행이 있으면 확인된 배치는 건너뛰고, 새로 확인된 배치를 기록하며 푸시"""
+        run = self.run
+        if not run:
+            return await engine.push(items, label=section)
+    
+        run.set_section(section, len(items), -(-len(items) // engine.batch_size))
+        report = await engine.push(
+            items, label=section, skip_batches=run.completed_batches(section),
+            on_batch_acked=lambda index, batch, attempts: run.ack_batch(section, index, len(batch), attempts)
+        )
+        run.add_retries(report.retries)
+        return report
     
     async def get_local_sync_data(self) -> Dict[str, Any]:
-        """로컬서버에서 동기화 데이터 가져오기"""
+        """로컬서버에서 동기화 데이터 가져오기
+        
+        컬럼형 압축 형식(msgpack/JSON)을 Accept 로 먼저 요청하고, 지원하지 않는 서버면
+        NDJSON 스트리밍(gzip)으로 받는다. 어느 쪽이든 기존 JSON 과 같은 구조로 조립한다.
+        이전에 받은 ETag 를 If-None-Match 로 보내 변경이 없으면(304) 받아 둔 데이터를 그대로 쓴다.
+        """
         logger.info("📤 로컬서버에서 동기화 데이터 추출 중...")
         
         try:
             url = f"{LOCAL_SERVER}/admin-api/bulk-sync/keywords/export"
-            async with self.session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    logger.info(f"✅ 로컬 데이터 추출 완료: {data['metadata']['total_keywords']}개 키워드")
-                    self.sync_data = data
-                    return data
-                else:
+            headers = {"Accept-Encoding": "gzip"}
+            if self.accept_compact:
+                headers["Accept"] = compact_accept_header()
+            if self.sync_etag and self.sync_data:
+                headers["If-None-Match"] = self.sync_etag
+            
+            async with self.session.get(url, params={"format": "ndjson"}, headers=headers) as response:
+                if response.status == 304:
+                    logger.info("✅ 로컬 데이터 변경 없음 (ETag 일치) - 기존 데이터 사용")
+                    return self.sync_data
+                if response.status != 200:
                     raise Exception(f"로컬 데이터 추출 실패: HTTP {response.status}")
+                
+                content_type = response.headers.get("Content-Type")
+                if is_compact_media_type(content_type):
+                    try:
+                        data = load_sync_payload(await response.read(), content_type)
+                    except SyncWireFormatError as e:
+                        logger.warning(f"압축 형식 해석 실패 - NDJSON 으로 다시 요청: {e}")
+                        self.accept_compact = False
+                        self.sync_etag = None
+                        return await self.get_local_sync_data()
+                else:
+                    data = await self.read_sync_ndjson(response)
+                self.sync_etag = response.headers.get("ETag")
+                logger.info(f"✅ 로컬 데이터 추출 완료: {data['metadata']['total_keywords']}개 키워드")
+                self.sync_data = data
+                return data
         except Exception as e:
             logger.error(f"❌ 로컬 데이터 추출 오류: {e}")
             raise
     
+    @staticmethod
+    async def read_sync_ndjson(response) -> Dict[str, Any]:
+        """NDJSON 동기화 스트림을 {metadata, keywords, subcategories, dependencies} 로 조립"""
+        data = {"metadata": {}, "keywords": [], "subcategories": [], "dependencies": []}
+        sections = {"keyword": "keywords", "subcategory": "subcategories", "dependency": "dependencies"}
+        
+        async for line in response.content:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            record_type = record.pop("type")
+            if record_type in sections:
+                data[sections[record_type]].append(record)
+            else:
+                # metadata 와 summary 는 하나의 metadata 로 합친다
+                data["metadata"].update(record)
+        
+        if "total_keywords" not in data["metadata"]:
+            raise Exception("동기화 스트림이 끝까지 전송되지 않았습니다")
+        return data
+    
     async def get_remote_status(self) -> Dict[str, Any]:
         """원격서버 현재 상태 확인"""
         logger.info("🔍 원격서버 현재 상태 확인 중...")
         
         try:
-            # 키워드 수 확인
-            async with self.session.get(f"{REMOTE_SERVER}/admin-api/keywords/") as response:
-                if response.status == 200:
-                    keywords = await response.json()
-                    keyword_count = len(keywords)
-                else:
-                    keyword_count = 0
+            # 키워드 수 확인 (다이제스트가 있으면 전체 목록을 내려받지 않고 행 수와 루트 해시만 비교)
+            digest_root = None
+            remote_digest = await self.get_digest(REMOTE_SERVER)
+            if remote_digest:
+                keyword_count = remote_digest["sections"]["keywords"]["row_count"]
+                digest_root = remote_digest["root"]
+            else:
+                async with self.session.get(f"{REMOTE_SERVER}/admin-api/keywords/") as response:
+                    if response.status == 200:
+                        keywords = await response.json()
+                        keyword_count = len(keywords)
+                    else:
+                        keyword_count = 0
             
             # 건강 상태 확인
             health_status = "unknown"
@@ -74,11 +433,18 @@ class RemoteSyncManager:
             except:
                 pass
             
+            sync_needed = keyword_count != 442
+            if digest_root:
+                local_digest = await self.get_digest(LOCAL_SERVER)
+                if local_digest:
+                    sync_needed = local_digest["root"] != digest_root
+            
             status = {
                 "keyword_count": keyword_count,
                 "health_status": health_status,
                 "server_url": REMOTE_SERVER,
-                "sync_needed": keyword_count != 442
+                "digest_root": digest_root,
+                "sync_needed": sync_needed
             }
             
             logger.info(f"원격서버 상태: {keyword_count}개 키워드, 건강상태: {health_status}")
@@ -115,7 +481,11 @@ class RemoteSyncManager:
             return False
     
     async def _sync_via_bulk_endpoint(self) -> bool:
-        """벌크 엔드포인트를 통한 동기화"""
+        """벌크 엔드포인트를 통한 동기화 (요청 하나 = 저널 배치 하나)"""
+        if self.run and 0 in self.run.completed_batches("bulk"):
+            logger.info("♻️ 이전 실행에서 벌크 동기화가 이미 확인됨 - 건너뜀")
+            return True
+        
         try:
             # 원격서버의 bulk-sync 엔드포인트로 데이터 전송
             payload = {
@@ -131,56 +501,343 @@ class RemoteSyncManager:
                 if response.status == 200:
                     result = await response.json()
                     logger.info(f"✅ 벌크 동기화 성공: {result}")
+                    if self.run:
+                        items = sum(len(self.sync_data.get(section, [])) for section in DIGEST_SECTIONS)
+                        self.run.set_section("bulk", items, 1)
+                        self.run.ack_batch("bulk", 0, items)
                     return True
                 else:
-                    logger.error(f"벌크 동기화 실패: HTTP {response.status}")
+                    logger.error(f"벌크 동기화 실패: HTTP {response.status} {await response.text()}")
                     return False
                     
         except Exception as e:
             logger.error(f"벌크 동기화 오류: {e}")
             return False
     
-    async def _sync_via_individual_apis(self) -> bool:
-        """개별 API를 통한 동기화 (느리지만 확실한 방법)"""
-        logger.info("개별 키워드 API를 통한 동기화 시작...")
+    async def _sync_via_individual_apis(self, concurrency: int = PUSH_CONCURRENCY) -> bool:
+        """개별 키워드 API를 통한 동기화 (원격서버에 bulk-sync 가 없을 때, 키워드 하나당 요청 하나)"""
+        logger.info(f"개별 키워드 API를 통한 동기화 시작 (동시 요청 {concurrency}개)...")
+        
+        def build_payload(batch: List[Dict[str, Any]]) -> Dict[str, Any]:
+            keyword = batch[0]
+            return {
+                "name": keyword['name'],
+                "category": keyword['category'],
+                "weight": keyword['weight'],
+                "status": keyword['status']
+            }
+        
+        engine = KeywordPushEngine(
+            self.session, f"{REMOTE_SERVER}/admin-api/keywords/", build_payload,
+            concurrency=concurrency, batch_size=1
+        )
+        report = await self.push_checkpointed(engine, self.sync_data['keywords'], "keywords")
+        logger.info(f"개별 API 동기화 완료: {report.to_dict()}")
+        return report.succeeded
+    
+    async def push_sync_data(self, concurrency: int = PUSH_CONCURRENCY,
+                             batch_size: int = PUSH_BATCH_SIZE, resume: bool = True) -> Dict[str, Any]:
+        """원격서버 bulk-sync/import(merge) 로 나눠서 푸시
         
+        서브카테고리 → 키워드 → 의존성 순서로 보내 각 배치의 참조 무결성 검사가 통과하도록 한다.
+        merge 모드라 원격서버에만 있는 행은 지우지 않는다 (전체 교체는 _sync_via_bulk_endpoint).
+        확인된 배치는 작업 저널에 기록되며, 중단된 푸시는 같은 batch_size 로 다시 실행하면 이어서 진행한다.
+        """
+        return await self.run_journaled(
+            "push", lambda: self._push_sections(concurrency, batch_size),
+            resume_key={"batch_size": batch_size},
+            params={"concurrency": concurrency, "batch_size": batch_size, "remote": REMOTE_SERVER},
+            resume=resume
+        )
+    
+    async def _push_sections(self, concurrency: int, batch_size: int) -> Dict[str, Any]:
+        def import_payload(section: str) -> Callable[[List[Dict[str, Any]]], Dict[str, Any]]:
+            return lambda batch: {"sync_data": {section: batch}, "mode": "merge", "source": "local-server"}
+        
+        url = f"{REMOTE_SERVER}/admin-api/bulk-sync/import"
+        reports = {}
+        for section in ("subcategories", "keywords", "dependencies"):
+            engine = KeywordPushEngine(
+                self.session, url, import_payload(section), concurrency=concurrency, batch_size=batch_size
+            )
+            report = await self.push_checkpointed(engine, self.sync_data.get(section, []), section)
+            reports[section] = report.to_dict()
+            if not reports[section]["success"]:
+                logger.error(f"❌ {section} 푸시 실패 - 이후 단계 중단: {report.failed_batches[:3]}")
+                break
+        
+        success = len(reports) == 3 and all(r["success"] for r in reports.values())
+        failed = [section for section, report in reports.items() if not report["success"]]
+        return {"success": success, "phases": reports,
+                "error": f"{failed[0]} 배치 푸시 실패" if failed else None}
+    
+    # ==================== 증분 동기화 ====================
+    
+    def load_sync_cursor(self) -> Optional[str]:
+        """마지막으로 반영한 변경 피드 커서 (없으면 None)"""
         try:
-            keywords = self.sync_data['keywords'][:10]  # 테스트용으로 처음 10개만
+            with open(self.cursor_file, 'r', encoding='utf-8') as f:
+                return json.load(f).get("cursor")
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"동기화 커서 파일을 읽지 못했습니다 ({self.cursor_file}): {e}")
+            return None
+    
+    def save_sync_cursor(self, cursor: str):
+        """원격서버 반영이 끝난 커서 저장 (임시 파일에 쓴 뒤 교체)"""
+        tmp_file = f"{self.cursor_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"cursor": cursor, "saved_at": datetime.now().isoformat()}, f)
+        os.replace(tmp_file, self.cursor_file)
+    
+    async def get_local_changes(self, cursor: str) -> Dict[str, Any]:
+        """로컬서버 변경 피드 조회"""
+        url = f"{LOCAL_SERVER}/admin-api/bulk-sync/changes"
+        params = {"since": cursor, "limit": CHANGE_FEED_PAGE_SIZE}
+        async with self.session.get(url, params=params) as response:
+            if response.status != 200:
+                raise Exception(f"변경 피드 조회 실패: HTTP {response.status} {await response.text()}")
+            return await response.json()
+    
+    async def push_changes(self, feed: Dict[str, Any]) -> bool:
+        """변경 피드를 원격서버에 적용"""
+        payload = {"changes": feed["changes"], "cursor": feed["cursor"], "source": "local-server"}
+        async with self.session.post(
+            f"{REMOTE_SERVER}/admin-api/bulk-sync/changes/apply", json=payload
+        ) as response:
+            if response.status == 200:
+                return True
+            logger.error(f"변경 적용 실패: HTTP {response.status} {await response.text()}")
+            return False
+    
+    async def full_sync_with_cursor(self) -> bool:
+        """전체 내보내기를 원격서버에 반영하고 내보내기 시점의 커서를 저장"""
+        self.sync_etag = None
+        await self.get_local_sync_data()
+        cursor = self.sync_data['metadata'].get('cursor')
+        
+        if not await self._sync_via_bulk_endpoint():
+            return False
+        if cursor:
+            self.save_sync_cursor(cursor)
+        return True
+    
+    async def sync_incremental(self) -> Dict[str, Any]:
+        """저장된 커서 이후의 변경만 원격서버에 반영
+        
+        커서가 없거나 변경 로그가 정리되어 이어받을 수 없으면 전체 동기화 후 커서를 저장한다.
+        페이지 단위로 적용할 때마다 커서를 저장하므로 중간에 실패해도 다음 실행이 이어서 진행한다
+        (이어받기는 커서가 맡으므로 작업 저널에는 페이지별 처리량만 기록).
+        """
+        return await self.run_journaled("incremental", self._sync_incremental, resume=False, snapshot=False)
+    
+    async def _sync_incremental(self) -> Dict[str, Any]:
+        stats = {"mode": "incremental", "pages": 0, "changes": 0, "applied": {}}
+        cursor = self.load_sync_cursor()
+        
+        if cursor is None:
+            logger.info("저장된 동기화 커서 없음 - 전체 동기화로 시작")
+            stats["mode"] = "full"
+            stats["success"] = await self.full_sync_with_cursor()
+            return stats
+        
+        while True:
+            feed = await self.get_local_changes(cursor)
             
-            success_count = 0
-            for keyword in keywords:
-                try:
-                    # 각 키워드를 개별적으로 원격서버에 전송 시도
-                    payload = {
-                        "name": keyword['name'],
-                        "category": keyword['category'],
-                        "weight": keyword['weight'],
-                        "status": keyword['status']
-                    }
-                    
-                    # POST 또는 PUT 요청으로 키워드 추가/업데이트 시도
-                    async with self.session.post(
-                        f"{REMOTE_SERVER}/admin-api/keywords/",
-                        json=payload
-                    ) as response:
-                        if response.status in [200, 201]:
-                            success_count += 1
-                            logger.info(f"키워드 '{keyword['name']}' 동기화 성공")
-                        else:
-                            logger.warning(f"키워드 '{keyword['name']}' 동기화 실패: HTTP {response.status}")
-                            
-                except Exception as e:
-                    logger.warning(f"키워드 '{keyword['name']}' 처리 오류: {e}")
-                
-                # 너무 빠른 요청 방지
-                await asyncio.sleep(0.1)
+            if feed.get("full_resync_required"):
+                logger.warning(f"커서 {cursor} 가 정리된 변경 로그보다 오래됨 - 전체 재동기화")
+                stats["mode"] = "full"
+                stats["success"] = await self.full_sync_with_cursor()
+                return stats
             
-            logger.info(f"개별 API 동기화 완료: {success_count}/{len(keywords)}개 성공")
-            return success_count > 0
+            if feed["change_count"]:
+                if not await self.push_changes(feed):
+                    stats["success"] = False
+                    return stats
+                if self.run:
+                    self.run.ack_batch("changes", stats["pages"], feed["change_count"])
+                stats["pages"] += 1
+                stats["changes"] += feed["change_count"]
+                for section, section_changes in feed["changes"].items():
+                    counts = stats["applied"].setdefault(section, {"upserted": 0, "deleted": 0})
+                    counts["upserted"] += len(section_changes["upserted"])
+                    counts["deleted"] += len(section_changes["deleted"])
             
-        except Exception as e:
-            logger.error(f"개별 API 동기화 오류: {e}")
-            return False
+            if feed["cursor"] != cursor:
+                cursor = feed["cursor"]
+                self.save_sync_cursor(cursor)
+            
+            if not feed["has_more"]:
+                break
+        
+        stats["success"] = True
+        stats["cursor"] = cursor
+        logger.info(f"✅ 증분 동기화 완료: 변경 {stats['changes']}건, 커서 {cursor}")
+        return stats
+    
+    # ==================== 다이제스트 비교 동기화 ====================
+    
+    async def get_digest(self, server: str) -> Optional[Dict[str, Any]]:
+        """서버 다이제스트 루트 (엔드포인트나 다이제스트 테이블이 없으면 None)"""
+        try:
+            async with self.session.get(f"{server}{DIGEST_PATH}") as response:
+                if response.status == 200:
+                    return await response.json()
+                logger.info(f"다이제스트 사용 불가 ({server}): HTTP {response.status}")
+        except aiohttp.ClientError as e:
+            logger.info(f"다이제스트 사용 불가 ({server}): {e}")
+        return None
+    
+    async def _fetch_digest_json(self, url: str, stats: Dict[str, Any]) -> Dict[str, Any]:
+        async with self.session.get(url) as response:
+            body = await response.read()
+            stats["requests"] += 1
+            stats["bytes"] += len(body)
+            if response.status != 200:
+                raise Exception(f"다이제스트 조회 실패: HTTP {response.status} {url}")
+            return json.loads(body)
+    
+    async def find_digest_differences(self, stats: Dict[str, Any]) -> Optional[List[tuple]]:
+        """루트 → 그룹 → 버킷 순으로 내려가며 해시가 다른 (구역, 그룹, 버킷) 목록
+        
+        두 서버의 분할 설정이 다르면 비교할 수 없으므로 None.
+        """
+        local, remote = await asyncio.gather(
+            self._fetch_digest_json(f"{LOCAL_SERVER}{DIGEST_PATH}", stats),
+            self._fetch_digest_json(f"{REMOTE_SERVER}{DIGEST_PATH}", stats)
+        )
+        stats["local_root"], stats["remote_root"] = local["root"], remote["root"]
+        if local["layout"] != remote["layout"]:
+            return None
+        if local["root"] == remote["root"]:
+            return []
+        
+        groups = []
+        for section in DIGEST_SECTIONS:
+            local_groups = local["sections"][section]["groups"]
+            remote_groups = remote["sections"][section]["groups"]
+            groups.extend(
+                (section, group_id) for group_id in sorted(set(local_groups) | set(remote_groups), key=int)
+                if local_groups.get(group_id) != remote_groups.get(group_id)
+            )
+        
+        listings = await gather_limited([
+            self._fetch_digest_json(f"{server}{DIGEST_PATH}/{section}/{group_id}", stats)
+            for section, group_id in groups
+            for server in (LOCAL_SERVER, REMOTE_SERVER)
+        ], PUSH_CONCURRENCY)
+        
+        differences = []
+        for index, (section, group_id) in enumerate(groups):
+            local_buckets = listings[2 * index]["buckets"]
+            remote_buckets = listings[2 * index + 1]["buckets"]
+            differences.extend(
+                (section, group_id, bucket) for bucket in sorted(set(local_buckets) | set(remote_buckets), key=int)
+                if local_buckets.get(bucket) != remote_buckets.get(bucket)
+            )
+        stats["differing_groups"] = len(groups)
+        return differences
+    
+    @staticmethod
+    def diff_bucket_rows(section: str, local_rows: List[Dict[str, Any]],
+                         remote_rows: List[Dict[str, Any]]) -> Dict[str, list]:
+        """버킷 하나의 로컬/원격 행 비교 → /changes/apply 형식의 upserted / deleted"""
+        if section == "dependencies":
+            local_keys = {(r['parent_keyword_id'], r['dependent_keyword_id']) for r in local_rows}
+            remote_keys = {(r['parent_keyword_id'], r['dependent_keyword_id']) for r in remote_rows}
+            as_record = lambda key: {"parent_keyword_id": key[0], "dependent_keyword_id": key[1]}
+            return {
+                "upserted": [as_record(key) for key in sorted(local_keys - remote_keys)],
+                "deleted": [as_record(key) for key in sorted(remote_keys - local_keys)]
+            }
+        
+        remote_by_id = {r['id']: r for r in remote_rows}
+        local_ids = {r['id'] for r in local_rows}
+        return {
+            "upserted": [r for r in local_rows if remote_by_id.get(r['id']) != r],
+            "deleted": sorted(set(remote_by_id) - local_ids)
+        }
+    
+    @staticmethod
+    def merge_bucket_diffs(section: str, diffs: List[Dict[str, list]]) -> Dict[str, list]:
+        """섹션 하나의 버킷별 diff 를 /changes/apply 형식으로 합침
+
+        키워드 다이제스트 그룹은 subcategory_id 라서 분류를 옮긴 키워드는 새 그룹 버킷에서 upserted,
+        옛 그룹 버킷에서 deleted 로 함께 나온다. /changes/apply 는 upsert 뒤에 deleted 를 비활성화하므로
+        upserted 에 있는 id 는 deleted 에서 뺀다.
+
+        >>> RemoteSyncManager.merge_bucket_diffs("keywords", [
+        ...     {"upserted": [{"id": 7, "subcategory_id": 3}], "deleted": []},
+        ...     {"upserted": [], "deleted": [7, 9]},
+        ... ])
+        {'upserted': [{'id': 7, 'subcategory_id': 3}], 'deleted': [9]}
+        """
+        merged = {"upserted": [], "deleted": []}
+        for diff in diffs:
+            merged["upserted"].extend(diff["upserted"])
+            merged["deleted"].extend(diff["deleted"])
+        if section != "dependencies":
+            upserted_ids = {row['id'] for row in merged["upserted"]}
+            merged["deleted"] = [row_id for row_id in merged["deleted"] if row_id not in upserted_ids]
+        return merged
+    
+    async def sync_via_digest(self) -> Dict[str, Any]:
+        """다이제스트가 다른 버킷의 행만 내려받아 원격서버에 반영 (/changes/apply)"""
+        return await self.run_journaled("digest", self._sync_via_digest, resume=False, snapshot=False)
+    
+    async def _sync_via_digest(self) -> Dict[str, Any]:
+        stats = {"mode": "digest", "requests": 0, "bytes": 0, "differing_groups": 0, "differing_buckets": 0, "applied": {}}
+        differences = await self.find_digest_differences(stats)
+        
+        if differences is None:
+            logger.warning("두 서버의 다이제스트 분할 설정이 달라 전체 동기화로 대체")
+            stats["mode"] = "full"
+            stats["success"] = await self.full_sync_with_cursor()
+            return stats
+        
+        stats["differing_buckets"] = len(differences)
+        if not differences:
+            logger.info(f"✅ 다이제스트 일치 - 동기화 불필요 (요청 {stats['requests']}회, {stats['bytes']} bytes)")
+            stats["success"] = True
+            return stats
+        
+        bucket_rows = await gather_limited([
+            self._fetch_digest_json(f"{server}{DIGEST_PATH}/{section}/{group_id}/{bucket}/rows", stats)
+            for section, group_id, bucket in differences
+            for server in (LOCAL_SERVER, REMOTE_SERVER)
+        ], PUSH_CONCURRENCY)
+        
+        section_diffs = {section: [] for section in DIGEST_SECTIONS}
+        for index, (section, _, _) in enumerate(differences):
+            section_diffs[section].append(
+                self.diff_bucket_rows(section, bucket_rows[2 * index]["rows"], bucket_rows[2 * index + 1]["rows"])
+            )
+        changes = {section: self.merge_bucket_diffs(section, diffs) for section, diffs in section_diffs.items()}
+        
+        async with self.session.post(
+            f"{REMOTE_SERVER}/admin-api/bulk-sync/changes/apply",
+            json={"changes": changes, "source": "digest-diff"}
+        ) as response:
+            if response.status != 200:
+                logger.error(f"다이제스트 차이 반영 실패: HTTP {response.status} {await response.text()}")
+                stats["success"] = False
+                return stats
+            stats["applied"] = (await response.json())["applied"]
+        if self.run:
+            self.run.ack_batch("changes", 0, sum(
+                len(section_changes["upserted"]) + len(section_changes["deleted"]) for section_changes in changes.values()
+            ))
+        
+        # 반영 후 루트 해시 재확인
+        local, remote = await asyncio.gather(self.get_digest(LOCAL_SERVER), self.get_digest(REMOTE_SERVER))
+        stats["converged"] = bool(local and remote and local["root"] == remote["root"])
+        stats["success"] = True
+        logger.info(
+            f"✅ 다이제스트 동기화 완료: 버킷 {stats['differing_buckets']}개, 요청 {stats['requests']}회, "
+            f"{stats['bytes']} bytes, 반영 {stats['applied']}, 일치 {stats['converged']}"
+        )
+        return stats
     
     async def create_sync_instructions(self) -> str:
         """수동 동기화 가이드 생성"""
@@ -272,60 +929,180 @@ ORDER BY 분류;
 동기화 데이터 크기: {len(str(self.sync_data))} 바이트
 """
         
-        # 가이드를 파일로 저장
-        guide_file = "/tmp/remote_sync_guide.md"
-        with open(guide_file, 'w', encoding='utf-8') as f:
-            f.write(instructions)
+        # 가이드를 파일로 저장 (저널 실행 중이면 동기화 데이터 스냅샷과 같은 실행 디렉토리)
+        if self.run:
+            guide_file = self.run.save_artifact(SYNC_GUIDE_ARTIFACT, instructions)
+        else:
+            os.makedirs(self.journal.directory, exist_ok=True)
+            guide_file = os.path.join(self.journal.directory, SYNC_GUIDE_ARTIFACT)
+            with open(guide_file, 'w', encoding='utf-8') as f:
+                f.write(instructions)
         
         logger.info(f"✅ 동기화 가이드 생성 완료: {guide_file}")
         return instructions
 
-async def main():
-    """메인 동기화 프로세스"""
+async def run_incremental():
+    """증분 동기화 모드: 저장된 커서 이후의 변경만 원격서버에 반영"""
+    print("🚀 HEAL7 증분 동기화 시작")
+    
+    async with RemoteSyncManager() as sync_manager:
+        try:
+            stats = await sync_manager.sync_incremental()
+        except Exception as e:
+            logger.error(f"❌ 증분 동기화 오류: {e}")
+            sys.exit(1)
+    
+    print(f"   모드: {stats['mode']}, 변경: {stats['changes']}건, 반영: {stats['applied']}")
+    if not stats.get("success"):
+        print("❌ 증분 동기화 실패")
+        sys.exit(1)
+    print("✅ 증분 동기화 완료")
+
+async def run_push(concurrency: int, batch_size: int, resume: bool = True):
+    """배치 푸시 모드: 로컬 데이터를 나눠서 원격서버 bulk-sync/import 로 동시 전송"""
+    print(f"🚀 HEAL7 배치 푸시 시작 (동시 요청 {concurrency}개, 요청당 {batch_size}개)")
+    
+    async with RemoteSyncManager() as sync_manager:
+        try:
+            result = await sync_manager.push_sync_data(concurrency, batch_size, resume=resume)
+        except Exception as e:
+            logger.error(f"❌ 배치 푸시 오류: {e}")
+            sys.exit(1)
+    
+    print(f"   실행 {result['run_id']}{' (이어받음)' if result['resumed'] else ''}")
+    for section, report in result["phases"].items():
+        print(f"   {section}: {report['pushed'] + report['resumed']}/{report['items']}개 "
+              f"(이어받은 항목 {report['resumed']}개), {report['elapsed_s']}s, "
+              f"{report['items_per_s']}개/s, 재시도 {report['retries']}회, 실패 배치 {len(report['failed_batches'])}개")
+    if not result["success"]:
+        print("❌ 배치 푸시 실패")
+        sys.exit(1)
+    print("✅ 배치 푸시 완료")
+
+async def run_digest():
+    """다이제스트 비교 모드: 해시가 다른 버킷만 찾아 원격서버에 반영"""
+    print("🚀 HEAL7 다이제스트 비교 동기화 시작")
+    
+    async with RemoteSyncManager() as sync_manager:
+        try:
+            stats = await sync_manager.sync_via_digest()
+        except Exception as e:
+            logger.error(f"❌ 다이제스트 동기화 오류: {e}")
+            sys.exit(1)
+    
+    print(f"   다른 버킷: {stats['differing_buckets']}개, 요청: {stats['requests']}회, "
+          f"전송량: {stats['bytes']} bytes, 반영: {stats['applied']}")
+    if not stats.get("success"):
+        print("❌ 다이제스트 동기화 실패")
+        sys.exit(1)
+    print("✅ 다이제스트 동기화 완료")
+
+async def run_full_sync(sync_manager: RemoteSyncManager) -> Dict[str, Any]:
+    """기본 동기화 단계 (상태 확인 → 직접 동기화 → 실패하면 수동 동기화 가이드)"""
+    # 1. 현재 상태 확인 (로컬 데이터는 저널 실행의 스냅샷)
+    print("\\n1️⃣ 현재 상태 확인 중...")
+    local_data = sync_manager.sync_data
+    remote_status = await sync_manager.get_remote_status()
+    
+    print(f"   로컬: {local_data['metadata']['total_keywords']}개 키워드")
+    print(f"   원격: {remote_status['keyword_count']}개 키워드")
+    
+    if not remote_status['sync_needed']:
+        print("✅ 동기화 불필요 - 이미 442개 키워드 보유")
+        return {"success": True, "sync_needed": False}
+    
+    # 2. 직접 동기화 시도
+    print("\\n2️⃣ 직접 동기화 시도 중...")
+    sync_success = await sync_manager.attempt_direct_database_sync()
+    
+    if sync_success:
+        print("✅ 직접 동기화 성공!")
+        
+        # 결과 확인
+        print("\\n3️⃣ 동기화 결과 확인 중...")
+        final_status = await sync_manager.get_remote_status()
+        print(f"   원격서버 최종 키워드 수: {final_status['keyword_count']}개")
+        
+        if final_status['keyword_count'] == 442:
+            print("🎉 완전 동기화 성공!")
+            return {"success": True, "sync_needed": True}
+    
+    # 3. 수동 동기화 가이드 생성
+    print("\\n3️⃣ 수동 동기화 가이드 생성 중...")
+    await sync_manager.create_sync_instructions()
+    return {"success": False, "sync_needed": True, "error": "직접 동기화 실패 - 수동 동기화 가이드 생성"}
+
+async def main(resume: bool = True):
+    """메인 동기화 프로세스 (작업 저널에 기록, 중단된 실행은 확인된 배치부터 이어서 진행)"""
     print("🚀 HEAL7 고급 원격서버 동기화 시스템 시작")
     print("=" * 60)
     
     async with RemoteSyncManager() as sync_manager:
         try:
-            # 1. 현재 상태 확인
-            print("\\n1️⃣ 현재 상태 확인 중...")
-            local_data = await sync_manager.get_local_sync_data()
-            remote_status = await sync_manager.get_remote_status()
-            
-            print(f"   로컬: {local_data['metadata']['total_keywords']}개 키워드")
-            print(f"   원격: {remote_status['keyword_count']}개 키워드")
-            
-            if not remote_status['sync_needed']:
-                print("✅ 동기화 불필요 - 이미 442개 키워드 보유")
-                return
-            
-            # 2. 직접 동기화 시도
-            print("\\n2️⃣ 직접 동기화 시도 중...")
-            sync_success = await sync_manager.attempt_direct_database_sync()
-            
-            if sync_success:
-                print("✅ 직접 동기화 성공!")
-                
-                # 결과 확인
-                print("\\n3️⃣ 동기화 결과 확인 중...")
-                final_status = await sync_manager.get_remote_status()
-                print(f"   원격서버 최종 키워드 수: {final_status['keyword_count']}개")
-                
-                if final_status['keyword_count'] == 442:
-                    print("🎉 완전 동기화 성공!")
-                    return
-            
-            # 3. 수동 동기화 가이드 생성
-            print("\\n3️⃣ 수동 동기화 가이드 생성 중...")
-            instructions = await sync_manager.create_sync_instructions()
-            
-            print("📋 원격서버 관리자용 동기화 가이드:")
-            print("   - /tmp/remote_sync_guide.md")
-            print("   - /tmp/remote_sync_data.json")
-            
+            result = await sync_manager.run_journaled(
+                "full", lambda: run_full_sync(sync_manager), params={"remote": REMOTE_SERVER}, resume=resume
+            )
         except Exception as e:
             logger.error(f"❌ 동기화 프로세스 오류: {e}")
             sys.exit(1)
+        
+        run = sync_manager.journal.get_run(result["run_id"])
+        print(f"\n📝 동기화 실행 {run['run_id']}{' (이어받음)' if result['resumed'] else ''}: {run['status']}")
+        if not result["success"]:
+            print("📋 원격서버 관리자용 동기화 가이드:")
+            for path in run["artifacts"].values():
+                print(f"   - {path}")
+
+def print_sync_runs(run_id: Optional[str], limit: int):
+    """작업 저널의 동기화 실행 목록 / 상세 출력"""
+    journal = SyncJournal()
+    try:
+        if run_id:
+            run = journal.get_run(run_id)
+            if not run:
+                print(f"❌ 동기화 실행 없음: {run_id}")
+                sys.exit(1)
+            print(json.dumps(run, ensure_ascii=False, indent=2))
+            return
+        
+        runs = journal.list_runs(limit)
+        if not runs:
+            print(f"기록된 동기화 실행 없음 ({journal.path})")
+            return
+        print(f"{'run_id':<23} {'mode':<12} {'status':<10} {'items':>7} {'batches':>7} "
+              f"{'retries':>7} {'tries':>5} {'active_s':>9} {'items/s':>8}  started_at")
+        for run in runs:
+            items_per_s = run['items_per_s'] if run['items_per_s'] is not None else "-"
+            print(f"{run['run_id']:<23} {run['mode']:<12} {run['status']:<10} {run['done_items']:>7} "
+                  f"{run['done_batches']:>7} {run['retries']:>7} {run['attempts']:>5} "
+                  f"{run['active_seconds']:>9} {items_per_s:>8}  {run['started_at']}")
+    finally:
+        journal.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="HEAL7 원격서버 키워드 동기화")
+    parser.add_argument("--incremental", action="store_true",
+                        help=f"저장된 커서({SYNC_CURSOR_FILE}) 이후의 변경만 동기화")
+    parser.add_argument("--digest", action="store_true",
+                        help="다이제스트(내용 해시 트리)를 비교해 다른 버킷만 동기화")
+    parser.add_argument("--push", action="store_true",
+                        help="원격서버 bulk-sync/import 로 배치를 나눠 동시 전송 (merge)")
+    parser.add_argument("--concurrency", type=int, default=PUSH_CONCURRENCY, help="동시 요청 수")
+    parser.add_argument("--batch-size", type=int, default=PUSH_BATCH_SIZE, help="요청당 항목 수")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="중단된 실행을 이어받지 않고 새로 시작 (기본 동기화 / --push)")
+    parser.add_argument("--runs", action="store_true", help="작업 저널의 최근 동기화 실행과 처리량 출력")
+    parser.add_argument("--run-id", help="--runs 와 함께: 실행 하나의 구역별 진행 상황과 산출물 출력")
+    parser.add_argument("--limit", type=int, default=20, help="--runs 출력 개수")
+    args = parser.parse_args()
+    
+    if args.runs or args.run_id:
+        print_sync_runs(args.run_id, args.limit)
+    elif args.incremental:
+        asyncio.run(run_incremental())
+    elif args.digest:
+        asyncio.run(run_digest())
+    elif args.push:
+        asyncio.run(run_push(args.concurrency, args.batch_size, resume=not args.no_resume))
+    else:
+        asyncio.run(main(resume=not args.no_resume))
\ No newline at end of file
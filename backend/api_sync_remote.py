@@ -4,14 +4,20 @@ HEAL7 원격서버 API 동기화 스크립트
 SSH 연결이 불가능한 경우를 위한 API 기반 동기화
 """
 
+import argparse
 import asyncio
 import json
 import aiohttp
 import asyncpg
+import os
 import sys
 from datetime import datetime
 from typing import List, Dict, Any
 
+from services.sync_wire_format import (
+    COLUMNAR_JSON_MEDIA_TYPE, COLUMNAR_MSGPACK_MEDIA_TYPE, dump_sync_payload, load_sync_payload
+)
+
 # 데이터베이스 설정
 DB_CONFIG = {
     "host": "localhost",
@@ -22,6 +28,13 @@ DB_CONFIG = {
 
 REMOTE_SERVER = "https://admin.heal7.com"
 
+# 동기화 파일 형식별 확장자 / 컬럼형 미디어 타입 (json 은 기존 들여쓰기 JSON)
+SYNC_FILE_FORMATS = {
+    "json": (".json", None),
+    "columnar": (".columnar.json", COLUMNAR_JSON_MEDIA_TYPE),
+    "msgpack": (".msgpack", COLUMNAR_MSGPACK_MEDIA_TYPE)
+}
+
 async def get_local_keywords() -> List[Dict]:
     """로컬 데이터베이스에서 442개 키워드 추출"""
     print("📤 로컬 데이터베이스에서 키워드 데이터 추출 중...")
@@ -34,6 +47,7 @@ async def get_local_keywords() -> List[Dict]:
             k.text as name,
             ksc.name as category,
             ksc.name as subcategory,
+            k.subcategory_id,
             k.weight,
             COALESCE(k.usage_count, 0) as connections,
             CASE WHEN k.is_active THEN 'active' ELSE 'inactive' END as status,
@@ -42,6 +56,7 @@ async def get_local_keywords() -> List[Dict]:
                     SELECT kd.dependent_keyword_id 
                     FROM keyword_dependencies kd 
                     WHERE kd.parent_keyword_id = k.id
+                    ORDER BY kd.dependent_keyword_id
                 ), 
                 ARRAY[]::integer[]
             ) as dependencies,
@@ -67,6 +82,7 @@ async def get_local_keywords() -> List[Dict]:
                 "name": row['name'],
                 "category": row['category'],
                 "subcategory": row['subcategory'],
+                "subcategory_id": row['subcategory_id'],
                 "weight": float(row['weight']),
                 "connections": row['connections'],
                 "status": row['status'],
@@ -88,6 +104,14 @@ async def get_remote_keyword_count() -> int:
     
     async with aiohttp.ClientSession() as session:
         try:
+            # 다이제스트가 있으면 키워드 전체 목록 대신 행 수만 받음
+            async with session.get(f"{REMOTE_SERVER}/admin-api/bulk-sync/digest") as response:
+                if response.status == 200:
+                    data = await response.json()
+                    count = data["sections"]["keywords"]["row_count"]
+                    print(f"원격서버 현재 키워드: {count}개 (다이제스트 {data['root'][:12]})")
+                    return count
+            
             async with session.get(f"{REMOTE_SERVER}/admin-api/keywords/") as response:
                 if response.status == 200:
                     data = await response.json()
@@ -133,16 +157,33 @@ async def create_sync_endpoint_data(keywords: List[Dict]) -> Dict:
     
     return sync_data
 
-async def save_sync_data_to_file(sync_data: Dict, filename: str = "/tmp/remote_sync_data.json"):
-    """동기화 데이터를 파일로 저장"""
+async def save_sync_data_to_file(sync_data: Dict, filename: str = "/tmp/remote_sync_data.json",
+                                 file_format: str = "json"):
+    """동기화 데이터를 파일로 저장 (columnar / msgpack 은 컬럼형 압축 형식)"""
+    extension, media_type = SYNC_FILE_FORMATS[file_format]
+    if filename.endswith(".json"):
+        filename = filename[:-len(".json")] + extension
     print(f"💾 동기화 데이터를 {filename}에 저장 중...")
     
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(sync_data, f, ensure_ascii=False, indent=2)
+    if media_type:
+        with open(filename, 'wb') as f:
+            f.write(dump_sync_payload(sync_data, media_type))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(sync_data, f, ensure_ascii=False, indent=2)
     
-    print(f"✅ 동기화 데이터 저장 완료")
+    print(f"✅ 동기화 데이터 저장 완료 ({os.path.getsize(filename):,} bytes)")
     return filename
 
+def load_sync_data_file(filename: str) -> Dict:
+    """저장한 동기화 파일 읽기 (확장자로 형식 판단, 컬럼형은 내보내기 JSON 구조로 복원)"""
+    for extension, media_type in sorted(SYNC_FILE_FORMATS.values(), key=lambda entry: -len(entry[0])):
+        if media_type and filename.endswith(extension):
+            with open(filename, 'rb') as f:
+                return load_sync_payload(f.read(), media_type)
+    with open(filename, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 async def check_remote_server_sync(expected_count: int = 442) -> bool:
     """원격서버 동기화 상태 확인"""
     print(f"🔍 원격서버 동기화 확인 (예상: {expected_count}개)...")
@@ -156,7 +197,7 @@ async def check_remote_server_sync(expected_count: int = 442) -> bool:
         print(f"⚠️  동기화 필요: 현재 {current_count}개, 목표 {expected_count}개")
         return False
 
-async def main():
+async def main(file_format: str = "json"):
     """메인 동기화 프로세스"""
     print("🚀 HEAL7 원격서버 API 동기화 시작")
     print(f"원격서버: {REMOTE_SERVER}")
@@ -178,7 +219,10 @@ async def main():
         sync_data = await create_sync_endpoint_data(keywords)
         
         # 4. 동기화 데이터 파일 저장
-        sync_file = await save_sync_data_to_file(sync_data)
+        sync_file = await save_sync_data_to_file(sync_data, file_format=file_format)
+        if len(load_sync_data_file(sync_file)["keywords"]) != len(keywords):
+            print(f"❌ 저장한 동기화 파일 검증 실패: {sync_file}")
+            sys.exit(1)
         
         print()
         print("📋 동기화 요약:")
@@ -212,4 +256,8 @@ async def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="HEAL7 원격서버 API 동기화")
+    parser.add_argument("--format", choices=sorted(SYNC_FILE_FORMATS), default="json",
+                        help="동기화 파일 형식 (columnar / msgpack 은 분류 사전 + id 차이값 압축)")
+    args = parser.parse_args()
+    asyncio.run(main(args.format))
\ No newline at end of file
@@ -7,12 +7,12 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import os
 import uuid
 from datetime import datetime, timedelta
 
+from services.database_manager import db, rows_affected
+
 logger = logging.getLogger(__name__)
 
 # Pydantic 모델 정의
@@ -50,22 +50,6 @@ class EnrollmentRequest(BaseModel):
 # 라우터 생성
 router = APIRouter(prefix="/admin-api/academy")
 
-# 데이터베이스 연결 함수
-def get_db_connection():
-    """PostgreSQL 데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(
-            host="localhost",
-            database="livedb",
-            user="liveuser",
-            password="livepass2024",
-            cursor_factory=RealDictCursor
-        )
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
-
 @router.get("/health")
 async def academy_health():
     """아카데미 관리 시스템 상태 확인"""
@@ -84,57 +68,32 @@ async def get_projects(
 ):
     """프로젝트 목록 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 쿼리 구성
-        base_query = """
-        SELECT p.id, p.title, p.description, p.category, p.instructor_name,
-               p.target_amount, p.current_amount, p.target_participants, p.current_participants,
-               p.duration_days, p.price, p.image_url, p.difficulty_level, p.status,
-               p.created_at, p.updated_at, p.start_date, p.end_date,
-               CASE 
-                   WHEN p.target_amount > 0 THEN ROUND(((p.current_amount::numeric / p.target_amount::numeric) * 100)::numeric, 2)
-                   ELSE 0 
-               END as funding_percentage,
-               CASE 
-                   WHEN p.end_date > NOW() THEN EXTRACT(DAY FROM p.end_date - NOW())::int
-                   ELSE 0
-               END as days_remaining
-        FROM academy_projects p
-        WHERE 1=1
-        """
-        
-        params = []
-        if category:
-            base_query += " AND p.category = %s"
-            params.append(category)
-        
-        if status:
-            base_query += " AND p.status = %s"
-            params.append(status)
-        
-        base_query += " ORDER BY p.created_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-        
-        cursor.execute(base_query, params)
-        projects = cursor.fetchall()
-        
-        # 전체 개수 조회
-        count_query = "SELECT COUNT(*) FROM academy_projects WHERE 1=1"
-        count_params = []
-        if category:
-            count_query += " AND category = %s"
-            count_params.append(category)
-        if status:
-            count_query += " AND status = %s"
-            count_params.append(status)
+        async with db.lease() as conn:
+            projects = await conn.fetch("""
+            SELECT p.id, p.title, p.description, p.category, p.instructor_name,
+                   p.target_amount, p.current_amount, p.target_participants, p.current_participants,
+                   p.duration_days, p.price, p.image_url, p.difficulty_level, p.status,
+                   p.created_at, p.updated_at, p.start_date, p.end_date,
+                   CASE 
+                       WHEN p.target_amount > 0 THEN ROUND(((p.current_amount::numeric / p.target_amount::numeric) * 100)::numeric, 2)
+                       ELSE 0 
+                   END as funding_percentage,
+                   CASE 
+                       WHEN p.end_date > NOW() THEN EXTRACT(DAY FROM p.end_date - NOW())::int
+                       ELSE 0
+                   END as days_remaining
+            FROM academy_projects p
+            WHERE ($1::text IS NULL OR p.category = $1)
+              AND ($2::text IS NULL OR p.status = $2)
+            ORDER BY p.created_at DESC LIMIT $3 OFFSET $4
+            """, category or None, status or None, limit, offset)
             
-        cursor.execute(count_query, count_params)
-        total_count = cursor.fetchone()['count']
-        
-        cursor.close()
-        conn.close()
+            # 전체 개수 조회
+            total_count = await conn.fetchval("""
+            SELECT COUNT(*) FROM academy_projects
+            WHERE ($1::text IS NULL OR category = $1)
+              AND ($2::text IS NULL OR status = $2)
+            """, category or None, status or None)
         
         # 데이터 포맷팅
         formatted_projects = []
@@ -180,29 +139,23 @@ async def get_projects(
 async def get_project(project_id: int):
     """특정 프로젝트 상세 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT p.id, p.title, p.description, p.category, p.instructor_name,
-               p.target_amount, p.current_amount, p.target_participants, p.current_participants,
-               p.duration_days, p.price, p.image_url, p.difficulty_level, p.status,
-               p.created_at, p.updated_at, p.start_date, p.end_date,
-               CASE 
-                   WHEN p.target_amount > 0 THEN ROUND(((p.current_amount::numeric / p.target_amount::numeric) * 100)::numeric, 2)
-                   ELSE 0 
-               END as funding_percentage,
-               CASE 
-                   WHEN p.end_date > NOW() THEN EXTRACT(DAY FROM p.end_date - NOW())::int
-                   ELSE 0
-               END as days_remaining
-        FROM academy_projects p
-        WHERE p.id = %s
-        """, (project_id,))
-        
-        project = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            project = await conn.fetchrow("""
+            SELECT p.id, p.title, p.description, p.category, p.instructor_name,
+                   p.target_amount, p.current_amount, p.target_participants, p.current_participants,
+                   p.duration_days, p.price, p.image_url, p.difficulty_level, p.status,
+                   p.created_at, p.updated_at, p.start_date, p.end_date,
+                   CASE 
+                       WHEN p.target_amount > 0 THEN ROUND(((p.current_amount::numeric / p.target_amount::numeric) * 100)::numeric, 2)
+                       ELSE 0 
+                   END as funding_percentage,
+                   CASE 
+                       WHEN p.end_date > NOW() THEN EXTRACT(DAY FROM p.end_date - NOW())::int
+                       ELSE 0
+                   END as days_remaining
+            FROM academy_projects p
+            WHERE p.id = $1
+            """, project_id)
         
         if not project:
             raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
@@ -243,20 +196,14 @@ async def get_project(project_id: int):
 async def get_categories():
     """프로젝트 카테고리 목록 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT category, COUNT(*) as project_count
-        FROM academy_projects 
-        WHERE status != 'deleted'
-        GROUP BY category
-        ORDER BY category
-        """)
-        
-        categories = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            categories = await conn.fetch("""
+            SELECT category, COUNT(*) as project_count
+            FROM academy_projects 
+            WHERE status != 'deleted'
+            GROUP BY category
+            ORDER BY category
+            """)
         
         return {
             "success": True,
@@ -277,44 +224,37 @@ async def get_categories():
 async def create_project(project_request: ProjectCreateRequest):
     """새 프로젝트 생성"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # 종료일 계산
         end_date = datetime.now() + timedelta(days=project_request.duration_days)
         
-        cursor.execute("""
-        INSERT INTO academy_projects (
-            title, description, category, instructor_name,
-            target_amount, current_amount, target_participants, current_participants,
-            duration_days, price, image_url, difficulty_level, status,
-            created_at, updated_at, start_date, end_date
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING id
-        """, (
-            project_request.title,
-            project_request.description,
-            project_request.category,
-            project_request.instructor_name,
-            project_request.target_amount,
-            0,  # current_amount
-            project_request.target_participants,
-            0,  # current_participants
-            project_request.duration_days,
-            project_request.price,
-            project_request.image_url,
-            project_request.difficulty_level,
-            'active',
-            datetime.now(),
-            datetime.now(),
-            datetime.now(),
-            end_date
-        ))
-        
-        project_id = cursor.fetchone()['id']
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            project_id = await conn.fetchval("""
+            INSERT INTO academy_projects (
+                title, description, category, instructor_name,
+                target_amount, current_amount, target_participants, current_participants,
+                duration_days, price, image_url, difficulty_level, status,
+                created_at, updated_at, start_date, end_date
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17)
+            RETURNING id
+            """,
+                project_request.title,
+                project_request.description,
+                project_request.category,
+                project_request.instructor_name,
+                project_request.target_amount,
+                0,  # current_amount
+                project_request.target_participants,
+                0,  # current_participants
+                project_request.duration_days,
+                project_request.price,
+                project_request.image_url,
+                project_request.difficulty_level,
+                'active',
+                datetime.now(),
+                datetime.now(),
+                datetime.now(),
+                end_date
+            )
         
         return {
             "success": True,
@@ -330,40 +270,34 @@ async def create_project(project_request: ProjectCreateRequest):
 async def update_project(project_id: int, project_request: ProjectUpdateRequest):
     """프로젝트 정보 업데이트"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # 업데이트할 필드들 동적으로 구성
         update_fields = []
         params = []
         
         for field, value in project_request.dict(exclude_unset=True).items():
             if value is not None:
-                update_fields.append(f"{field} = %s")
                 params.append(value)
+                update_fields.append(f"{field} = ${len(params)}")
         
         if not update_fields:
             raise HTTPException(status_code=400, detail="업데이트할 필드가 없습니다")
         
-        update_fields.append("updated_at = %s")
         params.append(datetime.now())
+        update_fields.append(f"updated_at = ${len(params)}")
         params.append(project_id)
         
         query = f"""
         UPDATE academy_projects 
         SET {', '.join(update_fields)}
-        WHERE id = %s
+        WHERE id = ${len(params)}
         """
         
-        cursor.execute(query, params)
+        async with db.lease() as conn:
+            result = await conn.execute(query, *params)
         
-        if cursor.rowcount == 0:
+        if rows_affected(result) == 0:
             raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
         
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
         return {
             "success": True,
             "message": "프로젝트가 성공적으로 업데이트되었습니다"
@@ -379,63 +313,56 @@ async def update_project(project_id: int, project_request: ProjectUpdateRequest)
 async def enroll_project(project_id: int, enrollment_request: EnrollmentRequest):
     """프로젝트 등록/후원"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 프로젝트 정보 조회
-        cursor.execute("""
-        SELECT id, title, price, current_participants, target_participants, status, end_date
-        FROM academy_projects 
-        WHERE id = %s
-        """, (project_id,))
-        
-        project = cursor.fetchone()
-        if not project:
-            raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
-        
-        if project['status'] != 'active':
-            raise HTTPException(status_code=400, detail="활성화되지 않은 프로젝트입니다")
-        
-        if project['end_date'] <= datetime.now():
-            raise HTTPException(status_code=400, detail="마감된 프로젝트입니다")
-        
-        if project['current_participants'] >= project['target_participants']:
-            raise HTTPException(status_code=400, detail="정원이 마감된 프로젝트입니다")
-        
-        # 등록 ID 생성
-        enrollment_id = f"ENROLL_{datetime.now().strftime('%Y%m%d')}_{str(uuid.uuid4())[:8]}"
-        
-        # 등록 정보 저장
-        cursor.execute("""
-        INSERT INTO academy_enrollments (
-            enrollment_id, project_id, user_name, user_email, user_phone,
-            amount, payment_method, status, created_at, updated_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            enrollment_id,
-            project_id,
-            enrollment_request.user_name,
-            enrollment_request.user_email,
-            enrollment_request.user_phone,
-            project['price'],
-            enrollment_request.payment_method,
-            'pending',
-            datetime.now(),
-            datetime.now()
-        ))
-        
-        # 프로젝트 통계 업데이트
-        cursor.execute("""
-        UPDATE academy_projects 
-        SET current_participants = current_participants + 1,
-            current_amount = current_amount + %s,
-            updated_at = %s
-        WHERE id = %s
-        """, (project['price'], datetime.now(), project_id))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn, conn.transaction():
+            # 프로젝트 정보 조회
+            project = await conn.fetchrow("""
+            SELECT id, title, price, current_participants, target_participants, status, end_date
+            FROM academy_projects 
+            WHERE id = $1
+            """, project_id)
+            
+            if not project:
+                raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+            
+            if project['status'] != 'active':
+                raise HTTPException(status_code=400, detail="활성화되지 않은 프로젝트입니다")
+            
+            if project['end_date'] <= datetime.now():
+                raise HTTPException(status_code=400, detail="마감된 프로젝트입니다")
+            
+            if project['current_participants'] >= project['target_participants']:
+                raise HTTPException(status_code=400, detail="정원이 마감된 프로젝트입니다")
+            
+            # 등록 ID 생성
+            enrollment_id = f"ENROLL_{datetime.now().strftime('%Y%m%d')}_{str(uuid.uuid4())[:8]}"
+            
+            # 등록 정보 저장
+            await conn.execute("""
+            INSERT INTO academy_enrollments (
+                enrollment_id, project_id, user_name, user_email, user_phone,
+                amount, payment_method, status, created_at, updated_at
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10)
+            """,
+                enrollment_id,
+                project_id,
+                enrollment_request.user_name,
+                enrollment_request.user_email,
+                enrollment_request.user_phone,
+                project['price'],
+                enrollment_request.payment_method,
+                'pending',
+                datetime.now(),
+                datetime.now()
+            )
+            
+            # 프로젝트 통계 업데이트
+            await conn.execute("""
+            UPDATE academy_projects 
+            SET current_participants = current_participants + 1,
+                current_amount = current_amount + $1,
+                updated_at = $2
+            WHERE id = $3
+            """, project['price'], datetime.now(), project_id)
         
         return {
             "success": True,
@@ -459,35 +386,26 @@ async def enroll_project(project_id: int, enrollment_request: EnrollmentRequest)
 async def get_academy_stats():
     """아카데미 통계 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 프로젝트 통계
-        cursor.execute("""
-        SELECT 
-            COUNT(*) as total_projects,
-            COUNT(CASE WHEN status = 'active' THEN 1 END) as active_projects,
-            COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_projects,
-            COALESCE(SUM(current_amount), 0) as total_funding,
-            COALESCE(SUM(current_participants), 0) as total_participants
-        FROM academy_projects
-        """)
-        
-        project_stats = cursor.fetchone()
-        
-        # 카테고리별 통계
-        cursor.execute("""
-        SELECT category, COUNT(*) as count, COALESCE(SUM(current_amount), 0) as funding
-        FROM academy_projects 
-        WHERE status != 'deleted'
-        GROUP BY category
-        ORDER BY count DESC
-        """)
-        
-        category_stats = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            # 프로젝트 통계
+            project_stats = await conn.fetchrow("""
+            SELECT 
+                COUNT(*) as total_projects,
+                COUNT(CASE WHEN status = 'active' THEN 1 END) as active_projects,
+                COUNT(CASE WHEN status = 'completed' THEN 1 END) as completed_projects,
+                COALESCE(SUM(current_amount), 0) as total_funding,
+                COALESCE(SUM(current_participants), 0) as total_participants
+            FROM academy_projects
+            """)
+            
+            # 카테고리별 통계
+            category_stats = await conn.fetch("""
+            SELECT category, COUNT(*) as count, COALESCE(SUM(current_amount), 0) as funding
+            FROM academy_projects 
+            WHERE status != 'deleted'
+            GROUP BY category
+            ORDER BY count DESC
+            """)
         
         return {
             "success": True,
@@ -3,106 +3,186 @@ HEAL7 Analytics API Routes
 실시간 통계 분석 및 대시보드 데이터 제공
 """
 
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query
+from pydantic import BaseModel, Field, IPvAnyAddress
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import asyncpg
 import json
 import logging
+import math
+import os
 try:
-    from services.database_manager import get_db_connection
+    from services.database_manager import db
+    from services.analytics_funnels import funnel_registry
+    from services.analytics_rollups import MEMBER_DEVICE_USER, MEMBER_PAGE_SESSION, MEMBER_SESSION, analytics_rollups
+    from services.analytics_sketches import distinct_sketches
+    from services.analytics_partitions import analytics_partitions
+    from services.event_ingest import IngestBackpressure, event_ingest
+    from services.query_fanout import endpoint_budget, fan_out
+    from services.realtime_metrics import realtime_metrics
+    from services.response_cache import CachePolicy, StaleWhileRevalidateCache, do_not_cache
+    from services.service_container import container
 except ImportError:
-    # Fallback database connection
-    async def get_db_connection():
-        return None
+    # Fallback: 데이터베이스 모듈이 없으면 각 엔드포인트가 기본 응답을 반환
+    db = None
+    container = None
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/admin-api/analytics", tags=["Analytics"])
 
+# page_analytics / saju_analysis_sessions 는 롤업(services/analytics_rollups.py)으로만 읽는다.
+# 시간 창은 원본 쿼리와 같고, NOW() 기준 창은 시간 단위 롤업이라 시작 시각이 정시로 내려간다.
+if container is not None:
+    # 파티션을 먼저 맞춘 뒤 롤업 백필 / 수집이 시작되도록 가장 먼저 등록
+    container.register("analytics_partitions", lambda c: analytics_partitions)
+    container.register("analytics_rollups", lambda c: analytics_rollups)
+    container.register("realtime_metrics", lambda c: realtime_metrics)
+    container.register("event_ingest", lambda c: event_ingest)
+
+# 대시보드 탭마다 같은 집계를 폴링하므로 응답을 (fresh, stale) 초 동안 캐시한다
+# ANALYTICS_CACHE_<ENDPOINT>="fresh:stale" 로 조정, 0:0 이면 캐시하지 않음
+ANALYTICS_CACHE_TTLS = {
+    "overview": (30, 300),
+    "demographics": (300, 3600),
+    "device-stats": (60, 600),
+    "popular-pages": (60, 600),
+    "saju-performance": (60, 600),
+    "realtime-stats": (5, 30),
+    "conversion-funnel": (120, 1200),
+}
+
+def is_complete_response(value: Any) -> bool:
+    """stale 섹션이 섞인 부분 응답은 캐시하지 않음"""
+    return not (isinstance(value, dict) and (value.get("meta") or {}).get("stale"))
+
+if container is not None:
+    analytics_cache = StaleWhileRevalidateCache(
+        "analytics",
+        {name: CachePolicy.from_env("analytics", name, *ttls) for name, ttls in ANALYTICS_CACHE_TTLS.items()},
+        cacheable=is_complete_response
+    )
+    container.register("analytics_cache", lambda c: analytics_cache)
+    cached = analytics_cache.cached
+else:
+    def cached(name):
+        return lambda func: func
+
+    def do_not_cache():
+        pass
+
+# 기간 내 고유 구성원 수 ($1: 차원, $2: 기간 일수 - date >= CURRENT_DATE - $2 와 같은 창, $3: 대상 값 목록)
+ROLLUP_MEMBERS_QUERY = """
+    SELECT dim_value, COUNT(*) AS members
+    FROM analytics_rollup_members
+    WHERE dimension = $1 AND last_seen >= CURRENT_DATE - $2::int
+    AND ($3::text[] IS NULL OR dim_value = ANY($3::text[]))
+    GROUP BY dim_value
+"""
+
+async def count_rollup_members(conn, dimension: str, days: int, values: Optional[List[str]] = None) -> Dict[str, int]:
+    """차원 값별 기간 내 고유 구성원 수 (세션/사용자, 값을 주면 그 값들만)
+
+    ANALYTICS_DISTINCT_MODE=approx 면 일별 HLL 스케치를 합친 근사값 (services/analytics_sketches.py)
+    """
+    if distinct_sketches.enabled:
+        return await distinct_sketches.count_distinct(conn, dimension, days, values)
+    rows = await conn.fetch(ROLLUP_MEMBERS_QUERY, dimension, days, values)
+    return {row['dim_value']: row['members'] for row in rows}
+
+# ==================== /overview 섹션 (서로 독립, 각자 연결에서 동시 실행) ====================
+
+async def overview_users(conn) -> Dict[str, Any]:
+    """기본 사용자 통계"""
+    user_stats = await conn.fetchrow("""
+        SELECT 
+            COUNT(*) as total_users,
+            COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '7 days') as new_users_7d,
+            COUNT(*) FILTER (WHERE last_login >= NOW() - INTERVAL '7 days') as active_users_7d,
+            COUNT(*) FILTER (WHERE last_login >= NOW() - INTERVAL '30 days') as active_users_30d
+        FROM users
+    """)
+    return {
+        "total": user_stats['total_users'] or 0,
+        "new_7d": user_stats['new_users_7d'] or 0,
+        "active_7d": user_stats['active_users_7d'] or 0,
+        "active_30d": user_stats['active_users_30d'] or 0,
+        "retention_rate": round((user_stats['active_users_7d'] or 0) * 100.0 / max(user_stats['new_users_7d'] or 1, 1), 1)
+    }
+
+async def overview_saju(conn) -> Dict[str, Any]:
+    """사주 분석 통계"""
+    saju_stats = await conn.fetchrow("""
+        SELECT 
+            SUM(requests)::bigint as total_analysis,
+            SUM(requests) FILTER (WHERE bucket_hour >= date_trunc('hour', LOCALTIMESTAMP - INTERVAL '1 day'))::bigint as today_analysis,
+            SUM(processing_seconds) / NULLIF(SUM(processed), 0) as avg_processing_time,
+            SUM(requests) FILTER (WHERE status = 'completed') * 100.0 / NULLIF(SUM(requests), 0) as success_rate,
+            SUM(requests) FILTER (WHERE ai_reviewed = true) * 100.0 / NULLIF(SUM(requests), 0) as ai_review_rate
+        FROM analytics_saju_hourly
+        WHERE bucket_hour >= date_trunc('hour', LOCALTIMESTAMP - INTERVAL '30 days')
+    """)
+    return {
+        "total": saju_stats['total_analysis'] or 0,
+        "today": saju_stats['today_analysis'] or 0,
+        "avg_processing_time": round(saju_stats['avg_processing_time'] or 0, 1),
+        "success_rate": round(saju_stats['success_rate'] or 0, 1),
+        "ai_review_rate": round(saju_stats['ai_review_rate'] or 0, 1)
+    }
+
+async def overview_keywords(conn) -> Dict[str, Any]:
+    """키워드 시스템 통계"""
+    keyword_stats = await conn.fetchrow("""
+        SELECT 
+            COUNT(DISTINCT keyword_id) as total_keywords,
+            COUNT(DISTINCT keyword_id) FILTER (WHERE status = 'active') as active_keywords,
+            SUM(usage_count) as total_usage
+        FROM keyword_usage_stats
+        WHERE date >= CURRENT_DATE - INTERVAL '30 days'
+    """)
+    return {
+        "total": keyword_stats['total_keywords'] or 0,
+        "active": keyword_stats['active_keywords'] or 0,
+        "total_usage": keyword_stats['total_usage'] or 0
+    }
+
+async def overview_traffic(conn) -> Dict[str, Any]:
+    """페이지뷰 통계 (롤업)"""
+    pageview_stats = await conn.fetchrow("""
+        SELECT 
+            SUM(pageviews)::bigint as total_pageviews,
+            SUM(session_duration_sum)::float / NULLIF(SUM(session_duration_count), 0) as avg_session_duration,
+            SUM(bounces) * 100.0 / NULLIF(SUM(pageviews), 0) as bounce_rate
+        FROM analytics_pageview_daily
+        WHERE day >= CURRENT_DATE - 7
+    """)
+    unique_sessions = await count_rollup_members(conn, MEMBER_SESSION, 7)
+    return {
+        "pageviews": pageview_stats['total_pageviews'] or 0,
+        "sessions": unique_sessions.get('', 0),
+        "avg_session_duration": round(pageview_stats['avg_session_duration'] or 0),
+        "bounce_rate": round(pageview_stats['bounce_rate'] or 0, 1)
+    }
+
 @router.get("/overview")
-async def get_analytics_overview():
+@cached("overview")
+async def get_analytics_overview(partial: bool = Query(True, description="예산 안에 끝난 섹션만 새로 계산하고 나머지는 stale 로 표시")):
     """메인 대시보드 개요 통계"""
     try:
-        conn = await get_db_connection()
-        
-        if conn is None:
+        if db is None:
             raise Exception("Database connection not available")
-        
-        # 기본 사용자 통계
-        user_stats = await conn.fetchrow("""
-            SELECT 
-                COUNT(*) as total_users,
-                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '7 days') as new_users_7d,
-                COUNT(*) FILTER (WHERE last_login >= NOW() - INTERVAL '7 days') as active_users_7d,
-                COUNT(*) FILTER (WHERE last_login >= NOW() - INTERVAL '30 days') as active_users_30d
-            FROM users
-        """)
-        
-        # 사주 분석 통계
-        saju_stats = await conn.fetchrow("""
-            SELECT 
-                COUNT(*) as total_analysis,
-                COUNT(*) FILTER (WHERE created_at >= NOW() - INTERVAL '1 day') as today_analysis,
-                AVG(EXTRACT(EPOCH FROM (completed_at - created_at))) as avg_processing_time,
-                COUNT(*) FILTER (WHERE status = 'completed') * 100.0 / COUNT(*) as success_rate,
-                COUNT(*) FILTER (WHERE ai_reviewed = true) * 100.0 / COUNT(*) as ai_review_rate
-            FROM saju_analysis_sessions
-            WHERE created_at >= NOW() - INTERVAL '30 days'
-        """)
-        
-        # 키워드 시스템 통계
-        keyword_stats = await conn.fetchrow("""
-            SELECT 
-                COUNT(DISTINCT keyword_id) as total_keywords,
-                COUNT(DISTINCT keyword_id) FILTER (WHERE status = 'active') as active_keywords,
-                SUM(usage_count) as total_usage
-            FROM keyword_usage_stats
-            WHERE date >= CURRENT_DATE - INTERVAL '30 days'
-        """)
-        
-        # 페이지뷰 통계 (로그 기반 또는 별도 테이블)
-        pageview_stats = await conn.fetchrow("""
-            SELECT 
-                COUNT(*) as total_pageviews,
-                COUNT(DISTINCT session_id) as unique_sessions,
-                AVG(session_duration) as avg_session_duration,
-                COUNT(*) FILTER (WHERE bounce = true) * 100.0 / COUNT(*) as bounce_rate
-            FROM page_analytics
-            WHERE date >= CURRENT_DATE - INTERVAL '7 days'
-        """)
-        
-        await conn.close()
-        
-        return {
-            "users": {
-                "total": user_stats['total_users'] or 0,
-                "new_7d": user_stats['new_users_7d'] or 0,
-                "active_7d": user_stats['active_users_7d'] or 0,
-                "active_30d": user_stats['active_users_30d'] or 0,
-                "retention_rate": round((user_stats['active_7d'] or 0) * 100.0 / max(user_stats['new_users_7d'] or 1, 1), 1)
-            },
-            "saju_analysis": {
-                "total": saju_stats['total_analysis'] or 0,
-                "today": saju_stats['today_analysis'] or 0,
-                "avg_processing_time": round(saju_stats['avg_processing_time'] or 0, 1),
-                "success_rate": round(saju_stats['success_rate'] or 0, 1),
-                "ai_review_rate": round(saju_stats['ai_review_rate'] or 0, 1)
-            },
-            "keywords": {
-                "total": keyword_stats['total_keywords'] or 0,
-                "active": keyword_stats['active_keywords'] or 0,
-                "total_usage": keyword_stats['total_usage'] or 0
-            },
-            "traffic": {
-                "pageviews": pageview_stats['total_pageviews'] or 0,
-                "sessions": pageview_stats['unique_sessions'] or 0,
-                "avg_session_duration": round(pageview_stats['avg_session_duration'] or 0),
-                "bounce_rate": round(pageview_stats['bounce_rate'] or 0, 1)
-            }
-        }
+
+        result = await fan_out("overview", {
+            "users": overview_users,
+            "saju_analysis": overview_saju,
+            "keywords": overview_keywords,
+            "traffic": overview_traffic
+        }, partial=partial)
+        return {**result.values, "meta": result.meta()}
         
     except Exception as e:
         logger.error(f"Analytics overview error: {e}")
+        do_not_cache()
         # Fallback to existing data structure
         return {
             "users": {"total": 12847, "new_7d": 1234, "active_7d": 8932, "active_30d": 11613, "retention_rate": 72.4},
@@ -111,79 +191,85 @@ async def get_analytics_overview():
             "traffic": {"pageviews": 53900, "sessions": 12847, "avg_session_duration": 265, "bounce_rate": 42.3}
         }
 
+# ==================== /demographics 섹션 ====================
+
+async def demographics_age(conn) -> List[Dict[str, Any]]:
+    """연령대별 분포"""
+    rows = await conn.fetch("""
+        SELECT 
+            CASE 
+                WHEN age BETWEEN 20 AND 29 THEN '20대'
+                WHEN age BETWEEN 30 AND 39 THEN '30대'
+                WHEN age BETWEEN 40 AND 49 THEN '40대'
+                WHEN age BETWEEN 50 AND 59 THEN '50대'
+                WHEN age >= 60 THEN '60대+'
+                ELSE '기타'
+            END as age_group,
+            COUNT(*) as count
+        FROM users 
+        WHERE age IS NOT NULL
+        GROUP BY age_group
+        ORDER BY age_group
+    """)
+    return [{"label": row['age_group'], "value": row['count']} for row in rows]
+
+async def demographics_gender(conn) -> List[Dict[str, Any]]:
+    """성별 분포"""
+    rows = await conn.fetch("""
+        SELECT 
+            COALESCE(gender, '미설정') as gender,
+            COUNT(*) as count
+        FROM users
+        GROUP BY gender
+    """)
+    return [{"label": row['gender'], "value": row['count']} for row in rows]
+
+async def demographics_region(conn) -> List[Dict[str, Any]]:
+    """지역별 분포 (IP 기반 또는 사용자 입력)"""
+    rows = await conn.fetch("""
+        SELECT 
+            COALESCE(region, '미설정') as region,
+            COUNT(*) as count
+        FROM users
+        GROUP BY region
+        ORDER BY count DESC
+        LIMIT 10
+    """)
+    return [{"label": row['region'], "value": row['count']} for row in rows]
+
+def with_percentages(distribution: Optional[List[Dict[str, Any]]], total: int) -> Optional[List[Dict[str, Any]]]:
+    if distribution is None:
+        return None
+    return [{**item, "percentage": round(item['value'] * 100.0 / max(total, 1), 1)} for item in distribution]
+
 @router.get("/demographics")
-async def get_user_demographics():
+@cached("demographics")
+async def get_user_demographics(partial: bool = Query(True, description="예산 안에 끝난 섹션만 새로 계산하고 나머지는 stale 로 표시")):
     """사용자 인구통계 분석"""
     try:
-        conn = await get_db_connection()
-        
-        # 연령대별 분포
-        age_distribution = await conn.fetch("""
-            SELECT 
-                CASE 
-                    WHEN age BETWEEN 20 AND 29 THEN '20대'
-                    WHEN age BETWEEN 30 AND 39 THEN '30대'
-                    WHEN age BETWEEN 40 AND 49 THEN '40대'
-                    WHEN age BETWEEN 50 AND 59 THEN '50대'
-                    WHEN age >= 60 THEN '60대+'
-                    ELSE '기타'
-                END as age_group,
-                COUNT(*) as count
-            FROM users 
-            WHERE age IS NOT NULL
-            GROUP BY age_group
-            ORDER BY age_group
-        """)
-        
-        # 성별 분포
-        gender_distribution = await conn.fetch("""
-            SELECT 
-                COALESCE(gender, '미설정') as gender,
-                COUNT(*) as count
-            FROM users
-            GROUP BY gender
-        """)
-        
-        # 지역별 분포 (IP 기반 또는 사용자 입력)
-        region_distribution = await conn.fetch("""
-            SELECT 
-                COALESCE(region, '미설정') as region,
-                COUNT(*) as count
-            FROM users
-            GROUP BY region
-            ORDER BY count DESC
-            LIMIT 10
-        """)
-        
-        await conn.close()
+        if db is None:
+            raise Exception("Database connection not available")
+
+        result = await fan_out("demographics", {
+            "age_distribution": demographics_age,
+            "gender_distribution": demographics_gender,
+            "region_distribution": demographics_region
+        }, partial=partial)
         
-        total_users = sum(row['count'] for row in age_distribution)
+        # 비율 기준은 연령 분포 합계 (연령 섹션이 없으면 성별 분포 합계)
+        basis = result["age_distribution"] or result["gender_distribution"] or []
+        total_users = sum(item['value'] for item in basis)
         
         return {
-            "age_distribution": [
-                {
-                    "label": row['age_group'],
-                    "value": row['count'],
-                    "percentage": round(row['count'] * 100.0 / max(total_users, 1), 1)
-                } for row in age_distribution
-            ],
-            "gender_distribution": [
-                {
-                    "label": row['gender'],
-                    "value": row['count'],
-                    "percentage": round(row['count'] * 100.0 / max(total_users, 1), 1)
-                } for row in gender_distribution
-            ],
-            "region_distribution": [
-                {
-                    "label": row['region'],
-                    "value": row['count']
-                } for row in region_distribution
-            ]
+            "age_distribution": with_percentages(result["age_distribution"], total_users),
+            "gender_distribution": with_percentages(result["gender_distribution"], total_users),
+            "region_distribution": result["region_distribution"],
+            "meta": result.meta()
         }
         
     except Exception as e:
         logger.error(f"Demographics error: {e}")
+        do_not_cache()
         return {
             "age_distribution": [
                 {"label": "20대", "value": 2847, "percentage": 22.1},
@@ -205,42 +291,59 @@ async def get_user_demographics():
             ]
         }
 
+# ==================== /device-stats 섹션 ====================
+
+async def device_totals(conn) -> List[Dict[str, Any]]:
+    """기기별 페이지뷰 / 평균 체류 (롤업)"""
+    rows = await conn.fetch("""
+        SELECT 
+            device_type,
+            SUM(pageviews)::bigint as sessions,
+            SUM(session_duration_sum)::float / NULLIF(SUM(session_duration_count), 0) as avg_duration
+        FROM analytics_pageview_daily
+        WHERE day >= CURRENT_DATE - 7
+        GROUP BY device_type
+        ORDER BY sessions DESC
+    """)
+    return [dict(row) for row in rows]
+
+async def device_unique_users(conn) -> Dict[str, int]:
+    """기기별 고유 사용자"""
+    return await count_rollup_members(conn, MEMBER_DEVICE_USER, 7)
+
 @router.get("/device-stats")
-async def get_device_statistics():
+@cached("device-stats")
+async def get_device_statistics(partial: bool = Query(True, description="예산 안에 끝난 섹션만 새로 계산하고 나머지는 stale 로 표시")):
     """기기별 접속 통계"""
     try:
-        conn = await get_db_connection()
-        
-        device_stats = await conn.fetch("""
-            SELECT 
-                device_type,
-                COUNT(*) as sessions,
-                AVG(session_duration) as avg_duration,
-                COUNT(DISTINCT user_id) as unique_users
-            FROM page_analytics
-            WHERE date >= CURRENT_DATE - INTERVAL '7 days'
-            GROUP BY device_type
-            ORDER BY sessions DESC
-        """)
-        
-        await conn.close()
+        if db is None:
+            raise Exception("Database connection not available")
+
+        result = await fan_out("device-stats", {
+            "totals": device_totals,
+            "unique_users": device_unique_users
+        }, partial=partial)
         
+        device_stats = result["totals"] or []
+        unique_users = result["unique_users"]
         total_sessions = sum(row['sessions'] for row in device_stats)
         
         return {
             "device_distribution": [
                 {
                     "label": row['device_type'].title(),
-                    "value": row['unique_users'],
+                    "value": unique_users.get(row['device_type'], 0) if unique_users is not None else None,
                     "sessions": row['sessions'],
                     "percentage": round(row['sessions'] * 100.0 / max(total_sessions, 1)),
                     "avg_duration": round(row['avg_duration'] or 0)
                 } for row in device_stats
-            ]
+            ],
+            "meta": result.meta()
         }
         
     except Exception as e:
         logger.error(f"Device stats error: {e}")
+        do_not_cache()
         return {
             "device_distribution": [
                 {"label": "모바일", "value": 7708, "sessions": 23456, "percentage": 60, "avg_duration": 245},
@@ -250,33 +353,33 @@ async def get_device_statistics():
         }
 
 @router.get("/popular-pages")
+@cached("popular-pages")
 async def get_popular_pages():
     """인기 페이지 통계"""
     try:
-        conn = await get_db_connection()
-        
-        popular_pages = await conn.fetch("""
-            SELECT 
-                page_path,
-                COUNT(*) as pageviews,
-                COUNT(DISTINCT session_id) as unique_sessions,
-                AVG(time_on_page) as avg_time_on_page,
-                COUNT(*) FILTER (WHERE bounce = true) * 100.0 / COUNT(*) as bounce_rate
-            FROM page_analytics
-            WHERE date >= CURRENT_DATE - INTERVAL '7 days'
-            GROUP BY page_path
-            ORDER BY pageviews DESC
-            LIMIT 10
-        """)
-        
-        await conn.close()
+        async with db.lease() as conn:
+            popular_pages = await conn.fetch("""
+                SELECT 
+                    page_path,
+                    SUM(pageviews)::bigint as pageviews,
+                    SUM(time_on_page_sum)::float / NULLIF(SUM(time_on_page_count), 0) as avg_time_on_page,
+                    SUM(bounces) * 100.0 / NULLIF(SUM(pageviews), 0) as bounce_rate
+                FROM analytics_pageview_daily
+                WHERE day >= CURRENT_DATE - 7
+                GROUP BY page_path
+                ORDER BY pageviews DESC
+                LIMIT 10
+            """)
+            unique_sessions = await count_rollup_members(
+                conn, MEMBER_PAGE_SESSION, 7, [row['page_path'] for row in popular_pages]
+            )
         
         return {
             "popular_pages": [
                 {
                     "page": row['page_path'],
                     "pageviews": row['pageviews'],
-                    "unique_sessions": row['unique_sessions'],
+                    "unique_sessions": unique_sessions.get(row['page_path'], 0),
                     "avg_time": f"{int(row['avg_time_on_page'] or 0 // 60)}:{int(row['avg_time_on_page'] or 0 % 60):02d}",
                     "bounce_rate": round(row['bounce_rate'] or 0, 1)
                 } for row in popular_pages
@@ -285,6 +388,7 @@ async def get_popular_pages():
         
     except Exception as e:
         logger.error(f"Popular pages error: {e}")
+        do_not_cache()
         return {
             "popular_pages": [
                 {"page": "/saju/free", "pageviews": 8234, "unique_sessions": 6123, "avg_time": "3:45", "bounce_rate": 34.2},
@@ -295,58 +399,79 @@ async def get_popular_pages():
             ]
         }
 
+# ==================== /saju-performance 섹션 ====================
+
+async def saju_hourly(conn) -> List[Dict[str, Any]]:
+    """시간대별 사주 분석 요청 (최근 7일 완료 건)"""
+    rows = await conn.fetch("""
+        SELECT 
+            EXTRACT(HOUR FROM bucket_hour) as hour,
+            SUM(requests)::bigint as requests,
+            SUM(processing_seconds) / NULLIF(SUM(processed), 0) as avg_processing_time
+        FROM analytics_saju_hourly
+        WHERE bucket_hour >= date_trunc('hour', LOCALTIMESTAMP - INTERVAL '7 days')
+        AND status = 'completed'
+        GROUP BY EXTRACT(HOUR FROM bucket_hour)
+        HAVING SUM(requests) > 0
+        ORDER BY hour
+    """)
+    return [dict(row) for row in rows]
+
+async def saju_daily(conn) -> List[Dict[str, Any]]:
+    """일별 추이 (최근 30일)"""
+    rows = await conn.fetch("""
+        SELECT 
+            day as date,
+            SUM(requests)::bigint as total_requests,
+            COALESCE(SUM(requests) FILTER (WHERE status = 'completed'), 0)::bigint as successful,
+            COALESCE(SUM(requests) FILTER (WHERE ai_reviewed = true), 0)::bigint as ai_reviewed,
+            SUM(processing_seconds) / NULLIF(SUM(processed), 0) as avg_processing_time
+        FROM analytics_saju_daily
+        WHERE day >= (LOCALTIMESTAMP - INTERVAL '30 days')::date
+        GROUP BY day
+        HAVING SUM(requests) > 0
+        ORDER BY date DESC
+    """)
+    return [dict(row) for row in rows]
+
 @router.get("/saju-performance")
-async def get_saju_performance_stats():
+@cached("saju-performance")
+async def get_saju_performance_stats(partial: bool = Query(True, description="예산 안에 끝난 섹션만 새로 계산하고 나머지는 stale 로 표시")):
     """사주 시스템 성능 통계"""
     try:
-        conn = await get_db_connection()
-        
-        # 시간대별 사주 분석 요청
-        hourly_stats = await conn.fetch("""
-            SELECT 
-                EXTRACT(HOUR FROM created_at) as hour,
-                COUNT(*) as requests,
-                AVG(EXTRACT(EPOCH FROM (completed_at - created_at))) as avg_processing_time
-            FROM saju_analysis_sessions
-            WHERE created_at >= NOW() - INTERVAL '7 days'
-            AND status = 'completed'
-            GROUP BY EXTRACT(HOUR FROM created_at)
-            ORDER BY hour
-        """)
-        
-        # 일별 추이 (최근 30일)
-        daily_stats = await conn.fetch("""
-            SELECT 
-                DATE(created_at) as date,
-                COUNT(*) as total_requests,
-                COUNT(*) FILTER (WHERE status = 'completed') as successful,
-                COUNT(*) FILTER (WHERE ai_reviewed = true) as ai_reviewed,
-                AVG(EXTRACT(EPOCH FROM (completed_at - created_at))) as avg_processing_time
-            FROM saju_analysis_sessions
-            WHERE created_at >= NOW() - INTERVAL '30 days'
-            GROUP BY DATE(created_at)
-            ORDER BY date DESC
-        """)
-        
-        await conn.close()
-        
-        # 가장 인기 있는 시간대 찾기
-        peak_hour = max(hourly_stats, key=lambda x: x['requests'], default={'hour': 22})
+        if db is None:
+            raise Exception("Database connection not available")
+
+        result = await fan_out("saju-performance", {
+            "hourly": saju_hourly,
+            "daily": saju_daily
+        }, partial=partial)
+        hourly_stats = result["hourly"]
+        daily_stats = result["daily"]
+        
+        performance_metrics = {"peak_hour": None, "avg_processing_time": None, "daily_average": None}
+        if hourly_stats is not None:
+            # 가장 인기 있는 시간대 찾기
+            peak_hour = max(hourly_stats, key=lambda x: x['requests'], default={'hour': 22})
+            performance_metrics["peak_hour"] = f"{int(peak_hour['hour'])}:00-{int(peak_hour['hour'])+1}:00"
+            performance_metrics["avg_processing_time"] = round(
+                sum(row['avg_processing_time'] or 0 for row in hourly_stats) / max(len(hourly_stats), 1), 1
+            )
+        if daily_stats is not None:
+            performance_metrics["daily_average"] = round(
+                sum(row['total_requests'] for row in daily_stats) / max(len(daily_stats), 1)
+            )
         
         return {
-            "performance_metrics": {
-                "peak_hour": f"{int(peak_hour['hour'])}:00-{int(peak_hour['hour'])+1}:00",
-                "avg_processing_time": round(sum(row['avg_processing_time'] or 0 for row in hourly_stats) / max(len(hourly_stats), 1), 1),
-                "daily_average": round(sum(row['total_requests'] for row in daily_stats) / max(len(daily_stats), 1))
-            },
-            "hourly_distribution": [
+            "performance_metrics": performance_metrics,
+            "hourly_distribution": None if hourly_stats is None else [
                 {
                     "hour": int(row['hour']),
                     "requests": row['requests'],
                     "avg_time": round(row['avg_processing_time'] or 0, 1)
                 } for row in hourly_stats
             ],
-            "daily_trend": [
+            "daily_trend": None if daily_stats is None else [
                 {
                     "date": row['date'].strftime("%Y-%m-%d"),
                     "total": row['total_requests'],
@@ -355,11 +480,13 @@ async def get_saju_performance_stats():
                     "success_rate": round(row['successful'] * 100.0 / max(row['total_requests'], 1), 1),
                     "avg_time": round(row['avg_processing_time'] or 0, 1)
                 } for row in daily_stats[:7]  # 최근 7일만
-            ]
+            ],
+            "meta": result.meta()
         }
         
     except Exception as e:
         logger.error(f"Saju performance error: {e}")
+        do_not_cache()
         return {
             "performance_metrics": {
                 "peak_hour": "22:00-23:00",
@@ -378,51 +505,74 @@ async def get_saju_performance_stats():
             ]
         }
 
+# ==================== /realtime-stats 섹션 ====================
+
+async def realtime_activity(conn) -> Dict[str, Any]:
+    """최근 1시간 활동 (Redis 분 단위 버킷, Redis 를 못 쓰면 원본 테이블)"""
+    try:
+        return {**await realtime_metrics.snapshot(), "source": "redis"}
+    except Exception as e:
+        logger.warning(f"Realtime metrics unavailable, reading page_analytics: {e}")
+
+    realtime_data = await conn.fetchrow("""
+        SELECT 
+            COUNT(DISTINCT session_id) as active_sessions,
+            (SELECT COUNT(*) FROM saju_analysis_sessions
+             WHERE created_at >= NOW() - INTERVAL '1 hour') as saju_requests_1h,
+            COUNT(*) as page_views_1h,
+            COUNT(DISTINCT user_id) as unique_visitors_1h
+        FROM page_analytics
+        WHERE timestamp >= NOW() - INTERVAL '1 hour'
+        AND date >= (NOW() - INTERVAL '1 hour')::date
+    """)
+    return {
+        "active_sessions": realtime_data['active_sessions'] or 0,
+        "saju_requests_1h": realtime_data['saju_requests_1h'] or 0,
+        "page_views_1h": realtime_data['page_views_1h'] or 0,
+        "unique_visitors_1h": realtime_data['unique_visitors_1h'] or 0,
+        "source": "database"
+    }
+
+async def realtime_workers(conn) -> Dict[str, Any]:
+    """현재 활성 크롤러/작업자 상태"""
+    active_systems = await conn.fetchrow("""
+        SELECT 
+            COUNT(*) FILTER (WHERE last_heartbeat >= NOW() - INTERVAL '5 minutes') as active_workers,
+            COUNT(*) as total_workers
+        FROM system_workers
+    """)
+    return {
+        "active_workers": active_systems['active_workers'] or 0,
+        "total_workers": active_systems['total_workers'] or 0
+    }
+
 @router.get("/realtime-stats")
-async def get_realtime_statistics():
+@cached("realtime-stats")
+async def get_realtime_statistics(partial: bool = Query(True, description="예산 안에 끝난 섹션만 새로 계산하고 나머지는 stale 로 표시")):
     """실시간 통계 (최근 1시간)"""
     try:
-        conn = await get_db_connection()
-        
-        realtime_data = await conn.fetchrow("""
-            SELECT 
-                COUNT(DISTINCT s.session_id) as active_sessions,
-                COUNT(sa.id) as saju_requests_1h,
-                COUNT(pa.id) as page_views_1h,
-                COUNT(DISTINCT pa.user_id) as unique_visitors_1h
-            FROM page_analytics pa
-            LEFT JOIN sessions s ON pa.session_id = s.id
-            LEFT JOIN saju_analysis_sessions sa ON sa.created_at >= NOW() - INTERVAL '1 hour'
-            WHERE pa.timestamp >= NOW() - INTERVAL '1 hour'
-        """)
-        
-        # 현재 활성 크롤러/작업자 상태
-        active_systems = await conn.fetchrow("""
-            SELECT 
-                COUNT(*) FILTER (WHERE last_heartbeat >= NOW() - INTERVAL '5 minutes') as active_workers,
-                COUNT(*) as total_workers
-            FROM system_workers
-        """)
-        
-        await conn.close()
+        if db is None:
+            raise Exception("Database connection not available")
+
+        # 실시간 화면은 자주 폴링하므로 예산을 짧게
+        result = await fan_out("realtime-stats", {
+            "current_activity": realtime_activity,
+            "workers": realtime_workers
+        }, budget=endpoint_budget("realtime-stats", 1.0), partial=partial)
         
         return {
-            "current_activity": {
-                "active_sessions": realtime_data['active_sessions'] or 0,
-                "saju_requests_1h": realtime_data['saju_requests_1h'] or 0,
-                "page_views_1h": realtime_data['page_views_1h'] or 0,
-                "unique_visitors_1h": realtime_data['unique_visitors_1h'] or 0
-            },
+            "current_activity": result["current_activity"],
             "system_health": {
-                "active_workers": active_systems['active_workers'] or 0,
-                "total_workers": active_systems['total_workers'] or 0,
+                **(result["workers"] or {"active_workers": None, "total_workers": None}),
                 "system_load": 45.6,  # CPU/메모리 사용률은 별도 모니터링 시스템에서
                 "response_time": 150  # ms
-            }
+            },
+            "meta": result.meta()
         }
         
     except Exception as e:
         logger.error(f"Realtime stats error: {e}")
+        do_not_cache()
         return {
             "current_activity": {
                 "active_sessions": 23,
@@ -439,57 +589,20 @@ async def get_realtime_statistics():
         }
 
 @router.get("/conversion-funnel")
-async def get_conversion_funnel():
-    """전환 퍼널 분석"""
+@cached("conversion-funnel")
+async def get_conversion_funnel(funnel: str = Query("conversion", description="퍼널 이름 (GET /funnels)")):
+    """전환 퍼널 분석 (최근 7일 세션별 단계 비트마스크 집계)"""
+    definition = funnel_registry.get(funnel) if db else None
+    if db and definition is None:
+        raise HTTPException(status_code=404, detail=f"정의되지 않은 퍼널입니다: {funnel}")
     try:
-        conn = await get_db_connection()
-        
-        funnel_data = await conn.fetch("""
-            WITH funnel_steps AS (
-                SELECT 
-                    session_id,
-                    MAX(CASE WHEN page_path = '/' THEN 1 ELSE 0 END) as visited_home,
-                    MAX(CASE WHEN page_path LIKE '/saju%' THEN 1 ELSE 0 END) as viewed_saju,
-                    MAX(CASE WHEN page_path = '/register' THEN 1 ELSE 0 END) as started_signup,
-                    MAX(CASE WHEN page_path = '/profile' THEN 1 ELSE 0 END) as completed_signup,
-                    MAX(CASE WHEN page_path LIKE '/payment%' THEN 1 ELSE 0 END) as initiated_payment,
-                    MAX(CASE WHEN page_path = '/payment/success' THEN 1 ELSE 0 END) as completed_payment
-                FROM page_analytics
-                WHERE date >= CURRENT_DATE - INTERVAL '7 days'
-                GROUP BY session_id
-            )
-            SELECT 
-                SUM(visited_home) as home_visitors,
-                SUM(viewed_saju) as saju_viewers,
-                SUM(started_signup) as signup_starters,
-                SUM(completed_signup) as signup_completers,
-                SUM(initiated_payment) as payment_initiators,
-                SUM(completed_payment) as payment_completers
-            FROM funnel_steps
-        """)
-        
-        await conn.close()
-        
-        if funnel_data:
-            row = funnel_data[0]
-            return {
-                "funnel_steps": [
-                    {"step": "홈페이지 방문", "count": row['home_visitors'] or 0, "conversion_rate": 100.0},
-                    {"step": "사주 페이지 조회", "count": row['saju_viewers'] or 0, 
-                     "conversion_rate": round((row['saju_viewers'] or 0) * 100.0 / max(row['home_visitors'] or 1, 1), 1)},
-                    {"step": "회원가입 시작", "count": row['signup_starters'] or 0,
-                     "conversion_rate": round((row['signup_starters'] or 0) * 100.0 / max(row['saju_viewers'] or 1, 1), 1)},
-                    {"step": "회원가입 완료", "count": row['signup_completers'] or 0,
-                     "conversion_rate": round((row['signup_completers'] or 0) * 100.0 / max(row['signup_starters'] or 1, 1), 1)},
-                    {"step": "결제 시작", "count": row['payment_initiators'] or 0,
-                     "conversion_rate": round((row['payment_initiators'] or 0) * 100.0 / max(row['signup_completers'] or 1, 1), 1)},
-                    {"step": "결제 완료", "count": row['payment_completers'] or 0,
-                     "conversion_rate": round((row['payment_completers'] or 0) * 100.0 / max(row['payment_initiators'] or 1, 1), 1)}
-                ]
-            }
+        async with db.lease() as conn:
+            funnel_steps = await definition.step_counts(conn, 7)
+        return {"funnel": funnel, "funnel_steps": funnel_steps}
         
     except Exception as e:
         logger.error(f"Conversion funnel error: {e}")
+        do_not_cache()
         
     return {
         "funnel_steps": [
@@ -502,6 +615,109 @@ async def get_conversion_funnel():
         ]
     }
 
+# ==================== /events 수집 ====================
+
+INGEST_MAX_BATCH = int(os.getenv('INGEST_MAX_BATCH', 5000))
+
+class PageViewEvent(BaseModel):
+    session_id: Optional[str] = Field(None, max_length=100)
+    user_id: Optional[int] = None
+    page_path: str = Field(..., max_length=255)
+    device_type: Optional[str] = Field(None, max_length=20)
+    timestamp: Optional[datetime] = Field(None, description="생략하면 수신 시각")
+    time_on_page: int = 0
+    bounce: bool = False
+    session_duration: int = 0
+
+class SessionEvent(BaseModel):
+    session_id: str = Field(..., max_length=100)
+    user_id: Optional[int] = None
+    started_at: Optional[datetime] = None
+    last_activity: Optional[datetime] = Field(None, description="생략하면 수신 시각")
+    device_info: Optional[Dict[str, Any]] = None
+    ip_address: Optional[IPvAnyAddress] = None
+
+class AnalyticsEventBatch(BaseModel):
+    pageviews: List[PageViewEvent] = []
+    sessions: List[SessionEvent] = []
+
+def local_timestamp(value: Optional[datetime], default: datetime) -> datetime:
+    """page_analytics / sessions 는 시간대 없는 현지 시각 - 시간대가 붙은 값은 현지 시각으로 바꿈"""
+    if value is None:
+        return default
+    if value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+def pageview_record(event: PageViewEvent, received_at: datetime) -> tuple:
+    timestamp = local_timestamp(event.timestamp, received_at)
+    return (event.session_id, event.user_id, event.page_path, event.device_type, timestamp, timestamp.date(),
+            event.time_on_page, event.bounce, event.session_duration)
+
+def session_record(event: SessionEvent, received_at: datetime) -> tuple:
+    last_activity = local_timestamp(event.last_activity, received_at)
+    return (event.session_id, event.user_id, local_timestamp(event.started_at, last_activity), last_activity,
+            json.dumps(event.device_info, ensure_ascii=False) if event.device_info is not None else None,
+            str(event.ip_address) if event.ip_address is not None else None)
+
+@router.post("/events", status_code=202)
+async def ingest_analytics_events(
+    batch: AnalyticsEventBatch,
+    wait: bool = Query(False, description="DB 에 저장될 때까지 기다린 뒤 응답")
+):
+    """페이지뷰 / 세션 이벤트 일괄 수집 (워커 버퍼에 모아 COPY 로 저장, 버퍼가 가득 차면 429)"""
+    if container is None:
+        raise HTTPException(status_code=503, detail="Database connection not available")
+    total = len(batch.pageviews) + len(batch.sessions)
+    if total > INGEST_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"한 번에 보낼 수 있는 이벤트는 {INGEST_MAX_BATCH}건입니다")
+
+    received_at = datetime.now()
+    try:
+        waiter = await event_ingest.submit(
+            [pageview_record(event, received_at) for event in batch.pageviews],
+            [session_record(event, received_at) for event in batch.sessions],
+            wait=wait
+        )
+    except IngestBackpressure as e:
+        raise HTTPException(status_code=429, detail="이벤트 버퍼가 가득 찼습니다",
+                            headers={"Retry-After": str(math.ceil(e.retry_after))})
+
+    result = {"accepted": total, "pageviews": len(batch.pageviews), "sessions": len(batch.sessions)}
+    if waiter is not None:
+        try:
+            result["flush"] = await waiter
+        except Exception as e:
+            raise HTTPException(status_code=503, detail=f"이벤트 저장 실패: {str(e)}")
+    return result
+
+@router.get("/events/stats")
+async def get_event_ingest_stats():
+    """이 워커의 이벤트 버퍼와 플러시 통계"""
+    return event_ingest.stats()
+
+@router.get("/rollups")
+async def get_rollup_status():
+    """롤업 대기열 깊이와 집계기 상태"""
+    async with db.lease() as conn:
+        return {**await analytics_rollups.status(conn), "realtime": realtime_metrics.stats()}
+
+@router.get("/cache")
+async def get_cache_stats():
+    """응답 캐시 엔드포인트별 hit/miss/refresh 카운터"""
+    return analytics_cache.stats()
+
+@router.get("/funnels")
+async def get_funnel_definitions():
+    """설정된 전환 퍼널 정의 (ANALYTICS_FUNNELS_FILE)"""
+    return funnel_registry.describe()
+
+@router.get("/partitions")
+async def get_partition_status():
+    """page_analytics / saju_analysis_sessions 파티션 목록과 보존 정책"""
+    async with db.lease() as conn:
+        return await analytics_partitions.status(conn)
+
 @router.get("/health")
 async def analytics_health():
     """Analytics API 헬스체크"""
@@ -509,5 +725,5 @@ async def analytics_health():
         "status": "healthy",
         "service": "analytics",
         "timestamp": datetime.now().isoformat(),
-        "endpoints_available": 8
+        "endpoints_available": 14
     }
\ No newline at end of file
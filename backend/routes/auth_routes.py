@@ -9,13 +9,13 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from pydantic import BaseModel, EmailStr, validator
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import bcrypt
 import jwt
 from datetime import datetime, timedelta
 import secrets
 
+from services.database_manager import db
+
 logger = logging.getLogger(__name__)
 
 # Pydantic 모델 정의
@@ -69,22 +69,6 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30일
 router = APIRouter(prefix="/api/auth")
 security = HTTPBearer()
 
-# 데이터베이스 연결 함수
-def get_db_connection():
-    """PostgreSQL 데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(
-            host="localhost",
-            database="livedb",
-            user="liveuser",
-            password="livepass2024",
-            cursor_factory=RealDictCursor
-        )
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
-
 def hash_password(password: str) -> str:
     """비밀번호 해싱"""
     salt = bcrypt.gensalt()
@@ -105,7 +89,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """현재 사용자 정보 가져오기"""
     try:
         payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
@@ -115,22 +99,16 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     except jwt.PyJWTError:
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
     
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-    SELECT id, email, full_name, phone, is_active, email_verified, created_at, last_login
-    FROM users WHERE id = %s AND is_active = true
-    """, (user_id,))
-    
-    user = cursor.fetchone()
-    cursor.close()
-    conn.close()
+    async with db.lease() as conn:
+        user = await conn.fetchrow("""
+        SELECT id, email, full_name, phone, is_active, email_verified, created_at, last_login
+        FROM users WHERE id = $1 AND is_active = true
+        """, user_id)
     
     if user is None:
         raise HTTPException(status_code=401, detail="User not found")
     
-    return UserResponse(**user)
+    return UserResponse(**dict(user))
 
 @router.get("/health")
 async def auth_health():
@@ -146,42 +124,34 @@ async def auth_health():
 async def register_user(user_data: UserRegister):
     """사용자 회원가입"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 이메일 중복 확인
-        cursor.execute("SELECT id FROM users WHERE email = %s", (user_data.email,))
-        if cursor.fetchone():
-            raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다")
-        
-        # 비밀번호 해싱
-        hashed_password = hash_password(user_data.password)
-        
-        # 사용자 생성
-        cursor.execute("""
-        INSERT INTO users (email, hashed_password, full_name, phone, is_active, email_verified, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING id, email, full_name, phone, is_active, email_verified, created_at
-        """, (
-            user_data.email,
-            hashed_password,
-            user_data.full_name,
-            user_data.phone,
-            True,
-            False,  # 이메일 인증은 추후 구현
-            datetime.now(),
-            datetime.now()
-        ))
-        
-        new_user = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            # 이메일 중복 확인
+            if await conn.fetchval("SELECT id FROM users WHERE email = $1", user_data.email):
+                raise HTTPException(status_code=400, detail="이미 등록된 이메일입니다")
+            
+            # 비밀번호 해싱
+            hashed_password = hash_password(user_data.password)
+            
+            # 사용자 생성
+            new_user = await conn.fetchrow("""
+            INSERT INTO users (email, hashed_password, full_name, phone, is_active, email_verified, created_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+            RETURNING id, email, full_name, phone, is_active, email_verified, created_at
+            """,
+                user_data.email,
+                hashed_password,
+                user_data.full_name,
+                user_data.phone,
+                True,
+                False,  # 이메일 인증은 추후 구현
+                datetime.now(),
+                datetime.now()
+            )
         
         # JWT 토큰 생성
         access_token = create_access_token(data={"sub": new_user["id"]})
         
-        user_response = UserResponse(**new_user, last_login=None)
+        user_response = UserResponse(**dict(new_user), last_login=None)
         
         return TokenResponse(
             access_token=access_token,
@@ -198,27 +168,20 @@ async def register_user(user_data: UserRegister):
 async def login_user(login_data: UserLogin):
     """사용자 로그인"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 사용자 조회
-        cursor.execute("""
-        SELECT id, email, hashed_password, full_name, phone, is_active, email_verified, created_at, last_login
-        FROM users WHERE email = %s AND is_active = true
-        """, (login_data.email,))
-        
-        user = cursor.fetchone()
-        if not user or not verify_password(login_data.password, user["hashed_password"]):
-            raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다")
-        
-        # 마지막 로그인 시간 업데이트
-        cursor.execute("""
-        UPDATE users SET last_login = %s, updated_at = %s WHERE id = %s
-        """, (datetime.now(), datetime.now(), user["id"]))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            # 사용자 조회
+            user = await conn.fetchrow("""
+            SELECT id, email, hashed_password, full_name, phone, is_active, email_verified, created_at, last_login
+            FROM users WHERE email = $1 AND is_active = true
+            """, login_data.email)
+            
+            if not user or not verify_password(login_data.password, user["hashed_password"]):
+                raise HTTPException(status_code=401, detail="이메일 또는 비밀번호가 올바르지 않습니다")
+            
+            # 마지막 로그인 시간 업데이트
+            await conn.execute("""
+            UPDATE users SET last_login = $1, updated_at = $2 WHERE id = $3
+            """, datetime.now(), datetime.now(), user["id"])
         
         # JWT 토큰 생성
         access_token = create_access_token(data={"sub": user["id"]})
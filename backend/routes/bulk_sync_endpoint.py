@@ -3,159 +3,1112 @@
 원격서버가 로컬 데이터를 가져갈 수 있도록 하는 임시 API
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List, Dict, Any
-import asyncpg
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from starlette.background import BackgroundTask
+from pydantic import BaseModel
+from typing import List, Dict, Any, AsyncIterator, Optional, Tuple
+from contextlib import AsyncExitStack
+from datetime import timezone
+import asyncio
+import gzip
+import hashlib
 import json
 import logging
+import time
+import zlib
+
+from services.database_manager import db, rows_affected
+from services.keyword_dependency_graph import keyword_dependency_index
+from services.sync_journal import SyncJournal
+from services.sync_wire_format import (
+    SYNC_SCHEMA_HEADER, SYNC_WIRE_SCHEMA_VERSION, SyncWireFormatError,
+    dump_sync_payload, negotiate_sync_media_type, representation_etag
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin-api/bulk-sync", tags=["Bulk Sync"])
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "localhost",
-    "database": "livedb", 
-    "user": "liveuser",
-    "password": "password"
-}
+# 키워드별 의존 키워드 목록은 키워드마다 하위 쿼리를 돌리지 않고 한 번 집계해 조인한다
+SYNC_KEYWORDS_TEMPLATE = """
+SELECT 
+    k.id,
+    k.text as name,
+    ksc.name as category,
+    ksc.name as subcategory,
+    k.subcategory_id,
+    k.weight,
+    COALESCE(k.usage_count, 0) as connections,
+    CASE WHEN k.is_active THEN 'active' ELSE 'inactive' END as status,
+    COALESCE(deps.dependencies, ARRAY[]::integer[]) as dependencies,
+    NULL as position,
+    CASE 
+        WHEN ksc.name LIKE 'A-%' THEN '#3B82F6'
+        WHEN ksc.name LIKE 'B-%' THEN '#EF4444'
+        WHEN ksc.name LIKE 'C-%' THEN '#06B6D4'
+        ELSE '#6366F1'
+    END as color
+FROM keywords k
+JOIN keywords_subcategories ksc ON k.subcategory_id = ksc.id
+LEFT JOIN (
+    SELECT parent_keyword_id,
+           array_agg(dependent_keyword_id ORDER BY dependent_keyword_id) as dependencies
+    FROM keyword_dependencies
+    {dependency_filter}
+    GROUP BY parent_keyword_id
+) deps ON deps.parent_keyword_id = k.id
+WHERE k.is_active = true {keyword_filter}
+ORDER BY k.id
+"""
+
+SYNC_KEYWORDS_QUERY = SYNC_KEYWORDS_TEMPLATE.format(dependency_filter="", keyword_filter="")
+
+SYNC_SUBCATEGORIES_QUERY = """
+SELECT id, name, description, category_group, display_order, is_active
+FROM keywords_subcategories 
+WHERE is_active = true
+ORDER BY name
+"""
+
+SYNC_DEPENDENCIES_QUERY = """
+SELECT parent_keyword_id, dependent_keyword_id
+FROM keyword_dependencies
+ORDER BY parent_keyword_id, dependent_keyword_id
+"""
+
+# 다이제스트가 없을 때의 동기화 버전: 내보내는 컬럼 전체의 내용 해시
+# (weight 는 내보내는 float 값 기준이라 numeric 자릿수 차이는 무시)
+SYNC_VERSION_QUERY = """
+SELECT md5(concat_ws('#',
+    (SELECT string_agg(concat_ws('|', id, text, subcategory_id, weight::float8, usage_count), ',' ORDER BY id)
+     FROM keywords WHERE is_active = true),
+    (SELECT string_agg(concat_ws('|', id, name, description, category_group, display_order, is_active), ',' ORDER BY id)
+     FROM keywords_subcategories),
+    (SELECT string_agg(parent_keyword_id || '>' || dependent_keyword_id, ',' ORDER BY parent_keyword_id, dependent_keyword_id)
+     FROM keyword_dependencies)
+)) as version
+"""
+
+# 현재 스냅샷에서 끝나지 않은 가장 오래된 트랜잭션 ID (이보다 작은 txid 의 변경은 모두 확정됨)
+SYNC_SNAPSHOT_XMIN_QUERY = "SELECT txid_snapshot_xmin(txid_current_snapshot())"
+
+# 스냅샷 시각 (트랜잭션 시작 시각 - 같은 트랜잭션 안에서는 몇 번 불러도 같음)
+SYNC_SNAPSHOT_TIME_QUERY = "SELECT now()"
+
+# ==================== 증분 동기화 (변경 피드) ====================
+
+CHANGE_LOG_EXISTS_QUERY = "SELECT to_regclass('sync_change_log') IS NOT NULL"
+
+CHANGE_LOG_PRUNED_QUERY = "SELECT pruned_before_txid FROM sync_change_log_state"
+
+# (txid, seq) 순서로 커서 이후의 확정된 변경만 읽는다
+CHANGE_LOG_QUERY = """
+SELECT txid, seq, table_name, row_key, operation
+FROM sync_change_log
+WHERE (txid, seq) > ($1::bigint, $2::bigint)
+AND txid < $3::bigint
+ORDER BY txid, seq
+LIMIT $4
+"""
+
+CHANGED_SUBCATEGORIES_QUERY = """
+SELECT id, name, description, category_group, display_order, is_active
+FROM keywords_subcategories
+WHERE is_active = true AND id = ANY($1::int[])
+ORDER BY id
+"""
+
+CHANGED_KEYWORDS_QUERY = SYNC_KEYWORDS_TEMPLATE.format(
+    dependency_filter="WHERE parent_keyword_id = ANY($1::int[])",
+    keyword_filter="AND k.id = ANY($1::int[])"
+)
+
+CHANGED_DEPENDENCIES_QUERY = """
+SELECT kd.parent_keyword_id, kd.dependent_keyword_id
+FROM keyword_dependencies kd
+JOIN unnest($1::int[], $2::int[]) AS changed(parent_keyword_id, dependent_keyword_id)
+  ON kd.parent_keyword_id = changed.parent_keyword_id
+ AND kd.dependent_keyword_id = changed.dependent_keyword_id
+"""
+
+CHANGE_FEED_DEFAULT_LIMIT = 5000
+CHANGE_FEED_MAX_LIMIT = 50000
+
+# 스트리밍 내보내기: 서버 측 커서 prefetch 행 수, 한 번에 내보내는 청크 크기
+EXPORT_CURSOR_PREFETCH = 500
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+def keyword_record(row) -> Dict[str, Any]:
+    return {
+        "id": row['id'],
+        "name": row['name'],
+        "category": row['category'],
+        "subcategory": row['subcategory'],
+        "subcategory_id": row['subcategory_id'],
+        "weight": float(row['weight']),
+        "connections": row['connections'],
+        "status": row['status'],
+        "dependencies": list(row['dependencies']),
+        "position": row['position'],
+        "color": row['color']
+    }
+
+def subcategory_record(row) -> Dict[str, Any]:
+    return {
+        "id": row['id'],
+        "name": row['name'],
+        "description": row['description'],
+        "category_group": row['category_group'],
+        "display_order": row['display_order'],
+        "is_active": row['is_active']
+    }
+
+def dependency_record(row) -> Dict[str, Any]:
+    return {
+        "parent_keyword_id": row['parent_keyword_id'],
+        "dependent_keyword_id": row['dependent_keyword_id']
+    }
+
+def count_categories(categories: Dict[str, int], category: str):
+    cat = category[:2]  # A-, B-, C-
+    categories[cat] = categories.get(cat, 0) + 1
+
+async def get_sync_version(conn) -> str:
+    """동기화 데이터 버전 (내보내는 내용이 같으면 같은 값)
+
+    다이제스트(scripts/create_sync_digest.sql)가 설치되어 있으면 트리거가 유지하는 구역별 해시 합으로
+    /digest 의 루트 해시를 구해 쓰고 (버킷 수백 행 집계), 없을 때만 전체 행을 md5 로 해시한다.
+    """
+    if await conn.fetchval(DIGEST_EXISTS_QUERY):
+        tables = {table: section for section, table in DIGEST_SECTIONS.items()}
+        totals = {section: (0, 0) for section in DIGEST_SECTIONS}
+        for row in await conn.fetch(DIGEST_TOTALS_QUERY):
+            if row['table_name'] in tables:
+                totals[tables[row['table_name']]] = (row['digest'], row['row_count'])
+        return digest_root(totals)
+    return await conn.fetchval(SYNC_VERSION_QUERY)
+
+def format_sync_cursor(txid: int, seq: int = 0) -> str:
+    """변경 피드 커서 ("txid:seq")"""
+    return f"{txid}:{seq}"
+
+def parse_sync_cursor(cursor: str) -> Tuple[int, int]:
+    try:
+        txid, seq = cursor.split(":", 1)
+        return int(txid), int(seq)
+    except (AttributeError, ValueError):
+        raise HTTPException(status_code=400, detail=f"잘못된 동기화 커서입니다: {cursor}")
+
+async def get_snapshot_cursor(conn) -> str:
+    """현재 스냅샷 기준 커서 (이 스냅샷에서 보이지 않을 수 있는 변경은 모두 커서 이후에 있음)"""
+    return format_sync_cursor(await conn.fetchval(SYNC_SNAPSHOT_XMIN_QUERY))
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    return if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]
+
+def accepts_gzip(request: Request) -> bool:
+    return "gzip" in request.headers.get("accept-encoding", "").lower()
+
+class SyncExportSnapshot:
+    """내보내기 한 번의 읽기 스냅샷
+
+    버전(ETag), 커서, 시각(sync_timestamp), 본문을 모두 같은 repeatable_read 트랜잭션에서 읽어
+    헤더와 본문, JSON 과 NDJSON 이 어긋나지 않게 한다.
+    NDJSON 스트리밍은 헤더를 먼저 보내고 본문을 읽으므로 응답이 끝날 때까지 열어 두고 close() 한다.
+    """
+
+    def __init__(self):
+        self._stack = AsyncExitStack()
+        self.conn = None
+        self.version: Optional[str] = None
+        self.cursor: Optional[str] = None
+        self.timestamp: Optional[str] = None
+
+    async def open(self) -> "SyncExportSnapshot":
+        try:
+            self.conn = await self._stack.enter_async_context(db.lease())
+            await self._stack.enter_async_context(
+                self.conn.transaction(isolation="repeatable_read", readonly=True)
+            )
+            self.version = await get_sync_version(self.conn)
+            self.cursor = await get_snapshot_cursor(self.conn)
+            taken_at = await self.conn.fetchval(SYNC_SNAPSHOT_TIME_QUERY)
+            self.timestamp = taken_at.astimezone(timezone.utc).isoformat()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def close(self):
+        """트랜잭션을 끝내고 연결 반환 (여러 번 불러도 한 번만 닫힘)"""
+        await self._stack.aclose()
+
+async def stream_sync_ndjson(snapshot: SyncExportSnapshot, use_gzip: bool) -> AsyncIterator[bytes]:
+    """동기화 데이터를 NDJSON 으로 스트리밍 (헤더의 버전을 구한 스냅샷 안에서 서버 측 커서로 읽음)
+
+    줄 순서: metadata → subcategory… → keyword… → dependency… → summary
+    metadata 의 version 은 응답 헤더의 X-Sync-Version 과 같다. 끝나면 스냅샷을 닫는다.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS) if use_gzip else None
+    buffer: List[bytes] = []
+    buffered = 0
+
+    def encode(record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+    def drain() -> bytes:
+        nonlocal buffered
+        chunk = b"".join(buffer)
+        buffer.clear()
+        buffered = 0
+        return compressor.compress(chunk) if compressor else chunk
+
+    totals = {"subcategory": 0, "keyword": 0, "dependency": 0}
+    categories: Dict[str, int] = {}
+
+    version, cursor = snapshot.version, snapshot.cursor
+    buffer.append(encode({
+        "type": "metadata",
+        "version": version,
+        "cursor": cursor,
+        "sync_timestamp": snapshot.timestamp,
+        "source": "local-server-livedb"
+    }))
+
+    sections = (
+        ("subcategory", SYNC_SUBCATEGORIES_QUERY, subcategory_record),
+        ("keyword", SYNC_KEYWORDS_QUERY, keyword_record),
+        ("dependency", SYNC_DEPENDENCIES_QUERY, dependency_record),
+    )
+    try:
+        for record_type, query, to_record in sections:
+            async for row in snapshot.conn.cursor(query, prefetch=EXPORT_CURSOR_PREFETCH):
+                record = to_record(row)
+                if record_type == "keyword":
+                    count_categories(categories, record['category'])
+                record["type"] = record_type
+                line = encode(record)
+                buffer.append(line)
+                buffered += len(line)
+                totals[record_type] += 1
+
+                if buffered >= EXPORT_CHUNK_BYTES:
+                    chunk = drain()
+                    if chunk:
+                        yield chunk
+    finally:
+        await snapshot.close()
+
+    buffer.append(encode({
+        "type": "summary",
+        "version": version,
+        "cursor": cursor,
+        "total_keywords": totals["keyword"],
+        "total_subcategories": totals["subcategory"],
+        "total_dependencies": totals["dependency"],
+        "categories": categories
+    }))
+    chunk = drain()
+    if compressor:
+        chunk += compressor.flush()
+    if chunk:
+        yield chunk
+
+    logger.info(f"✅ 동기화 데이터 스트리밍 완료: {totals['keyword']}개 키워드 (v{version[:8]})")
+
+async def load_sync_export(snapshot: SyncExportSnapshot) -> Dict[str, Any]:
+    """스냅샷에서 읽은 전체 동기화 데이터 (format=json 과 압축 형식이 같은 내용을 씀)"""
+    conn = snapshot.conn
+    keywords_rows = await conn.fetch(SYNC_KEYWORDS_QUERY)
+    subcategories_rows = await conn.fetch(SYNC_SUBCATEGORIES_QUERY)
+    dependencies_rows = await conn.fetch(SYNC_DEPENDENCIES_QUERY)
+    
+    # 데이터 변환
+    keywords = [keyword_record(row) for row in keywords_rows]
+    subcategories = [subcategory_record(row) for row in subcategories_rows]
+    dependencies = [dependency_record(row) for row in dependencies_rows]
+    
+    # 통계 계산
+    categories = {}
+    for keyword in keywords:
+        count_categories(categories, keyword['category'])
+    
+    return {
+        "metadata": {
+            "total_keywords": len(keywords),
+            "total_subcategories": len(subcategories),
+            "total_dependencies": len(dependencies),
+            "categories": categories,
+            "version": snapshot.version,
+            "cursor": snapshot.cursor,
+            "sync_timestamp": snapshot.timestamp,
+            "source": "local-server-livedb"
+        },
+        "keywords": keywords,
+        "subcategories": subcategories,
+        "dependencies": dependencies
+    }
 
 @router.get("/keywords/export")
-async def export_keywords_for_sync():
+async def export_keywords_for_sync(
+    request: Request,
+    export_format: str = Query("json", alias="format", pattern="^(json|ndjson)$")
+):
     """
     442개 키워드를 동기화용으로 내보내기
     원격서버가 이 데이터를 가져가서 자신의 DB에 적용할 수 있음
+
+    - format=json: 기존과 같은 단일 JSON 문서
+    - format=ndjson: 한 줄에 레코드 하나씩 스트리밍 (서버 측 커서 사용)
+    - Accept 가 application/vnd.heal7.sync+msgpack 또는 +json 이면 format 대신 컬럼형 압축 형식
+      (services/sync_wire_format.py, X-Sync-Schema 헤더에 스키마 버전)
+    - ETag(내용 해시, 형식별)를 함께 보내므로 If-None-Match 가 같으면 304 로 본문 없이 응답
+    - Accept-Encoding: gzip 이면 gzip 으로 압축
+    - metadata.cursor 는 이 내보내기 이후의 변경을 /changes 로 받을 때 쓰는 시작 커서
     """
     try:
-        conn = await asyncpg.connect(**DB_CONFIG)
-        
-        # 키워드 데이터 추출
-        keyword_query = """
-        SELECT 
-            k.id,
-            k.text as name,
-            ksc.name as category,
-            ksc.name as subcategory,
-            k.weight,
-            COALESCE(k.usage_count, 0) as connections,
-            CASE WHEN k.is_active THEN 'active' ELSE 'inactive' END as status,
-            COALESCE(
-                ARRAY(
-                    SELECT kd.dependent_keyword_id 
-                    FROM keyword_dependencies kd 
-                    WHERE kd.parent_keyword_id = k.id
-                ), 
-                ARRAY[]::integer[]
-            ) as dependencies,
-            NULL as position,
-            CASE 
-                WHEN ksc.name LIKE 'A-%' THEN '#3B82F6'
-                WHEN ksc.name LIKE 'B-%' THEN '#EF4444'
-                WHEN ksc.name LIKE 'C-%' THEN '#06B6D4'
-                ELSE '#6366F1'
-            END as color
-        FROM keywords k
-        JOIN keywords_subcategories ksc ON k.subcategory_id = ksc.id
-        WHERE k.is_active = true
-        ORDER BY k.id
-        """
+        snapshot = await SyncExportSnapshot().open()
+        streaming = False
+        try:
+            version = snapshot.version
+            compact_type = negotiate_sync_media_type(request.headers.get("accept"))
+            etag = representation_etag(version, compact_type)
+            headers = {"ETag": etag, "X-Sync-Version": version, "Vary": "Accept, Accept-Encoding"}
+            if compact_type:
+                headers[SYNC_SCHEMA_HEADER] = str(SYNC_WIRE_SCHEMA_VERSION)
+            if etag_matches(request, etag):
+                return Response(status_code=304, headers=headers)
+
+            use_gzip = accepts_gzip(request)
+            if use_gzip:
+                headers["Content-Encoding"] = "gzip"
+
+            if export_format == "ndjson" and not compact_type:
+                # 본문은 같은 스냅샷에서 스트리밍하며 읽고, 스트림이 끝나거나 응답이 중단되면 닫는다
+                streaming = True
+                return StreamingResponse(
+                    stream_sync_ndjson(snapshot, use_gzip),
+                    media_type="application/x-ndjson",
+                    headers=headers,
+                    background=BackgroundTask(snapshot.close)
+                )
+
+            sync_data = await load_sync_export(snapshot)
+        finally:
+            if not streaming:
+                await snapshot.close()
+
+        media_type = "application/json"
+        body = None
+        if compact_type:
+            try:
+                body = dump_sync_payload(sync_data, compact_type)
+                media_type = compact_type
+            except SyncWireFormatError as e:
+                # 압축 형식으로 나타낼 수 없는 데이터는 기존 JSON 으로 응답
+                logger.warning(f"압축 형식 내보내기 불가 - JSON 으로 응답: {e}")
+                headers["ETag"] = representation_etag(version, None)
+                headers.pop(SYNC_SCHEMA_HEADER)
+        if body is None:
+            body = json.dumps(sync_data, ensure_ascii=False).encode("utf-8")
+        if use_gzip:
+            body = gzip.compress(body)
         
-        keywords_rows = await conn.fetch(keyword_query)
+        logger.info(f"✅ 동기화 데이터 내보내기 완료: {sync_data['metadata']['total_keywords']}개 키워드 ({media_type})")
+        return Response(content=body, media_type=media_type, headers=headers)
         
-        # 서브카테고리 데이터 추출
-        subcategory_query = """
+    except Exception as e:
+        logger.error(f"❌ 동기화 데이터 내보내기 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"동기화 데이터 내보내기 실패: {str(e)}")
+
+class SyncChangesRequest(BaseModel):
+    changes: Dict[str, Any]
+    cursor: Optional[str] = None
+    source: Optional[str] = None
+
+def collapse_changes(rows) -> Dict[str, Dict[Any, str]]:
+    """같은 행의 여러 변경은 마지막 변경만 남김 (테이블별 {자연 키: 작업})"""
+    collapsed: Dict[str, Dict[Any, str]] = {
+        "keywords_subcategories": {}, "keywords": {}, "keyword_dependencies": {}
+    }
+    for row in rows:
+        table = collapsed.get(row['table_name'])
+        if table is None:
+            continue
+        key = row['row_key']
+        if row['table_name'] == "keyword_dependencies":
+            table[(key['parent_keyword_id'], key['dependent_keyword_id'])] = row['operation']
+        else:
+            table[key['id']] = row['operation']
+    return collapsed
+
+async def load_changed_rows(conn, collapsed: Dict[str, Dict[Any, str]]) -> Dict[str, Dict[str, list]]:
+    """변경된 키의 현재 상태 조회 (내보내기 기준에서 사라진 행은 deleted 로 분류)"""
+    subcategory_ids = list(collapsed["keywords_subcategories"])
+    keyword_ids = list(collapsed["keywords"])
+    dependency_keys = list(collapsed["keyword_dependencies"])
+
+    subcategories = [
+        subcategory_record(row)
+        for row in (await conn.fetch(CHANGED_SUBCATEGORIES_QUERY, subcategory_ids) if subcategory_ids else [])
+    ]
+    keywords = [
+        keyword_record(row)
+        for row in (await conn.fetch(CHANGED_KEYWORDS_QUERY, keyword_ids) if keyword_ids else [])
+    ]
+    dependencies = [
+        dependency_record(row)
+        for row in (await conn.fetch(
+            CHANGED_DEPENDENCIES_QUERY,
+            [parent for parent, _ in dependency_keys],
+            [dependent for _, dependent in dependency_keys]
+        ) if dependency_keys else [])
+    ]
+
+    present_subcategories = {record['id'] for record in subcategories}
+    present_keywords = {record['id'] for record in keywords}
+    present_dependencies = {
+        (record['parent_keyword_id'], record['dependent_keyword_id']) for record in dependencies
+    }
+
+    return {
+        "subcategories": {
+            "upserted": subcategories,
+            "deleted": [key for key in subcategory_ids if key not in present_subcategories]
+        },
+        "keywords": {
+            "upserted": keywords,
+            "deleted": [key for key in keyword_ids if key not in present_keywords]
+        },
+        "dependencies": {
+            "upserted": dependencies,
+            "deleted": [
+                {"parent_keyword_id": parent, "dependent_keyword_id": dependent}
+                for parent, dependent in dependency_keys
+                if (parent, dependent) not in present_dependencies
+            ]
+        }
+    }
+
+@router.get("/changes")
+async def get_sync_changes(
+    since: str = Query(..., description="이전 내보내기/변경 피드에서 받은 커서"),
+    limit: int = Query(CHANGE_FEED_DEFAULT_LIMIT, ge=1, le=CHANGE_FEED_MAX_LIMIT)
+):
+    """
+    증분 동기화 변경 피드
+    커서 이후 추가/수정/삭제된 서브카테고리, 키워드, 의존성 관계만 반환
+
+    has_more 가 true 면 응답의 cursor 로 다시 호출한다.
+    full_resync_required 가 true 면 커서가 정리된 로그보다 오래되었으므로 전체 내보내기부터 다시 받는다.
+    """
+    since_txid, since_seq = parse_sync_cursor(since)
+
+    try:
+        async with db.lease() as conn:
+            if not await conn.fetchval(CHANGE_LOG_EXISTS_QUERY):
+                raise HTTPException(
+                    status_code=501,
+                    detail="변경 로그가 설치되지 않았습니다 (scripts/create_sync_change_log.sql)"
+                )
+
+            async with conn.transaction(isolation="repeatable_read", readonly=True):
+                if since_txid < await conn.fetchval(CHANGE_LOG_PRUNED_QUERY):
+                    return {"since": since, "cursor": since, "full_resync_required": True, "has_more": False}
+
+                xmin = await conn.fetchval(SYNC_SNAPSHOT_XMIN_QUERY)
+                rows = await conn.fetch(CHANGE_LOG_QUERY, since_txid, since_seq, xmin, limit)
+
+                has_more = len(rows) == limit
+                if has_more:
+                    cursor = format_sync_cursor(rows[-1]['txid'], rows[-1]['seq'])
+                else:
+                    # 끝까지 읽었으면 이후 변경은 모두 xmin 이상의 txid 를 가진다
+                    cursor = format_sync_cursor(max(xmin, since_txid), 0 if xmin > since_txid else since_seq)
+
+                changes = await load_changed_rows(conn, collapse_changes(rows))
+
+        return {
+            "since": since,
+            "cursor": cursor,
+            "has_more": has_more,
+            "full_resync_required": False,
+            "change_count": len(rows),
+            "changes": changes
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ 변경 피드 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"변경 피드 조회 실패: {str(e)}")
+
+@router.post("/changes/apply")
+async def apply_sync_changes(changes_request: SyncChangesRequest):
+    """
+    변경 피드 적용 (원격서버에서 실행)
+    /changes 응답의 changes 를 한 트랜잭션으로 반영한다.
+    삭제된 키워드/서브카테고리는 설문 등에서 참조할 수 있으므로 비활성화로 반영한다.
+    """
+    changes = changes_request.changes
+    subcategories = changes.get("subcategories", {})
+    keywords = changes.get("keywords", {})
+    dependencies = changes.get("dependencies", {})
+
+    try:
+        async with db.lease() as conn:
+            async with conn.transaction():
+                if subcategories.get("upserted"):
+                    await conn.executemany("""
+                        INSERT INTO keywords_subcategories (id, name, description, category_group, display_order, is_active)
+                        VALUES ($1, $2, $3, $4, $5, $6)
+                        ON CONFLICT (id) DO UPDATE SET
+                            name = EXCLUDED.name,
+                            description = EXCLUDED.description,
+                            category_group = EXCLUDED.category_group,
+                            display_order = EXCLUDED.display_order,
+                            is_active = EXCLUDED.is_active
+                    """, [
+                        (r['id'], r['name'], r['description'], r['category_group'], r['display_order'], r['is_active'])
+                        for r in subcategories["upserted"]
+                    ])
+                    await conn.execute(
+                        "SELECT setval(pg_get_serial_sequence('keywords_subcategories', 'id'), "
+                        "GREATEST((SELECT max(id) FROM keywords_subcategories), 1))"
+                    )
+
+                if keywords.get("upserted"):
+                    await conn.executemany("""
+                        INSERT INTO keywords (id, text, subcategory_id, weight, usage_count, is_active)
+                        VALUES ($1, $2, $3, $4::float8, $5, $6)
+                        ON CONFLICT (id) DO UPDATE SET
+                            text = EXCLUDED.text,
+                            subcategory_id = EXCLUDED.subcategory_id,
+                            weight = EXCLUDED.weight,
+                            usage_count = EXCLUDED.usage_count,
+                            is_active = EXCLUDED.is_active,
+                            updated_at = now()
+                    """, [
+                        (r['id'], r['name'], r['subcategory_id'], r['weight'], r['connections'], r['status'] == 'active')
+                        for r in keywords["upserted"]
+                    ])
+                    await conn.execute(
+                        "SELECT setval(pg_get_serial_sequence('keywords', 'id'), "
+                        "GREATEST((SELECT max(id) FROM keywords), 1))"
+                    )
+
+                if dependencies.get("deleted"):
+                    await conn.executemany("""
+                        DELETE FROM keyword_dependencies
+                        WHERE parent_keyword_id = $1 AND dependent_keyword_id = $2
+                    """, [(r['parent_keyword_id'], r['dependent_keyword_id']) for r in dependencies["deleted"]])
+
+                if dependencies.get("upserted"):
+                    await conn.executemany("""
+                        INSERT INTO keyword_dependencies (parent_keyword_id, dependent_keyword_id)
+                        SELECT $1::int, $2::int
+                        WHERE NOT EXISTS (
+                            SELECT 1 FROM keyword_dependencies
+                            WHERE parent_keyword_id = $1::int AND dependent_keyword_id = $2::int
+                        )
+                    """, [(r['parent_keyword_id'], r['dependent_keyword_id']) for r in dependencies["upserted"]])
+
+                if keywords.get("deleted"):
+                    await conn.execute(
+                        "UPDATE keywords SET is_active = false, updated_at = now() WHERE id = ANY($1::int[])",
+                        keywords["deleted"]
+                    )
+
+                if subcategories.get("deleted"):
+                    await conn.execute(
+                        "UPDATE keywords_subcategories SET is_active = false WHERE id = ANY($1::int[])",
+                        subcategories["deleted"]
+                    )
+
+        # 이 프로세스의 의존성 그래프는 바로 다시 읽도록
+        keyword_dependency_index.invalidate()
+
+        applied = {
+            section: {
+                "upserted": len(changes.get(section, {}).get("upserted", [])),
+                "deleted": len(changes.get(section, {}).get("deleted", []))
+            }
+            for section in ("subcategories", "keywords", "dependencies")
+        }
+        logger.info(f"✅ 증분 동기화 적용 완료 (커서 {changes_request.cursor}): {applied}")
+        return {"success": True, "cursor": changes_request.cursor, "applied": applied}
+
+    except Exception as e:
+        logger.error(f"❌ 증분 동기화 적용 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"증분 동기화 적용 실패: {str(e)}")
+
+# ==================== 내용 해시 트리 (다이제스트) ====================
+
+# API 구역 이름 → 테이블 (scripts/create_sync_digest.sql 의 sync_digest.table_name)
+DIGEST_SECTIONS = {
+    "subcategories": "keywords_subcategories",
+    "keywords": "keywords",
+    "dependencies": "keyword_dependencies"
+}
+DIGEST_MODULUS = 1 << 60
+
+DIGEST_EXISTS_QUERY = "SELECT to_regclass('sync_digest') IS NOT NULL"
+
+DIGEST_LAYOUT_QUERY = "SELECT sync_digest_buckets() AS buckets, sync_digest_dependency_groups() AS dependency_groups"
+
+DIGEST_GROUPS_QUERY = f"""
+SELECT table_name, group_id, (sum(digest) % {DIGEST_MODULUS})::bigint AS digest, sum(row_count)::bigint AS row_count
+FROM sync_digest
+WHERE row_count <> 0 OR digest <> 0
+GROUP BY table_name, group_id
+"""
+
+DIGEST_TOTALS_QUERY = f"""
+SELECT table_name, (sum(digest) % {DIGEST_MODULUS})::bigint AS digest, sum(row_count)::bigint AS row_count
+FROM sync_digest
+GROUP BY table_name
+"""
+
+DIGEST_BUCKETS_QUERY = """
+SELECT bucket, digest, row_count
+FROM sync_digest
+WHERE table_name = $1 AND group_id = $2 AND (row_count <> 0 OR digest <> 0)
+ORDER BY bucket
+"""
+
+DIGEST_ROWS_QUERIES = {
+    "subcategories": """
         SELECT id, name, description, category_group, display_order, is_active
-        FROM keywords_subcategories 
-        WHERE is_active = true
-        ORDER BY name
-        """
-        
-        subcategories_rows = await conn.fetch(subcategory_query)
-        
-        # 의존성 관계 추출
-        dependencies_query = """
+        FROM keywords_subcategories
+        WHERE is_active = true AND $1::int = 0 AND id % sync_digest_buckets() = $2
+        ORDER BY id
+    """,
+    "keywords": SYNC_KEYWORDS_TEMPLATE.format(
+        dependency_filter="""WHERE parent_keyword_id IN (
+            SELECT id FROM keywords WHERE COALESCE(subcategory_id, 0) = $1 AND id % sync_digest_buckets() = $2
+        )""",
+        keyword_filter="AND COALESCE(k.subcategory_id, 0) = $1 AND k.id % sync_digest_buckets() = $2"
+    ),
+    "dependencies": """
         SELECT parent_keyword_id, dependent_keyword_id
         FROM keyword_dependencies
+        WHERE parent_keyword_id % sync_digest_dependency_groups() = $1
+        AND dependent_keyword_id % sync_digest_buckets() = $2
         ORDER BY parent_keyword_id, dependent_keyword_id
-        """
-        
-        dependencies_rows = await conn.fetch(dependencies_query)
-        
-        await conn.close()
-        
-        # 데이터 변환
-        keywords = []
-        for row in keywords_rows:
-            keyword = {
-                "id": row['id'],
-                "name": row['name'],
-                "category": row['category'],
-                "subcategory": row['subcategory'],
-                "weight": float(row['weight']),
-                "connections": row['connections'],
-                "status": row['status'],
-                "dependencies": list(row['dependencies']),
-                "position": row['position'],
-                "color": row['color']
-            }
-            keywords.append(keyword)
-        
-        subcategories = []
-        for row in subcategories_rows:
-            subcategory = {
-                "id": row['id'],
-                "name": row['name'],
-                "description": row['description'],
-                "category_group": row['category_group'],
-                "display_order": row['display_order'],
-                "is_active": row['is_active']
-            }
-            subcategories.append(subcategory)
-        
-        dependencies = []
-        for row in dependencies_rows:
-            dependency = {
-                "parent_keyword_id": row['parent_keyword_id'],
-                "dependent_keyword_id": row['dependent_keyword_id']
+    """
+}
+
+DIGEST_RECORDS = {
+    "subcategories": subcategory_record,
+    "keywords": keyword_record,
+    "dependencies": dependency_record
+}
+
+def format_digest(digest: int) -> str:
+    return f"{digest:015x}"
+
+def digest_node(digest: int, row_count: int) -> Dict[str, Any]:
+    return {"digest": format_digest(digest), "row_count": row_count}
+
+def digest_root(totals: Dict[str, Tuple[int, int]]) -> str:
+    """구역별 (해시 합, 행 수) 로 만든 루트 해시 (/digest 의 root 이자 내보내기 버전)"""
+    source = "|".join(
+        f"{section}:{format_digest(digest)}:{row_count}" for section, (digest, row_count) in sorted(totals.items())
+    )
+    return hashlib.md5(source.encode()).hexdigest()
+
+def digest_table(section: str) -> str:
+    table = DIGEST_SECTIONS.get(section)
+    if table is None:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 다이제스트 구역입니다: {section}")
+    return table
+
+async def ensure_digest_installed(conn):
+    if not await conn.fetchval(DIGEST_EXISTS_QUERY):
+        raise HTTPException(
+            status_code=501,
+            detail="동기화 다이제스트가 설치되지 않았습니다 (scripts/create_sync_digest.sql)"
+        )
+
+@router.get("/digest")
+async def get_sync_digest():
+    """
+    동기화 다이제스트 루트
+    루트 해시, 구역(서브카테고리/키워드/의존성)별 해시와 그룹별 해시를 반환한다.
+    그룹 해시가 다르면 /digest/{section}/{group_id} 로 버킷 해시를 받아 범위를 좁힌다.
+    """
+    try:
+        async with db.lease() as conn:
+            await ensure_digest_installed(conn)
+            layout = await conn.fetchrow(DIGEST_LAYOUT_QUERY)
+            rows = await conn.fetch(DIGEST_GROUPS_QUERY)
+
+        tables = {table: section for section, table in DIGEST_SECTIONS.items()}
+        sections = {section: {"digest": 0, "row_count": 0, "groups": {}} for section in DIGEST_SECTIONS}
+        for row in rows:
+            section = tables.get(row['table_name'])
+            if section is None:
+                continue
+            node = sections[section]
+            node["digest"] = (node["digest"] + row['digest']) % DIGEST_MODULUS
+            node["row_count"] += row['row_count']
+            node["groups"][str(row['group_id'])] = digest_node(row['digest'], row['row_count'])
+
+        return {
+            "root": digest_root({section: (node["digest"], node["row_count"]) for section, node in sections.items()}),
+            "layout": {"buckets": layout['buckets'], "dependency_groups": layout['dependency_groups']},
+            "sections": {
+                section: {**digest_node(node["digest"], node["row_count"]), "groups": node["groups"]}
+                for section, node in sections.items()
             }
-            dependencies.append(dependency)
-        
-        # 통계 계산
-        categories = {}
-        for keyword in keywords:
-            cat = keyword['category'][:2]  # A-, B-, C-
-            if cat not in categories:
-                categories[cat] = 0
-            categories[cat] += 1
-        
-        sync_data = {
-            "metadata": {
-                "total_keywords": len(keywords),
-                "total_subcategories": len(subcategories),
-                "total_dependencies": len(dependencies),
-                "categories": categories,
-                "sync_timestamp": "2025-08-09T17:00:00Z",
-                "source": "local-server-livedb"
-            },
-            "keywords": keywords,
-            "subcategories": subcategories,
-            "dependencies": dependencies
         }
-        
-        logger.info(f"✅ 동기화 데이터 내보내기 완료: {len(keywords)}개 키워드")
-        return sync_data
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"❌ 동기화 데이터 내보내기 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"동기화 데이터 내보내기 실패: {str(e)}")
+        logger.error(f"❌ 동기화 다이제스트 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"동기화 다이제스트 조회 실패: {str(e)}")
+
+@router.get("/digest/{section}/{group_id}")
+async def get_sync_digest_buckets(section: str, group_id: int):
+    """그룹 안의 버킷별 해시"""
+    table = digest_table(section)
+    try:
+        async with db.lease() as conn:
+            await ensure_digest_installed(conn)
+            rows = await conn.fetch(DIGEST_BUCKETS_QUERY, table, group_id)
+
+        return {
+            "section": section,
+            "group_id": group_id,
+            "buckets": {str(row['bucket']): digest_node(row['digest'], row['row_count']) for row in rows}
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ 다이제스트 버킷 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"다이제스트 버킷 조회 실패: {str(e)}")
+
+@router.get("/digest/{section}/{group_id}/{bucket}/rows")
+async def get_sync_digest_rows(section: str, group_id: int, bucket: int):
+    """버킷에 속한 행 (내보내기와 같은 레코드 형식)"""
+    digest_table(section)
+    try:
+        async with db.lease() as conn:
+            await ensure_digest_installed(conn)
+            rows = await conn.fetch(DIGEST_ROWS_QUERIES[section], group_id, bucket)
+
+        return {
+            "section": section,
+            "group_id": group_id,
+            "bucket": bucket,
+            "rows": [DIGEST_RECORDS[section](row) for row in rows]
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"❌ 다이제스트 버킷 행 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"다이제스트 버킷 행 조회 실패: {str(e)}")
+
+# ==================== 일괄 가져오기 (원격서버) ====================
+
+# 가져오기는 한 번에 하나만 실행 (동시에 두 전체 교체가 섞이지 않도록)
+IMPORT_LOCK_KEY = "heal7_bulk_sync_import"
+
+# 트랜잭션이 끝나면 사라지는 스테이징 테이블 (COPY 로 채운다)
+IMPORT_STAGING_DDL = """
+CREATE TEMP TABLE sync_import_subcategories (
+    id integer, name text, description text, category_group text, display_order integer, is_active boolean
+) ON COMMIT DROP;
+CREATE TEMP TABLE sync_import_keywords (
+    id integer, text text, subcategory_id integer, weight float8, usage_count integer, is_active boolean
+) ON COMMIT DROP;
+CREATE TEMP TABLE sync_import_dependencies (
+    parent_keyword_id integer, dependent_keyword_id integer
+) ON COMMIT DROP;
+"""
+
+IMPORT_SUBCATEGORY_COLUMNS = ("id", "name", "description", "category_group", "display_order", "is_active")
+IMPORT_KEYWORD_COLUMNS = ("id", "text", "subcategory_id", "weight", "usage_count", "is_active")
+IMPORT_DEPENDENCY_COLUMNS = ("parent_keyword_id", "dependent_keyword_id")
+
+# 참조 무결성 검사: 스테이징 + 기존 테이블 기준으로 없는 행을 가리키는 항목 수와 예시
+IMPORT_VALIDATION_QUERY = """
+SELECT
+    (SELECT count(*) FROM (SELECT id FROM sync_import_subcategories GROUP BY id HAVING count(*) > 1) d)
+        AS duplicate_subcategories,
+    (SELECT count(*) FROM (SELECT id FROM sync_import_keywords GROUP BY id HAVING count(*) > 1) d)
+        AS duplicate_keywords,
+    (SELECT count(*) FROM sync_import_subcategories WHERE id IS NULL)
+      + (SELECT count(*) FROM sync_import_keywords WHERE id IS NULL)
+        AS missing_ids,
+    (SELECT array_agg(DISTINCT s.subcategory_id) FROM sync_import_keywords s
+     WHERE NOT EXISTS (SELECT 1 FROM sync_import_subcategories c WHERE c.id = s.subcategory_id)
+       AND NOT EXISTS (SELECT 1 FROM keywords_subcategories c WHERE c.id = s.subcategory_id))
+        AS unknown_subcategories,
+    (SELECT array_agg(DISTINCT d.keyword_id) FROM (
+        SELECT parent_keyword_id AS keyword_id FROM sync_import_dependencies
+        UNION
+        SELECT dependent_keyword_id FROM sync_import_dependencies
+     ) d
+     WHERE NOT EXISTS (SELECT 1 FROM sync_import_keywords k WHERE k.id = d.keyword_id)
+       AND NOT EXISTS (SELECT 1 FROM keywords k WHERE k.id = d.keyword_id))
+        AS unknown_dependency_keywords
+"""
+
+# 내용이 같은 행은 건드리지 않는다 (변경 로그/ updated_at 이 불필요하게 바뀌지 않도록)
+IMPORT_UPSERT_SUBCATEGORIES_QUERY = """
+INSERT INTO keywords_subcategories AS t (id, name, description, category_group, display_order, is_active)
+SELECT id, name, description, category_group, display_order, is_active FROM sync_import_subcategories
+ON CONFLICT (id) DO UPDATE SET
+    name = EXCLUDED.name,
+    description = EXCLUDED.description,
+    category_group = EXCLUDED.category_group,
+    display_order = EXCLUDED.display_order,
+    is_active = EXCLUDED.is_active
+WHERE (t.name, t.description, t.category_group, t.display_order, t.is_active)
+      IS DISTINCT FROM (EXCLUDED.name, EXCLUDED.description, EXCLUDED.category_group,
+                        EXCLUDED.display_order, EXCLUDED.is_active)
+RETURNING (xmax = 0) AS inserted
+"""
+
+IMPORT_UPSERT_KEYWORDS_QUERY = """
+INSERT INTO keywords AS t (id, text, subcategory_id, weight, usage_count, is_active)
+SELECT id, text, subcategory_id, weight, usage_count, is_active FROM sync_import_keywords
+ON CONFLICT (id) DO UPDATE SET
+    text = EXCLUDED.text,
+    subcategory_id = EXCLUDED.subcategory_id,
+    weight = EXCLUDED.weight,
+    usage_count = EXCLUDED.usage_count,
+    is_active = EXCLUDED.is_active,
+    updated_at = now()
+WHERE (t.text, t.subcategory_id, t.weight, t.usage_count, t.is_active)
+      IS DISTINCT FROM (EXCLUDED.text, EXCLUDED.subcategory_id, EXCLUDED.weight,
+                        EXCLUDED.usage_count, EXCLUDED.is_active)
+RETURNING (xmax = 0) AS inserted
+"""
+
+# 전체 교체: 가져온 데이터에 없는 활성 행은 비활성화 (설문 등에서 참조할 수 있으므로 삭제하지 않음)
+IMPORT_DEACTIVATE_SUBCATEGORIES_QUERY = """
+UPDATE keywords_subcategories t SET is_active = false
+WHERE t.is_active = true
+AND NOT EXISTS (SELECT 1 FROM sync_import_subcategories s WHERE s.id = t.id)
+"""
+
+IMPORT_DEACTIVATE_KEYWORDS_QUERY = """
+UPDATE keywords t SET is_active = false, updated_at = now()
+WHERE t.is_active = true
+AND NOT EXISTS (SELECT 1 FROM sync_import_keywords s WHERE s.id = t.id)
+"""
+
+IMPORT_DELETE_DEPENDENCIES_QUERY = """
+DELETE FROM keyword_dependencies kd
+WHERE NOT EXISTS (
+    SELECT 1 FROM sync_import_dependencies s
+    WHERE s.parent_keyword_id = kd.parent_keyword_id
+    AND s.dependent_keyword_id = kd.dependent_keyword_id
+)
+"""
+
+IMPORT_INSERT_DEPENDENCIES_QUERY = """
+INSERT INTO keyword_dependencies (parent_keyword_id, dependent_keyword_id)
+SELECT DISTINCT s.parent_keyword_id, s.dependent_keyword_id
+FROM sync_import_dependencies s
+WHERE NOT EXISTS (
+    SELECT 1 FROM keyword_dependencies kd
+    WHERE kd.parent_keyword_id = s.parent_keyword_id
+    AND kd.dependent_keyword_id = s.dependent_keyword_id
+)
+"""
+
+IMPORT_RESET_SEQUENCES_QUERY = """
+SELECT setval(pg_get_serial_sequence('keywords_subcategories', 'id'),
+              GREATEST((SELECT max(id) FROM keywords_subcategories), 1)),
+       setval(pg_get_serial_sequence('keywords', 'id'),
+              GREATEST((SELECT max(id) FROM keywords), 1))
+"""
+
+IMPORT_MODES = ("replace", "merge")
+
+class BulkImportRequest(BaseModel):
+    sync_data: Dict[str, Any]
+    source: Optional[str] = None
+    timestamp: Optional[str] = None
+    mode: str = "replace"
+
+class SyncImportError(Exception):
+    """가져올 데이터가 참조 무결성 검사를 통과하지 못함"""
+
+    def __init__(self, problems: Dict[str, Any]):
+        super().__init__(f"가져올 데이터 검증 실패: {problems}")
+        self.problems = problems
+
+def import_subcategory_rows(subcategories: List[Dict[str, Any]]) -> List[tuple]:
+    return [
+        (r.get('id'), r.get('name'), r.get('description'), r.get('category_group'),
+         r.get('display_order'), r.get('is_active', True))
+        for r in subcategories
+    ]
+
+def import_keyword_rows(keywords: List[Dict[str, Any]], subcategories: List[Dict[str, Any]]) -> List[tuple]:
+    """내보내기 키워드 레코드 → keywords 행 (subcategory_id 가 없는 이전 형식은 서브카테고리 이름으로 찾음)"""
+    subcategory_ids = {r.get('name'): r.get('id') for r in subcategories}
+    rows = []
+    for r in keywords:
+        subcategory_id = r.get('subcategory_id')
+        if subcategory_id is None:
+            subcategory_id = subcategory_ids.get(r.get('subcategory'))
+        weight = r.get('weight')
+        rows.append((
+            r.get('id'), r.get('name'), subcategory_id,
+            float(weight) if weight is not None else 1.0,
+            r.get('connections') or 0,
+            r.get('status', 'active') == 'active'
+        ))
+    return rows
+
+def import_dependency_rows(dependencies: List[Dict[str, Any]]) -> List[tuple]:
+    return [(r['parent_keyword_id'], r['dependent_keyword_id']) for r in dependencies]
+
+def count_upserts(rows) -> Dict[str, int]:
+    inserted = sum(1 for row in rows if row['inserted'])
+    return {"inserted": inserted, "updated": len(rows) - inserted}
+
+async def import_sync_data(conn, sync_data: Dict[str, Any], mode: str = "replace") -> Dict[str, Any]:
+    """내보내기 데이터를 스테이징 테이블에 COPY 한 뒤 한 트랜잭션으로 반영
+
+    replace: 가져온 데이터를 전체 상태로 보고 없는 키워드/서브카테고리는 비활성화, 없는 의존성은 삭제
+    merge  : 가져온 행만 추가/갱신
+    검증에 실패하면 아무것도 반영하지 않고 SyncImportError 를 던진다.
+    """
+    subcategories = sync_data.get("subcategories") or []
+    subcategory_rows = import_subcategory_rows(subcategories)
+    keyword_rows = import_keyword_rows(sync_data.get("keywords") or [], subcategories)
+    dependency_rows = import_dependency_rows(sync_data.get("dependencies") or [])
+
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+
+    def mark(step: str):
+        timings[step] = round((time.perf_counter() - started) * 1000 - sum(timings.values()), 3)
+
+    async with conn.transaction():
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", IMPORT_LOCK_KEY)
+        await conn.execute(IMPORT_STAGING_DDL)
+        await conn.copy_records_to_table(
+            "sync_import_subcategories", records=subcategory_rows, columns=IMPORT_SUBCATEGORY_COLUMNS
+        )
+        await conn.copy_records_to_table(
+            "sync_import_keywords", records=keyword_rows, columns=IMPORT_KEYWORD_COLUMNS
+        )
+        await conn.copy_records_to_table(
+            "sync_import_dependencies", records=dependency_rows, columns=IMPORT_DEPENDENCY_COLUMNS
+        )
+        mark("copy_ms")
+
+        checks = await conn.fetchrow(IMPORT_VALIDATION_QUERY)
+        problems = {name: value for name, value in dict(checks).items() if value}
+        if problems:
+            raise SyncImportError(problems)
+        mark("validate_ms")
+
+        subcategory_result = count_upserts(await conn.fetch(IMPORT_UPSERT_SUBCATEGORIES_QUERY))
+        keyword_result = count_upserts(await conn.fetch(IMPORT_UPSERT_KEYWORDS_QUERY))
+        dependency_result = {"inserted": 0, "deleted": 0}
+
+        if mode == "replace":
+            subcategory_result["deactivated"] = rows_affected(
+                await conn.execute(IMPORT_DEACTIVATE_SUBCATEGORIES_QUERY)
+            )
+            keyword_result["deactivated"] = rows_affected(await conn.execute(IMPORT_DEACTIVATE_KEYWORDS_QUERY))
+            dependency_result["deleted"] = rows_affected(await conn.execute(IMPORT_DELETE_DEPENDENCIES_QUERY))
+
+        dependency_result["inserted"] = rows_affected(await conn.execute(IMPORT_INSERT_DEPENDENCIES_QUERY))
+        await conn.execute(IMPORT_RESET_SEQUENCES_QUERY)
+        mark("apply_ms")
+
+    timings["total_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return {
+        "mode": mode,
+        "received": {
+            "subcategories": len(subcategory_rows),
+            "keywords": len(keyword_rows),
+            "dependencies": len(dependency_rows)
+        },
+        "subcategories": subcategory_result,
+        "keywords": keyword_result,
+        "dependencies": dependency_result,
+        "timings": timings
+    }
+
+@router.post("/import")
+async def import_sync_payload(import_request: BulkImportRequest):
+    """
+    일괄 동기화 가져오기 (원격서버에서 실행)
+    /keywords/export 데이터를 스테이징 테이블에 COPY 하고 SQL 로 참조 무결성을 검사한 뒤
+    키워드/서브카테고리/의존성을 한 트랜잭션으로 반영한다.
+    """
+    if import_request.mode not in IMPORT_MODES:
+        raise HTTPException(status_code=400, detail=f"지원하지 않는 가져오기 모드입니다: {import_request.mode}")
+
+    try:
+        async with db.lease() as conn:
+            result = await import_sync_data(conn, import_request.sync_data, import_request.mode)
+
+        # 이 프로세스의 의존성 그래프는 바로 다시 읽도록
+        keyword_dependency_index.invalidate()
+
+        logger.info(f"✅ 일괄 가져오기 완료 ({import_request.source or 'unknown'}): {result}")
+        return {"success": True, **result}
+
+    except SyncImportError as e:
+        logger.warning(f"⚠️ 일괄 가져오기 거부: {e.problems}")
+        raise HTTPException(status_code=422, detail={"message": "가져올 데이터 검증 실패", "problems": e.problems})
+    except Exception as e:
+        logger.error(f"❌ 일괄 가져오기 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"일괄 가져오기 실패: {str(e)}")
+
+# ==================== 동기화 작업 저널 ====================
+
+# advanced_remote_sync.py 가 기록하는 실행 저널 (SQLite, 읽기 전용으로 조회)
+sync_journal = SyncJournal()
+
+@router.get("/jobs")
+async def list_sync_jobs(
+    limit: int = Query(20, ge=1, le=200),
+    mode: Optional[str] = Query(None, description="full / push / incremental / digest")
+):
+    """최근 원격 동기화 실행 목록 (상태, 확인된 항목/배치, 재시도, 실제 실행 시간 기준 처리량)"""
+    try:
+        runs = await asyncio.to_thread(sync_journal.list_runs, limit, mode)
+        return {"journal": sync_journal.path, "count": len(runs), "runs": runs}
+    except Exception as e:
+        logger.error(f"❌ 동기화 실행 목록 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"동기화 실행 목록 조회 실패: {str(e)}")
+
+@router.get("/jobs/{run_id}")
+async def get_sync_job(run_id: str):
+    """원격 동기화 실행 상세 (구역별 전체/확인된 배치, 산출물 경로)"""
+    try:
+        run = await asyncio.to_thread(sync_journal.get_run, run_id)
+    except Exception as e:
+        logger.error(f"❌ 동기화 실행 조회 실패: {e}")
+        raise HTTPException(status_code=500, detail=f"동기화 실행 조회 실패: {str(e)}")
+    
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"동기화 실행 없음: {run_id}")
+    return run
 
 @router.get("/status")
 async def get_sync_status():
     """동기화 상태 확인"""
     try:
-        conn = await asyncpg.connect(**DB_CONFIG)
-        
         # 기본 통계
         stats_query = """
         SELECT 
@@ -167,8 +1120,6 @@ async def get_sync_status():
         WHERE k.is_active = true
         """
         
-        stats = await conn.fetchrow(stats_query)
-        
         # 분류별 통계
         category_query = """
         SELECT 
@@ -190,9 +1141,9 @@ async def get_sync_status():
         ORDER BY 분류
         """
         
-        category_stats = await conn.fetch(category_query)
-        
-        await conn.close()
+        async with db.lease() as conn:
+            stats = await conn.fetchrow(stats_query)
+            category_stats = await conn.fetch(category_query)
         
         return {
             "server_type": "local-source",
@@ -7,12 +7,12 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import os
 import uuid
 from datetime import datetime
 
+from services.database_manager import db, rows_affected
+
 logger = logging.getLogger(__name__)
 
 # Pydantic 모델 정의
@@ -43,22 +43,6 @@ class InquiryReplyRequest(BaseModel):
 # 라우터 생성
 router = APIRouter(prefix="/admin-api/community")
 
-# 데이터베이스 연결 함수
-def get_db_connection():
-    """PostgreSQL 데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(
-            host="localhost",
-            database="livedb",
-            user="liveuser",
-            password="livepass2024",
-            cursor_factory=RealDictCursor
-        )
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
-
 @router.get("/health")
 async def community_health():
     """커뮤니티 관리 시스템 상태 확인"""
@@ -76,25 +60,17 @@ async def get_notices(
 ):
     """공지사항 목록 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT id, title, content, author_name, views, is_pinned,
-               created_at, updated_at
-        FROM notices 
-        ORDER BY is_pinned DESC, created_at DESC 
-        LIMIT %s OFFSET %s
-        """, (limit, offset))
-        
-        notices = cursor.fetchall()
-        
-        # 전체 개수 조회
-        cursor.execute("SELECT COUNT(*) FROM notices")
-        total_count = cursor.fetchone()['count']
-        
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            notices = await conn.fetch("""
+            SELECT id, title, content, author_name, views, is_pinned,
+                   created_at, updated_at
+            FROM notices 
+            ORDER BY is_pinned DESC, created_at DESC 
+            LIMIT $1 OFFSET $2
+            """, limit, offset)
+            
+            # 전체 개수 조회
+            total_count = await conn.fetchval("SELECT COUNT(*) FROM notices")
         
         # 데이터 포맷팅
         formatted_notices = []
@@ -126,28 +102,15 @@ async def get_notices(
 async def get_notice(notice_id: int):
     """특정 공지사항 상세 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 조회수 증가
-        cursor.execute("""
-        UPDATE notices 
-        SET views = views + 1, updated_at = %s
-        WHERE id = %s
-        """, (datetime.now(), notice_id))
-        
-        # 공지사항 조회
-        cursor.execute("""
-        SELECT id, title, content, author_name, views, is_pinned,
-               created_at, updated_at
-        FROM notices 
-        WHERE id = %s
-        """, (notice_id,))
-        
-        notice = cursor.fetchone()
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            # 조회수 증가와 조회를 한 번에 처리
+            notice = await conn.fetchrow("""
+            UPDATE notices 
+            SET views = views + 1, updated_at = $1
+            WHERE id = $2
+            RETURNING id, title, content, author_name, views, is_pinned,
+                      created_at, updated_at
+            """, datetime.now(), notice_id)
         
         if not notice:
             raise HTTPException(status_code=404, detail="공지사항을 찾을 수 없습니다")
@@ -176,27 +139,20 @@ async def get_notice(notice_id: int):
 async def create_notice(notice_request: NoticeCreateRequest):
     """새 공지사항 생성"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        INSERT INTO notices (title, content, author_name, is_pinned, views, created_at, updated_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        RETURNING id
-        """, (
-            notice_request.title,
-            notice_request.content,
-            notice_request.author_name,
-            notice_request.is_pinned,
-            0,  # views
-            datetime.now(),
-            datetime.now()
-        ))
-        
-        notice_id = cursor.fetchone()['id']
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            notice_id = await conn.fetchval("""
+            INSERT INTO notices (title, content, author_name, is_pinned, views, created_at, updated_at)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+            RETURNING id
+            """,
+                notice_request.title,
+                notice_request.content,
+                notice_request.author_name,
+                notice_request.is_pinned,
+                0,  # views
+                datetime.now(),
+                datetime.now()
+            )
         
         return {
             "success": True,
@@ -212,40 +168,34 @@ async def create_notice(notice_request: NoticeCreateRequest):
 async def update_notice(notice_id: int, notice_request: NoticeUpdateRequest):
     """공지사항 수정"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # 업데이트할 필드들 동적으로 구성
         update_fields = []
         params = []
         
         for field, value in notice_request.dict(exclude_unset=True).items():
             if value is not None:
-                update_fields.append(f"{field} = %s")
                 params.append(value)
+                update_fields.append(f"{field} = ${len(params)}")
         
         if not update_fields:
             raise HTTPException(status_code=400, detail="업데이트할 필드가 없습니다")
         
-        update_fields.append("updated_at = %s")
         params.append(datetime.now())
+        update_fields.append(f"updated_at = ${len(params)}")
         params.append(notice_id)
         
         query = f"""
         UPDATE notices 
         SET {', '.join(update_fields)}
-        WHERE id = %s
+        WHERE id = ${len(params)}
         """
         
-        cursor.execute(query, params)
+        async with db.lease() as conn:
+            result = await conn.execute(query, *params)
         
-        if cursor.rowcount == 0:
+        if rows_affected(result) == 0:
             raise HTTPException(status_code=404, detail="공지사항을 찾을 수 없습니다")
         
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
         return {
             "success": True,
             "message": "공지사항이 성공적으로 업데이트되었습니다"
@@ -261,18 +211,12 @@ async def update_notice(notice_id: int, notice_request: NoticeUpdateRequest):
 async def delete_notice(notice_id: int):
     """공지사항 삭제"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("DELETE FROM notices WHERE id = %s", (notice_id,))
+        async with db.lease() as conn:
+            result = await conn.execute("DELETE FROM notices WHERE id = $1", notice_id)
         
-        if cursor.rowcount == 0:
+        if rows_affected(result) == 0:
             raise HTTPException(status_code=404, detail="공지사항을 찾을 수 없습니다")
         
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
         return {
             "success": True,
             "message": "공지사항이 성공적으로 삭제되었습니다"
@@ -294,47 +238,22 @@ async def get_inquiries(
 ):
     """1:1 문의 목록 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 쿼리 구성
-        base_query = """
-        SELECT id, title, content, user_name, user_email, user_phone, category,
-               status, admin_reply, admin_name, replied_at, created_at, updated_at
-        FROM inquiries 
-        WHERE 1=1
-        """
-        
-        params = []
-        if status:
-            base_query += " AND status = %s"
-            params.append(status)
-        
-        if category:
-            base_query += " AND category = %s"
-            params.append(category)
-        
-        base_query += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-        params.extend([limit, offset])
-        
-        cursor.execute(base_query, params)
-        inquiries = cursor.fetchall()
-        
-        # 전체 개수 조회
-        count_query = "SELECT COUNT(*) FROM inquiries WHERE 1=1"
-        count_params = []
-        if status:
-            count_query += " AND status = %s"
-            count_params.append(status)
-        if category:
-            count_query += " AND category = %s"
-            count_params.append(category)
+        async with db.lease() as conn:
+            inquiries = await conn.fetch("""
+            SELECT id, title, content, user_name, user_email, user_phone, category,
+                   status, admin_reply, admin_name, replied_at, created_at, updated_at
+            FROM inquiries 
+            WHERE ($1::text IS NULL OR status = $1)
+              AND ($2::text IS NULL OR category = $2)
+            ORDER BY created_at DESC LIMIT $3 OFFSET $4
+            """, status or None, category or None, limit, offset)
             
-        cursor.execute(count_query, count_params)
-        total_count = cursor.fetchone()['count']
-        
-        cursor.close()
-        conn.close()
+            # 전체 개수 조회
+            total_count = await conn.fetchval("""
+            SELECT COUNT(*) FROM inquiries
+            WHERE ($1::text IS NULL OR status = $1)
+              AND ($2::text IS NULL OR category = $2)
+            """, status or None, category or None)
         
         # 데이터 포맷팅
         formatted_inquiries = []
@@ -373,19 +292,13 @@ async def get_inquiries(
 async def get_inquiry(inquiry_id: int):
     """특정 1:1 문의 상세 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT id, title, content, user_name, user_email, user_phone, category,
-               status, admin_reply, admin_name, replied_at, created_at, updated_at
-        FROM inquiries 
-        WHERE id = %s
-        """, (inquiry_id,))
-        
-        inquiry = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            inquiry = await conn.fetchrow("""
+            SELECT id, title, content, user_name, user_email, user_phone, category,
+                   status, admin_reply, admin_name, replied_at, created_at, updated_at
+            FROM inquiries 
+            WHERE id = $1
+            """, inquiry_id)
         
         if not inquiry:
             raise HTTPException(status_code=404, detail="문의를 찾을 수 없습니다")
@@ -419,31 +332,24 @@ async def get_inquiry(inquiry_id: int):
 async def create_inquiry(inquiry_request: InquiryCreateRequest):
     """새 1:1 문의 생성"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        INSERT INTO inquiries (
-            title, content, user_name, user_email, user_phone, category,
-            status, created_at, updated_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-        RETURNING id
-        """, (
-            inquiry_request.title,
-            inquiry_request.content,
-            inquiry_request.user_name,
-            inquiry_request.user_email,
-            inquiry_request.user_phone,
-            inquiry_request.category,
-            'pending',
-            datetime.now(),
-            datetime.now()
-        ))
-        
-        inquiry_id = cursor.fetchone()['id']
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            inquiry_id = await conn.fetchval("""
+            INSERT INTO inquiries (
+                title, content, user_name, user_email, user_phone, category,
+                status, created_at, updated_at
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+            RETURNING id
+            """,
+                inquiry_request.title,
+                inquiry_request.content,
+                inquiry_request.user_name,
+                inquiry_request.user_email,
+                inquiry_request.user_phone,
+                inquiry_request.category,
+                'pending',
+                datetime.now(),
+                datetime.now()
+            )
         
         return {
             "success": True,
@@ -459,33 +365,26 @@ async def create_inquiry(inquiry_request: InquiryCreateRequest):
 async def reply_inquiry(inquiry_id: int, reply_request: InquiryReplyRequest):
     """1:1 문의 답변"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
+        async with db.lease() as conn:
+            # 답변 업데이트 (대상이 없으면 0행 처리)
+            result = await conn.execute("""
+            UPDATE inquiries 
+            SET admin_reply = $1, admin_name = $2, status = $3, 
+                replied_at = $4, updated_at = $5
+            WHERE id = $6
+            """,
+                reply_request.reply_content,
+                reply_request.admin_name,
+                'answered',
+                datetime.now(),
+                datetime.now(),
+                inquiry_id
+            )
         
         # 문의 존재 확인
-        cursor.execute("SELECT id FROM inquiries WHERE id = %s", (inquiry_id,))
-        if not cursor.fetchone():
+        if rows_affected(result) == 0:
             raise HTTPException(status_code=404, detail="문의를 찾을 수 없습니다")
         
-        # 답변 업데이트
-        cursor.execute("""
-        UPDATE inquiries 
-        SET admin_reply = %s, admin_name = %s, status = %s, 
-            replied_at = %s, updated_at = %s
-        WHERE id = %s
-        """, (
-            reply_request.reply_content,
-            reply_request.admin_name,
-            'answered',
-            datetime.now(),
-            datetime.now(),
-            inquiry_id
-        ))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
-        
         return {
             "success": True,
             "message": "답변이 성공적으로 등록되었습니다"
@@ -501,36 +400,26 @@ async def reply_inquiry(inquiry_id: int, reply_request: InquiryReplyRequest):
 async def get_community_stats():
     """커뮤니티 통계 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 공지사항 통계
-        cursor.execute("SELECT COUNT(*) as count FROM notices")
-        total_notices = cursor.fetchone()['count']
-        
-        # 문의 통계
-        cursor.execute("""
-        SELECT 
-            COUNT(*) as total_inquiries,
-            COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending_inquiries,
-            COUNT(CASE WHEN status = 'answered' THEN 1 END) as answered_inquiries
-        FROM inquiries
-        """)
-        
-        inquiry_stats = cursor.fetchone()
-        
-        # 카테고리별 문의 통계
-        cursor.execute("""
-        SELECT category, COUNT(*) as count 
-        FROM inquiries 
-        GROUP BY category
-        ORDER BY count DESC
-        """)
-        
-        category_stats = cursor.fetchall()
-        
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            # 공지사항 통계
+            total_notices = await conn.fetchval("SELECT COUNT(*) FROM notices")
+            
+            # 문의 통계
+            inquiry_stats = await conn.fetchrow("""
+            SELECT 
+                COUNT(*) as total_inquiries,
+                COUNT(CASE WHEN status = 'pending' THEN 1 END) as pending_inquiries,
+                COUNT(CASE WHEN status = 'answered' THEN 1 END) as answered_inquiries
+            FROM inquiries
+            """)
+            
+            # 카테고리별 문의 통계
+            category_stats = await conn.fetch("""
+            SELECT category, COUNT(*) as count 
+            FROM inquiries 
+            GROUP BY category
+            ORDER BY count DESC
+            """)
         
         return {
             "success": True,
@@ -6,59 +6,30 @@ heal7.com에서 사용하는 상품 조회 전용 API
 from fastapi import APIRouter, HTTPException
 from typing import List, Dict, Any, Optional
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+from services.database_manager import db
 
 logger = logging.getLogger(__name__)
 
 # 라우터 생성 (프론트엔드 전용)
 router = APIRouter(prefix="/api/store")
 
-# 데이터베이스 연결 함수
-def get_db_connection():
-    """PostgreSQL 데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(
-            host="localhost",
-            database="livedb",
-            user="liveuser",
-            password="livepass2024",
-            cursor_factory=RealDictCursor
-        )
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
 
 @router.get("/products")
 async def get_products(category: Optional[str] = None):
     """상품 목록 조회 (프론트엔드용)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        if category:
-            cursor.execute("""
-            SELECT id, name, price, description, category, stock_quantity, 
-                   is_active, created_at, updated_at, image_url, 
-                   featured_badge as badge, is_featured, shipping_info
-            FROM products 
-            WHERE category = %s AND is_active = true
-            ORDER BY created_at DESC
-            """, (category,))
-        else:
-            cursor.execute("""
+        async with db.lease() as conn:
+            rows = await conn.fetch("""
             SELECT id, name, price, description, category, stock_quantity, 
                    is_active, created_at, updated_at, image_url, 
                    featured_badge as badge, is_featured, shipping_info
             FROM products 
-            WHERE is_active = true
+            WHERE ($1::text IS NULL OR category = $1) AND is_active = true
             ORDER BY created_at DESC
-            """)
+            """, category or None)
         
-        products = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        products = [dict(row) for row in rows]
         
         return {
             "success": True,
@@ -74,27 +45,21 @@ async def get_products(category: Optional[str] = None):
 async def get_product(product_id: int):
     """상품 상세 조회 (프론트엔드용)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT id, name, price, description, category, stock_quantity, 
-               is_active, created_at, updated_at, image_url, 
-               featured_badge as badge, is_featured, shipping_info
-        FROM products 
-        WHERE id = %s AND is_active = true
-        """, (product_id,))
-        
-        product = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            product = await conn.fetchrow("""
+            SELECT id, name, price, description, category, stock_quantity, 
+                   is_active, created_at, updated_at, image_url, 
+                   featured_badge as badge, is_featured, shipping_info
+            FROM products 
+            WHERE id = $1 AND is_active = true
+            """, product_id)
         
         if not product:
             raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
         
         return {
             "success": True,
-            "product": product
+            "product": dict(product)
         }
         
     except HTTPException:
@@ -107,21 +72,17 @@ async def get_product(product_id: int):
 async def get_featured_products():
     """추천 상품 조회 (프론트엔드용)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT id, name, price, description, category, stock_quantity, 
-               is_active, created_at, updated_at, image_url, 
-               featured_badge as badge, is_featured, shipping_info
-        FROM products 
-        WHERE is_featured = true AND is_active = true
-        ORDER BY created_at DESC
-        """)
+        async with db.lease() as conn:
+            rows = await conn.fetch("""
+            SELECT id, name, price, description, category, stock_quantity, 
+                   is_active, created_at, updated_at, image_url, 
+                   featured_badge as badge, is_featured, shipping_info
+            FROM products 
+            WHERE is_featured = true AND is_active = true
+            ORDER BY created_at DESC
+            """)
         
-        products = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        products = [dict(row) for row in rows]
         
         return {
             "success": True,
@@ -7,8 +7,6 @@ HEAL7 키워드 시스템 통합 API
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
-import subprocess
-import asyncio
 
 from fastapi import APIRouter, HTTPException, Depends, Query
 from pydantic import BaseModel
@@ -17,6 +15,8 @@ import redis
 import json
 import os
 
+from services.database_manager import db
+
 # 로깅 설정
 logger = logging.getLogger(__name__)
 
@@ -45,75 +45,81 @@ class KeywordSearchRequest(BaseModel):
     subcategory_id: Optional[int] = None
     limit: Optional[int] = 100
 
-# 서브프로세스를 통한 PostgreSQL 직접 접근
-async def run_postgres_query(query: str, params: List = None):
-    """PostgreSQL 쿼리를 subprocess로 실행"""
-    try:
-        # psql 명령어 구성
-        cmd = [
-            'sudo', '-u', 'postgres', 'psql', '-d', 'livedb',
-            '-t', '-A', '-F', '\t',  # 탭 분리, 헤더 없음
-            '-c', query
-        ]
-        
-        # 비동기 subprocess 실행
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
-        )
-        
-        stdout, stderr = await process.communicate()
-        
-        if process.returncode != 0:
-            error_msg = stderr.decode('utf-8').strip()
-            logger.error(f"PostgreSQL query failed: {error_msg}")
-            raise Exception(f"Database query failed: {error_msg}")
-        
-        result = stdout.decode('utf-8').strip()
-        logger.debug(f"Query executed successfully: {len(result)} chars returned")
-        return result
-        
-    except Exception as e:
-        logger.error(f"Failed to execute PostgreSQL query: {e}")
-        raise
-
-async def parse_query_result(result: str, columns: List[str]) -> List[Dict]:
-    """쿼리 결과를 파싱하여 딕셔너리 리스트로 변환"""
-    if not result:
-        return []
-    
-    rows = []
-    for line in result.split('\n'):
-        if line.strip():
-            values = line.split('\t')
-            if len(values) == len(columns):
-                row_dict = {}
-                for i, col in enumerate(columns):
-                    value = values[i]
-                    # NULL 값 처리
-                    if value == '' or value == 'NULL':
-                        row_dict[col] = None
-                    # 정수 변환
-                    elif col in ['id', 'count', 'total', 'active', 'usage_count']:
-                        try:
-                            row_dict[col] = int(value)
-                        except ValueError:
-                            row_dict[col] = 0
-                    # 실수 변환
-                    elif col in ['avg_score', 'score']:
-                        try:
-                            row_dict[col] = float(value)
-                        except ValueError:
-                            row_dict[col] = 0.0
-                    # 불린 변환
-                    elif col in ['is_active']:
-                        row_dict[col] = value.lower() in ('t', 'true', '1', 'yes')
-                    else:
-                        row_dict[col] = value
-                rows.append(row_dict)
-    
-    return rows
+# ==================== 쿼리 정의 ====================
+# SQL 텍스트를 상수로 고정하고 선택 조건은 파라미터로 처리한다.
+# asyncpg는 연결별로 prepared statement를 캐시하므로 동일한 텍스트는
+# 두 번째 호출부터 parse/plan 없이 바로 실행된다.
+
+ALL_KEYWORDS_QUERY = """
+    SELECT k.id, k.text, k.subcategory_id, ks.name AS subcategory_name, k.is_active, k.created_at
+    FROM keywords k
+    LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
+    WHERE ($1::int IS NULL OR k.subcategory_id = $1)
+      AND (NOT $2::bool OR k.is_active = true)
+    ORDER BY ks.name, k.text
+    LIMIT $3
+"""
+
+KEYWORD_COUNTS_QUERY = """
+    SELECT COUNT(*) AS total,
+           COUNT(*) FILTER (WHERE is_active = true) AS active
+    FROM keywords
+"""
+
+SUBCATEGORY_COUNTS_QUERY = """
+    SELECT ks.name, COUNT(*) AS count
+    FROM keywords k
+    LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
+    WHERE k.is_active = true
+    GROUP BY ks.name
+    ORDER BY count DESC
+"""
+
+SEARCH_KEYWORDS_QUERY = """
+    SELECT k.id, k.text, k.subcategory_id, ks.name AS subcategory_name, k.is_active, k.created_at
+    FROM keywords k
+    LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
+    WHERE k.is_active = true
+      AND ($1::text IS NULL OR k.text ILIKE '%' || $1 || '%')
+      AND ($2::int IS NULL OR k.subcategory_id = $2)
+    ORDER BY CASE WHEN $1::text IS NOT NULL AND k.text ILIKE $1 || '%' THEN 1 ELSE 2 END, k.text
+    LIMIT $3
+"""
+
+SUBCATEGORIES_QUERY = """
+    SELECT ks.id, ks.name, ks.group_code, ks.description, COUNT(k.id) AS keyword_count
+    FROM keyword_subcategories ks
+    LEFT JOIN keywords k ON ks.id = k.subcategory_id AND k.is_active = true
+    GROUP BY ks.id, ks.name, ks.group_code, ks.description
+    ORDER BY ks.group_code, ks.name
+"""
+
+MATRIX_KEYWORDS_QUERY = """
+    SELECT k.id, k.text, k.subcategory_id, ks.name AS subcategory_name
+    FROM keywords k
+    LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
+    WHERE k.is_active = true
+      AND ($1::int IS NULL OR k.subcategory_id = $1)
+    ORDER BY k.id
+    LIMIT 442
+"""
+
+KEYWORDS_TABLE_INFO_QUERY = """
+    SELECT schemaname, tablename, tableowner, tablespace, hasindexes, hasrules, hastriggers
+    FROM pg_tables
+    WHERE tablename = 'keywords'
+"""
+
+def _to_keyword_response(row: asyncpg.Record) -> KeywordResponse:
+    """asyncpg 레코드를 응답 모델로 변환 (컬럼 타입은 드라이버가 보장)"""
+    return KeywordResponse(
+        id=row['id'],
+        keyword=row['text'],
+        subcategory_id=row['subcategory_id'],
+        subcategory_name=row['subcategory_name'],
+        is_active=row['is_active'],
+        created_at=row['created_at']
+    )
 
 # ==================== 통합 키워드 API 엔드포인트 ====================
 
@@ -136,39 +142,11 @@ async def get_all_keywords(
 ):
     """모든 키워드 조회 (통합)"""
     try:
-        # WHERE 조건 구성
-        where_conditions = []
-        if subcategory_id:
-            where_conditions.append(f"k.subcategory_id = {subcategory_id}")
-        if active_only:
-            where_conditions.append("k.is_active = true")
-        
-        where_clause = " AND ".join(where_conditions) if where_conditions else "1=1"
-        
-        query = f"""
-            SELECT k.id, k.text, k.subcategory_id, ks.name as subcategory_name, k.is_active, k.created_at
-            FROM keywords k 
-            LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
-            WHERE {where_clause}
-            ORDER BY ks.name, k.text
-            LIMIT {limit}
-        """
-        
-        result = await run_postgres_query(query)
-        columns = ['id', 'text', 'subcategory_id', 'subcategory_name', 'is_active', 'created_at']
-        rows = await parse_query_result(result, columns)
-            
-        keywords = []
-        for row in rows:
-            keywords.append(KeywordResponse(
-                id=row['id'],
-                keyword=row['text'],
-                subcategory_id=row['subcategory_id'],
-                subcategory_name=row['subcategory_name'],
-                is_active=row['is_active'],
-                created_at=row['created_at']
-            ))
-        
+        async with db.lease() as conn:
+            rows = await conn.fetch(ALL_KEYWORDS_QUERY, subcategory_id or None, active_only, limit)
+
+        keywords = [_to_keyword_response(row) for row in rows]
+
         logger.info(f"키워드 조회 완료: {len(keywords)}개")
         return keywords
         
@@ -181,33 +159,17 @@ async def get_all_keywords(
 async def get_keyword_stats():
     """키워드 통계 조회 (통합)"""
     try:
-        # 전체 통계 쿼리
-        total_query = "SELECT COUNT(*) as total FROM keywords"
-        total_result = await run_postgres_query(total_query)
-        total_count = int(total_result.strip()) if total_result.strip() else 0
-        
-        # 활성 키워드 통계
-        active_query = "SELECT COUNT(*) as active FROM keywords WHERE is_active = true"
-        active_result = await run_postgres_query(active_query)
-        active_count = int(active_result.strip()) if active_result.strip() else 0
-        
-        # 서브카테고리별 통계
-        subcategory_query = """
-            SELECT ks.name, COUNT(*) as count 
-            FROM keywords k
-            LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
-            WHERE k.is_active = true 
-            GROUP BY ks.name 
-            ORDER BY count DESC
-        """
-        subcategory_result = await run_postgres_query(subcategory_query)
-        subcategory_rows = await parse_query_result(subcategory_result, ['name', 'count'])
-        
+        async with db.lease() as conn:
+            # 전체/활성 키워드 수는 한 번의 스캔으로 집계
+            counts = await conn.fetchrow(KEYWORD_COUNTS_QUERY)
+            # 서브카테고리별 통계
+            subcategory_rows = await conn.fetch(SUBCATEGORY_COUNTS_QUERY)
+
         subcategories = {row['name']: row['count'] for row in subcategory_rows if row['name']}
         
         stats = KeywordStats(
-            total_keywords=total_count,
-            active_keywords=active_count,
+            total_keywords=counts['total'],
+            active_keywords=counts['active'],
             subcategories=subcategories
         )
         
@@ -227,70 +189,25 @@ async def search_keywords(
 ):
     """키워드 검색 (통합)"""
     try:
-        # WHERE 조건 구성
-        where_conditions = ["k.is_active = true"]
-        
-        if q:
-            # SQL Injection 방지를 위한 이스케이프 처리
-            escaped_query = q.replace("'", "''")
-            where_conditions.append(f"k.text ILIKE '%{escaped_query}%'")
-        
-        if subcategory_id:
-            where_conditions.append(f"k.subcategory_id = {subcategory_id}")
-        
-        where_clause = " AND ".join(where_conditions)
-        
-        # 검색 순서: 정확한 매치 우선
-        order_clause = "ORDER BY k.text" 
-        if q:
-            escaped_query = q.replace("'", "''")
-            order_clause = f"ORDER BY CASE WHEN k.text ILIKE '{escaped_query}%' THEN 1 ELSE 2 END, k.text"
-        
-        query = f"""
-            SELECT k.id, k.text, k.subcategory_id, ks.name as subcategory_name, k.is_active, k.created_at
-            FROM keywords k
-            LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
-            WHERE {where_clause}
-            {order_clause}
-            LIMIT {limit}
-        """
-        
-        result = await run_postgres_query(query)
-        columns = ['id', 'text', 'subcategory_id', 'subcategory_name', 'is_active', 'created_at']
-        rows = await parse_query_result(result, columns)
-            
-        keywords = []
-        for row in rows:
-            keywords.append(KeywordResponse(
-                id=row['id'],
-                keyword=row['text'],
-                subcategory_id=row['subcategory_id'],
-                subcategory_name=row['subcategory_name'],
-                is_active=row['is_active'],
-                created_at=row['created_at']
-            ))
+        # 검색어는 바인드 파라미터로 전달 (정확한 접두 매치 우선 정렬)
+        async with db.lease() as conn:
+            rows = await conn.fetch(SEARCH_KEYWORDS_QUERY, q or None, subcategory_id or None, limit)
+
+        keywords = [_to_keyword_response(row) for row in rows]
         
         logger.info(f"키워드 검색 완료: '{q}' 결과 {len(keywords)}개")
         return keywords
         
     except Exception as e:
         logger.error(f"키워드 검색 실패: {e}")
-        raise HTTPException(status_code=500, detail=f"키웛드 검색 실패: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"키워드 검색 실패: {str(e)}")
 
 @router.get("/subcategories")
 async def get_subcategories():
     """키워드 서브카테고리 목록 조회"""
     try:
-        query = """
-            SELECT ks.id, ks.name, ks.group_code, ks.description, COUNT(k.id) as keyword_count
-            FROM keyword_subcategories ks
-            LEFT JOIN keywords k ON ks.id = k.subcategory_id AND k.is_active = true
-            GROUP BY ks.id, ks.name, ks.group_code, ks.description
-            ORDER BY ks.group_code, ks.name
-        """
-        
-        result = await run_postgres_query(query)
-        rows = await parse_query_result(result, ['id', 'name', 'group_code', 'description', 'keyword_count'])
+        async with db.lease() as conn:
+            rows = await conn.fetch(SUBCATEGORIES_QUERY)
             
         subcategories = [
             {
@@ -317,22 +234,8 @@ async def get_keyword_matrix(
     """키워드 매트릭스 데이터 조회 (3D 시각화용)"""
     try:
         # 간단한 키워드 목록으로 매트릭스 생성
-        where_clause = "k.is_active = true"
-        if subcategory_id:
-            where_clause += f" AND k.subcategory_id = {subcategory_id}"
-        
-        query = f"""
-            SELECT k.id, k.text, k.subcategory_id, ks.name as subcategory_name
-            FROM keywords k
-            LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
-            WHERE {where_clause}
-            ORDER BY k.id
-            LIMIT 442
-        """
-        
-        result = await run_postgres_query(query)
-        columns = ['id', 'text', 'subcategory_id', 'subcategory_name']
-        rows = await parse_query_result(result, columns)
+        async with db.lease() as conn:
+            rows = await conn.fetch(MATRIX_KEYWORDS_QUERY, subcategory_id or None)
             
         matrix_data = []
         for row in rows:
@@ -365,34 +268,27 @@ async def get_keyword_matrix(
 async def get_debug_info():
     """디버그 정보 조회"""
     try:
-        # 데이터베이스 연결 테스트
-        db_version_result = await run_postgres_query("SELECT version()")
-        db_version = db_version_result.strip() if db_version_result else "Unknown"
-        
-        # 키워드 테이블 정보
-        table_query = """
-            SELECT 
-                schemaname, tablename, tableowner, tablespace, hasindexes, hasrules, hastriggers
-            FROM pg_tables 
-            WHERE tablename = 'keywords'
-        """
-        table_result = await run_postgres_query(table_query)
-        table_info = await parse_query_result(table_result, 
-                                            ['schemaname', 'tablename', 'tableowner', 'tablespace', 
-                                             'hasindexes', 'hasrules', 'hastriggers'])
+        async with db.lease() as conn:
+            # 데이터베이스 연결 테스트
+            db_version = await conn.fetchval("SELECT version()") or "Unknown"
+            # 키워드 테이블 정보
+            table_rows = await conn.fetch(KEYWORDS_TABLE_INFO_QUERY)
+
+        table_info = [dict(row) for row in table_rows]
             
         debug_info = {
             "database": {
                 "connected": True,
                 "version": db_version[:50] + "..." if len(db_version) > 50 else db_version,
-                "connection_method": "subprocess_psql"
+                "connection_method": "asyncpg_pool",
+                "pool": db.stats()
             },
             "table_info": table_info,
             "service_info": {
                 "router_prefix": "/admin-api/keywords",
-                "unified_version": "4.0",
+                "unified_version": "4.1",
                 "features": ["search", "stats", "matrix", "subcategories", "debug"],
-                "database_manager": "subprocess_psql",
+                "database_manager": "services.database_manager",
                 "actual_columns": ["id", "text", "subcategory_id", "is_active", "created_at", "updated_at"]
             }
         }
@@ -403,5 +299,5 @@ async def get_debug_info():
         logger.error(f"디버그 정보 조회 실패: {e}")
         return {
             "database": {"connected": False, "error": str(e)},
-            "service_info": {"status": "error", "connection_method": "subprocess_psql"}
-        }
\ No newline at end of file
+            "service_info": {"status": "error", "connection_method": "asyncpg_pool"}
+        }
@@ -5,23 +5,16 @@
 
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Dict, Any, Optional
-import asyncpg
 import json
 import logging
 from datetime import datetime, timedelta
 
+from services.database_manager import db
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/admin-api", tags=["Missing Endpoints Fix"])
 
-# 데이터베이스 설정
-DB_CONFIG = {
-    "host": "localhost",
-    "database": "livedb",
-    "user": "liveuser", 
-    "password": "livepass2024"
-}
-
 @router.get("/dependencies/")
 async def get_keyword_dependencies():
     """
@@ -29,8 +22,6 @@ async def get_keyword_dependencies():
     프론트엔드에서 /admin-api/dependencies/ 호출시 사용
     """
     try:
-        conn = await asyncpg.connect(**DB_CONFIG)
-        
         query = """
         SELECT 
             kd.parent_keyword_id,
@@ -48,8 +39,8 @@ async def get_keyword_dependencies():
         ORDER BY kd.parent_keyword_id, kd.dependent_keyword_id
         """
         
-        rows = await conn.fetch(query)
-        await conn.close()
+        async with db.lease() as conn:
+            rows = await conn.fetch(query)
         
         dependencies = []
         for row in rows:
@@ -80,8 +71,6 @@ async def get_all_keywords_working():
     기존 keywords_api.py의 /all이 문제가 있어서 새로 구현
     """
     try:
-        conn = await asyncpg.connect(**DB_CONFIG)
-        
         query = """
         SELECT 
             k.id,
@@ -111,8 +100,8 @@ async def get_all_keywords_working():
         ORDER BY k.id
         """
         
-        rows = await conn.fetch(query)
-        await conn.close()
+        async with db.lease() as conn:
+            rows = await conn.fetch(query)
         
         keywords = []
         for row in rows:
@@ -144,9 +133,7 @@ async def get_keyword_matrix_data():
     기존 키워드 unified API를 활용하여 3D 시각화 형식으로 변환
     """
     try:
-        # 직접 데이터베이스 연결로 키워드 조회 (HTTP 순환 호출 방지)
-        conn = await asyncpg.connect(**DB_CONFIG)
-        
+        # 직접 데이터베이스 조회 (HTTP 순환 호출 방지)
         query = """
         SELECT 
             k.id,
@@ -158,8 +145,8 @@ async def get_keyword_matrix_data():
         ORDER BY k.id
         """
         
-        rows = await conn.fetch(query)
-        await conn.close()
+        async with db.lease() as conn:
+            rows = await conn.fetch(query)
         
         logger.info(f"🔍 데이터베이스에서 키워드 조회 완료: {len(rows)}개")
         
@@ -199,9 +186,8 @@ async def get_keyword_matrix_data():
         ORDER BY kd.parent_keyword_id, kd.dependent_keyword_id
         """
         
-        conn_deps = await asyncpg.connect(**DB_CONFIG)
-        deps_rows = await conn_deps.fetch(dependencies_query)
-        await conn_deps.close()
+        async with db.lease() as conn:
+            deps_rows = await conn.fetch(dependencies_query)
         
         dependencies_data = []
         for dep_row in deps_rows:
@@ -366,17 +352,14 @@ async def get_extended_health_check():
     시스템 전반적인 상태 정보 제공
     """
     try:
-        conn = await asyncpg.connect(**DB_CONFIG)
-        
         # 데이터베이스 연결 상태 확인
-        db_stats = await conn.fetchrow("""
-        SELECT 
-            (SELECT COUNT(*) FROM keywords WHERE is_active = true) as active_keywords,
-            (SELECT COUNT(*) FROM keywords_subcategories WHERE is_active = true) as subcategories,
-            (SELECT COUNT(*) FROM keyword_dependencies) as dependencies
-        """)
-        
-        await conn.close()
+        async with db.lease() as conn:
+            db_stats = await conn.fetchrow("""
+            SELECT 
+                (SELECT COUNT(*) FROM keywords WHERE is_active = true) as active_keywords,
+                (SELECT COUNT(*) FROM keywords_subcategories WHERE is_active = true) as subcategories,
+                (SELECT COUNT(*) FROM keyword_dependencies) as dependencies
+            """)
         
         health_info = {
             "status": "healthy",
@@ -385,7 +368,8 @@ async def get_extended_health_check():
                 "connected": True,
                 "active_keywords": db_stats['active_keywords'],
                 "subcategories": db_stats['subcategories'], 
-                "dependencies": db_stats['dependencies']
+                "dependencies": db_stats['dependencies'],
+                "pool": db.stats()
             },
             "apis": {
                 "keywords": "operational",
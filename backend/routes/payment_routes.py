@@ -7,8 +7,6 @@ from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import List, Dict, Any, Optional
 from pydantic import BaseModel
 import logging
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import os
 import uuid
 import requests
@@ -17,6 +15,8 @@ from datetime import datetime
 import json
 import secrets
 
+from services.database_manager import db
+
 logger = logging.getLogger(__name__)
 
 # Pydantic 모델 정의
@@ -47,22 +47,6 @@ TOSS_CLIENT_KEY = "test_ck_D5GePWvyJnrK0W0k6q8gLzN97Eoq"
 TOSS_SECRET_KEY = "test_sk_zXLkKEypNArWmo50nX3lmeaxYG5R"
 TOSS_API_BASE_URL = "https://api.tosspayments.com/v1"
 
-# 데이터베이스 연결 함수
-def get_db_connection():
-    """PostgreSQL 데이터베이스 연결"""
-    try:
-        conn = psycopg2.connect(
-            host="localhost",
-            database="livedb",
-            user="liveuser",
-            password="livepass2024",
-            cursor_factory=RealDictCursor
-        )
-        return conn
-    except Exception as e:
-        logger.error(f"Database connection error: {e}")
-        raise HTTPException(status_code=500, detail="Database connection failed")
-
 def get_toss_headers():
     """토스페이먼츠 API 헤더 생성"""
     credentials = base64.b64encode(f"{TOSS_SECRET_KEY}:".encode()).decode()
@@ -85,91 +69,83 @@ async def payment_health():
 async def prepare_payment(payment_request: PaymentRequest):
     """결제 준비 (주문 생성)"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
         # 주문 ID 생성
         order_id = f"HEAL7_{payment_request.order_type.upper()}_{datetime.now().strftime('%Y%m%d')}_{str(uuid.uuid4())[:8]}"
         
-        # 상품/서비스 정보 조회 및 검증
-        if payment_request.order_type == "store":
-            cursor.execute("""
-            SELECT id, name, price, stock_quantity, is_active
-            FROM products 
-            WHERE id = %s AND is_active = true
-            """, (payment_request.item_id,))
-            
-            item = cursor.fetchone()
-            if not item:
-                raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
-            
-            if item['stock_quantity'] < payment_request.quantity:
-                raise HTTPException(status_code=400, detail="재고가 부족합니다")
+        async with db.lease() as conn:
+            # 상품/서비스 정보 조회 및 검증
+            if payment_request.order_type == "store":
+                item = await conn.fetchrow("""
+                SELECT id, name, price, stock_quantity, is_active
+                FROM products 
+                WHERE id = $1 AND is_active = true
+                """, payment_request.item_id)
                 
-        elif payment_request.order_type == "academy":
-            cursor.execute("""
-            SELECT id, title, price, current_participants, target_participants, status, end_date
-            FROM academy_projects 
-            WHERE id = %s AND status = 'active'
-            """, (payment_request.item_id,))
-            
-            item = cursor.fetchone()
-            if not item:
-                raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+                if not item:
+                    raise HTTPException(status_code=404, detail="상품을 찾을 수 없습니다")
                 
-            if item['end_date'] <= datetime.now():
-                raise HTTPException(status_code=400, detail="마감된 프로젝트입니다")
+                if item['stock_quantity'] < payment_request.quantity:
+                    raise HTTPException(status_code=400, detail="재고가 부족합니다")
+                    
+            elif payment_request.order_type == "academy":
+                item = await conn.fetchrow("""
+                SELECT id, title, price, current_participants, target_participants, status, end_date
+                FROM academy_projects 
+                WHERE id = $1 AND status = 'active'
+                """, payment_request.item_id)
                 
-            if item['current_participants'] >= item['target_participants']:
-                raise HTTPException(status_code=400, detail="정원이 마감된 프로젝트입니다")
+                if not item:
+                    raise HTTPException(status_code=404, detail="프로젝트를 찾을 수 없습니다")
+                    
+                if item['end_date'] <= datetime.now():
+                    raise HTTPException(status_code=400, detail="마감된 프로젝트입니다")
+                    
+                if item['current_participants'] >= item['target_participants']:
+                    raise HTTPException(status_code=400, detail="정원이 마감된 프로젝트입니다")
+                    
+            elif payment_request.order_type == "subscription":
+                # 구독 플랜 정보 (하드코딩된 플랜 정보 사용)
+                subscription_plans = {
+                    1: {"name": "월간 힐링 플랜", "price": 29000, "duration": 30},
+                    2: {"name": "분기 프리미엄 플랜", "price": 75000, "duration": 90},
+                    3: {"name": "연간 마스터 플랜", "price": 240000, "duration": 365}
+                }
                 
-        elif payment_request.order_type == "subscription":
-            # 구독 플랜 정보 (하드코딩된 플랜 정보 사용)
-            subscription_plans = {
-                1: {"name": "월간 힐링 플랜", "price": 29000, "duration": 30},
-                2: {"name": "분기 프리미엄 플랜", "price": 75000, "duration": 90},
-                3: {"name": "연간 마스터 플랜", "price": 240000, "duration": 365}
-            }
+                if payment_request.item_id not in subscription_plans:
+                    raise HTTPException(status_code=404, detail="구독 플랜을 찾을 수 없습니다")
+                    
+                item = subscription_plans[payment_request.item_id]
+                # 구독 플랜은 재고나 참여자 제한이 없음
+            else:
+                raise HTTPException(status_code=400, detail="올바르지 않은 주문 유형입니다")
             
-            if payment_request.item_id not in subscription_plans:
-                raise HTTPException(status_code=404, detail="구독 플랜을 찾을 수 없습니다")
-                
-            item = subscription_plans[payment_request.item_id]
-            # 구독 플랜은 재고나 참여자 제한이 없음
-        else:
-            raise HTTPException(status_code=400, detail="올바르지 않은 주문 유형입니다")
-        
-        # 금액 검증
-        expected_amount = int(item['price']) * payment_request.quantity
-        if payment_request.amount != expected_amount:
-            raise HTTPException(status_code=400, detail="결제 금액이 올바르지 않습니다")
-        
-        # 주문 정보 저장
-        cursor.execute("""
-        INSERT INTO orders (
-            order_id, order_type, item_id, item_name, order_name,
-            customer_name, customer_email, customer_phone,
-            total_amount, quantity, status, created_at, updated_at
-        ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            order_id,
-            payment_request.order_type,
-            payment_request.item_id,
-            payment_request.item_name,
-            payment_request.item_name,  # order_name과 item_name을 동일하게 설정
-            payment_request.customer_name,
-            payment_request.customer_email,
-            payment_request.customer_phone,
-            payment_request.amount,
-            payment_request.quantity,
-            'PENDING',
-            datetime.now(),
-            datetime.now()
-        ))
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+            # 금액 검증
+            expected_amount = int(item['price']) * payment_request.quantity
+            if payment_request.amount != expected_amount:
+                raise HTTPException(status_code=400, detail="결제 금액이 올바르지 않습니다")
+            
+            # 주문 정보 저장
+            await conn.execute("""
+            INSERT INTO orders (
+                order_id, order_type, item_id, item_name, order_name,
+                customer_name, customer_email, customer_phone,
+                total_amount, quantity, status, created_at, updated_at
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13)
+            """,
+                order_id,
+                payment_request.order_type,
+                payment_request.item_id,
+                payment_request.item_name,
+                payment_request.item_name,  # order_name과 item_name을 동일하게 설정
+                payment_request.customer_name,
+                payment_request.customer_email,
+                payment_request.customer_phone,
+                payment_request.amount,
+                payment_request.quantity,
+                'PENDING',
+                datetime.now(),
+                datetime.now()
+            )
         
         return {
             "success": True,
@@ -215,58 +191,44 @@ async def confirm_payment(confirm_request: PaymentConfirmRequest):
         payment_result = response.json()
         
         # 데이터베이스 업데이트
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 주문 상태 업데이트
-        cursor.execute("""
-        UPDATE orders 
-        SET status = %s, payment_key = %s, payment_method = %s,
-            payment_approved_at = %s, updated_at = %s
-        WHERE order_id = %s
-        """, (
-            'PAID',
-            confirm_request.payment_key,
-            payment_result.get('method'),
-            datetime.now(),
-            datetime.now(),
-            confirm_request.order_id
-        ))
-        
-        # 주문 정보 조회
-        cursor.execute("""
-        SELECT order_type, item_id, quantity
-        FROM orders 
-        WHERE order_id = %s
-        """, (confirm_request.order_id,))
-        
-        order = cursor.fetchone()
-        
-        if order:
-            # 재고 차감 또는 참여자 수 증가
-            if order['order_type'] == 'store':
-                cursor.execute("""
-                UPDATE products 
-                SET stock_quantity = stock_quantity - %s, updated_at = %s
-                WHERE id = %s
-                """, (order['quantity'], datetime.now(), order['item_id']))
-                
-            elif order['order_type'] == 'academy':
-                cursor.execute("""
-                UPDATE academy_projects 
-                SET current_participants = current_participants + %s,
-                    current_amount = current_amount + %s,
-                    updated_at = %s
-                WHERE id = %s
-                """, (order['quantity'], confirm_request.amount, datetime.now(), order['item_id']))
-                
-            elif order['order_type'] == 'subscription':
-                # 구독의 경우 별도의 구독 테이블에 기록 (현재는 로깅만)
-                logger.info(f"Subscription confirmed: order_id={confirm_request.order_id}, amount={confirm_request.amount}")
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn, conn.transaction():
+            # 주문 상태 업데이트 후 주문 정보 조회
+            order = await conn.fetchrow("""
+            UPDATE orders 
+            SET status = $1, payment_key = $2, payment_method = $3,
+                payment_approved_at = $4, updated_at = $5
+            WHERE order_id = $6
+            RETURNING order_type, item_id, quantity
+            """,
+                'PAID',
+                confirm_request.payment_key,
+                payment_result.get('method'),
+                datetime.now(),
+                datetime.now(),
+                confirm_request.order_id
+            )
+            
+            if order:
+                # 재고 차감 또는 참여자 수 증가
+                if order['order_type'] == 'store':
+                    await conn.execute("""
+                    UPDATE products 
+                    SET stock_quantity = stock_quantity - $1, updated_at = $2
+                    WHERE id = $3
+                    """, order['quantity'], datetime.now(), order['item_id'])
+                    
+                elif order['order_type'] == 'academy':
+                    await conn.execute("""
+                    UPDATE academy_projects 
+                    SET current_participants = current_participants + $1,
+                        current_amount = current_amount + $2,
+                        updated_at = $3
+                    WHERE id = $4
+                    """, order['quantity'], confirm_request.amount, datetime.now(), order['item_id'])
+                    
+                elif order['order_type'] == 'subscription':
+                    # 구독의 경우 별도의 구독 테이블에 기록 (현재는 로깅만)
+                    logger.info(f"Subscription confirmed: order_id={confirm_request.order_id}, amount={confirm_request.amount}")
         
         return {
             "success": True,
@@ -309,27 +271,21 @@ async def cancel_payment(cancel_request: PaymentCancelRequest):
         cancel_result = response.json()
         
         # 데이터베이스 업데이트
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # 주문 상태 업데이트
-        cursor.execute("""
-        UPDATE orders 
-        SET status = %s, cancel_reason = %s, cancelled_at = %s, updated_at = %s
-        WHERE payment_key = %s
-        """, (
-            'CANCELLED',
-            cancel_request.cancel_reason,
-            datetime.now(),
-            datetime.now(),
-            cancel_request.payment_key
-        ))
-        
-        # 재고 복구 또는 참여자 수 감소 로직 필요시 추가
-        
-        conn.commit()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            # 주문 상태 업데이트
+            await conn.execute("""
+            UPDATE orders 
+            SET status = $1, cancel_reason = $2, cancelled_at = $3, updated_at = $4
+            WHERE payment_key = $5
+            """,
+                'CANCELLED',
+                cancel_request.cancel_reason,
+                datetime.now(),
+                datetime.now(),
+                cancel_request.payment_key
+            )
+            
+            # 재고 복구 또는 참여자 수 감소 로직 필요시 추가
         
         return {
             "success": True,
@@ -349,20 +305,14 @@ async def cancel_payment(cancel_request: PaymentCancelRequest):
 async def get_order_status(order_id: str):
     """주문 상태 조회"""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute("""
-        SELECT order_id, order_type, item_id, item_name, customer_name, customer_email,
-               total_amount, quantity, status, payment_key, payment_method,
-               created_at, payment_approved_at, cancelled_at
-        FROM orders 
-        WHERE order_id = %s
-        """, (order_id,))
-        
-        order = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        async with db.lease() as conn:
+            order = await conn.fetchrow("""
+            SELECT order_id, order_type, item_id, item_name, customer_name, customer_email,
+                   total_amount, quantity, status, payment_key, payment_method,
+                   created_at, payment_approved_at, cancelled_at
+            FROM orders 
+            WHERE order_id = $1
+            """, order_id)
         
         if not order:
             raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다")
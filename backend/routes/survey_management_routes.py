@@ -12,96 +12,22 @@ from uuid import UUID, uuid4
 import json
 import asyncio
 import redis
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import logging
 
-# 내부 모듈 임포트 (절대 임포트)
+from models.survey_models import *
+from utils.json_serializer import JSONSerializer, create_api_response
+from services.survey_engine import MPISIntegrationEngine, SurveyEngine
+from services.keyword_calculator import KeywordScoreCalculator
+
 try:
-    import sys
-    import os
-    
-    # 현재 파일의 디렉토리 경로
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    # 백엔드 디렉토리 경로
-    backend_dir = os.path.dirname(current_dir)
-    
-    # Python 경로에 추가
-    if backend_dir not in sys.path:
-        sys.path.insert(0, backend_dir)
-    
-    # 직접 import
-    sys.path.insert(0, os.path.join(backend_dir, 'services'))
-    sys.path.insert(0, os.path.join(backend_dir, 'models'))
-    sys.path.insert(0, os.path.join(backend_dir, 'utils'))
-    
-    from survey_engine import SurveyEngine
-    from mpis_integration import MPISIntegrationEngine
-    from mpis_global_manager import mpis_global_manager
-    from keyword_calculator import KeywordScoreCalculator
-    from survey_models import *
-    from json_serializer import JSONSerializer, create_api_response
-    
-    logger = logging.getLogger(__name__)
-    logger.info("✅ 설문 관리 모듈 임포트 성공")
-    
-except ImportError as e:
-    logger = logging.getLogger(__name__)
-    logger.error(f"❌ 설문 관리 모듈 임포트 실패: {e}")
-    
-    # 최소한의 응답 함수 정의
-    def create_api_response(data=None, success=True, message=""):
-        return {
-            "success": success,
-            "data": data if data is not None else {},
-            "message": message,
-            "timestamp": datetime.now().isoformat()
-        }
-    
-    # 더미 클래스들 (서버가 시작되도록)
-    class SurveyEngine:
-        async def get_dashboard_statistics(self, period: str):
-            return {
-                "overview": {
-                    "total_sessions": 0,
-                    "completed_sessions": 0,
-                    "active_sessions": 0,
-                    "avg_completion_minutes": 0
-                },
-                "template_breakdown": [],
-                "period": period
-            }
-        
-        async def list_templates(self, **kwargs):
-            return []
-        
-        async def get_active_sessions(self, limit: int):
-            return []
-        
-        async def create_template(self, template_data: dict):
-            # 더미 구현: 단순히 ID 1을 반환
-            return 1
-        
-        async def get_template(self, template_id: int, include_questions: bool = True):
-            return None
-        
-        async def update_template(self, template_id: int, template_data: dict):
-            return True
-        
-        async def delete_template(self, template_id: int):
-            return True
-    
-    class MPISIntegrationEngine:
-        pass
-    
-    class KeywordScoreCalculator:
-        pass
-    
-    class MPISGlobalManager:
-        async def get_global_mpis_status(self):
-            return {"status": "unavailable", "error": "Module import failed"}
-    
-    mpis_global_manager = MPISGlobalManager()
+    from services.mpis_global_manager import mpis_global_manager
+except ImportError:
+    # M-PIS 전역 관리자는 ADMIN 배포에서 제거됨 - AI 생성 / M-PIS 검증 API 는 503
+    mpis_global_manager = None
+
+from services.service_container import container
+from services.option_keyword_index import option_keyword_index
+from services.keyword_dependency_graph import keyword_dependency_index
 
 # 라우터 초기화
 router = APIRouter(prefix="/admin-api/surveys", tags=["설문관리"])
@@ -109,15 +35,32 @@ router = APIRouter(prefix="/admin-api/surveys", tags=["설문관리"])
 # 로깅 설정
 logger = logging.getLogger("heal7.survey")
 
+# 서비스 등록 (인스턴스는 앱 lifespan 시작 시 한 번만 생성되어 공유됨)
+container.register("option_keyword_index", lambda c: option_keyword_index)
+container.register("keyword_dependency_index", lambda c: keyword_dependency_index)
+container.register("keyword_calculator", lambda c: KeywordScoreCalculator(
+    mapping_index=c.get("option_keyword_index"),
+    dependency_index=c.get("keyword_dependency_index")
+))
+if MPISIntegrationEngine is not None:
+    container.register("mpis_engine", lambda c: MPISIntegrationEngine())
+container.register("survey_engine", lambda c: SurveyEngine(
+    keyword_calculator=c.get("keyword_calculator"),
+    mpis_engine=get_mpis_engine()
+))
+
 # 의존성 주입
 def get_survey_engine():
-    return SurveyEngine()
+    return container.get("survey_engine")
 
 def get_mpis_engine():
-    return MPISIntegrationEngine()
+    # M-PIS 통합 모듈이 없으면 None (M-PIS 분석은 건너뜀)
+    if MPISIntegrationEngine is None:
+        return None
+    return container.get("mpis_engine")
 
 def get_keyword_calculator():
-    return KeywordScoreCalculator()
+    return container.get("keyword_calculator")
 
 # ==================== 데이터 모델 정의 ====================
 
@@ -322,6 +265,9 @@ async def ai_generate_survey_template(
     try:
         logger.info(f"AI 마법 설문 생성 요청: {request.title}")
         
+        if mpis_global_manager is None:
+            raise HTTPException(status_code=503, detail="M-PIS 전역 관리자가 설치되지 않았습니다")
+
         # M-PIS 전역 관리자를 통한 자동 생성
         generation_result = await mpis_global_manager.auto_generate_survey(
             title=request.title,
@@ -363,6 +309,9 @@ async def validate_survey_with_mpis(
     template_data: Dict[str, Any]
 ):
     """M-PIS 기준으로 설문 템플릿 검증"""
+    if mpis_global_manager is None:
+        raise HTTPException(status_code=503, detail="M-PIS 전역 관리자가 설치되지 않았습니다")
+
     try:
         validation_result = await mpis_global_manager.validate_survey_template(template_data)
         
@@ -384,6 +333,9 @@ async def validate_survey_with_mpis(
 @router.get("/mpis/global-status", response_model=Dict[str, Any])
 async def get_mpis_global_status():
     """M-PIS 전역 상태 조회"""
+    if mpis_global_manager is None:
+        return await get_mpis_global_status_fallback()
+
     try:
         global_status = await mpis_global_manager.get_global_mpis_status()
         
@@ -497,7 +449,7 @@ async def submit_survey_response(
     background_tasks: BackgroundTasks,
     survey_engine: SurveyEngine = Depends(get_survey_engine),
     keyword_calculator: KeywordScoreCalculator = Depends(get_keyword_calculator),
-    mpis_engine: MPISIntegrationEngine = Depends(get_mpis_engine)
+    mpis_engine: Optional[Any] = Depends(get_mpis_engine)
 ):
     """설문 응답 제출 및 실시간 분석"""
     try:
@@ -512,10 +464,11 @@ async def submit_survey_response(
         )
         
         # 3. M-PIS 프로필 업데이트 (백그라운드)
-        background_tasks.add_task(
-            mpis_engine.update_session_profile,
-            str(session_uuid)
-        )
+        if mpis_engine is not None:
+            background_tasks.add_task(
+                mpis_engine.update_session_profile,
+                str(session_uuid)
+            )
         
         # 4. 다음 질문 결정
         next_question = await survey_engine.get_next_question(str(session_uuid))
@@ -555,7 +508,7 @@ async def get_realtime_analysis(
     include_keywords: bool = Query(True),
     include_mpis: bool = Query(True),
     keyword_calculator: KeywordScoreCalculator = Depends(get_keyword_calculator),
-    mpis_engine: MPISIntegrationEngine = Depends(get_mpis_engine)
+    mpis_engine: Optional[Any] = Depends(get_mpis_engine)
 ):
     """실시간 분석 결과 조회"""
     try:
@@ -565,12 +518,12 @@ async def get_realtime_analysis(
             # 실시간 키워드 점수 조회
             keyword_scores = await keyword_calculator.get_session_scores(str(session_uuid))
             analysis_result["keyword_analysis"] = {
-                "scores": keyword_scores,
+                "scores": dict(keyword_scores),
                 "top_keywords": keyword_calculator.get_top_keywords(keyword_scores, limit=10),
                 "group_scores": keyword_calculator.aggregate_by_groups(keyword_scores)
             }
         
-        if include_mpis:
+        if include_mpis and mpis_engine is not None:
             # 실시간 M-PIS 프로필 조회
             mpis_profile = await mpis_engine.get_session_profile(str(session_uuid))
             analysis_result["mpis_analysis"] = mpis_profile
@@ -767,7 +720,7 @@ async def survey_system_health():
                 "database": "up",
                 "redis": "up", 
                 "survey_engine": "up",
-                "mpis_integration": "up",
+                "mpis_integration": "up" if MPISIntegrationEngine is not None else "unavailable",
                 "keyword_calculator": "up"
             }
         }
@@ -780,8 +733,7 @@ async def survey_system_health():
 
 # ==================== M-PIS 전역 상태 API (ADMIN 호환) ====================
 
-@router.get("/mpis/global-status")
-async def get_mpis_global_status():
+async def get_mpis_global_status_fallback():
     """M-PIS 전역 상태 조회 - ADMIN에서 제거됨 (폴백 응답 제공)"""
     try:
         # ADMIN 환경에서는 M-PIS 전역 상태가 제거되었으므로 폴백 데이터 반환
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Analytics 롤업 백필 / 검증
+page_analytics, saju_analysis_sessions 원본 전체로 시간별/일별 롤업과 고유 구성원 테이블을 다시 만든다.
+(롤업 테이블/트리거가 없으면 먼저 만든다. 원본을 대기열로 옮기는 동안 원본 쓰기는 잠시 대기)
+
+--verify 는 대시보드 엔드포인트가 쓰던 원본 집계 쿼리와 롤업 결과를 비교하고, 다르면 종료 코드 1.
+
+사용법 (backend 디렉토리에서 실행, DB_* 환경변수로 Postgres 지정):
+    python scripts/backfill_analytics_rollups.py
+    python scripts/backfill_analytics_rollups.py --verify-only
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import connect_direct
+from services.analytics_funnels import funnel_registry
+from services.analytics_rollups import (
+    MEMBER_DEVICE_USER, MEMBER_PAGE_SESSION, MEMBER_SESSION, AnalyticsRollupAggregator
+)
+
+# (이름, 원본 쿼리, 롤업 쿼리) - 둘 다 (키, 값) 행을 돌려준다
+CHECKS: List[Tuple[str, str, str]] = [
+    ("pageviews by day/page/device",
+     """SELECT date::text || ' ' || COALESCE(page_path, '') || ' ' || COALESCE(device_type, ''),
+               COUNT(*)::text || '/' || COUNT(*) FILTER (WHERE bounce) || '/' || COALESCE(SUM(time_on_page), 0)
+               || '/' || COALESCE(SUM(session_duration), 0)
+        FROM page_analytics GROUP BY 1""",
+     """SELECT day::text || ' ' || page_path || ' ' || device_type,
+               pageviews::text || '/' || bounces || '/' || time_on_page_sum || '/' || session_duration_sum
+        FROM analytics_pageview_daily WHERE pageviews <> 0"""),
+    ("pageviews by hour",
+     """SELECT date_trunc('hour', timestamp)::text, COUNT(*) FROM page_analytics GROUP BY 1""",
+     """SELECT bucket_hour::text, SUM(pageviews) FROM analytics_pageview_hourly
+        GROUP BY 1 HAVING SUM(pageviews) <> 0"""),
+    ("saju by hour/status",
+     """SELECT date_trunc('hour', created_at)::text || ' ' || COALESCE(status, '') || ' ' || COALESCE(ai_reviewed, false),
+               COUNT(*)::text || '/' || COUNT(completed_at)
+        FROM saju_analysis_sessions WHERE created_at IS NOT NULL GROUP BY 1""",
+     """SELECT bucket_hour::text || ' ' || status || ' ' || ai_reviewed, requests::text || '/' || processed
+        FROM analytics_saju_hourly WHERE requests <> 0"""),
+    ("saju by day",
+     """SELECT created_at::date::text, COUNT(*) FROM saju_analysis_sessions WHERE created_at IS NOT NULL GROUP BY 1""",
+     """SELECT day::text, SUM(requests) FROM analytics_saju_daily GROUP BY 1 HAVING SUM(requests) <> 0"""),
+    ("unique sessions 7d",
+     """SELECT '', COUNT(DISTINCT session_id) FROM page_analytics WHERE date >= CURRENT_DATE - 7""",
+     f"""SELECT '', COUNT(*) FROM analytics_rollup_members
+         WHERE dimension = '{MEMBER_SESSION}' AND last_seen >= CURRENT_DATE - 7"""),
+    ("unique sessions per page 7d",
+     """SELECT COALESCE(page_path, ''), COUNT(DISTINCT session_id) FROM page_analytics
+        WHERE date >= CURRENT_DATE - 7 AND session_id IS NOT NULL GROUP BY 1""",
+     f"""SELECT dim_value, COUNT(*) FROM analytics_rollup_members
+         WHERE dimension = '{MEMBER_PAGE_SESSION}' AND last_seen >= CURRENT_DATE - 7 GROUP BY 1"""),
+    ("unique users per device 7d",
+     """SELECT COALESCE(device_type, ''), COUNT(DISTINCT user_id) FROM page_analytics
+        WHERE date >= CURRENT_DATE - 7 AND user_id IS NOT NULL GROUP BY 1""",
+     f"""SELECT dim_value, COUNT(*) FROM analytics_rollup_members
+         WHERE dimension = '{MEMBER_DEVICE_USER}' AND last_seen >= CURRENT_DATE - 7 GROUP BY 1"""),
+    ("funnel step sessions 7d",
+     """SELECT f.funnel || ' ' || f.bit, COUNT(DISTINCT p.session_id) FROM page_analytics p
+        JOIN unnest($1::text[], $2::int[], $3::text[]) AS f(funnel, bit, pattern) ON p.page_path LIKE f.pattern
+        WHERE p.date >= CURRENT_DATE - 7 AND p.session_id IS NOT NULL GROUP BY 1""",
+     """SELECT f.funnel || ' ' || f.bit, COUNT(*)
+        FROM (SELECT funnel, BIT_OR(steps) AS steps FROM analytics_session_funnels
+              WHERE day >= CURRENT_DATE - 7 GROUP BY funnel, session_id) s
+        JOIN unnest($1::text[], $2::int[], $3::text[]) AS f(funnel, bit, pattern)
+          ON s.funnel = f.funnel AND s.steps & (1 << f.bit) <> 0
+        GROUP BY 1"""),
+]
+
+async def fetch_pairs(conn, query: str) -> Tuple[Dict[str, Any], float]:
+    args = []
+    if "$1" in query:
+        args = [funnel_registry.names, funnel_registry.bits, funnel_registry.patterns]
+    started = time.perf_counter()
+    rows = await conn.fetch(query, *args)
+    elapsed = (time.perf_counter() - started) * 1000
+    return {row[0]: str(row[1]) for row in rows if row[1] not in (0, '0')}, elapsed
+
+async def verify(conn) -> bool:
+    ok = True
+    print(f"{'check':<30} {'keys':>7} {'raw':>10} {'rollup':>10}  result")
+    for name, raw_query, rollup_query in CHECKS:
+        raw, raw_ms = await fetch_pairs(conn, raw_query)
+        rollup, rollup_ms = await fetch_pairs(conn, rollup_query)
+        mismatched = sorted(key for key in raw.keys() | rollup.keys() if raw.get(key) != rollup.get(key))
+        ok = ok and not mismatched
+        result = "ok" if not mismatched else f"MISMATCH {mismatched[:3]}"
+        print(f"{name:<30} {len(raw):>7} {raw_ms:>8.1f}ms {rollup_ms:>8.1f}ms  {result}")
+    return ok
+
+async def main():
+    parser = argparse.ArgumentParser(description="Analytics 롤업 백필 / 검증")
+    parser.add_argument("--verify", action="store_true", help="백필 후 원본 집계와 비교")
+    parser.add_argument("--verify-only", action="store_true", help="백필 없이 현재 롤업만 비교 (대기열을 먼저 비움)")
+    args = parser.parse_args()
+
+    aggregator = AnalyticsRollupAggregator()
+    conn = await connect_direct()
+    try:
+        await aggregator.ensure_tables(conn)
+        if args.verify_only:
+            print(f"funnels: {await aggregator.sync_funnels(conn)}")
+            print(f"drain: {await aggregator.drain(conn, wait_for_lock=True)}")
+        else:
+            print(f"backfill: {await aggregator.backfill(conn)}")
+
+        if args.verify or args.verify_only:
+            if not await verify(conn):
+                print("\n❌ 롤업이 원본 집계와 다름")
+                sys.exit(1)
+            print("\n✅ 롤업이 원본 집계와 같음")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
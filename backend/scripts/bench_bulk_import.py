@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+일괄 동기화 가져오기 벤치마크
+442개 키워드 + 약 26k 의존성 내보내기 데이터를 /admin-api/bulk-sync/import 와 같은 경로
+(스테이징 테이블 COPY → SQL 검증 → 한 트랜잭션 반영)로 가져오는 시간 측정
+
+실제 테이블을 건드리지 않도록 별도 스키마에 keywords / keywords_subcategories /
+keyword_dependencies 를 같은 구조(외래 키 포함)로 만들고 search_path 로 그 스키마를 쓴다.
+비교용으로 행마다 INSERT 하던 방식(executemany)도 함께 잰다.
+
+측정 순서:
+    1. 빈 테이블에 처음 가져오기
+    2. 같은 데이터 다시 가져오기 (바뀐 행 없음)
+    3. 키워드 가중치/의존성 일부를 바꾼 데이터 가져오기
+
+사용법 (backend 디렉토리에서 실행, DB_* 환경변수로 로컬 Postgres 지정):
+    python scripts/bench_bulk_import.py --keywords 442 --dependencies 26000 --repeat 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import connect_direct
+from routes.bulk_sync_endpoint import import_sync_data
+
+BENCH_SCHEMA = "bench_bulk_import"
+
+# 전체 가져오기 목표 시간
+TARGET_IMPORT_MS = 1000.0
+
+SCHEMA_DDL = f"""
+DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE;
+CREATE SCHEMA {BENCH_SCHEMA};
+CREATE TABLE {BENCH_SCHEMA}.keywords_subcategories (LIKE public.keywords_subcategories INCLUDING ALL);
+CREATE TABLE {BENCH_SCHEMA}.keywords (LIKE public.keywords INCLUDING ALL);
+CREATE TABLE {BENCH_SCHEMA}.keyword_dependencies (LIKE public.keyword_dependencies INCLUDING ALL);
+ALTER TABLE {BENCH_SCHEMA}.keywords
+    ADD FOREIGN KEY (subcategory_id) REFERENCES {BENCH_SCHEMA}.keywords_subcategories(id);
+ALTER TABLE {BENCH_SCHEMA}.keyword_dependencies
+    ADD FOREIGN KEY (parent_keyword_id) REFERENCES {BENCH_SCHEMA}.keywords(id),
+    ADD FOREIGN KEY (dependent_keyword_id) REFERENCES {BENCH_SCHEMA}.keywords(id);
+"""
+
+CHANGE_LOG_TRIGGERS_DDL = f"""
+SELECT install_sync_log_triggers('{BENCH_SCHEMA}.keywords', 'id');
+SELECT install_sync_log_triggers('{BENCH_SCHEMA}.keywords_subcategories', 'id');
+SELECT install_sync_log_triggers('{BENCH_SCHEMA}.keyword_dependencies', 'parent_keyword_id', 'dependent_keyword_id');
+"""
+
+def build_sync_data(keywords: int, dependencies: int, subcategories: int, seed: int) -> Dict[str, Any]:
+    """내보내기(/keywords/export)와 같은 형식의 합성 데이터"""
+    rng = random.Random(seed)
+    subcategory_records = [
+        {"id": i, "name": f"{'ABC'[i % 3]}-{i:02d}", "description": f"서브카테고리 {i}",
+         "category_group": "ABC"[i % 3], "display_order": i, "is_active": True}
+        for i in range(1, subcategories + 1)
+    ]
+    keyword_records = [
+        {"id": i, "name": f"키워드{i}", "subcategory_id": rng.randint(1, subcategories),
+         "weight": round(rng.uniform(0.1, 2.0), 2), "connections": rng.randint(0, 50), "status": "active"}
+        for i in range(1, keywords + 1)
+    ]
+    pairs = set()
+    while len(pairs) < dependencies:
+        parent, dependent = rng.randint(1, keywords), rng.randint(1, keywords)
+        if parent != dependent:
+            pairs.add((parent, dependent))
+    return {
+        "subcategories": subcategory_records,
+        "keywords": keyword_records,
+        "dependencies": [
+            {"parent_keyword_id": parent, "dependent_keyword_id": dependent} for parent, dependent in sorted(pairs)
+        ]
+    }
+
+def mutate_sync_data(sync_data: Dict[str, Any], fraction: float, seed: int) -> Dict[str, Any]:
+    """키워드 가중치와 의존성 일부를 바꾼 사본"""
+    rng = random.Random(seed + 1)
+    keywords = [dict(r) for r in sync_data["keywords"]]
+    for record in rng.sample(keywords, int(len(keywords) * fraction)):
+        record["weight"] = round(record["weight"] + 0.05, 2)
+
+    size = len(keywords)
+    dependencies = list(sync_data["dependencies"])
+    removed = int(len(dependencies) * fraction)
+    rng.shuffle(dependencies)
+    dependencies = dependencies[removed:]
+    existing = {(r["parent_keyword_id"], r["dependent_keyword_id"]) for r in dependencies}
+    while len(dependencies) < len(sync_data["dependencies"]):
+        parent, dependent = rng.randint(1, size), rng.randint(1, size)
+        if parent != dependent and (parent, dependent) not in existing:
+            existing.add((parent, dependent))
+            dependencies.append({"parent_keyword_id": parent, "dependent_keyword_id": dependent})
+
+    return {**sync_data, "keywords": keywords, "dependencies": dependencies}
+
+async def row_by_row_import(conn, sync_data: Dict[str, Any]) -> float:
+    """비교용: 행마다 INSERT (executemany) 로 같은 데이터 반영"""
+    started = time.perf_counter()
+    async with conn.transaction():
+        await conn.executemany("""
+            INSERT INTO keywords_subcategories (id, name, description, category_group, display_order, is_active)
+            VALUES ($1, $2, $3, $4, $5, $6)
+            ON CONFLICT (id) DO UPDATE SET name = EXCLUDED.name, description = EXCLUDED.description,
+                category_group = EXCLUDED.category_group, display_order = EXCLUDED.display_order,
+                is_active = EXCLUDED.is_active
+        """, [(r["id"], r["name"], r["description"], r["category_group"], r["display_order"], r["is_active"])
+              for r in sync_data["subcategories"]])
+        await conn.executemany("""
+            INSERT INTO keywords (id, text, subcategory_id, weight, usage_count, is_active)
+            VALUES ($1, $2, $3, $4::float8, $5, $6)
+            ON CONFLICT (id) DO UPDATE SET text = EXCLUDED.text, subcategory_id = EXCLUDED.subcategory_id,
+                weight = EXCLUDED.weight, usage_count = EXCLUDED.usage_count, is_active = EXCLUDED.is_active
+        """, [(r["id"], r["name"], r["subcategory_id"], r["weight"], r["connections"], True)
+              for r in sync_data["keywords"]])
+        await conn.execute("DELETE FROM keyword_dependencies")
+        await conn.executemany(
+            "INSERT INTO keyword_dependencies (parent_keyword_id, dependent_keyword_id) VALUES ($1, $2)",
+            [(r["parent_keyword_id"], r["dependent_keyword_id"]) for r in sync_data["dependencies"]]
+        )
+    return (time.perf_counter() - started) * 1000
+
+async def reset_tables(conn):
+    await conn.execute("TRUNCATE keyword_dependencies, keywords, keywords_subcategories")
+
+def summarize(label: str, totals: List[float], result: Dict[str, Any]):
+    totals = sorted(totals)
+    median = totals[len(totals) // 2]
+    status = "OK" if median < TARGET_IMPORT_MS else "OVER"
+    print(f"{label:<22} median={median:8.1f}ms min={totals[0]:8.1f}ms ({status} target {TARGET_IMPORT_MS:.0f}ms)")
+    print(f"{'':<22} steps={result['timings']} "
+          f"keywords={result['keywords']} dependencies={result['dependencies']}")
+
+async def main():
+    parser = argparse.ArgumentParser(description="일괄 동기화 가져오기 벤치마크")
+    parser.add_argument("--keywords", type=int, default=442)
+    parser.add_argument("--dependencies", type=int, default=26000)
+    parser.add_argument("--subcategories", type=int, default=15)
+    parser.add_argument("--change-fraction", type=float, default=0.05, help="3단계에서 바꿀 행 비율")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--change-log", action="store_true",
+                        help="변경 로그 트리거를 붙인 상태로 측정 (create_sync_change_log.sql 설치 필요)")
+    parser.add_argument("--skip-baseline", action="store_true", help="행 단위 INSERT 비교 생략")
+    parser.add_argument("--keep-schema", action="store_true")
+    args = parser.parse_args()
+
+    sync_data = build_sync_data(args.keywords, args.dependencies, args.subcategories, args.seed)
+    changed_data = mutate_sync_data(sync_data, args.change_fraction, args.seed)
+    print(f"payload: subcategories={len(sync_data['subcategories'])} keywords={len(sync_data['keywords'])} "
+          f"dependencies={len(sync_data['dependencies'])} change_log={args.change_log}\n")
+
+    conn = await connect_direct()
+    try:
+        await conn.execute(SCHEMA_DDL)
+        if args.change_log:
+            await conn.execute(CHANGE_LOG_TRIGGERS_DDL)
+        await conn.execute(f"SET search_path TO {BENCH_SCHEMA}, public")
+
+        initial, again, changed = [], [], []
+        for _ in range(args.repeat):
+            await reset_tables(conn)
+            started = time.perf_counter()
+            initial_result = await import_sync_data(conn, sync_data)
+            initial.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            again_result = await import_sync_data(conn, sync_data)
+            again.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            changed_result = await import_sync_data(conn, changed_data)
+            changed.append((time.perf_counter() - started) * 1000)
+
+        summarize("1. 첫 가져오기", initial, initial_result)
+        summarize("2. 같은 데이터 재가져오기", again, again_result)
+        summarize(f"3. {args.change_fraction:.0%} 변경 가져오기", changed, changed_result)
+
+        if not args.skip_baseline:
+            baseline = []
+            for _ in range(max(1, args.repeat // 2)):
+                await reset_tables(conn)
+                baseline.append(await row_by_row_import(conn, sync_data))
+            baseline.sort()
+            median = baseline[len(baseline) // 2]
+            print(f"\n행 단위 INSERT (비교) median={median:8.1f}ms → COPY 가져오기가 "
+                  f"{median / sorted(initial)[len(initial) // 2]:.1f}배 빠름")
+    finally:
+        if not args.keep_schema:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+키워드 의존성 전파 벤치마크
+442개 키워드 × 약 26k 간선 규모의 합성 그래프로 세션당 전파 지연시간과 묶음 처리량 측정
+
+실제 keyword_dependencies 와 같은 규모의 무작위 그래프를 만들고, float64 기준 구현과
+전파 결과가 같은지 먼저 확인한 뒤 커널(csr/dense)별로 단일 세션/묶음 전파 시간을 잰다. DB 연결은 필요 없다.
+
+사용법 (backend 디렉토리에서 실행):
+    python scripts/bench_keyword_propagation.py --keywords 442 --edges 26000 --sessions 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.keyword_dependency_graph import KeywordDependencyGraph
+
+# 단일 세션 전파 목표 지연시간
+TARGET_SESSION_MS = 1.0
+
+def build_graph(keywords: int, edges: int, seed: int, kernel=None) -> KeywordDependencyGraph:
+    """무작위 의존성 그래프 (키워드 ID는 실제처럼 1부터 시작, 자기 자신으로의 간선 제외)"""
+    rng = np.random.default_rng(seed)
+    keyword_ids = np.arange(1, keywords + 1)
+    parents = rng.choice(keyword_ids, size=edges)
+    dependents = rng.choice(keyword_ids, size=edges)
+    keep = parents != dependents
+    weights = rng.uniform(0.1, 1.0, size=edges) * rng.uniform(0.5, 1.5, size=edges)
+    weights *= np.where(rng.random(edges) < 0.2, -1.0, 1.0)
+    return KeywordDependencyGraph.from_edges(parents[keep], dependents[keep], weights[keep], kernel=kernel)
+
+def session_scores(graph: KeywordDependencyGraph, sessions: int, answered: int, seed: int) -> np.ndarray:
+    """세션마다 일부 키워드에만 직접 점수가 있는 세션 × 키워드 행렬"""
+    rng = np.random.default_rng(seed + 1)
+    scores = np.zeros((sessions, graph.size), dtype=np.float32)
+    for row in range(sessions):
+        positions = rng.choice(graph.size, size=min(answered, graph.size), replace=False)
+        scores[row, positions] = rng.uniform(-1.0, 1.0, size=len(positions))
+    return scores
+
+def dense_reference(graph: KeywordDependencyGraph, scores: np.ndarray, steps: int, damping: float) -> np.ndarray:
+    """검증용 float64 밀집 행렬 구현"""
+    matrix = graph.to_dense().astype(np.float64)
+    total = scores.astype(np.float64).copy()
+    term = total.copy()
+    for _ in range(steps):
+        term = damping * term @ matrix.T
+        total += term
+    return np.clip(total, -1.0, 1.0)
+
+def percentile(values, q: float) -> float:
+    return float(np.percentile(values, q))
+
+def main():
+    parser = argparse.ArgumentParser(description="키워드 의존성 전파 벤치마크")
+    parser.add_argument("--keywords", type=int, default=442)
+    parser.add_argument("--edges", type=int, default=26000)
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--answered", type=int, default=60, help="세션당 직접 점수가 있는 키워드 수")
+    parser.add_argument("--steps", type=int, default=2)
+    parser.add_argument("--damping", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--kernel", nargs="+", default=["csr", "dense"], choices=["csr", "dense"])
+    args = parser.parse_args()
+
+    for kernel in args.kernel:
+        run(args, kernel)
+
+def run(args, kernel: str):
+    started = time.perf_counter()
+    graph = build_graph(args.keywords, args.edges, args.seed, kernel)
+    build_ms = (time.perf_counter() - started) * 1000
+    scores = session_scores(graph, args.sessions, args.answered, args.seed)
+
+    # 1. 정확도 확인
+    sample = scores[:64]
+    error = np.max(np.abs(graph.propagate(sample, args.steps, args.damping)
+                          - dense_reference(graph, sample, args.steps, args.damping)))
+
+    # 2. 단일 세션 지연시간
+    for row in scores[:32]:
+        graph.propagate(row, args.steps, args.damping)
+    latencies = []
+    for row in scores:
+        t0 = time.perf_counter()
+        graph.propagate(row, args.steps, args.damping)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    # 3. 묶음 전파
+    t0 = time.perf_counter()
+    graph.propagate(scores, args.steps, args.damping)
+    batch_ms = (time.perf_counter() - t0) * 1000
+
+    p50, p99 = percentile(latencies, 50), percentile(latencies, 99)
+    print(f"[{graph.kernel}] keywords={graph.size} edges={graph.edge_count} density={graph.density:.3f} "
+          f"build={build_ms:.1f}ms steps={args.steps} damping={args.damping}")
+    print(f"max abs error vs float64 reference: {error:.2e}")
+    print(f"single session: p50={p50:.3f}ms p99={p99:.3f}ms "
+          f"({'OK' if p99 < TARGET_SESSION_MS else 'OVER'} target {TARGET_SESSION_MS}ms)")
+    print(f"batch {args.sessions} sessions: {batch_ms:.1f}ms total, "
+          f"{batch_ms / args.sessions:.4f}ms/session, {args.sessions / batch_ms * 1000:.0f} sessions/s\n")
+
+if __name__ == "__main__":
+    main()
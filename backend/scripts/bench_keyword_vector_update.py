@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+세션 키워드 벡터 갱신 벤치마크
+UPDATE_VECTOR_SCRIPT (Redis 안에서 키워드마다 도는 Lua 루프, EVALSHA 1회) 와
+numpy 벡터 연산 갱신 (GET → 클라이언트에서 배열 계산 → WATCH / MULTI 로 SET, 왕복 3회) 을 비교한다.
+
+같은 응답 순서를 두 키에 적용해 결과 블롭이 float32 오차 안에서 같은지 먼저 확인하고,
+갱신 1회의 클라이언트 지연시간(p50 / p95)과 Redis 서버 안에서 쓴 시간(INFO commandstats,
+다른 명령을 막는 시간)을 출력한다. Lua 루프는 블롭 전체를 풀고 다시 묶으므로 비용은 세션의 키워드 수에 비례한다.
+
+실제 Redis 서버가 필요하다 (REDIS_* 환경변수, 내장 struct 라이브러리 사용 - fakeredis 는 지원하지 않음).
+벤치마크 키(heal7:bench:keyword_vector:*)만 쓰고 끝나면 지운다. CONFIG RESETSTAT 을 호출하므로 운영 서버에 쓰지 말 것.
+
+사용법 (backend 디렉토리에서 실행):
+    python scripts/bench_keyword_vector_update.py --keywords 442 --impacts 8 --updates 2000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import redis.asyncio as aioredis
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.keyword_vector import UPDATE_VECTOR_SCRIPT, SessionKeywordVector
+from services.redis_manager import get_redis_config
+
+WEIGHT_DECAY = 0.9
+BENCH_KEY_PREFIX = "heal7:bench:keyword_vector"
+
+# 갱신 1회가 Redis 를 막는 시간 목표 (442개 키워드 세션 기준)
+TARGET_SERVER_US = 1000
+
+def numpy_update(vector: SessionKeywordVector, ids: np.ndarray, impacts: np.ndarray,
+                 confidences: np.ndarray, decay: float, updated_at: int) -> SessionKeywordVector:
+    """UPDATE_VECTOR_SCRIPT 와 같은 갱신을 numpy 배열 연산으로 (비교 기준)"""
+    keyword_ids = np.union1d(vector.keyword_ids, ids).astype(np.int32)
+    size = len(keyword_ids)
+    existing = np.searchsorted(keyword_ids, vector.keyword_ids)
+    result = SessionKeywordVector(keyword_ids)
+    for name in ("scores", "confidences", "counts", "updated_at"):
+        array = np.zeros(size, dtype=getattr(vector, name).dtype)
+        array[existing] = getattr(vector, name)
+        setattr(result, name, array)
+
+    positions = np.searchsorted(keyword_ids, ids)
+    current = result.scores[positions].astype(np.float64)
+    scores = np.where(current == 0.0, impacts, current * decay + impacts * (1 - decay))
+    result.scores[positions] = np.clip(scores, -1.0, 1.0)
+    result.confidences[positions] = confidences
+    result.counts[positions] += 1
+    result.updated_at[positions] = updated_at
+    return result
+
+def build_responses(keywords: int, impacts: int, updates: int, seed: int) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """응답마다 서로 다른 키워드 impacts 개의 (id, 영향 점수, 신뢰도)"""
+    rng = np.random.default_rng(seed)
+    keyword_ids = np.arange(1, keywords + 1, dtype=np.int32)
+    responses = []
+    for _ in range(updates):
+        ids = np.sort(rng.choice(keyword_ids, size=min(impacts, keywords), replace=False))
+        responses.append((ids, rng.uniform(-1.0, 1.0, size=len(ids)), rng.uniform(0.3, 1.0, size=len(ids))))
+    return responses
+
+def initial_vector(keywords: int, seed: int) -> SessionKeywordVector:
+    """모든 키워드에 점수가 있는 세션 (블롭 크기 최대)"""
+    rng = np.random.default_rng(seed + 1)
+    return SessionKeywordVector(
+        np.arange(1, keywords + 1, dtype=np.int32),
+        rng.uniform(-1.0, 1.0, size=keywords).astype(np.float32),
+        rng.uniform(0.3, 1.0, size=keywords).astype(np.float32),
+        np.ones(keywords, dtype=np.uint32),
+        np.full(keywords, int(time.time()), dtype=np.uint32)
+    )
+
+async def run_lua(client: aioredis.Redis, key: str, responses, updated_at: int) -> List[float]:
+    script = client.register_script(UPDATE_VECTOR_SCRIPT)
+    latencies = []
+    for ids, impacts, confidences in responses:
+        args = [WEIGHT_DECAY, updated_at]
+        for keyword_id, impact, confidence in zip(ids.tolist(), impacts.tolist(), confidences.tolist()):
+            args.extend([keyword_id, impact, confidence])
+        started = time.perf_counter()
+        await script(keys=[key, f"{key}:legacy"], args=args)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+async def run_numpy(client: aioredis.Redis, key: str, responses, updated_at: int) -> List[float]:
+    latencies = []
+    for ids, impacts, confidences in responses:
+        started = time.perf_counter()
+        async with client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(key)
+                    vector = SessionKeywordVector.from_bytes(await pipe.get(key))
+                    vector = numpy_update(vector, ids, impacts, confidences, WEIGHT_DECAY, updated_at)
+                    pipe.multi()
+                    pipe.set(key, vector.to_bytes())
+                    await pipe.execute()
+                    break
+                except aioredis.WatchError:
+                    continue
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+async def server_usec(client: aioredis.Redis) -> Dict[str, Tuple[int, float]]:
+    """명령별 (호출 수, 호출당 서버 시간 us)"""
+    stats = await client.info("commandstats")
+    return {
+        name[len("cmdstat_"):]: (int(values["calls"]), float(values["usec_per_call"]))
+        for name, values in stats.items()
+    }
+
+def percentile(values: List[float], q: float) -> float:
+    return float(np.percentile(values, q))
+
+async def main():
+    parser = argparse.ArgumentParser(description="세션 키워드 벡터 갱신 벤치마크 (Lua 루프 vs numpy)")
+    parser.add_argument("--keywords", type=int, default=442, help="세션 벡터의 키워드 수")
+    parser.add_argument("--impacts", type=int, default=8, help="응답 하나가 바꾸는 키워드 수")
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    config = get_redis_config()
+    client = aioredis.Redis(host=config['host'], port=config['port'], db=config['db'], password=config['password'])
+    responses = build_responses(args.keywords, args.impacts, args.updates, args.seed)
+    start = initial_vector(args.keywords, args.seed)
+    updated_at = int(time.time())
+    lua_key, numpy_key = f"{BENCH_KEY_PREFIX}:lua", f"{BENCH_KEY_PREFIX}:numpy"
+
+    try:
+        results = {}
+        for mode, key, runner, commands in (
+            ("lua", lua_key, run_lua, ("evalsha",)),
+            ("numpy", numpy_key, run_numpy, ("watch", "get", "multi", "set", "exec")),
+        ):
+            await client.set(key, start.to_bytes())
+            await client.config_resetstat()
+            latencies = await runner(client, key, responses, updated_at)
+            stats = await server_usec(client)
+            server = sum(stats[name][0] * stats[name][1] for name in commands if name in stats) / len(responses)
+            results[mode] = (latencies, server)
+
+        lua_vector = SessionKeywordVector.from_bytes(await client.get(lua_key))
+        numpy_vector = SessionKeywordVector.from_bytes(await client.get(numpy_key))
+        same = (
+            np.array_equal(lua_vector.keyword_ids, numpy_vector.keyword_ids)
+            and np.array_equal(lua_vector.counts, numpy_vector.counts)
+            and np.array_equal(lua_vector.updated_at, numpy_vector.updated_at)
+            and np.allclose(lua_vector.confidences, numpy_vector.confidences, atol=1e-6)
+        )
+        max_diff = float(np.max(np.abs(lua_vector.scores - numpy_vector.scores))) if len(lua_vector) else 0.0
+    finally:
+        await client.delete(lua_key, numpy_key)
+        await client.aclose()
+
+    print(f"키워드 {args.keywords}개 세션, 응답당 {args.impacts}개 갱신 × {args.updates}회 "
+          f"(블롭 {len(start.to_bytes())} bytes)")
+    print(f"결과 일치: {same and max_diff < 1e-5} (점수 최대 차이 {max_diff:.2e})")
+    print(f"{'mode':<6} {'p50 ms':>8} {'p95 ms':>8} {'server us/update':>17}")
+    for mode, (latencies, server) in results.items():
+        print(f"{mode:<6} {percentile(latencies, 50):>8.3f} {percentile(latencies, 95):>8.3f} {server:>17.1f}")
+    lua_server = results["lua"][1]
+    print(f"Lua 서버 시간 목표 {TARGET_SERVER_US}us 이하: {'OK' if lua_server <= TARGET_SERVER_US else 'FAIL'}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+키워드 통합 API 데이터 경로 벤치마크
+subprocess psql 경로(기존)와 asyncpg 풀 경로(현재)의 처리량/지연시간 비교
+
+사용법 (backend 디렉토리에서 실행):
+    python scripts/bench_keywords_unified.py --requests 2000 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import init_db_pool, close_db_pool
+from routes import keywords_unified
+
+# ==================== 기존 subprocess 경로 (비교용) ====================
+
+async def run_psql_query(query: str) -> str:
+    """기존 구현과 동일하게 psql 프로세스를 띄워 쿼리 실행"""
+    process = await asyncio.create_subprocess_exec(
+        'sudo', '-u', 'postgres', 'psql', '-d', os.getenv('DB_NAME', 'livedb'),
+        '-t', '-A', '-F', '\t', '-c', query,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await process.communicate()
+    if process.returncode != 0:
+        raise RuntimeError(stderr.decode('utf-8').strip())
+    return stdout.decode('utf-8').strip()
+
+async def legacy_keyword_stats() -> Dict:
+    """기존 /stats 엔드포인트: 요청당 psql 프로세스 3개"""
+    total = await run_psql_query("SELECT COUNT(*) as total FROM keywords")
+    active = await run_psql_query("SELECT COUNT(*) as active FROM keywords WHERE is_active = true")
+    by_subcategory = await run_psql_query("""
+        SELECT ks.name, COUNT(*) as count
+        FROM keywords k
+        LEFT JOIN keyword_subcategories ks ON k.subcategory_id = ks.id
+        WHERE k.is_active = true
+        GROUP BY ks.name
+        ORDER BY count DESC
+    """)
+    subcategories = {}
+    for line in by_subcategory.split('\n'):
+        values = line.split('\t')
+        if len(values) == 2 and values[0]:
+            subcategories[values[0]] = int(values[1])
+    return {
+        "total_keywords": int(total or 0),
+        "active_keywords": int(active or 0),
+        "subcategories": subcategories
+    }
+
+async def pooled_keyword_stats() -> Dict:
+    """현재 /stats 엔드포인트: 공유 asyncpg 풀"""
+    return await keywords_unified.get_keyword_stats()
+
+# ==================== 측정 ====================
+
+async def measure(name: str, func: Callable[[], Awaitable], total: int, concurrency: int) -> Dict:
+    """동시 실행 제한 하에서 total회 호출하고 처리량과 지연시간 분포를 계산"""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_call():
+        async with semaphore:
+            started = time.perf_counter()
+            await func()
+            latencies.append(time.perf_counter() - started)
+
+    # 워밍업 (풀 연결 생성, prepared statement 캐시)
+    await asyncio.gather(*(func() for _ in range(min(concurrency, 8))))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "name": name,
+        "requests": total,
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description="키워드 API 데이터 경로 벤치마크")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--skip-legacy", action="store_true", help="subprocess 경로 측정 생략")
+    args = parser.parse_args()
+
+    await init_db_pool()
+    results = []
+    try:
+        results.append(await measure("asyncpg_pool", pooled_keyword_stats, args.requests, args.concurrency))
+        if not args.skip_legacy:
+            # subprocess 경로는 느리므로 요청 수를 1/10로 줄여서 측정
+            results.append(await measure("subprocess_psql", legacy_keyword_stats,
+                                         max(args.requests // 10, 10), args.concurrency))
+    finally:
+        await close_db_pool()
+
+    print(f"{'path':<18}{'requests':>10}{'req/s':>12}{'p50(ms)':>12}{'p99(ms)':>12}")
+    for r in results:
+        print(f"{r['name']:<18}{r['requests']:>10}{r['rps']:>12.1f}{r['p50_ms']:>12.2f}{r['p99_ms']:>12.2f}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
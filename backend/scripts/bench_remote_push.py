@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+원격서버 푸시 엔진 시뮬레이션
+지연/실패를 흉내 내는 로컬 대역 HTTP 서버에 KeywordPushEngine 으로 키워드를 푸시하고
+기존 방식(키워드 하나씩 순차 전송 + 0.1초 대기)과 처리량을 비교한다.
+
+대역 서버는 원격서버와 같은 두 경로를 제공한다.
+    POST /admin-api/keywords/          키워드 하나
+    POST /admin-api/bulk-sync/import   {"sync_data": {"keywords": [...]}, "mode": "merge"}
+요청마다 latency-ms (+ 항목당 per-item-ms) 만큼 지연하고, failure-rate 확률로 503,
+throttle-rate 확률로 429 + Retry-After, timeout-rate 확률로 클라이언트 타임아웃보다 오래 멈춘다.
+엔진 실행 후 모든 키워드가 도착했는지 확인하고, 빠진 키워드가 있으면 종료 코드 1.
+마지막으로 RemoteSyncManager.push_sync_data 를 키워드 배치 절반이 확인된 시점에 취소하고
+같은 작업 저널(임시 디렉토리)로 다시 실행해, 이어받은 실행이 남은 배치만 보내는지 확인한다.
+클라이언트가 타임아웃으로 포기한 요청도 서버에서는 끝까지 처리되므로 max_in_flight 가
+concurrency 보다 클 수 있고, 재시도와 겹쳐 같은 키워드가 두 번 도착할 수 있다 (duplicates, 원격 반영은 upsert).
+
+사용법 (backend 디렉토리에서 실행, DB 연결 필요 없음):
+    python scripts/bench_remote_push.py --keywords 442 --latency-ms 40 --failure-rate 0.1
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Set
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import advanced_remote_sync
+from advanced_remote_sync import KeywordPushEngine, RemoteSyncManager
+from services.sync_journal import SyncJournal
+
+class StandInRemoteServer:
+    """지연과 실패를 흉내 내는 원격서버 대역"""
+
+    def __init__(self, latency_ms: float, per_item_ms: float, failure_rate: float,
+                 throttle_rate: float, timeout_rate: float, hang_seconds: float, seed: int):
+        self.latency_ms = latency_ms
+        self.per_item_ms = per_item_ms
+        self.failure_rate = failure_rate
+        self.throttle_rate = throttle_rate
+        self.timeout_rate = timeout_rate
+        self.hang_seconds = hang_seconds
+        self.rng = random.Random(seed)
+        self.received: Dict[str, int] = {}
+        self.requests = 0
+        self.max_in_flight = 0
+        self._in_flight = 0
+        self.runner = None
+        self.port = None
+
+    def reset(self):
+        self.received.clear()
+        self.requests = 0
+        self.max_in_flight = 0
+
+    async def _simulate(self, items: List[Dict[str, Any]]) -> web.Response:
+        self.requests += 1
+        self._in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self._in_flight)
+        try:
+            roll = self.rng.random()
+            if roll < self.timeout_rate:
+                await asyncio.sleep(self.hang_seconds)
+            await asyncio.sleep((self.latency_ms + self.per_item_ms * len(items)) / 1000)
+
+            roll = self.rng.random()
+            if roll < self.failure_rate:
+                return web.json_response({"detail": "simulated failure"}, status=503)
+            if roll < self.failure_rate + self.throttle_rate:
+                return web.json_response({"detail": "slow down"}, status=429, headers={"Retry-After": "0.2"})
+
+            for item in items:
+                self.received[item['name']] = self.received.get(item['name'], 0) + 1
+            return web.json_response({"success": True, "received": len(items)})
+        finally:
+            self._in_flight -= 1
+
+    async def create_keyword(self, request: web.Request) -> web.Response:
+        return await self._simulate([await request.json()])
+
+    async def bulk_import(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        return await self._simulate(payload["sync_data"].get("keywords", []))
+
+    async def start(self):
+        app = web.Application(client_max_size=64 * 1024 * 1024)
+        app.router.add_post("/admin-api/keywords/", self.create_keyword)
+        app.router.add_post("/admin-api/bulk-sync/import", self.bulk_import)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+def build_keywords(count: int) -> List[Dict[str, Any]]:
+    return [
+        {"id": i, "name": f"키워드{i}", "category": "A-01", "weight": 1.0, "status": "active",
+         "subcategory_id": 1, "connections": 0}
+        for i in range(1, count + 1)
+    ]
+
+async def legacy_push(session: aiohttp.ClientSession, url: str, keywords: List[Dict[str, Any]]) -> int:
+    """기존 _sync_via_individual_apis 동작 재현 (순차 전송, 재시도 없음, 요청 사이 0.1초 대기)"""
+    success = 0
+    for keyword in keywords:
+        try:
+            payload = {"name": keyword['name'], "category": keyword['category'],
+                       "weight": keyword['weight'], "status": keyword['status']}
+            async with session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=5)) as response:
+                if response.status in [200, 201]:
+                    success += 1
+        except Exception:
+            pass
+        await asyncio.sleep(0.1)
+    return success
+
+def verify(server: StandInRemoteServer, keywords: List[Dict[str, Any]]) -> Set[str]:
+    expected = {keyword['name'] for keyword in keywords}
+    return expected - set(server.received)
+
+async def interrupted_push(server: StandInRemoteServer, session: aiohttp.ClientSession,
+                           keywords: List[Dict[str, Any]], journal_dir: str) -> bool:
+    """키워드 배치 절반이 확인되면 푸시를 취소하고, 같은 저널로 다시 실행해 이어받기 확인"""
+    concurrency, batch_size = 2, 10
+    total_batches = -(-len(keywords) // batch_size)
+    journal = SyncJournal(journal_dir)
+    sync_data = {"metadata": {}, "subcategories": [], "keywords": keywords, "dependencies": []}
+    
+    server.reset()
+    first = RemoteSyncManager(journal)
+    first.session = session
+    first.sync_data = sync_data
+    task = asyncio.create_task(first.push_sync_data(concurrency=concurrency, batch_size=batch_size, resume=False))
+    while not task.done():
+        runs = journal.list_runs(1, mode="push")
+        if runs and runs[0]["done_batches"] >= total_batches // 2:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    interrupted = journal.list_runs(1, mode="push")[0]
+    received_before = dict(server.received)
+    
+    server.reset()
+    second = RemoteSyncManager(journal)
+    second.session = session
+    result = await second.push_sync_data(concurrency=concurrency, batch_size=batch_size)
+    run = journal.get_run(result["run_id"])
+    missing = {keyword['name'] for keyword in keywords} - set(received_before) - set(server.received)
+    resent = len(set(received_before) & set(server.received))
+    
+    ok = result["success"] and result["resumed"] and run["run_id"] == interrupted["run_id"] and not missing
+    print(f"\n중단 후 이어받기 (batch={batch_size} c={concurrency}): "
+          f"중단 시점 {interrupted['status']} {interrupted['done_batches']}/{total_batches} 배치 확인, "
+          f"재실행 {'이어받음' if result['resumed'] else '새 실행'} 요청={server.requests} "
+          f"다시 보낸 키워드={resent} missing={len(missing)} status={run['status']} "
+          f"attempts={run['attempts']} items/s={run['items_per_s']} → {'OK' if ok else 'FAIL'}")
+    journal.close()
+    return ok
+
+async def main():
+    parser = argparse.ArgumentParser(description="원격서버 푸시 엔진 시뮬레이션")
+    parser.add_argument("--keywords", type=int, default=442)
+    parser.add_argument("--latency-ms", type=float, default=40.0)
+    parser.add_argument("--per-item-ms", type=float, default=0.2)
+    parser.add_argument("--failure-rate", type=float, default=0.1)
+    parser.add_argument("--throttle-rate", type=float, default=0.03)
+    parser.add_argument("--timeout-rate", type=float, default=0.02)
+    parser.add_argument("--request-timeout", type=float, default=1.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[1, 50])
+    parser.add_argument("--legacy", action="store_true", help="기존 순차 방식도 측정 (442개면 약 1분)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    server = StandInRemoteServer(
+        args.latency_ms, args.per_item_ms, args.failure_rate, args.throttle_rate,
+        args.timeout_rate, hang_seconds=args.request_timeout * 2, seed=args.seed
+    )
+    await server.start()
+    base_url = f"http://127.0.0.1:{server.port}"
+    keywords = build_keywords(args.keywords)
+    random.seed(args.seed)
+    journal_dir = tempfile.mkdtemp(prefix="sync_journal_")
+    failed_runs = 0
+
+    print(f"stand-in server {base_url}: latency={args.latency_ms}ms failure={args.failure_rate:.0%} "
+          f"throttle={args.throttle_rate:.0%} timeout={args.timeout_rate:.0%} keywords={args.keywords}\n")
+
+    try:
+        async with aiohttp.ClientSession() as session:
+            if args.legacy:
+                server.reset()
+                started = time.perf_counter()
+                success = await legacy_push(session, f"{base_url}/admin-api/keywords/", keywords)
+                elapsed = time.perf_counter() - started
+                print(f"{'legacy sequential':<28} {elapsed:7.2f}s {success / elapsed:8.1f} kw/s "
+                      f"pushed={success}/{len(keywords)} missing={len(verify(server, keywords))}")
+
+            for batch_size in args.batch_size:
+                for concurrency in args.concurrency:
+                    server.reset()
+                    if batch_size == 1:
+                        url = f"{base_url}/admin-api/keywords/"
+                        build_payload = lambda batch: batch[0]
+                    else:
+                        url = f"{base_url}/admin-api/bulk-sync/import"
+                        build_payload = lambda batch: {"sync_data": {"keywords": batch}, "mode": "merge"}
+
+                    engine = KeywordPushEngine(
+                        session, url, build_payload, concurrency=concurrency, batch_size=batch_size,
+                        request_timeout=args.request_timeout, backoff_base=0.05, backoff_max=1.0
+                    )
+                    report = (await engine.push(keywords, label="keywords")).to_dict()
+                    missing = verify(server, keywords)
+                    failed_runs += bool(missing)
+                    duplicates = sum(count - 1 for count in server.received.values())
+                    label = f"engine c={concurrency} batch={batch_size}"
+                    print(f"{label:<28} {report['elapsed_s']:7.2f}s {report['items_per_s']:8.1f} kw/s "
+                          f"requests={server.requests} retries={report['retries']} "
+                          f"max_in_flight={server.max_in_flight} p95={report['request_p95_ms']}ms "
+                          f"missing={len(missing)} duplicates={duplicates} "
+                          f"failed_batches={len(report['failed_batches'])}")
+
+            # RemoteSyncManager 경로 (bulk-sync/import merge 로 서브카테고리 → 키워드 → 의존성)
+            server.reset()
+            advanced_remote_sync.REMOTE_SERVER = base_url
+            manager = RemoteSyncManager(SyncJournal(journal_dir))
+            manager.session = session
+            manager.sync_data = {"metadata": {}, "subcategories": [], "keywords": keywords, "dependencies": []}
+            result = await manager.push_sync_data(concurrency=max(args.concurrency), batch_size=max(args.batch_size))
+            missing = verify(server, keywords)
+            failed_runs += bool(missing) or not result["success"]
+            print(f"\nRemoteSyncManager.push_sync_data: success={result['success']} missing={len(missing)} "
+                  f"keywords={result['phases']['keywords']['elapsed_s']}s")
+            
+            failed_runs += not await interrupted_push(server, session, keywords, journal_dir)
+    finally:
+        await server.stop()
+        shutil.rmtree(journal_dir, ignore_errors=True)
+
+    sys.exit(1 if failed_runs else 0)
+
+if __name__ == "__main__":
+    asyncio.run(main())
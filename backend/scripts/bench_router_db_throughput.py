@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+라우터 DB 접근 경로 부하 테스트
+요청마다 psycopg2.connect 하던 기존 방식과 공유 asyncpg 풀 방식의 동시 처리량 비교
+
+기존 방식은 async 핸들러 안에서 블로킹 연결/쿼리를 수행하므로 이벤트 루프가 막혀
+동시성이 올라가도 처리량이 늘지 않는다. 두 경로 모두 같은 쿼리(스토어 상품 목록)를 실행한다.
+
+사용법 (backend 디렉토리에서 실행, DB_* 환경변수로 로컬 Postgres 지정):
+    python scripts/bench_router_db_throughput.py --requests 2000 --concurrency 64
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Awaitable, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import init_db_pool, close_db_pool, db
+from routes import frontend_store_routes
+
+PRODUCTS_QUERY = """
+SELECT id, name, price, description, category, stock_quantity,
+       is_active, created_at, updated_at, image_url,
+       featured_badge as badge, is_featured, shipping_info
+FROM products
+WHERE is_active = true
+ORDER BY created_at DESC
+"""
+
+# ==================== 기존 psycopg2 경로 (비교용) ====================
+
+def legacy_dsn() -> Dict:
+    """기존 라우터와 같은 방식의 연결 설정 (환경변수로 덮어쓰기 가능)"""
+    config = {
+        "dbname": os.getenv("DB_NAME", "livedb"),
+        "user": os.getenv("DB_USER", "liveuser"),
+    }
+    if os.getenv("DB_HOST"):
+        config["host"] = os.getenv("DB_HOST")
+        config["port"] = int(os.getenv("DB_PORT", "5432"))
+    if os.getenv("DB_PASSWORD"):
+        config["password"] = os.getenv("DB_PASSWORD")
+    return config
+
+async def legacy_get_products() -> List:
+    """기존 구현: async 핸들러 안에서 요청마다 블로킹 연결 생성 후 쿼리"""
+    import psycopg2
+    from psycopg2.extras import RealDictCursor
+
+    conn = psycopg2.connect(cursor_factory=RealDictCursor, **legacy_dsn())
+    cursor = conn.cursor()
+    cursor.execute(PRODUCTS_QUERY)
+    products = cursor.fetchall()
+    cursor.close()
+    conn.close()
+    return products
+
+async def pooled_get_products() -> Dict:
+    """현재 구현: 공유 asyncpg 풀을 사용하는 라우터 핸들러"""
+    return await frontend_store_routes.get_products()
+
+# ==================== 측정 ====================
+
+async def measure(name: str, func: Callable[[], Awaitable], total: int, concurrency: int) -> Dict:
+    """동시 실행 제한 하에서 total회 호출하고 처리량과 지연시간 분포를 계산"""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_call():
+        async with semaphore:
+            started = time.perf_counter()
+            await func()
+            latencies.append(time.perf_counter() - started)
+
+    # 워밍업 (풀 연결 생성, prepared statement 캐시)
+    await asyncio.gather(*(func() for _ in range(min(concurrency, 8))))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_call() for _ in range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "name": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "rps": total / elapsed,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description="라우터 DB 접근 경로 부하 테스트")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    parser.add_argument("--skip-legacy", action="store_true", help="psycopg2 경로 측정 생략")
+    args = parser.parse_args()
+
+    await init_db_pool()
+    results = []
+    try:
+        for concurrency in args.concurrency:
+            results.append(await measure("asyncpg_pool", pooled_get_products,
+                                         args.requests, concurrency))
+            if not args.skip_legacy:
+                results.append(await measure("psycopg2_connect", legacy_get_products,
+                                             args.requests, concurrency))
+        pool_stats = db.stats()
+    finally:
+        await close_db_pool()
+
+    print(f"{'path':<18}{'conc':>6}{'requests':>10}{'req/s':>12}{'p50(ms)':>12}{'p99(ms)':>12}")
+    for r in results:
+        print(f"{r['name']:<18}{r['concurrency']:>6}{r['requests']:>10}"
+              f"{r['rps']:>12.1f}{r['p50_ms']:>12.2f}{r['p99_ms']:>12.2f}")
+    print(f"\npool: size={pool_stats['size']} max={pool_stats['max_size']} "
+          f"avg_wait={pool_stats['avg_wait_ms']:.2f}ms max_wait={pool_stats['max_wait_ms']:.2f}ms "
+          f"timeouts={pool_stats['acquire_timeouts']}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+동기화 전송 형식 비교
+/admin-api/bulk-sync/keywords/export 와 같은 쿼리로 읽은 데이터를 형식별로 직렬화/해석하며
+본문 크기(원본, gzip)와 인코딩/디코딩 시간을 잰다.
+
+    json      : format=json 응답 (단일 JSON 문서)
+    ndjson    : format=ndjson 응답 (레코드마다 한 줄)
+    columnar  : application/vnd.heal7.sync+json (분류 사전 + id 차이값 컬럼형)
+    msgpack   : application/vnd.heal7.sync+msgpack (같은 컬럼형을 msgpack 으로, msgpack 설치 필요)
+
+압축 형식은 해석 결과가 원본과 같은지 확인하고, 다르면 종료 코드 1.
+
+사용법 (backend 디렉토리에서 실행, DB_* 환경변수로 로컬 Postgres 지정):
+    python scripts/bench_sync_wire_format.py --repeat 20
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import connect_direct
+from services.sync_wire_format import (
+    COLUMNAR_JSON_MEDIA_TYPE, COLUMNAR_MSGPACK_MEDIA_TYPE, dump_sync_payload, load_sync_payload, msgpack
+)
+from routes.bulk_sync_endpoint import (
+    SYNC_DEPENDENCIES_QUERY, SYNC_KEYWORDS_QUERY, SYNC_SUBCATEGORIES_QUERY,
+    dependency_record, keyword_record, subcategory_record
+)
+
+async def load_export() -> Dict[str, Any]:
+    """내보내기와 같은 구조의 동기화 데이터"""
+    conn = await connect_direct()
+    try:
+        keywords = [keyword_record(row) for row in await conn.fetch(SYNC_KEYWORDS_QUERY)]
+        subcategories = [subcategory_record(row) for row in await conn.fetch(SYNC_SUBCATEGORIES_QUERY)]
+        dependencies = [dependency_record(row) for row in await conn.fetch(SYNC_DEPENDENCIES_QUERY)]
+    finally:
+        await conn.close()
+    return {
+        "metadata": {"total_keywords": len(keywords), "total_subcategories": len(subcategories),
+                     "total_dependencies": len(dependencies), "source": "bench"},
+        "keywords": keywords,
+        "subcategories": subcategories,
+        "dependencies": dependencies
+    }
+
+def dump_ndjson(sync_data: Dict[str, Any]) -> bytes:
+    lines = [json.dumps({"type": "metadata", **sync_data["metadata"]}, ensure_ascii=False, separators=(",", ":"))]
+    for record_type, section in (("subcategory", "subcategories"), ("keyword", "keywords"), ("dependency", "dependencies")):
+        lines.extend(
+            json.dumps({**record, "type": record_type}, ensure_ascii=False, separators=(",", ":"))
+            for record in sync_data[section]
+        )
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+def load_ndjson(body: bytes) -> Dict[str, Any]:
+    data = {"metadata": {}, "keywords": [], "subcategories": [], "dependencies": []}
+    sections = {"keyword": "keywords", "subcategory": "subcategories", "dependency": "dependencies"}
+    for line in body.splitlines():
+        record = json.loads(line)
+        record_type = record.pop("type")
+        if record_type in sections:
+            data[sections[record_type]].append(record)
+        else:
+            data["metadata"].update(record)
+    return data
+
+def median_ms(fn: Callable[[], Any], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+async def main():
+    parser = argparse.ArgumentParser(description="동기화 전송 형식 비교")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    sync_data = await load_export()
+    print(f"data: keywords={len(sync_data['keywords'])} subcategories={len(sync_data['subcategories'])} "
+          f"dependencies={len(sync_data['dependencies'])}\n")
+
+    formats: Dict[str, tuple] = {
+        "json": (lambda data: json.dumps(data, ensure_ascii=False).encode("utf-8"), json.loads),
+        "ndjson": (dump_ndjson, load_ndjson),
+        "columnar": (lambda data: dump_sync_payload(data, COLUMNAR_JSON_MEDIA_TYPE),
+                     lambda body: load_sync_payload(body, COLUMNAR_JSON_MEDIA_TYPE)),
+    }
+    if msgpack:
+        formats["msgpack"] = (lambda data: dump_sync_payload(data, COLUMNAR_MSGPACK_MEDIA_TYPE),
+                              lambda body: load_sync_payload(body, COLUMNAR_MSGPACK_MEDIA_TYPE))
+    else:
+        print("msgpack 미설치 - msgpack 형식 생략\n")
+
+    results: List[Dict[str, Any]] = []
+    mismatched = []
+    for name, (dump, load) in formats.items():
+        body = dump(sync_data)
+        if load(body) != sync_data:
+            mismatched.append(name)
+        compressed = gzip.compress(body)
+        results.append({
+            "format": name,
+            "bytes": len(body),
+            "gzip_bytes": len(compressed),
+            "encode_ms": median_ms(lambda: dump(sync_data), args.repeat),
+            "decode_ms": median_ms(lambda: load(body), args.repeat),
+            "gzip_ms": median_ms(lambda: gzip.compress(body), max(1, args.repeat // 4)),
+        })
+
+    baseline = results[0]
+    print(f"{'format':<10} {'bytes':>10} {'vs json':>8} {'gzip':>9} {'vs json':>8} "
+          f"{'encode':>9} {'decode':>9} {'gzip':>9}")
+    for r in results:
+        print(f"{r['format']:<10} {r['bytes']:>10,} {r['bytes'] / baseline['bytes']:>7.1%} "
+              f"{r['gzip_bytes']:>9,} {r['gzip_bytes'] / baseline['gzip_bytes']:>7.1%} "
+              f"{r['encode_ms']:>7.1f}ms {r['decode_ms']:>7.1f}ms {r['gzip_ms']:>7.1f}ms")
+
+    if mismatched:
+        print(f"\n❌ 해석 결과가 원본과 다름: {mismatched}")
+        sys.exit(1)
+    print("\n✅ 모든 형식의 해석 결과가 원본과 같음")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+고유 수 집계 정확도 / 속도 비교
+같은 기간 창(date >= CURRENT_DATE - N)의 고유 세션 / 페이지별 고유 세션 / 기기별 고유 사용자를
+    raw     page_analytics 원본 COUNT(DISTINCT ...)
+    members 정확 모드 롤업 (analytics_rollup_members, ANALYTICS_ROLLUP_MEMBER_DAYS 이내 창만)
+    hll     근사 모드 HLL 스케치 합치기 (analytics_hll_sketches)
+로 구해 중앙값 시간과 raw 대비 상대오차(평균 / 최대, 표준오차 2배 안에 든 비율)를 출력한다.
+page_top10 행은 /popular-pages 와 같은 모양으로, 기간 내 조회수 상위 10개 페이지만 values 로 넘겨 센다.
+page_session 행은 모든 페이지를 한 번에 세는 모양이라 엔드포인트가 실제로 돌리는 쿼리가 아니다.
+
+HLL 합치기(analytics_hll_merge)는 레지스터마다 도는 plpgsql 루프라서 (값 × 일수) 만큼 스케치를 합치는
+여러 날 / 많은 값의 조회는 정확 모드의 구성원 집계보다 느릴 수 있다. 근사 모드의 이점은 보관 크기와
+구성원 보관 기간을 넘는 긴 창이다.
+
+스케치가 아직 없으면 (근사 모드로 실행한 적이 없으면) 먼저 원본에서 만든다.
+--generate SCALE 을 주면 먼저 users / page_analytics 를 비우고 (CASCADE) 합성 데이터로 채운다
+(scripts/generate_synthetic_data.py, 가장 긴 기간 창 + 1일, 오늘까지).
+
+사용법 (backend 디렉토리에서 실행, DB_* 환경변수로 Postgres 지정):
+    python scripts/benchmark_distinct_counts.py
+    python scripts/benchmark_distinct_counts.py --days 1 7 30 90 --repeat 5
+    python scripts/benchmark_distinct_counts.py --generate 5 --seed 7
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import date
+from typing import Dict, List, Tuple
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import connect_direct
+from services.analytics_rollups import (
+    MEMBER_DEVICE_USER, MEMBER_PAGE_SESSION, MEMBER_SESSION, AnalyticsRollupAggregator
+)
+from services.analytics_sketches import HLL_PRECISION, SKETCH_DISTINCT_QUERY, DistinctSketches, standard_error
+from generate_synthetic_data import GenerationContext, populate
+
+# 차원별 원본 정확 집계 ($1: 기간 일수)
+RAW_QUERIES = {
+    MEMBER_SESSION: """
+        SELECT '' AS dim_value, COUNT(DISTINCT session_id) AS members
+        FROM page_analytics WHERE date >= CURRENT_DATE - $1::int
+    """,
+    MEMBER_PAGE_SESSION: """
+        SELECT COALESCE(page_path, '') AS dim_value, COUNT(DISTINCT session_id) AS members
+        FROM page_analytics WHERE date >= CURRENT_DATE - $1::int AND session_id IS NOT NULL GROUP BY 1
+    """,
+    MEMBER_DEVICE_USER: """
+        SELECT COALESCE(device_type, '') AS dim_value, COUNT(DISTINCT user_id) AS members
+        FROM page_analytics WHERE date >= CURRENT_DATE - $1::int AND user_id IS NOT NULL GROUP BY 1
+    """,
+}
+
+# /popular-pages 처럼 값 목록을 받은 페이지별 원본 정확 집계 ($1: 기간 일수, $2: 페이지 목록)
+RAW_PAGE_VALUES_QUERY = """
+    SELECT page_path AS dim_value, COUNT(DISTINCT session_id) AS members
+    FROM page_analytics WHERE date >= CURRENT_DATE - $1::int AND session_id IS NOT NULL
+    AND page_path = ANY($2::text[]) GROUP BY 1
+"""
+
+# /popular-pages 의 대상 페이지: 기간 내 조회수 상위 10개
+TOP_PAGES_QUERY = """
+    SELECT page_path FROM analytics_pageview_daily WHERE day >= CURRENT_DATE - $1::int
+    GROUP BY page_path ORDER BY SUM(pageviews) DESC LIMIT 10
+"""
+
+# 정확 모드 롤업 (routes/analytics_routes.py 의 ROLLUP_MEMBERS_QUERY 와 같은 쿼리)
+MEMBERS_QUERY = """
+    SELECT dim_value, COUNT(*) AS members FROM analytics_rollup_members
+    WHERE dimension = $1 AND last_seen >= CURRENT_DATE - $2::int
+    AND ($3::text[] IS NULL OR dim_value = ANY($3::text[]))
+    GROUP BY dim_value
+"""
+
+async def timed(conn, repeat: int, query: str, *args) -> Tuple[Dict[str, int], float]:
+    """(값별 고유 수, 중앙값 ms)"""
+    timings = []
+    rows = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = await conn.fetch(query, *args)
+        timings.append((time.perf_counter() - started) * 1000)
+    return {row['dim_value']: row['members'] or 0 for row in rows}, statistics.median(timings)
+
+def errors(exact: Dict[str, int], approx: Dict[str, int]) -> List[float]:
+    return [abs(approx.get(key, 0) - count) / count for key, count in exact.items() if count]
+
+async def main():
+    parser = argparse.ArgumentParser(description="고유 수: 원본 COUNT(DISTINCT) vs 롤업 구성원 vs HLL 스케치")
+    parser.add_argument("--days", type=int, nargs="+", default=[1, 7, 30], help="비교할 기간 창 (일)")
+    parser.add_argument("--repeat", type=int, default=3, help="쿼리별 반복 횟수 (중앙값)")
+    parser.add_argument("--generate", type=float, metavar="SCALE", help="먼저 합성 데이터로 채움 (대상 테이블을 비움)")
+    parser.add_argument("--seed", type=int, default=42, help="--generate 난수 시드")
+    args = parser.parse_args()
+
+    # 스케치를 만들 수 있도록 근사 모드 집계기로 준비 (이미 있으면 그대로)
+    aggregator = AnalyticsRollupAggregator(sketches=DistinctSketches(mode='approx'))
+    bound = 2 * standard_error()
+    conn = await connect_direct()
+    try:
+        await aggregator.ensure_tables(conn)
+        if args.generate:
+            ctx = GenerationContext(args.seed, args.generate, max(args.days) + 1, date.today(), growth=2.0)
+            print(f"generate: {await populate(conn, ctx, ('users', 'page_analytics'), truncate=True)}")
+        print(f"drain: {await aggregator.drain(conn, wait_for_lock=True)}")
+        built = await aggregator.sync_sketches(conn)
+        if built:
+            print(f"sketches: {built}")
+        sketch_bytes = await conn.fetchval("SELECT pg_total_relation_size('analytics_hll_sketches')")
+        member_bytes = await conn.fetchval("SELECT pg_total_relation_size('analytics_rollup_members')")
+        print(f"HLL p={HLL_PRECISION}, 표준오차 {standard_error():.2%} (2σ {bound:.2%}), "
+              f"스케치 {sketch_bytes / 1e6:.1f}MB / 구성원 {member_bytes / 1e6:.1f}MB\n")
+
+        print(f"{'dimension':<14} {'days':>4} {'values':>6} {'raw':>10} {'members':>10} {'hll':>10}"
+              f"  {'mean err':>8} {'max err':>8} {'≤2σ':>6}")
+        for days in args.days:
+            top_pages = [row['page_path'] for row in await conn.fetch(TOP_PAGES_QUERY, days)]
+            cases = [(dimension, dimension, query, (days,), None) for dimension, query in RAW_QUERIES.items()]
+            cases.append(("page_top10", MEMBER_PAGE_SESSION, RAW_PAGE_VALUES_QUERY, (days, top_pages), top_pages))
+            for label, dimension, raw_query, raw_args, values in cases:
+                exact, raw_ms = await timed(conn, args.repeat, raw_query, *raw_args)
+                members_ms = None
+                if days <= aggregator.member_days:
+                    members, members_ms = await timed(conn, args.repeat, MEMBERS_QUERY, dimension, days, values)
+                    if members != {key: count for key, count in exact.items() if count}:
+                        print(f"  ⚠️ {label} {days}d: 롤업 구성원이 원본과 다름 (backfill_analytics_rollups.py --verify)")
+                approx, hll_ms = await timed(conn, args.repeat, SKETCH_DISTINCT_QUERY, dimension, days, values)
+
+                errs = errors(exact, approx) or [0.0]
+                within = sum(err <= bound for err in errs) / len(errs)
+                members_col = f"{members_ms:>8.1f}ms" if members_ms is not None else f"{'-':>10}"
+                print(f"{label:<14} {days:>4} {len(exact):>6} {raw_ms:>8.1f}ms {members_col} {hll_ms:>8.1f}ms"
+                      f"  {statistics.mean(errs):>8.2%} {max(errs):>8.2%} {within:>6.0%}")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+-- ================================================
+-- HEAL7 키워드 동기화 변경 로그 (증분 동기화용)
+-- keywords / keywords_subcategories / keyword_dependencies 의 변경을
+-- 트리거로 sync_change_log 에 기록한다.
+--
+-- 변경 피드(/admin-api/bulk-sync/changes)는 (txid, seq) 순서로 읽고,
+-- 진행 중인 트랜잭션이 남길 수 있는 행을 건너뛰지 않도록
+-- 현재 스냅샷의 xmin 보다 작은 txid 의 행만 내보낸다.
+-- 여러 번 실행해도 안전하다.
+-- ================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS sync_change_log (
+    seq BIGSERIAL PRIMARY KEY,
+    txid BIGINT NOT NULL DEFAULT txid_current(),
+    table_name TEXT NOT NULL,
+    row_key JSONB NOT NULL,          -- 원격서버와 공유하는 자연 키 (id 또는 부모/종속 키워드 ID)
+    operation CHAR(1) NOT NULL,      -- I / U / D
+    changed_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_change_log_txid_seq ON sync_change_log (txid, seq);
+CREATE INDEX IF NOT EXISTS idx_sync_change_log_changed_at ON sync_change_log (changed_at);
+
+-- 정리(prune)된 구간: 이 txid 보다 오래된 커서는 전체 재동기화가 필요하다
+CREATE TABLE IF NOT EXISTS sync_change_log_state (
+    id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+    pruned_before_txid BIGINT NOT NULL DEFAULT 0
+);
+INSERT INTO sync_change_log_state (id) VALUES (true) ON CONFLICT (id) DO NOTHING;
+
+-- 문장 단위 트리거: 변경된 행 전체(전이 테이블)를 한 번의 INSERT ... SELECT 로 기록한다
+-- (일괄 가져오기처럼 수만 행을 바꾸는 문장도 행마다 plpgsql 을 실행하지 않음)
+-- 트리거 인자: 자연 키 컬럼 이름들
+CREATE OR REPLACE FUNCTION sync_log_change() RETURNS trigger AS $$
+DECLARE
+    key_expr TEXT;
+BEGIN
+    SELECT 'jsonb_build_object(' || string_agg(format('%L, r.%I', k, k), ', ') || ')'
+    INTO key_expr FROM unnest(TG_ARGV) AS k;
+
+    IF TG_OP = 'INSERT' THEN
+        EXECUTE format('INSERT INTO sync_change_log (table_name, row_key, operation)
+                        SELECT %L, %s, ''I'' FROM new_rows r', TG_TABLE_NAME, key_expr);
+    ELSIF TG_OP = 'DELETE' THEN
+        EXECUTE format('INSERT INTO sync_change_log (table_name, row_key, operation)
+                        SELECT %L, %s, ''D'' FROM old_rows r', TG_TABLE_NAME, key_expr);
+    ELSE
+        -- 키 자체가 바뀐 UPDATE 는 사라진 이전 키를 삭제로도 기록
+        EXECUTE format('INSERT INTO sync_change_log (table_name, row_key, operation)
+                        SELECT %1$L, gone.row_key, ''D''
+                        FROM (SELECT %2$s AS row_key FROM old_rows r
+                              EXCEPT SELECT %2$s FROM new_rows r) gone', TG_TABLE_NAME, key_expr);
+        EXECUTE format('INSERT INTO sync_change_log (table_name, row_key, operation)
+                        SELECT %L, %s, ''U'' FROM new_rows r', TG_TABLE_NAME, key_expr);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- 테이블에 INSERT / UPDATE / DELETE 문장 트리거 설치 (예전 행 단위 트리거는 제거)
+CREATE OR REPLACE FUNCTION install_sync_log_triggers(target REGCLASS, VARIADIC key_columns TEXT[])
+RETURNS void AS $$
+DECLARE
+    base TEXT := 'trg_sync_log_' || (SELECT relname FROM pg_class WHERE oid = target);
+    args TEXT := (SELECT string_agg(quote_literal(c), ', ') FROM unnest(key_columns) AS c);
+BEGIN
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base, target);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base || '_ins', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base || '_upd', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base || '_del', target);
+
+    EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %s REFERENCING NEW TABLE AS new_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION sync_log_change(%s)', base || '_ins', target, args);
+    EXECUTE format('CREATE TRIGGER %I AFTER UPDATE ON %s REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION sync_log_change(%s)', base || '_upd', target, args);
+    EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %s REFERENCING OLD TABLE AS old_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION sync_log_change(%s)', base || '_del', target, args);
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT install_sync_log_triggers('keywords', 'id');
+SELECT install_sync_log_triggers('keywords_subcategories', 'id');
+SELECT install_sync_log_triggers('keyword_dependencies', 'parent_keyword_id', 'dependent_keyword_id');
+
+-- 오래된 변경 로그 정리 (예: SELECT prune_sync_change_log(interval '30 days');)
+CREATE OR REPLACE FUNCTION prune_sync_change_log(keep INTERVAL) RETURNS BIGINT AS $$
+DECLARE
+    boundary BIGINT;
+    removed BIGINT;
+BEGIN
+    SELECT max(txid) + 1 INTO boundary FROM sync_change_log WHERE changed_at < now() - keep;
+    IF boundary IS NULL THEN
+        RETURN 0;
+    END IF;
+
+    DELETE FROM sync_change_log WHERE txid < boundary;
+    GET DIAGNOSTICS removed = ROW_COUNT;
+
+    UPDATE sync_change_log_state SET pruned_before_txid = GREATEST(pruned_before_txid, boundary);
+    RETURN removed;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMIT;
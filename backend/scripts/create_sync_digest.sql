@@ -0,0 +1,142 @@
+-- ================================================
+-- HEAL7 키워드 동기화 다이제스트 (내용 해시 트리)
+-- keywords_subcategories / keywords / keyword_dependencies 를 (그룹, 버킷) 단위로 나눠
+-- 버킷마다 행 해시의 합(mod 2^60)과 행 수를 sync_digest 에 보관한다.
+--
+--   서브카테고리: 그룹 0,                       버킷 id % 16
+--   키워드      : 그룹 subcategory_id,          버킷 id % 16
+--   의존성      : 그룹 parent_keyword_id % 32,  버킷 dependent_keyword_id % 16
+--
+-- 합은 행 순서와 무관하고 빼기가 되므로, 문장 트리거가 바뀐 행의 해시만 더하고 빼서
+-- 요청마다 전체를 다시 해시하지 않는다. 해시 대상은 내보내기(/keywords/export)로 전달되는 컬럼이며
+-- 비활성 키워드/서브카테고리는 포함하지 않는다. 두 서버의 분할 상수가 같아야 비교할 수 있다.
+-- 여러 번 실행해도 안전하다 (마지막에 전체 재계산).
+-- ================================================
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS sync_digest (
+    table_name TEXT NOT NULL,
+    group_id INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    digest BIGINT NOT NULL DEFAULT 0,   -- 행 해시 합 (mod 2^60)
+    row_count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (table_name, group_id, bucket)
+);
+
+CREATE OR REPLACE FUNCTION sync_digest_buckets() RETURNS INTEGER AS 'SELECT 16' LANGUAGE sql IMMUTABLE;
+CREATE OR REPLACE FUNCTION sync_digest_dependency_groups() RETURNS INTEGER AS 'SELECT 32' LANGUAGE sql IMMUTABLE;
+
+-- 행 해시: md5 앞 60비트 (음수가 되지 않도록 60비트만 사용)
+CREATE OR REPLACE FUNCTION sync_digest_hash(row_text TEXT) RETURNS BIGINT AS $$
+    SELECT ('x' || left(md5(row_text), 15))::bit(60)::bigint
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+-- 테이블별 (group_id, bucket, h) 를 내는 SELECT 문 (source 는 테이블 또는 전이 테이블 이름)
+CREATE OR REPLACE FUNCTION sync_digest_select(target TEXT, source TEXT) RETURNS TEXT AS $$
+    SELECT CASE target
+        WHEN 'keywords_subcategories' THEN format(
+            'SELECT 0 AS group_id, r.id %% sync_digest_buckets() AS bucket,
+                    sync_digest_hash(concat_ws(''|'', r.id, r.name, r.description, r.category_group, r.display_order)) AS h
+             FROM %s r WHERE r.is_active = true', source)
+        WHEN 'keywords' THEN format(
+            'SELECT COALESCE(r.subcategory_id, 0) AS group_id, r.id %% sync_digest_buckets() AS bucket,
+                    sync_digest_hash(concat_ws(''|'', r.id, r.text, r.subcategory_id, r.weight::float8, r.usage_count)) AS h
+             FROM %s r WHERE r.is_active = true', source)
+        WHEN 'keyword_dependencies' THEN format(
+            'SELECT r.parent_keyword_id %% sync_digest_dependency_groups() AS group_id,
+                    r.dependent_keyword_id %% sync_digest_buckets() AS bucket,
+                    sync_digest_hash(r.parent_keyword_id || ''>'' || r.dependent_keyword_id) AS h
+             FROM %s r WHERE r.parent_keyword_id IS NOT NULL AND r.dependent_keyword_id IS NOT NULL', source)
+    END
+$$ LANGUAGE sql IMMUTABLE;
+
+-- 문장 트리거: 전이 테이블의 해시를 버킷별로 더하고(new_rows) 빼서(old_rows) 반영
+CREATE OR REPLACE FUNCTION sync_digest_apply() RETURNS trigger AS $$
+DECLARE
+    delta TEXT;
+BEGIN
+    IF TG_OP = 'TRUNCATE' THEN
+        DELETE FROM sync_digest WHERE table_name = TG_TABLE_NAME;
+        RETURN NULL;
+    END IF;
+
+    delta := CASE TG_OP
+        WHEN 'INSERT' THEN format('SELECT group_id, bucket, h, 1 FROM (%s) a',
+                                  sync_digest_select(TG_TABLE_NAME, 'new_rows'))
+        WHEN 'DELETE' THEN format('SELECT group_id, bucket, -h, -1 FROM (%s) a',
+                                  sync_digest_select(TG_TABLE_NAME, 'old_rows'))
+        ELSE format('SELECT group_id, bucket, h, 1 FROM (%s) a UNION ALL SELECT group_id, bucket, -h, -1 FROM (%s) b',
+                    sync_digest_select(TG_TABLE_NAME, 'new_rows'), sync_digest_select(TG_TABLE_NAME, 'old_rows'))
+    END;
+
+    -- 버킷 순서대로 잠가 동시 쓰기 사이의 교착을 줄이고, 해시가 그대로인 UPDATE 는 건너뛴다
+    EXECUTE format($sql$
+        INSERT INTO sync_digest AS d (table_name, group_id, bucket, digest, row_count)
+        SELECT %L, group_id, bucket,
+               mod(mod(sum(h), 1152921504606846976) + 1152921504606846976, 1152921504606846976)::bigint,
+               sum(n)
+        FROM (%s) delta(group_id, bucket, h, n)
+        GROUP BY group_id, bucket
+        HAVING mod(sum(h), 1152921504606846976) <> 0 OR sum(n) <> 0
+        ORDER BY group_id, bucket
+        ON CONFLICT (table_name, group_id, bucket) DO UPDATE SET
+            digest = mod(d.digest + EXCLUDED.digest, 1152921504606846976),
+            row_count = d.row_count + EXCLUDED.row_count,
+            updated_at = now()
+    $sql$, TG_TABLE_NAME, delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION install_sync_digest_triggers(target REGCLASS) RETURNS void AS $$
+DECLARE
+    base TEXT := 'trg_sync_digest_' || (SELECT relname FROM pg_class WHERE oid = target);
+BEGIN
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base || '_ins', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base || '_upd', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base || '_del', target);
+    EXECUTE format('DROP TRIGGER IF EXISTS %I ON %s', base || '_trunc', target);
+
+    EXECUTE format('CREATE TRIGGER %I AFTER INSERT ON %s REFERENCING NEW TABLE AS new_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION sync_digest_apply()', base || '_ins', target);
+    EXECUTE format('CREATE TRIGGER %I AFTER UPDATE ON %s REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION sync_digest_apply()', base || '_upd', target);
+    EXECUTE format('CREATE TRIGGER %I AFTER DELETE ON %s REFERENCING OLD TABLE AS old_rows
+                    FOR EACH STATEMENT EXECUTE FUNCTION sync_digest_apply()', base || '_del', target);
+    EXECUTE format('CREATE TRIGGER %I AFTER TRUNCATE ON %s
+                    FOR EACH STATEMENT EXECUTE FUNCTION sync_digest_apply()', base || '_trunc', target);
+END;
+$$ LANGUAGE plpgsql;
+
+-- 전체 재계산 (설치 직후 또는 분할 상수 변경 후)
+CREATE OR REPLACE FUNCTION rebuild_sync_digest() RETURNS BIGINT AS $$
+DECLARE
+    target TEXT;
+    buckets BIGINT := 0;
+    inserted BIGINT;
+BEGIN
+    LOCK TABLE keywords_subcategories, keywords, keyword_dependencies IN SHARE MODE;
+    DELETE FROM sync_digest;
+
+    FOREACH target IN ARRAY ARRAY['keywords_subcategories', 'keywords', 'keyword_dependencies'] LOOP
+        EXECUTE format($sql$
+            INSERT INTO sync_digest (table_name, group_id, bucket, digest, row_count)
+            SELECT %L, group_id, bucket, mod(sum(h), 1152921504606846976)::bigint, count(*)
+            FROM (%s) a
+            GROUP BY group_id, bucket
+        $sql$, target, sync_digest_select(target, target));
+        GET DIAGNOSTICS inserted = ROW_COUNT;
+        buckets := buckets + inserted;
+    END LOOP;
+    RETURN buckets;
+END;
+$$ LANGUAGE plpgsql;
+
+SELECT install_sync_digest_triggers('keywords_subcategories');
+SELECT install_sync_digest_triggers('keywords');
+SELECT install_sync_digest_triggers('keyword_dependencies');
+SELECT rebuild_sync_digest();
+
+COMMIT;
@@ -0,0 +1,761 @@
+#!/usr/bin/env python3
+"""
+벤치마크용 합성 데이터 생성기
+users, page_analytics, saju_analysis_sessions, keyword_usage_stats, 설문(survey_sessions / survey_responses),
+orders, inquiries 에 운영 규모의 행을 COPY 로 넣는다. 기본(--scale 1)은 페이지뷰 200만 행이고,
+--scale 20 이면 페이지뷰 4천만 행 + 나머지 테이블 수백만 행.
+
+분포 (모두 --seed 로 결정되며 하루 단위 난수열이라 --end 를 고정하면 몇 번을 돌려도 같은 데이터):
+    - 기간(--days, --end): 일별 양은 기간 동안 --growth 배 늘어나는 추세 × 요일 가중치 × 하루 잡음
+    - 하루 안: 시간대 가중치 (새벽 최저, 점심 / 21~22시 최고)
+    - 사용자: 가입일 순서로 id, 활동은 Zipf (소수의 헤비 유저), 그날까지 가입한 사용자만 등장
+    - 페이지뷰: 세션당 페이지 수 기하분포, 첫 페이지는 진입 페이지 가중치, 이후 Zipf 인기 + 게시글 롱테일,
+      체류 시간 로그정규, 한 페이지 세션은 이탈, 세션 길이는 세션 마지막 페이지뷰에만 기록
+    - 사주 / 설문 / 주문 / 문의: 상태 비율, 처리 / 응답 시간 로그정규, 최근 문의일수록 미답변
+
+page_analytics / saju_analysis_sessions 는 기간에 맞게 파티션을 먼저 만들고, 기본으로 COPY 동안 트리거를 끈 뒤
+(session_replication_role = replica, 슈퍼유저 필요) 끝나면 롤업을 원본에서 다시 백필한다.
+--keep-triggers 면 트리거를 켠 채로 넣는다 (롤업 대기열이 행마다 쌓여 느림).
+survey_* / orders / inquiries 는 이 저장소에 스키마가 없어서, 테이블이 있으면 그 컬럼에 있는 값만 넣고
+없으면 서비스 코드가 읽고 쓰는 컬럼으로 최소 스키마를 만든다.
+
+--truncate 는 대상 테이블을 TRUNCATE ... CASCADE 한다 (운영 DB 에 쓰지 말 것).
+--truncate 없이 다시 돌리면 기존 행 뒤에 덧붙인다. 고유해야 하는 값(사용자 id / 이메일, 페이지뷰 · 사주 session_id,
+설문 session_uuid, 주문 order_id)은 실행할 때 각 테이블의 다음 id 에서 이어 만들어서 앞선 실행과 겹치지 않고,
+키워드 사용 수는 같은 (키워드, 날짜) 에 더한다. 이때 결과는 seed / --end 와 실행 전 테이블 상태로 정해진다.
+
+사용법 (backend 디렉토리에서 실행, DB_* 환경변수로 로컬 Postgres 지정):
+    python scripts/generate_synthetic_data.py --scale 1 --days 90 --end 2026-10-01 --truncate
+    python scripts/generate_synthetic_data.py --scale 20 --only users page_analytics --truncate
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import DatabaseManager, connect_direct, db
+from services.analytics_partitions import PARTITIONED_TABLES, analytics_partitions, is_partitioned
+from services.analytics_rollups import AnalyticsRollupAggregator
+
+TABLES = ("users", "page_analytics", "saju_analysis_sessions", "keyword_usage_stats", "survey", "orders", "inquiries")
+
+# --scale 1 기준 행 수 (기간 전체)
+BASE_ROWS = {
+    "users": 20_000,
+    "page_analytics": 2_000_000,
+    "saju_analysis_sessions": 100_000,
+    "survey": 20_000,          # 설문 세션 (응답은 세션당 평균 약 15개)
+    "orders": 10_000,
+    "inquiries": 2_000,
+}
+# 설문 session_uuid 는 (seed, 세션 id) 의 uuid5 (덧붙여도 id 가 겹치지 않으므로 uuid 도 겹치지 않음)
+SYNTHETIC_UUID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://heal7.test/synthetic")
+KEYWORD_DAILY_USAGE = 400      # 가장 인기 있는 키워드의 하루 평균 사용 수 (--scale 1)
+
+HOUR_WEIGHTS = np.array([2.0, 1.2, 0.8, 0.5, 0.4, 0.5, 1.0, 2.0, 3.2, 4.0, 4.5, 5.0,
+                         5.6, 5.2, 4.8, 4.6, 4.7, 5.0, 5.4, 6.0, 6.8, 7.2, 6.4, 4.0])
+HOUR_P = HOUR_WEIGHTS / HOUR_WEIGHTS.sum()
+WEEKDAY_WEIGHTS = (1.0, 0.97, 0.96, 0.98, 1.05, 1.22, 1.18)   # 월 ~ 일
+
+REGIONS = ("서울", "경기", "부산", "인천", "대구", "대전", "광주", "울산")
+REGION_P = np.array([0.32, 0.26, 0.1, 0.09, 0.07, 0.06, 0.05, 0.05])
+DEVICES = ("mobile", "desktop", "tablet")
+DEVICE_P = np.array([0.62, 0.30, 0.08])
+
+# (경로, 이후 페이지 가중치, 진입 페이지 가중치) - 전환 퍼널 경로 포함
+PAGES = (
+    ("/", 0.14, 0.45),
+    ("/saju/free", 0.15, 0.18),
+    ("/saju/detail", 0.09, 0.04),
+    ("/keywords", 0.08, 0.08),
+    ("/community", 0.07, 0.06),
+    ("/academy", 0.04, 0.03),
+    ("/store", 0.05, 0.04),
+    ("/register", 0.04, 0.02),
+    ("/profile", 0.035, 0.02),
+    ("/payment", 0.025, 0.0),
+    ("/payment/success", 0.015, 0.0),
+)
+POST_PAGES = 2000              # /community/post/<n> 롱테일 (Zipf)
+POST_SHARE = 0.22              # 이후 페이지 중 게시글 비율 (진입은 그 절반)
+
+SAJU_STATUSES = ("completed", "failed", "processing", "pending")
+SAJU_STATUS_P = np.array([0.88, 0.04, 0.05, 0.03])
+SURVEY_STATUSES = ("completed", "abandoned", "in_progress", "expired")
+SURVEY_STATUS_P = np.array([0.62, 0.25, 0.05, 0.08])
+ORDER_STATUSES = ("PAID", "PENDING", "CANCELLED", "FAILED")
+ORDER_STATUS_P = np.array([0.78, 0.10, 0.08, 0.04])
+PAYMENT_METHODS = ("카드", "간편결제", "계좌이체", "휴대폰")
+PAYMENT_METHOD_P = np.array([0.55, 0.3, 0.1, 0.05])
+# (주문 유형, 상품 id, 이름, 가격) - 앞쪽일수록 많이 팔림
+CATALOG = (
+    ("saju", 1, "사주 상세 풀이", 9900), ("saju", 2, "궁합 분석", 14900), ("saju", 3, "신년 운세", 19900),
+    ("saju", 4, "평생 사주 리포트", 49000), ("academy", 11, "사주 입문 강의", 99000),
+    ("academy", 12, "명리학 심화 과정", 290000), ("product", 21, "오행 팔찌", 39000),
+    ("product", 22, "행운 부적 세트", 25000), ("product", 23, "사주 다이어리", 18000),
+)
+INQUIRY_CATEGORIES = ("general", "technical", "billing", "other")
+INQUIRY_CATEGORY_P = np.array([0.5, 0.2, 0.2, 0.1])
+INQUIRY_TITLES = {
+    "general": ("사주 결과 문의", "회원 정보 변경", "서비스 이용 방법"),
+    "technical": ("결과 페이지가 열리지 않아요", "로그인 오류", "앱 화면 깨짐"),
+    "billing": ("결제 취소 요청", "중복 결제 환불", "영수증 발급"),
+    "other": ("제휴 문의", "기타 건의사항"),
+}
+
+# 이 저장소에 스키마가 없는 테이블 - 없을 때만 서비스 코드가 쓰는 컬럼으로 만든다
+FALLBACK_DDL = {
+    "survey_templates": """
+        CREATE TABLE IF NOT EXISTS survey_templates (
+            id SERIAL PRIMARY KEY, name VARCHAR(200) NOT NULL, description TEXT, category VARCHAR(50),
+            target_keywords INTEGER[] DEFAULT '{}', mpis_weights JSONB DEFAULT '{}', is_adaptive BOOLEAN DEFAULT true,
+            max_questions INTEGER DEFAULT 20, min_completion_rate FLOAT DEFAULT 0.8, is_active BOOLEAN DEFAULT true,
+            created_by INTEGER, created_at TIMESTAMP DEFAULT NOW(), updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """,
+    "survey_questions": """
+        CREATE TABLE IF NOT EXISTS survey_questions (
+            id SERIAL PRIMARY KEY, template_id INTEGER REFERENCES survey_templates(id), question_text TEXT NOT NULL,
+            question_type VARCHAR(30), category VARCHAR(50), primary_keywords INTEGER[] DEFAULT '{}',
+            secondary_keywords INTEGER[] DEFAULT '{}', display_conditions JSONB DEFAULT '{}',
+            importance_weight FLOAT DEFAULT 1.0, question_group VARCHAR(50), is_required BOOLEAN DEFAULT true,
+            validation_rules JSONB DEFAULT '{}', display_order INTEGER DEFAULT 0, is_active BOOLEAN DEFAULT true,
+            created_at TIMESTAMP DEFAULT NOW(), updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """,
+    "survey_sessions": """
+        CREATE TABLE IF NOT EXISTS survey_sessions (
+            id SERIAL PRIMARY KEY, session_uuid UUID UNIQUE NOT NULL, template_id INTEGER REFERENCES survey_templates(id),
+            user_id INTEGER, saju_result_id VARCHAR(100), birth_info JSONB DEFAULT '{}',
+            status VARCHAR(20) DEFAULT 'in_progress', progress_percentage FLOAT DEFAULT 0, current_question_id INTEGER,
+            ip_address INET, started_at TIMESTAMP DEFAULT NOW(), completed_at TIMESTAMP,
+            last_activity_at TIMESTAMP DEFAULT NOW(), current_keyword_scores JSONB DEFAULT '{}',
+            current_mpis_profile JSONB DEFAULT '{}', expires_at TIMESTAMP
+        )
+    """,
+    "survey_responses": """
+        CREATE TABLE IF NOT EXISTS survey_responses (
+            id SERIAL PRIMARY KEY, session_id INTEGER REFERENCES survey_sessions(id), question_id INTEGER,
+            response_value TEXT, selected_option_ids INTEGER[] DEFAULT '{}', keyword_impacts JSONB DEFAULT '{}',
+            response_time_seconds INTEGER, created_at TIMESTAMP DEFAULT NOW()
+        )
+    """,
+    "orders": """
+        CREATE TABLE IF NOT EXISTS orders (
+            id SERIAL PRIMARY KEY, order_id VARCHAR(100) UNIQUE NOT NULL, order_type VARCHAR(30), item_id INTEGER,
+            item_name VARCHAR(255), order_name VARCHAR(255), customer_name VARCHAR(100), customer_email VARCHAR(255),
+            customer_phone VARCHAR(30), total_amount INTEGER, quantity INTEGER DEFAULT 1, status VARCHAR(20),
+            payment_key VARCHAR(200), payment_method VARCHAR(50), created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """,
+    "inquiries": """
+        CREATE TABLE IF NOT EXISTS inquiries (
+            id SERIAL PRIMARY KEY, title VARCHAR(255), content TEXT, user_name VARCHAR(100), user_email VARCHAR(255),
+            user_phone VARCHAR(30), category VARCHAR(30) DEFAULT 'general', status VARCHAR(20) DEFAULT 'pending',
+            admin_reply TEXT, admin_name VARCHAR(100), replied_at TIMESTAMP, created_at TIMESTAMP DEFAULT NOW(),
+            updated_at TIMESTAMP DEFAULT NOW()
+        )
+    """,
+}
+
+# ==================== 공통 ====================
+
+class GenerationContext:
+    """기간 / 난수 / 사용자 풀 (일별 난수열은 (seed, 테이블, 날짜) 로 정해진다)"""
+
+    def __init__(self, seed: int, scale: float, days: int, end: date, growth: float):
+        self.seed = seed
+        self.scale = scale
+        self.start = end - timedelta(days=days - 1)
+        self.end = end
+        self.days = [self.start + timedelta(days=i) for i in range(days)]
+        rng = np.random.default_rng([seed, 0])
+        trend = np.exp(np.log(max(growth, 0.01)) * np.arange(days) / max(days - 1, 1))
+        weekday = np.array([WEEKDAY_WEIGHTS[day.weekday()] for day in self.days])
+        weights = trend * weekday * rng.lognormal(0, 0.08, days)
+        self.day_share = weights / weights.sum()
+        self.user_ids = np.zeros(0, dtype=np.int64)
+        self.user_created = np.zeros(0, dtype='datetime64[us]')
+
+    def rng(self, table: str, day: Optional[date] = None) -> np.random.Generator:
+        return np.random.default_rng([self.seed, TABLES.index(table) + 1, day.toordinal() if day else 0])
+
+    def rows(self, table: str) -> int:
+        return int(BASE_ROWS[table] * self.scale)
+
+    def day_rows(self, table: str, index: int) -> int:
+        return int(round(self.rows(table) * self.day_share[index]))
+
+    async def load_users(self, conn):
+        """가입 순서대로 사용자 id (그날까지 가입한 사용자만 고르기 위해)"""
+        rows = await conn.fetch("SELECT id, created_at FROM users ORDER BY created_at NULLS FIRST, id")
+        self.user_ids = np.array([row['id'] for row in rows], dtype=np.int64)
+        self.user_created = np.array(
+            [row['created_at'] or datetime(1970, 1, 1) for row in rows], dtype='datetime64[us]'
+        )
+
+    def pick_users(self, rng: np.random.Generator, day: date, size: int, logged_in: float) -> List[Optional[int]]:
+        """Zipf 활동량으로 그날 끝까지 가입한 사용자 중에서 고름 (비로그인은 None)"""
+        available = int(np.searchsorted(self.user_created, np.datetime64(day + timedelta(days=1)), side='left'))
+        if available == 0:
+            return [None] * size
+        ranks = (rng.zipf(1.3, size) - 1) % available
+        ids = self.user_ids[(ranks * 7919) % available]
+        ids[rng.random(size) >= logged_in] = -1
+        return [uid if uid >= 0 else None for uid in ids.tolist()]
+
+def times_of_day(rng: np.random.Generator, day: date, size: int) -> np.ndarray:
+    """시간대 가중치를 따르는 하루 안의 초"""
+    hours = rng.choice(24, size, p=HOUR_P)
+    return hours * 3600 + rng.uniform(0, 3600, size)
+
+def to_datetimes(day: date, seconds: np.ndarray) -> np.ndarray:
+    return np.datetime64(day, 'us') + (seconds * 1e6).astype(np.int64).astype('timedelta64[us]')
+
+def lognormal(rng: np.random.Generator, median: float, sigma: float, size: int,
+              low: float, high: float) -> np.ndarray:
+    return np.clip(rng.lognormal(np.log(median), sigma, size), low, high)
+
+def hex_ids(rng: np.random.Generator, size: int) -> List[str]:
+    return [f"{value:08x}" for value in rng.integers(0, 2 ** 32, size).tolist()]
+
+async def table_columns(conn, table: str) -> Dict[str, str]:
+    rows = await conn.fetch("""
+        SELECT attname, format_type(atttypid, atttypmod) AS type FROM pg_attribute
+        WHERE attrelid = $1::regclass AND attnum > 0 AND NOT attisdropped
+    """, table)
+    return {row['attname']: row['type'] for row in rows}
+
+def _converter(type_name: str) -> Optional[Callable[[Any], Any]]:
+    """스키마를 모르는 테이블의 컬럼 타입에 맞춰 값 변환"""
+    if type_name in ('json', 'jsonb'):
+        return lambda v: v if v is None or isinstance(v, str) else json.dumps(v, ensure_ascii=False)
+    if type_name.startswith(('character', 'text')):
+        return lambda v: v if v is None or isinstance(v, str) else (
+            json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else str(v))
+    if type_name.startswith('numeric'):
+        return lambda v: v if v is None else Decimal(str(v))
+    if type_name in ('double precision', 'real'):
+        return lambda v: v if v is None else float(v)
+    if type_name == 'uuid':
+        return lambda v: v if v is None or isinstance(v, uuid.UUID) else uuid.UUID(str(v))
+    return None
+
+async def copy_rows(conn, table: str, columns: Sequence[str], records: List[tuple], adapt: bool = False) -> int:
+    """COPY (adapt=True 면 테이블에 없는 컬럼은 빼고 값을 컬럼 타입에 맞춤)"""
+    if not records:
+        return 0
+    if adapt:
+        existing = await table_columns(conn, table)
+        keep = [i for i, column in enumerate(columns) if column in existing]
+        converters = [_converter(existing[columns[i]]) for i in keep]
+        columns = [columns[i] for i in keep]
+        records = [
+            tuple(conv(record[i]) if conv else record[i] for i, conv in zip(keep, converters))
+            for record in records
+        ]
+    await conn.copy_records_to_table(table, records=records, columns=list(columns))
+    return len(records)
+
+async def next_id(conn, table: str) -> int:
+    return (await conn.fetchval(f"SELECT COALESCE(MAX(id), 0) FROM {table}")) + 1
+
+async def sync_sequence(conn, table: str):
+    await conn.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST((SELECT MAX(id) FROM {table}), 1))"
+    )
+
+# ==================== 테이블별 생성 ====================
+
+async def generate_users(conn, ctx: GenerationContext) -> int:
+    """가입일: 30% 는 기간 전 1년에 고르게, 나머지는 기간의 일별 추세를 따름"""
+    rng = ctx.rng("users")
+    total = ctx.rows("users")
+    before = int(total * 0.3)
+    start = np.datetime64(ctx.start, 'us')
+    end = np.datetime64(ctx.end + timedelta(days=1), 'us')
+    day_index = rng.choice(len(ctx.days), total - before, p=ctx.day_share)
+    created = np.concatenate([
+        start - (rng.uniform(0, 365 * 86400, before) * 1e6).astype(np.int64).astype('timedelta64[us]'),
+        np.array([np.datetime64(ctx.days[i], 'us') for i in range(len(ctx.days))])[day_index]
+        + (times_of_day(rng, ctx.start, total - before) * 1e6).astype(np.int64).astype('timedelta64[us]'),
+    ])
+    created.sort()
+    span = (end - created).astype(np.int64)
+    last_login = created + (rng.random(total) * span).astype(np.int64).astype('timedelta64[us]')
+    logged_in = rng.random(total) < 0.8
+    ages = np.clip(rng.normal(34, 10, total), 18, 80).astype(int)
+    genders = np.where(rng.random(total) < 0.56, "여성", "남성")
+    regions = np.array(REGIONS)[rng.choice(len(REGIONS), total, p=REGION_P)]
+    statuses = rng.choice(np.array(["active", "inactive", "suspended"]), total, p=[0.95, 0.04, 0.01])
+
+    first_id = await next_id(conn, "users")
+    records = [
+        (first_id + i, f"synth{first_id + i}@heal7.test", f"synth{first_id + i}", age, gender, region,
+         created_at, login if has_login else None, status)
+        for i, (age, gender, region, created_at, login, has_login, status) in enumerate(zip(
+            ages.tolist(), genders.tolist(), regions.tolist(), created.tolist(),
+            last_login.tolist(), logged_in.tolist(), statuses.tolist()))
+    ]
+    await copy_rows(conn, "users", ("id", "email", "username", "age", "gender", "region",
+                                    "created_at", "last_login", "status"), records)
+    await sync_sequence(conn, "users")
+    return len(records)
+
+def _page_tables() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(경로, 이후 페이지 확률, 진입 페이지 확률) - 고정 페이지 + 게시글 Zipf 롱테일"""
+    paths = [path for path, _, _ in PAGES] + [f"/community/post/{n}" for n in range(1, POST_PAGES + 1)]
+    post = 1.0 / np.arange(1, POST_PAGES + 1) ** 1.1
+    post /= post.sum()
+    fixed = np.array([weight for _, weight, _ in PAGES])
+    entry = np.array([weight for _, _, weight in PAGES])
+    page_p = np.concatenate([fixed / fixed.sum() * (1 - POST_SHARE), post * POST_SHARE])
+    entry_p = np.concatenate([entry / entry.sum() * (1 - POST_SHARE / 2), post * POST_SHARE / 2])
+    return np.array(paths, dtype=object), page_p, entry_p
+
+PAGE_PATHS, PAGE_P, ENTRY_P = _page_tables()
+
+async def generate_page_analytics(conn, ctx: GenerationContext, progress: Callable[[int], None]) -> int:
+    total = 0
+    run = await next_id(conn, "page_analytics")   # 덧붙이는 실행의 세션 id 가 앞선 실행과 겹치지 않게
+    for index, day in enumerate(ctx.days):
+        rng = ctx.rng("page_analytics", day)
+        target = ctx.day_rows("page_analytics", index)
+        if target == 0:
+            continue
+        sessions = max(1, int(round(target * 0.3)))
+        pages = np.minimum(rng.geometric(0.3, sessions), 40)       # 세션당 페이지 수 (평균 약 3.3)
+        count = int(pages.sum())
+        starts = np.cumsum(pages) - pages
+        session_of = np.repeat(np.arange(sessions), pages)
+        position = np.arange(count) - starts[session_of]
+
+        time_on_page = lognormal(rng, 40, 0.9, count, 1, 1800).astype(np.int64)
+        elapsed = np.cumsum(time_on_page) - time_on_page
+        offset = elapsed - elapsed[starts][session_of]
+        timestamps = to_datetimes(day, times_of_day(rng, day, sessions)[session_of] + offset)
+
+        page_index = np.where(
+            position == 0,
+            rng.choice(len(PAGE_PATHS), count, p=ENTRY_P),
+            rng.choice(len(PAGE_PATHS), count, p=PAGE_P),
+        )
+        devices = np.array(DEVICES, dtype=object)[rng.choice(len(DEVICES), sessions, p=DEVICE_P)]
+        users = ctx.pick_users(rng, day, sessions, logged_in=0.35)
+        duration = np.full(count, -1, dtype=np.int64)
+        duration[starts + pages - 1] = np.add.reduceat(time_on_page, starts)
+        session_names = np.array(
+            [f"syn{ctx.seed}-{run}-{day:%Y%m%d}-{i}" for i in range(sessions)], dtype=object
+        )
+
+        session_list = session_of.tolist()
+        records = list(zip(
+            session_names[session_of].tolist(),
+            [users[s] for s in session_list],
+            PAGE_PATHS[page_index].tolist(),
+            devices[session_of].tolist(),
+            timestamps.tolist(),
+            timestamps.astype('datetime64[D]').tolist(),
+            time_on_page.tolist(),
+            (pages == 1)[session_of].tolist(),
+            [d if d >= 0 else None for d in duration.tolist()],
+        ))
+        total += await copy_rows(conn, "page_analytics", (
+            "session_id", "user_id", "page_path", "device_type", "timestamp", "date",
+            "time_on_page", "bounce", "session_duration"), records)
+        progress(total)
+    return total
+
+async def generate_saju_sessions(conn, ctx: GenerationContext, progress: Callable[[int], None]) -> int:
+    total = 0
+    run = await next_id(conn, "saju_analysis_sessions")
+    for index, day in enumerate(ctx.days):
+        rng = ctx.rng("saju_analysis_sessions", day)
+        count = ctx.day_rows("saju_analysis_sessions", index)
+        if count == 0:
+            continue
+        created = to_datetimes(day, times_of_day(rng, day, count))
+        statuses = np.array(SAJU_STATUSES, dtype=object)[rng.choice(len(SAJU_STATUSES), count, p=SAJU_STATUS_P)]
+        seconds = lognormal(rng, 2.5, 0.6, count, 0.2, 120)
+        finished = (statuses == "completed") | (statuses == "failed")
+        completed = created + (seconds * 1e6).astype(np.int64).astype('timedelta64[us]')
+        reviewed = rng.random(count) < 0.35
+        scores = rng.integers(40, 100, count)
+        elements = rng.choice(np.array(list("木火土金水"), dtype=object), count)
+        users = ctx.pick_users(rng, day, count, logged_in=0.7)
+
+        records = [
+            (user, f"saju{ctx.seed}-{run}-{day:%Y%m%d}-{i}", created_at,
+             completed_at if done else None, status, ai, timedelta(seconds=secs) if done else None,
+             json.dumps({"score": score, "element": element}, ensure_ascii=False) if status == "completed" else None)
+            for i, (user, created_at, completed_at, done, status, ai, secs, score, element) in enumerate(zip(
+                users, created.tolist(), completed.tolist(), finished.tolist(), statuses.tolist(),
+                reviewed.tolist(), seconds.tolist(), scores.tolist(), elements.tolist()))
+        ]
+        total += await copy_rows(conn, "saju_analysis_sessions", (
+            "user_id", "session_id", "created_at", "completed_at", "status", "ai_reviewed",
+            "processing_time", "result_data"), records)
+        progress(total)
+    return total
+
+async def generate_keyword_usage(conn, ctx: GenerationContext, keywords: int) -> int:
+    """키워드 인기 Zipf × 일별 추세 포아송 사용 수 (기존 (keyword_id, date) 는 더함)"""
+    keyword_ids = await conn.fetch("SELECT id FROM keywords ORDER BY id") \
+        if await conn.fetchval("SELECT to_regclass('keywords') IS NOT NULL") else []
+    ids = np.array([row['id'] for row in keyword_ids] or range(1, keywords + 1), dtype=np.int64)
+    rng = ctx.rng("keyword_usage_stats")
+    popularity = 1.0 / rng.permutation(np.arange(1, len(ids) + 1)) ** 1.1
+    mean_share = ctx.day_share.mean()
+
+    records = []
+    for index, day in enumerate(ctx.days):
+        day_rng = ctx.rng("keyword_usage_stats", day)
+        usage = day_rng.poisson(KEYWORD_DAILY_USAGE * ctx.scale * popularity * ctx.day_share[index] / mean_share)
+        used = usage > 0
+        records.extend(zip(ids[used].tolist(), [day] * int(used.sum()), usage[used].tolist()))
+
+    async with conn.transaction():
+        await conn.execute("""
+            CREATE TEMP TABLE synthetic_keyword_usage (keyword_id INTEGER, date DATE, usage_count INTEGER)
+            ON COMMIT DROP
+        """)
+        await copy_rows(conn, "synthetic_keyword_usage", ("keyword_id", "date", "usage_count"), records)
+        await conn.execute("""
+            INSERT INTO keyword_usage_stats AS k (keyword_id, date, usage_count, status)
+            SELECT keyword_id, date, usage_count, 'active' FROM synthetic_keyword_usage
+            ON CONFLICT (keyword_id, date) DO UPDATE SET usage_count = k.usage_count + EXCLUDED.usage_count
+        """)
+    return len(records)
+
+async def ensure_fallback_tables(conn, tables: Sequence[str]):
+    for table in tables:
+        if await conn.fetchval("SELECT to_regclass($1) IS NULL", table):
+            print(f"  {table}: 테이블이 없어 최소 스키마로 생성")
+            await conn.execute(FALLBACK_DDL[table])
+
+async def survey_templates(conn, ctx: GenerationContext) -> List[Tuple[int, List[int]]]:
+    """활성 템플릿과 질문 id 목록 (질문 있는 템플릿이 없으면 6개 x 20문항 생성)"""
+    query = """
+        SELECT st.id, array_agg(sq.id ORDER BY sq.display_order, sq.id) AS questions
+        FROM survey_templates st JOIN survey_questions sq ON sq.template_id = st.id
+        WHERE st.is_active AND sq.is_active GROUP BY st.id ORDER BY st.id
+    """
+    templates = await conn.fetch(query)
+    if not templates:
+        rng = ctx.rng("survey")
+        categories = ("mpis", "saju_psychology", "custom")
+        template_id = await next_id(conn, "survey_templates")
+        question_id = await next_id(conn, "survey_questions")
+        template_rows, question_rows = [], []
+        for t in range(6):
+            template_rows.append((template_id + t, f"합성 설문 {t + 1}", "벤치마크용 합성 템플릿",
+                                  categories[t % 3], [], {}, True, 20, 0.8, True, datetime.now()))
+            for q in range(20):
+                question_rows.append((
+                    question_id, template_id + t, f"합성 질문 {t + 1}-{q + 1}: 다음 중 가장 가까운 것은?",
+                    "scale" if q % 3 else "single_choice", categories[t % 3],
+                    rng.integers(1, 443, 2).tolist(), [], {}, 1.0, f"group{q // 5}", True, {}, q + 1, True,
+                    datetime.now()))
+                question_id += 1
+        await copy_rows(conn, "survey_templates", (
+            "id", "name", "description", "category", "target_keywords", "mpis_weights", "is_adaptive",
+            "max_questions", "min_completion_rate", "is_active", "created_at"), template_rows, adapt=True)
+        await copy_rows(conn, "survey_questions", (
+            "id", "template_id", "question_text", "question_type", "category", "primary_keywords",
+            "secondary_keywords", "display_conditions", "importance_weight", "question_group", "is_required",
+            "validation_rules", "display_order", "is_active", "created_at"), question_rows, adapt=True)
+        await sync_sequence(conn, "survey_templates")
+        await sync_sequence(conn, "survey_questions")
+        templates = await conn.fetch(query)
+    return [(row['id'], list(row['questions'])) for row in templates]
+
+async def generate_survey(conn, ctx: GenerationContext, progress: Callable[[int], None]) -> Dict[str, int]:
+    await ensure_fallback_tables(conn, ("survey_templates", "survey_questions", "survey_sessions", "survey_responses"))
+    templates = await survey_templates(conn, ctx)
+    template_weights = 1.0 / np.arange(1, len(templates) + 1) ** 0.8
+    template_weights /= template_weights.sum()
+    question_counts = np.array([len(questions) for _, questions in templates])
+    question_matrix = np.zeros((len(templates), question_counts.max()), dtype=np.int64)
+    for t, (_, questions) in enumerate(templates):
+        question_matrix[t, :len(questions)] = questions
+
+    session_id = await next_id(conn, "survey_sessions")
+    totals = {"survey_sessions": 0, "survey_responses": 0}
+    for index, day in enumerate(ctx.days):
+        rng = ctx.rng("survey", day)
+        count = ctx.day_rows("survey", index)
+        if count == 0:
+            continue
+        template_index = rng.choice(len(templates), count, p=template_weights)
+        statuses = np.array(SURVEY_STATUSES, dtype=object)[rng.choice(len(SURVEY_STATUSES), count, p=SURVEY_STATUS_P)]
+        progress_pct = np.where(statuses == "completed", 100.0, np.round(rng.uniform(5, 95, count), 1))
+        answered = np.minimum(
+            np.round(progress_pct / 100 * question_counts[template_index]).astype(np.int64),
+            question_counts[template_index]
+        )
+        started = times_of_day(rng, day, count)
+
+        # 응답: 세션마다 질문 순서대로, 응답 시간 로그정규
+        rows = int(answered.sum())
+        starts = np.cumsum(answered) - answered
+        session_of = np.repeat(np.arange(count), answered)
+        position = np.arange(rows) - starts[session_of]
+        response_seconds = lognormal(rng, 9, 0.7, rows, 1, 600).astype(np.int64)
+        elapsed = np.cumsum(response_seconds)
+        offset = elapsed - (elapsed - response_seconds)[starts][session_of]
+        response_times = to_datetimes(day, started[session_of] + offset)
+        finished_offset = np.zeros(count)
+        has_answers = answered > 0
+        finished_offset[has_answers] = offset[(starts + answered - 1)[has_answers]]
+        last_activity = to_datetimes(day, started + finished_offset)
+        started_at = to_datetimes(day, started)
+
+        ids = np.arange(session_id, session_id + count)
+        session_id += count
+        uuids = [uuid.uuid5(SYNTHETIC_UUID_NAMESPACE, f"{ctx.seed}:{sid}") for sid in ids.tolist()]
+        users = ctx.pick_users(rng, day, count, logged_in=0.6)
+        session_records = [
+            (sid, uid, templates[t][0], user, {}, status, pct, started_at_, last, last if status == "completed" else None,
+             {}, {}, started_at_ + timedelta(days=7))
+            for sid, uid, t, user, status, pct, started_at_, last in zip(
+                ids.tolist(), uuids, template_index.tolist(), users, statuses.tolist(),
+                progress_pct.tolist(), started_at.tolist(), last_activity.tolist())
+        ]
+        answers = rng.integers(1, 6, rows)
+        response_records = list(zip(
+            ids[session_of].tolist(),
+            question_matrix[template_index[session_of], position].tolist(),
+            [str(a) for a in answers.tolist()],
+            [[] for _ in range(rows)],
+            ["{}"] * rows,
+            response_seconds.tolist(),
+            response_times.tolist(),
+        ))
+        totals["survey_sessions"] += await copy_rows(conn, "survey_sessions", (
+            "id", "session_uuid", "template_id", "user_id", "birth_info", "status", "progress_percentage",
+            "started_at", "last_activity_at", "completed_at", "current_keyword_scores", "current_mpis_profile",
+            "expires_at"), session_records, adapt=True)
+        totals["survey_responses"] += await copy_rows(conn, "survey_responses", (
+            "session_id", "question_id", "response_value", "selected_option_ids", "keyword_impacts",
+            "response_time_seconds", "created_at"), response_records, adapt=True)
+        progress(totals["survey_sessions"])
+    await sync_sequence(conn, "survey_sessions")
+    return totals
+
+async def generate_orders(conn, ctx: GenerationContext) -> int:
+    await ensure_fallback_tables(conn, ("orders",))
+    item_p = 1.0 / np.arange(1, len(CATALOG) + 1) ** 1.2
+    item_p /= item_p.sum()
+    order_no = await next_id(conn, "orders")   # order_id 는 실행 시작 id 부터 이어지는 주문 번호
+    total = 0
+    for index, day in enumerate(ctx.days):
+        rng = ctx.rng("orders", day)
+        count = ctx.day_rows("orders", index)
+        if count == 0:
+            continue
+        items = rng.choice(len(CATALOG), count, p=item_p)
+        quantity = np.where(rng.random(count) < 0.9, 1, rng.integers(2, 4, count))
+        statuses = np.array(ORDER_STATUSES, dtype=object)[rng.choice(len(ORDER_STATUSES), count, p=ORDER_STATUS_P)]
+        methods = np.array(PAYMENT_METHODS, dtype=object)[rng.choice(len(PAYMENT_METHODS), count, p=PAYMENT_METHOD_P)]
+        created = to_datetimes(day, times_of_day(rng, day, count))
+        updated = created + (lognormal(rng, 90, 1.0, count, 5, 86400) * 1e6).astype(np.int64).astype('timedelta64[us]')
+        phones = rng.integers(0, 10 ** 8, count)
+        users = ctx.pick_users(rng, day, count, logged_in=0.85)
+
+        records = []
+        for i, (item, qty, status, method, created_at, updated_at, phone, user, suffix, key) in enumerate(zip(
+                items.tolist(), quantity.tolist(), statuses.tolist(), methods.tolist(), created.tolist(),
+                updated.tolist(), phones.tolist(), users, hex_ids(rng, count), hex_ids(rng, count))):
+            order_type, item_id, name, price = CATALOG[item]
+            paid = status == "PAID"
+            customer = f"synth{user}" if user else f"guest{suffix[:4]}"
+            number = order_no + i
+            records.append((
+                f"ORDER_{day:%Y%m%d}_{number:08d}", order_type, item_id, name, name if qty == 1 else f"{name} - {qty}개",
+                customer, f"{customer}@heal7.test", f"010-{phone // 10000:04d}-{phone % 10000:04d}",
+                price * qty, qty, status, f"pk_{number:08d}{key}" if paid else None, method if paid else None,
+                created_at, updated_at if status != "PENDING" else created_at
+            ))
+        order_no += count
+        total += await copy_rows(conn, "orders", (
+            "order_id", "order_type", "item_id", "item_name", "order_name", "customer_name", "customer_email",
+            "customer_phone", "total_amount", "quantity", "status", "payment_key", "payment_method",
+            "created_at", "updated_at"), records, adapt=True)
+    return total
+
+async def generate_inquiries(conn, ctx: GenerationContext) -> int:
+    """최근 문의일수록 미답변 (답변 확률 1 - exp(-경과일 / 2))"""
+    await ensure_fallback_tables(conn, ("inquiries",))
+    now = np.datetime64(ctx.end + timedelta(days=1), 'us')
+    total = 0
+    for index, day in enumerate(ctx.days):
+        rng = ctx.rng("inquiries", day)
+        count = ctx.day_rows("inquiries", index)
+        if count == 0:
+            continue
+        categories = np.array(INQUIRY_CATEGORIES, dtype=object)[
+            rng.choice(len(INQUIRY_CATEGORIES), count, p=INQUIRY_CATEGORY_P)]
+        created = to_datetimes(day, times_of_day(rng, day, count))
+        replied = created + (lognormal(rng, 6 * 3600, 1.0, count, 300, 7 * 86400) * 1e6).astype(np.int64) \
+            .astype('timedelta64[us]')
+        age_days = (now - created).astype(np.int64) / 86400e6
+        answered = (rng.random(count) < 1 - np.exp(-age_days / 2)) & (replied < now)
+        picks = rng.integers(0, 3, count)
+        users = ctx.pick_users(rng, day, count, logged_in=0.9)
+
+        records = []
+        for category, created_at, replied_at, done, pick, user in zip(
+                categories.tolist(), created.tolist(), replied.tolist(), answered.tolist(), picks.tolist(), users):
+            titles = INQUIRY_TITLES[category]
+            name = f"synth{user}" if user else "비회원"
+            records.append((
+                titles[pick % len(titles)], f"{titles[pick % len(titles)]} 관련해서 확인 부탁드립니다.",
+                name, f"{name}@heal7.test" if user else None, None, category,
+                "answered" if done else "pending", "확인 후 처리해 드렸습니다." if done else None,
+                "관리자" if done else None, replied_at if done else None, created_at,
+                replied_at if done else created_at
+            ))
+        total += await copy_rows(conn, "inquiries", (
+            "title", "content", "user_name", "user_email", "user_phone", "category", "status", "admin_reply",
+            "admin_name", "replied_at", "created_at", "updated_at"), records, adapt=True)
+    return total
+
+# ==================== 실행 ====================
+
+TRUNCATE_TARGETS = {
+    "users": ("users",),
+    "page_analytics": ("page_analytics",),
+    "saju_analysis_sessions": ("saju_analysis_sessions",),
+    "keyword_usage_stats": ("keyword_usage_stats",),
+    "survey": ("survey_responses", "survey_sessions"),
+    "orders": ("orders",),
+    "inquiries": ("inquiries",),
+}
+
+async def populate(conn, ctx: GenerationContext, tables: Sequence[str], truncate: bool = False,
+                   keep_triggers: bool = False, keywords: int = 442, rebuild_rollups: bool = True) -> Dict[str, int]:
+    """선택한 테이블을 채우고 테이블별 행 수를 돌려줌 (다른 벤치마크 스크립트에서도 호출)"""
+    if truncate:
+        targets = [t for table in tables for t in TRUNCATE_TARGETS[table]
+                   if await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", t)]
+        if targets:
+            await conn.execute(f"TRUNCATE {', '.join(targets)} RESTART IDENTITY CASCADE")
+
+    # 기간 전체에 파티션 (없으면 default 파티션에 몰림)
+    for spec in PARTITIONED_TABLES:
+        if spec.table in tables and await is_partitioned(conn, spec.table):
+            async with conn.transaction():
+                await analytics_partitions.ensure_partitions(conn, spec, ctx.start, ctx.end)
+
+    triggers_off = False
+    if not keep_triggers:
+        try:
+            await conn.execute("SET session_replication_role = replica")
+            triggers_off = True
+        except Exception as e:
+            print(f"  트리거를 끌 수 없어 켠 채로 넣습니다 ({e})")
+
+    counts: Dict[str, int] = {}
+    try:
+        if "users" in tables:
+            counts["users"] = await timed_step("users", generate_users(conn, ctx))
+        await ctx.load_users(conn)
+        for table, generator in (("page_analytics", generate_page_analytics),
+                                 ("saju_analysis_sessions", generate_saju_sessions)):
+            if table in tables:
+                counts[table] = await timed_step(table, generator(conn, ctx, progress_printer(table, ctx.rows(table))))
+        if "keyword_usage_stats" in tables:
+            counts["keyword_usage_stats"] = await timed_step("keyword_usage_stats",
+                                                             generate_keyword_usage(conn, ctx, keywords))
+        if "survey" in tables:
+            survey = await timed_step("survey", generate_survey(conn, ctx, progress_printer("survey", ctx.rows("survey"))))
+            counts.update(survey)
+        if "orders" in tables:
+            counts["orders"] = await timed_step("orders", generate_orders(conn, ctx))
+        if "inquiries" in tables:
+            counts["inquiries"] = await timed_step("inquiries", generate_inquiries(conn, ctx))
+    finally:
+        if triggers_off:
+            await conn.execute("RESET session_replication_role")
+
+    analytics = {"page_analytics", "saju_analysis_sessions"} & set(tables)
+    if analytics and (triggers_off or truncate) and rebuild_rollups:
+        aggregator = AnalyticsRollupAggregator()
+        await aggregator.ensure_tables(conn)
+        await timed_step("rollup backfill", aggregator.backfill(conn))
+        await aggregator.sync_sketches(conn)
+
+    for table in [t for table in tables for t in TRUNCATE_TARGETS[table]]:
+        if await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", table):
+            await conn.execute(f"ANALYZE {table}")
+    return counts
+
+def progress_printer(table: str, expected: int) -> Callable[[int], None]:
+    started = time.perf_counter()
+    state = {"last": 0.0}
+
+    def report(rows: int):
+        elapsed = time.perf_counter() - started
+        if elapsed - state["last"] >= 5:
+            state["last"] = elapsed
+            print(f"  {table}: {rows:,} / ~{expected:,} ({rows / elapsed:,.0f} rows/s)", flush=True)
+    return report
+
+async def timed_step(name: str, coro):
+    started = time.perf_counter()
+    result = await coro
+    elapsed = time.perf_counter() - started
+    rows = result if isinstance(result, int) else sum(result.values()) if isinstance(result, dict) else None
+    rate = f", {rows / elapsed:,.0f} rows/s" if rows else ""
+    print(f"✓ {name}: {result if not isinstance(result, int) else f'{result:,}'} ({elapsed:.1f}s{rate})", flush=True)
+    return result
+
+async def main():
+    parser = argparse.ArgumentParser(description="벤치마크용 합성 데이터 생성 (COPY)")
+    parser.add_argument("--scale", type=float, default=1.0, help="행 수 배율 (1 = 페이지뷰 200만)")
+    parser.add_argument("--days", type=int, default=90, help="생성 기간 (일)")
+    parser.add_argument("--end", type=date.fromisoformat, default=date.today(), help="마지막 날짜 (YYYY-MM-DD)")
+    parser.add_argument("--growth", type=float, default=2.0, help="기간 동안 일별 양이 늘어나는 배수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="+", choices=TABLES, default=list(TABLES), help="생성할 테이블")
+    parser.add_argument("--keywords", type=int, default=442, help="keywords 테이블이 없을 때 키워드 id 수")
+    parser.add_argument("--truncate", action="store_true", help="대상 테이블을 먼저 비움 (CASCADE)")
+    parser.add_argument("--keep-triggers", action="store_true", help="COPY 동안 롤업/실시간 트리거를 끄지 않음")
+    parser.add_argument("--skip-rollups", action="store_true", help="끝난 뒤 롤업 백필 생략")
+    args = parser.parse_args()
+
+    ctx = GenerationContext(args.seed, args.scale, args.days, args.end, args.growth)
+    print(f"기간 {ctx.start} ~ {ctx.end}, scale {args.scale}, seed {args.seed}")
+    print("예상 행 수: " + ", ".join(f"{t} ~{ctx.rows(t):,}" for t in BASE_ROWS if t in args.only))
+
+    # 테이블 / 파티션 / 트리거 준비 (풀 연결로 한 번)
+    await db.init()
+    try:
+        await DatabaseManager.ensure_analytics_tables()
+    finally:
+        await db.close()
+
+    started = time.perf_counter()
+    conn = await connect_direct()
+    try:
+        counts = await populate(conn, ctx, args.only, truncate=args.truncate, keep_triggers=args.keep_triggers,
+                                keywords=args.keywords, rebuild_rollups=not args.skip_rollups)
+    finally:
+        await conn.close()
+    total = sum(counts.values())
+    print(f"\n✅ {total:,}행 생성 ({time.perf_counter() - started:.1f}s): {counts}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
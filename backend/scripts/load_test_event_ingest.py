@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+이벤트 수집 부하 테스트
+실행 중인 서버의 POST /admin-api/analytics/events 에 동시 클라이언트 여러 개로 페이지뷰 배치를 계속 보내고
+초당 이벤트 수, 요청 지연(p50/p95/p99), 429(버퍼 가득) 횟수를 잰다.
+끝나면 서버 버퍼가 빌 때까지 기다린 뒤 page_analytics 에 늘어난 행 수가 수락된 이벤트 수와 같은지 확인하고,
+다르면 종료 코드 1 (DB_* 환경변수가 서버와 같은 Postgres 를 가리켜야 함, --no-verify 로 생략).
+
+--compare-executemany 는 같은 수의 행을 기존 seed_sample_data 방식(executemany INSERT)으로 넣어 비교한다.
+
+단일 워커 측정 예 (backend 디렉토리에서):
+    uvicorn main:app --port 8000 --workers 1
+    python scripts/load_test_event_ingest.py --url http://127.0.0.1:8000 --duration 20 --concurrency 16 --batch 200
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import aiohttp
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import connect_direct
+
+PAGES = ["/", "/saju/free", "/saju/detail", "/keywords", "/register", "/profile", "/payment", "/payment/success"]
+DEVICES = ["mobile", "desktop", "tablet"]
+
+def make_batch(rng: random.Random, size: int, sessions: int, users: int, prefix: str) -> Dict[str, Any]:
+    pageviews = []
+    for _ in range(size):
+        session = rng.randrange(sessions)
+        pageviews.append({
+            "session_id": f"{prefix}_{session}",
+            "user_id": session % users + 1 if session % 3 else None,
+            "page_path": rng.choice(PAGES),
+            "device_type": DEVICES[session % len(DEVICES)],
+            "time_on_page": rng.randrange(5, 300),
+            "bounce": rng.random() < 0.1,
+        })
+    return {"pageviews": pageviews}
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def client(session: aiohttp.ClientSession, url: str, deadline: float, args, seed: int,
+                 latencies: List[float], counters: Dict[str, int]):
+    rng = random.Random(seed)
+    while time.perf_counter() < deadline:
+        batch = make_batch(rng, args.batch, args.sessions, args.users, args.prefix)
+        started = time.perf_counter()
+        async with session.post(url, json=batch) as response:
+            await response.read()
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status == 202:
+                counters["accepted"] += args.batch
+            elif response.status == 429:
+                counters["throttled"] += 1
+                await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+            else:
+                counters["errors"] += 1
+
+async def wait_for_flush(session: aiohttp.ClientSession, base_url: str, timeout: float = 30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        async with session.get(f"{base_url}/admin-api/analytics/events/stats") as response:
+            stats = await response.json()
+        if stats.get("pending", 0) == 0:
+            return stats
+        await asyncio.sleep(0.2)
+    return stats
+
+async def count_rows(prefix: str) -> int:
+    conn = await connect_direct()
+    try:
+        return await conn.fetchval("SELECT COUNT(*) FROM page_analytics WHERE session_id LIKE $1", f"{prefix}\\_%")
+    finally:
+        await conn.close()
+
+async def executemany_baseline(rows: int, args) -> float:
+    """seed_sample_data 와 같은 executemany INSERT 로 같은 수의 행을 넣는 데 걸린 초"""
+    rng = random.Random(args.seed)
+    now = datetime.now()
+    records = [
+        (p["session_id"], p["user_id"], p["page_path"], p["device_type"], now, p["time_on_page"], p["bounce"])
+        for p in make_batch(rng, rows, args.sessions, args.users, f"{args.prefix}em")["pageviews"]
+    ]
+    conn = await connect_direct()
+    try:
+        started = time.perf_counter()
+        await conn.executemany("""
+            INSERT INTO page_analytics
+            (session_id, user_id, page_path, device_type, timestamp, time_on_page, bounce)
+            VALUES ($1, $2, $3, $4, $5, $6, $7)
+        """, records)
+        return time.perf_counter() - started
+    finally:
+        await conn.close()
+
+async def main():
+    parser = argparse.ArgumentParser(description="이벤트 수집 부하 테스트")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, default=20, help="측정 시간 (초)")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 클라이언트 수")
+    parser.add_argument("--batch", type=int, default=200, help="요청당 페이지뷰 수")
+    parser.add_argument("--sessions", type=int, default=20000, help="세션 id 범위")
+    parser.add_argument("--users", type=int, default=1000, help="user_id 범위 (users 테이블에 없는 id 는 NULL 로 저장)")
+    parser.add_argument("--prefix", default=f"lt{int(time.time())}", help="이번 실행 세션 id 접두사")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--no-verify", action="store_true", help="page_analytics 행 수 확인 생략")
+    parser.add_argument("--compare-executemany", action="store_true")
+    args = parser.parse_args()
+
+    url = f"{args.url}/admin-api/analytics/events"
+    latencies: List[float] = []
+    counters = {"accepted": 0, "throttled": 0, "errors": 0}
+    before = 0 if args.no_verify else await count_rows(args.prefix)
+
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            client(session, url, deadline, args, args.seed + i, latencies, counters)
+            for i in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+        flush_started = time.perf_counter()
+        stats = await wait_for_flush(session, args.url)
+        drain_seconds = time.perf_counter() - flush_started
+
+    print(f"duration {elapsed:.1f}s, concurrency {args.concurrency}, batch {args.batch}")
+    print(f"requests {len(latencies):,}  accepted events {counters['accepted']:,}  "
+          f"429 {counters['throttled']:,}  errors {counters['errors']:,}")
+    print(f"throughput {counters['accepted'] / elapsed:,.0f} events/s  ({len(latencies) / elapsed:,.0f} req/s)")
+    print(f"latency p50 {percentile(latencies, 0.5):.1f}ms  p95 {percentile(latencies, 0.95):.1f}ms  "
+          f"p99 {percentile(latencies, 0.99):.1f}ms")
+    print(f"server: flushes {stats.get('flushes', 0)}, avg flush {stats.get('avg_flush_ms')}ms, "
+          f"backpressure waits {stats.get('backpressure_waits', 0)}, buffer drained in {drain_seconds:.1f}s")
+
+    if args.compare_executemany:
+        seconds = await executemany_baseline(counters["accepted"] or args.batch, args)
+        print(f"executemany baseline: {counters['accepted'] or args.batch:,} rows in {seconds:.1f}s "
+              f"({(counters['accepted'] or args.batch) / seconds:,.0f} rows/s, one connection)")
+
+    if not args.no_verify:
+        stored = await count_rows(args.prefix) - before
+        if stored != counters["accepted"]:
+            print(f"\n❌ page_analytics 에 {stored:,}행 저장 (수락 {counters['accepted']:,})")
+            sys.exit(1)
+        print(f"\n✅ 수락된 이벤트 {stored:,}건이 모두 page_analytics 에 저장됨")
+
+if __name__ == "__main__":
+    asyncio.run(main())
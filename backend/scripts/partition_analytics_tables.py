@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+page_analytics / saju_analysis_sessions 를 시간 RANGE 파티션 테이블로 옮기기 (한 번만 실행)
+
+한 트랜잭션 안에서 테이블별로
+    1. 기존 테이블에 ACCESS EXCLUSIVE 잠금 후 이름(테이블/인덱스/제약/시퀀스)에 _unpartitioned 를 붙이고
+    2. 같은 이름의 파티션 부모 테이블과 default 파티션, 기존 데이터 기간 ~ 현재 + premake 파티션을 만들고
+    3. 행을 옮긴 뒤 (파티션 키가 NULL 인 행은 page_analytics 는 timestamp 날짜, 사주 세션은 completed_at/현재 시각)
+    4. id 시퀀스를 이어받고 BRIN/B-tree 인덱스를 만들고
+    5. 롤업 / 실시간 지표 트리거를 새 테이블에 다시 건다 (옮기는 동안 트리거가 없어 롤업은 그대로).
+--keep-old 가 없으면 기존 테이블은 삭제한다. 실행하는 동안 두 테이블의 읽기/쓰기는 대기한다.
+
+기본은 계획만 출력하고, --execute 를 줘야 실제로 옮긴다.
+
+사용법 (backend 디렉토리에서 실행, DB_* 환경변수로 Postgres 지정):
+    python scripts/partition_analytics_tables.py
+    python scripts/partition_analytics_tables.py --execute
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from services.database_manager import connect_direct
+from services.analytics_partitions import (
+    PARTITIONED_INDEX_DDL, PARTITIONED_TABLE_DDL, PARTITIONED_TABLES, AnalyticsPartitionManager, is_partitioned
+)
+from services.analytics_rollups import AnalyticsRollupAggregator
+from services.realtime_metrics import RealtimeMetrics
+
+OLD_SUFFIX = "_unpartitioned"
+
+# 옮길 때 파티션 키가 NULL 인 행의 대체 값
+KEY_FALLBACK = {
+    "page_analytics": "COALESCE(date, timestamp::date, CURRENT_DATE)",
+    "saju_analysis_sessions": "COALESCE(created_at, completed_at, LOCALTIMESTAMP)",
+}
+
+async def data_range(conn, table: str):
+    return await conn.fetchrow(
+        f"SELECT COUNT(*) AS rows, MIN({KEY_FALLBACK[table]})::date AS first, "
+        f"MAX({KEY_FALLBACK[table]})::date AS last FROM {table}"
+    )
+
+async def rename_old(conn, table: str):
+    """기존 테이블/인덱스/제약/시퀀스 이름 비우기 (새 테이블이 같은 이름을 쓴다)"""
+    for row in await conn.fetch("SELECT indexname FROM pg_indexes WHERE tablename = $1", table):
+        await conn.execute(f'ALTER INDEX "{row["indexname"]}" RENAME TO "{row["indexname"][:48]}{OLD_SUFFIX}"')
+    for row in await conn.fetch(
+        "SELECT conname FROM pg_constraint WHERE conrelid = $1::regclass AND contype IN ('f', 'c')", table
+    ):
+        await conn.execute(
+            f'ALTER TABLE {table} RENAME CONSTRAINT "{row["conname"]}" TO "{row["conname"][:48]}{OLD_SUFFIX}"'
+        )
+    sequence = await conn.fetchval("SELECT pg_get_serial_sequence($1, 'id')", table)
+    if sequence:
+        await conn.execute(f"ALTER SEQUENCE {sequence} RENAME TO {sequence.split('.')[-1]}{OLD_SUFFIX}")
+    # 롤업/실시간 트리거는 새 테이블에 다시 건다
+    for row in await conn.fetch(
+        "SELECT tgname FROM pg_trigger WHERE tgrelid = $1::regclass AND NOT tgisinternal", table
+    ):
+        await conn.execute(f'DROP TRIGGER "{row["tgname"]}" ON {table}')
+    await conn.execute(f"ALTER TABLE {table} RENAME TO {table}{OLD_SUFFIX}")
+
+async def migrate_table(conn, manager: AnalyticsPartitionManager, spec, keep_old: bool):
+    table = spec.table
+    await conn.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+    info = await data_range(conn, table)
+    await rename_old(conn, table)
+    old = f"{table}{OLD_SUFFIX}"
+
+    await conn.execute(PARTITIONED_TABLE_DDL[table])
+    first = info['first'] or date.today()
+    horizon = manager.period_start(date.today())
+    for _ in range(manager.premake):
+        horizon = manager.next_period(horizon)
+    result = await manager.ensure_partitions(conn, spec, min(first, date.today()), max(info['last'] or horizon, horizon))
+
+    columns = [row['attname'] for row in await conn.fetch("""
+        SELECT attname FROM pg_attribute
+        WHERE attrelid = $1::regclass AND attnum > 0 AND NOT attisdropped ORDER BY attnum
+    """, table)]
+    select = ", ".join(KEY_FALLBACK[table] if column == spec.column else column for column in columns)
+    copied = await conn.fetchval(f"""
+        WITH copied AS (INSERT INTO {table} ({', '.join(columns)}) SELECT {select} FROM {old} RETURNING 1)
+        SELECT COUNT(*) FROM copied
+    """)
+    await conn.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), GREATEST((SELECT MAX(id) FROM {old}), 1))"
+    )
+    for sql in PARTITIONED_INDEX_DDL[table]:
+        await conn.execute(sql)
+    if not keep_old:
+        await conn.execute(f"DROP TABLE {old}")
+    if copied != info['rows']:
+        raise RuntimeError(f"{table}: {info['rows']}행 중 {copied}행만 옮겨짐")
+    return {"rows": copied, "partitions": len(result["created"]), "kept_old": old if keep_old else None}
+
+async def main():
+    parser = argparse.ArgumentParser(description="analytics 원본 테이블을 시간 파티션 테이블로 옮기기")
+    parser.add_argument("--execute", action="store_true", help="실제로 옮김 (없으면 계획만 출력)")
+    parser.add_argument("--keep-old", action="store_true", help=f"기존 테이블을 <테이블>{OLD_SUFFIX} 로 남김")
+    args = parser.parse_args()
+
+    manager = AnalyticsPartitionManager()
+    conn = await connect_direct()
+    try:
+        targets = []
+        for spec in PARTITIONED_TABLES:
+            if await conn.fetchval("SELECT to_regclass($1) IS NULL", spec.table):
+                print(f"{spec.table}: 테이블 없음 (ensure_analytics_tables 가 파티션 테이블로 만든다)")
+            elif await is_partitioned(conn, spec.table):
+                print(f"{spec.table}: 이미 파티션 테이블")
+            else:
+                info = await data_range(conn, spec.table)
+                periods = manager.periods(info['first'] or date.today(), info['last'] or date.today())
+                print(f"{spec.table}: {info['rows']:,}행, {info['first']} ~ {info['last']} "
+                      f"→ {manager.interval} 파티션 {len(periods)}개 + 미리 만들 {manager.premake}개")
+                targets.append(spec)
+
+        if not targets or not args.execute:
+            if targets:
+                print("\n--execute 로 실행하세요")
+            return
+
+        started = time.perf_counter()
+        async with conn.transaction():
+            for spec in targets:
+                result = await migrate_table(conn, manager, spec, args.keep_old)
+                print(f"{spec.table}: {result}")
+            # 새 부모 테이블에 롤업 / 실시간 지표 트리거
+            await AnalyticsRollupAggregator.ensure_tables(conn)
+            await RealtimeMetrics.ensure_tables(conn)
+        print(f"\n✅ 완료 ({time.perf_counter() - started:.1f}s)")
+    finally:
+        await conn.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,191 @@
+"""
+HEAL7 Analytics 전환 퍼널
+세션별 퍼널 단계 비트마스크(analytics_session_funnels)를 이벤트가 들어올 때마다 갱신하고,
+퍼널 단계별 세션 수는 그 테이블의 비트 집계로 구한다.
+
+- 퍼널 정의는 (단계 키, 화면 표시 이름, page_path LIKE 패턴) 의 순서 있는 목록이다.
+  기본은 CONVERSION_FUNNEL 하나이고, ANALYTICS_FUNNELS_FILE 로 JSON 파일을 주면 그 정의를 쓴다:
+      {"conversion": [["home", "홈페이지 방문", "/"], ["saju", "사주 페이지 조회", "/saju%"], ...]}
+  i 번째 단계가 비트 i 이며 퍼널당 최대 31단계.
+- 정의는 시작할 때 한 번 (퍼널, 비트, 패턴) 배열로 컴파일되어 롤업 집계기의 대기열 배치에 함께 적용된다
+  (analytics_rollups.DRAIN_PAGEVIEWS_QUERY). 같은 (퍼널, 날짜, 세션) 의 비트는 OR 로 합쳐지므로
+  같은 이벤트가 두 번 반영되어도 결과는 같다.
+- 정의가 바뀌거나 새 퍼널이 추가되면 그 퍼널만 보존 기간만큼의 원본에서 한 번 다시 채운다 (sync).
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FUNNEL = "conversion"
+MAX_FUNNEL_STEPS = 31
+
+# 기본 전환 퍼널 단계: (키, 화면 표시 이름, page_path LIKE 패턴)
+CONVERSION_FUNNEL = (
+    ("home", "홈페이지 방문", "/"),
+    ("saju", "사주 페이지 조회", "/saju%"),
+    ("signup_start", "회원가입 시작", "/register"),
+    ("signup_complete", "회원가입 완료", "/profile"),
+    ("payment_start", "결제 시작", "/payment%"),
+    ("payment_complete", "결제 완료", "/payment/success"),
+)
+
+FUNNEL_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS analytics_session_funnels (
+        funnel VARCHAR(50) NOT NULL,
+        day DATE NOT NULL,
+        session_id VARCHAR(100) NOT NULL,
+        steps INTEGER NOT NULL,
+        PRIMARY KEY (funnel, day, session_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_funnel_definitions (
+        funnel VARCHAR(50) PRIMARY KEY,
+        signature TEXT NOT NULL,
+        synced_at TIMESTAMP NOT NULL DEFAULT LOCALTIMESTAMP
+    )
+    """,
+    # 이전 버전이 analytics_rollup_members 에 단계별로 남기던 퍼널 구성원
+    "DELETE FROM analytics_rollup_members WHERE dimension = 'funnel_step'",
+]
+
+# 원본에서 한 퍼널을 다시 채움 ($1: 퍼널, $2: 비트, $3: 패턴, $4: 보존 일수)
+FUNNEL_SYNC_QUERY = """
+INSERT INTO analytics_session_funnels AS f (funnel, day, session_id, steps)
+SELECT $1, p.date, p.session_id, BIT_OR(1 << s.bit)
+FROM page_analytics p
+JOIN unnest($2::int[], $3::text[]) AS s(bit, pattern) ON p.page_path LIKE s.pattern
+WHERE p.date >= CURRENT_DATE - $4::int AND p.session_id IS NOT NULL
+GROUP BY 2, 3
+ON CONFLICT (funnel, day, session_id) DO UPDATE SET steps = f.steps | EXCLUDED.steps
+"""
+
+class FunnelDefinition:
+    """순서 있는 퍼널 단계 목록 (i 번째 단계 = 비트 i)"""
+
+    def __init__(self, name: str, steps: List[Tuple[str, str, str]]):
+        if not name or len(name) > 50:
+            raise ValueError(f"퍼널 이름은 1~50자여야 합니다: {name!r}")
+        if not steps or len(steps) > MAX_FUNNEL_STEPS:
+            raise ValueError(f"퍼널 {name}: 단계는 1~{MAX_FUNNEL_STEPS}개여야 합니다")
+        if len({key for key, _, _ in steps}) != len(steps):
+            raise ValueError(f"퍼널 {name}: 단계 키가 중복됩니다")
+        self.name = name
+        self.steps = [tuple(step) for step in steps]
+        # 단계별 세션 수: 기간 내 세션의 비트를 OR 한 뒤 비트마다 센다
+        counts = ", ".join(
+            f"COUNT(*) FILTER (WHERE steps & {1 << bit} <> 0) AS step_{bit}" for bit in range(len(self.steps))
+        )
+        self.count_query = f"""
+            SELECT {counts}
+            FROM (
+                SELECT BIT_OR(steps) AS steps FROM analytics_session_funnels
+                WHERE funnel = $1 AND day >= CURRENT_DATE - $2::int
+                GROUP BY session_id
+            ) s
+        """
+
+    @property
+    def patterns(self) -> List[str]:
+        return [pattern for _, _, pattern in self.steps]
+
+    @property
+    def signature(self) -> str:
+        """패턴 순서가 같으면 같은 비트마스크 (표시 이름만 바뀌면 다시 채우지 않음)"""
+        return json.dumps(self.patterns)
+
+    async def step_counts(self, conn: asyncpg.Connection, days: int) -> List[Dict[str, Any]]:
+        """단계별 세션 수와 직전 단계 대비 전환율"""
+        row = await conn.fetchrow(self.count_query, self.name, days)
+        funnel_steps = []
+        previous = None
+        for bit, (key, label, _) in enumerate(self.steps):
+            count = row[bit] or 0
+            conversion_rate = 100.0 if previous is None else round(count * 100.0 / max(previous, 1), 1)
+            funnel_steps.append({"key": key, "step": label, "count": count, "conversion_rate": conversion_rate})
+            previous = count
+        return funnel_steps
+
+class FunnelRegistry:
+    """설정된 퍼널 목록과 대기열 배치에 넘길 (퍼널, 비트, 패턴) 배열"""
+
+    def __init__(self, funnels: List[FunnelDefinition]):
+        self.funnels = {funnel.name: funnel for funnel in funnels}
+        self.names: List[str] = []
+        self.bits: List[int] = []
+        self.patterns: List[str] = []
+        for funnel in funnels:
+            for bit, pattern in enumerate(funnel.patterns):
+                self.names.append(funnel.name)
+                self.bits.append(bit)
+                self.patterns.append(pattern)
+
+    @classmethod
+    def from_env(cls) -> "FunnelRegistry":
+        default = cls([FunnelDefinition(DEFAULT_FUNNEL, list(CONVERSION_FUNNEL))])
+        path = os.getenv('ANALYTICS_FUNNELS_FILE')
+        if not path:
+            return default
+        try:
+            with open(path, encoding='utf-8') as f:
+                config = json.load(f)
+            return cls([FunnelDefinition(name, steps) for name, steps in config.items()])
+        except (OSError, ValueError, TypeError) as e:
+            logger.error(f"퍼널 정의 파일 {path} 을 읽지 못해 기본 퍼널만 사용합니다: {e}")
+            return default
+
+    def get(self, name: str) -> Optional[FunnelDefinition]:
+        return self.funnels.get(name)
+
+    def describe(self) -> Dict[str, List[Dict[str, str]]]:
+        return {
+            name: [{"key": key, "step": label, "pattern": pattern} for key, label, pattern in funnel.steps]
+            for name, funnel in self.funnels.items()
+        }
+
+    async def mark_synced(self, conn: asyncpg.Connection):
+        """현재 정의를 반영된 것으로 기록 (원본 전체 백필 직후)"""
+        await conn.execute("TRUNCATE analytics_funnel_definitions")
+        await conn.executemany(
+            "INSERT INTO analytics_funnel_definitions (funnel, signature) VALUES ($1, $2)",
+            [(name, funnel.signature) for name, funnel in self.funnels.items()]
+        )
+
+    async def sync(self, conn: asyncpg.Connection, retention_days: int) -> Dict[str, List[str]]:
+        """정의가 바뀐/새 퍼널은 원본에서 다시 채우고 없어진 퍼널은 지움 (롤업 잠금 안에서 호출)"""
+        stored = {
+            row['funnel']: row['signature']
+            for row in await conn.fetch("SELECT funnel, signature FROM analytics_funnel_definitions")
+        }
+        result = {"rebuilt": [], "removed": []}
+        for name in stored.keys() - self.funnels.keys():
+            await conn.execute("DELETE FROM analytics_session_funnels WHERE funnel = $1", name)
+            await conn.execute("DELETE FROM analytics_funnel_definitions WHERE funnel = $1", name)
+            result["removed"].append(name)
+
+        for name, funnel in self.funnels.items():
+            if stored.get(name) == funnel.signature:
+                continue
+            await conn.execute("DELETE FROM analytics_session_funnels WHERE funnel = $1", name)
+            await conn.execute(
+                FUNNEL_SYNC_QUERY, name, list(range(len(funnel.steps))), funnel.patterns, retention_days
+            )
+            await conn.execute("""
+                INSERT INTO analytics_funnel_definitions (funnel, signature) VALUES ($1, $2)
+                ON CONFLICT (funnel) DO UPDATE SET signature = EXCLUDED.signature, synced_at = LOCALTIMESTAMP
+            """, name, funnel.signature)
+            result["rebuilt"].append(name)
+
+        if result["rebuilt"] or result["removed"]:
+            logger.info(f"퍼널 정의 동기화: {result}")
+        return result
+
+# 프로세스 전역 퍼널 정의 (시작할 때 한 번 컴파일)
+funnel_registry = FunnelRegistry.from_env()
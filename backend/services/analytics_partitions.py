@@ -0,0 +1,357 @@
+"""
+HEAL7 Analytics 시간 파티션 관리
+page_analytics(date) / saju_analysis_sessions(created_at) 를 월(또는 일) 단위 RANGE 파티션으로 나누고
+앞으로 쓸 파티션을 미리 만들며, 보존 기간이 지난 파티션을 분리(detach)하거나 삭제한다.
+
+- 파티션 이름: <테이블>_pYYYYMM (월) / <테이블>_pYYYYMMDD (일), 범위를 벗어난 행은 <테이블>_default 로 간다.
+  새 파티션 범위의 행이 default 에 있으면 그 행을 새 파티션으로 옮긴 뒤 붙인다.
+- 시간 컬럼은 BRIN 인덱스 (추가만 되는 로그라 물리 순서와 시간이 거의 같다). date/created_at 조건이 있는
+  쿼리는 필요한 파티션만 읽는다 (CURRENT_DATE / NOW() 기준 조건은 실행 시점에 잘라냄).
+- 분리/삭제는 파티션 단위 DDL 이라 부모 테이블의 롤업/실시간 트리거가 돌지 않는다.
+  롤업(analytics_rollups)은 원본 보존 기간이 지나도 과거 집계를 그대로 갖고 있다
+  (단, 그 뒤 롤업 백필을 다시 하면 남아 있는 원본만큼만 다시 만든다).
+- 여러 워커가 동시에 돌아도 advisory lock 으로 한 곳만 관리한다.
+- 기존의 파티션 없는 테이블은 건드리지 않는다 (scripts/partition_analytics_tables.py 로 한 번 옮긴다).
+
+환경변수:
+    ANALYTICS_PARTITION_INTERVAL   month | day (기본 month)
+    ANALYTICS_PARTITION_PREMAKE    현재 이후로 미리 만들 파티션 수 (기본 3)
+    PAGE_ANALYTICS_RETENTION_DAYS / SAJU_SESSIONS_RETENTION_DAYS   보존 일수 (기본 0 = 보존 기간 없음)
+    ANALYTICS_RETENTION_ACTION     detach | drop (기본 detach - 분리한 테이블은 보관 후 직접 삭제)
+"""
+
+import asyncio
+import logging
+import os
+import re
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import asyncpg
+
+from .database_manager import db, rows_affected
+
+logger = logging.getLogger(__name__)
+
+PARTITION_TRY_LOCK_QUERY = "SELECT pg_try_advisory_lock(hashtext('analytics_partitions'))"
+PARTITION_UNLOCK_QUERY = "SELECT pg_advisory_unlock(hashtext('analytics_partitions'))"
+
+# 파티션 부모 테이블 (PK 에 파티션 키가 들어가야 하므로 (id, 시간 컬럼))
+PARTITIONED_TABLE_DDL = {
+    "page_analytics": """
+        CREATE TABLE IF NOT EXISTS page_analytics (
+            id SERIAL,
+            session_id VARCHAR(100),
+            user_id INTEGER REFERENCES users(id),
+            page_path VARCHAR(255),
+            device_type VARCHAR(20),
+            timestamp TIMESTAMP DEFAULT NOW(),
+            date DATE NOT NULL DEFAULT CURRENT_DATE,
+            time_on_page INTEGER DEFAULT 0,
+            bounce BOOLEAN DEFAULT FALSE,
+            session_duration INTEGER DEFAULT 0,
+            PRIMARY KEY (id, date)
+        ) PARTITION BY RANGE (date)
+    """,
+    "saju_analysis_sessions": """
+        CREATE TABLE IF NOT EXISTS saju_analysis_sessions (
+            id SERIAL,
+            user_id INTEGER REFERENCES users(id),
+            session_id VARCHAR(100),
+            created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+            completed_at TIMESTAMP,
+            status VARCHAR(20) DEFAULT 'pending',
+            ai_reviewed BOOLEAN DEFAULT FALSE,
+            processing_time INTERVAL,
+            result_data JSONB,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """,
+}
+
+# 부모에 만들면 모든 파티션에 생긴다
+PARTITIONED_INDEX_DDL = {
+    "page_analytics": [
+        "CREATE INDEX IF NOT EXISTS idx_page_analytics_date_brin ON page_analytics USING brin (date)",
+        "CREATE INDEX IF NOT EXISTS idx_page_analytics_timestamp_brin ON page_analytics USING brin (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_page_analytics_user ON page_analytics(user_id)",
+        "CREATE INDEX IF NOT EXISTS idx_page_analytics_page ON page_analytics(page_path)",
+    ],
+    "saju_analysis_sessions": [
+        "CREATE INDEX IF NOT EXISTS idx_saju_sessions_created_brin ON saju_analysis_sessions USING brin (created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_saju_sessions_user ON saju_analysis_sessions(user_id)",
+    ],
+}
+
+PARTITIONS_QUERY = """
+SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound,
+       c.reltuples::bigint AS estimated_rows, pg_total_relation_size(c.oid) AS bytes
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = $1::regclass
+ORDER BY c.relname
+"""
+
+BOUND_PATTERN = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+class PartitionSpec:
+    """파티션으로 관리하는 테이블 하나"""
+
+    def __init__(self, table: str, column: str, column_type: str, retention_days: int):
+        self.table = table
+        self.column = column
+        self.column_type = column_type  # date | timestamp
+        self.retention_days = retention_days
+
+    @property
+    def default_partition(self) -> str:
+        return f"{self.table}_default"
+
+    def bound_value(self, day: date) -> Any:
+        """쿼리 파라미터로 넘길 경계 값"""
+        return day if self.column_type == "date" else datetime.combine(day, datetime.min.time())
+
+PARTITIONED_TABLES = (
+    PartitionSpec("page_analytics", "date", "date", int(os.getenv('PAGE_ANALYTICS_RETENTION_DAYS', 0))),
+    PartitionSpec("saju_analysis_sessions", "created_at", "timestamp", int(os.getenv('SAJU_SESSIONS_RETENTION_DAYS', 0))),
+)
+
+def parse_bound(bound: str) -> Optional[Tuple[date, date]]:
+    """'FOR VALUES FROM (...) TO (...)' → (시작, 끝), DEFAULT 면 None"""
+    match = BOUND_PATTERN.search(bound or "")
+    if not match:
+        return None
+    return date.fromisoformat(match.group(1)[:10]), date.fromisoformat(match.group(2)[:10])
+
+async def is_partitioned(conn: asyncpg.Connection, table: str) -> bool:
+    return await conn.fetchval(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass($1))", table
+    )
+
+class AnalyticsPartitionManager:
+    """파티션 미리 만들기 / 보존 기간 정리 (서비스 컨테이너에 등록)"""
+
+    def __init__(self,
+                 tables: Tuple[PartitionSpec, ...] = PARTITIONED_TABLES,
+                 interval: str = os.getenv('ANALYTICS_PARTITION_INTERVAL', 'month'),
+                 premake: int = int(os.getenv('ANALYTICS_PARTITION_PREMAKE', 3)),
+                 retention_action: str = os.getenv('ANALYTICS_RETENTION_ACTION', 'detach'),
+                 maintenance_interval: float = float(os.getenv('ANALYTICS_PARTITION_MAINTENANCE_INTERVAL', 3600))):
+        if interval not in ("month", "day"):
+            raise ValueError(f"ANALYTICS_PARTITION_INTERVAL must be month or day: {interval}")
+        if retention_action not in ("detach", "drop"):
+            raise ValueError(f"ANALYTICS_RETENTION_ACTION must be detach or drop: {retention_action}")
+        self.tables = tables
+        self.interval = interval
+        self.premake = premake
+        self.retention_action = retention_action
+        self.maintenance_interval = maintenance_interval
+        self._task: Optional[asyncio.Task] = None
+        self._last_result: Optional[Dict[str, Any]] = None
+        self._last_run_at: Optional[str] = None
+        self._last_error: Optional[str] = None
+
+    # ==================== 기간 계산 ====================
+
+    def period_start(self, day: date) -> date:
+        return day.replace(day=1) if self.interval == "month" else day
+
+    def next_period(self, start: date) -> date:
+        if self.interval == "month":
+            return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+        return start + timedelta(days=1)
+
+    def partition_name(self, spec: PartitionSpec, start: date) -> str:
+        return f"{spec.table}_p{start:%Y%m}" if self.interval == "month" else f"{spec.table}_p{start:%Y%m%d}"
+
+    def periods(self, first: date, last: date) -> List[Tuple[date, date]]:
+        """first ~ last 날짜를 덮는 (시작, 끝) 기간 목록"""
+        result = []
+        start = self.period_start(first)
+        while start <= last:
+            end = self.next_period(start)
+            result.append((start, end))
+            start = end
+        return result
+
+    # ==================== 파티션 DDL ====================
+
+    async def list_partitions(self, conn: asyncpg.Connection, spec: PartitionSpec) -> List[Dict[str, Any]]:
+        partitions = []
+        for row in await conn.fetch(PARTITIONS_QUERY, spec.table):
+            bounds = parse_bound(row['bound'])
+            partitions.append({
+                "name": row['name'],
+                "from": bounds[0] if bounds else None,
+                "to": bounds[1] if bounds else None,
+                "default": bounds is None,
+                "estimated_rows": max(row['estimated_rows'], 0),
+                "bytes": row['bytes']
+            })
+        return partitions
+
+    async def ensure_default(self, conn: asyncpg.Connection, spec: PartitionSpec):
+        await conn.execute(f"CREATE TABLE IF NOT EXISTS {spec.default_partition} PARTITION OF {spec.table} DEFAULT")
+
+    async def create_partition(self, conn: asyncpg.Connection, spec: PartitionSpec,
+                               start: date, end: date) -> int:
+        """[start, end) 파티션 생성 - default 에 그 범위 행이 있으면 옮긴 뒤 붙이고 옮긴 행 수를 돌려줌"""
+        name = self.partition_name(spec, start)
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        in_range = f"{spec.column} >= $1 AND {spec.column} < $2"
+        low, high = spec.bound_value(start), spec.bound_value(end)
+        async with conn.transaction():
+            has_default = await conn.fetchval("SELECT to_regclass($1) IS NOT NULL", spec.default_partition)
+            if not has_default or not await conn.fetchval(
+                f"SELECT EXISTS (SELECT 1 FROM {spec.default_partition} WHERE {in_range})", low, high
+            ):
+                await conn.execute(f"CREATE TABLE {name} PARTITION OF {spec.table} {bounds}")
+                return 0
+
+            # default 에서 직접 옮기므로 부모의 롤업/실시간 트리거는 돌지 않는다
+            await conn.execute(f"CREATE TABLE {name} (LIKE {spec.table} INCLUDING DEFAULTS)")
+            moved = await conn.fetchval(f"""
+                WITH moved AS (DELETE FROM {spec.default_partition} WHERE {in_range} RETURNING *),
+                copied AS (INSERT INTO {name} SELECT * FROM moved RETURNING 1)
+                SELECT COUNT(*) FROM copied
+            """, low, high)
+            await conn.execute(f"ALTER TABLE {spec.table} ATTACH PARTITION {name} {bounds}")
+            return moved
+
+    async def ensure_partitions(self, conn: asyncpg.Connection, spec: PartitionSpec,
+                                first: date, last: date) -> Dict[str, Any]:
+        """first ~ last 를 덮는 파티션이 없으면 만듦 (기존 파티션과 겹치는 기간은 건너뜀)"""
+        await self.ensure_default(conn, spec)
+        existing = [(p["from"], p["to"]) for p in await self.list_partitions(conn, spec) if not p["default"]]
+        created, moved = [], 0
+        for start, end in self.periods(first, last):
+            if any(start < upper and lower < end for lower, upper in existing):
+                continue
+            moved += await self.create_partition(conn, spec, start, end)
+            created.append(self.partition_name(spec, start))
+            existing.append((start, end))
+        return {"created": created, "moved_rows": moved}
+
+    async def apply_retention(self, conn: asyncpg.Connection, spec: PartitionSpec, today: date) -> Dict[str, Any]:
+        """보존 기간이 지난 파티션 분리/삭제 (기간 전체가 지난 파티션만)"""
+        result = {"detached": [], "dropped": [], "default_rows_deleted": 0}
+        if spec.retention_days <= 0:
+            return result
+        cutoff = today - timedelta(days=spec.retention_days)
+        for partition in await self.list_partitions(conn, spec):
+            if partition["default"] or partition["to"] > cutoff:
+                continue
+            if self.retention_action == "drop":
+                await conn.execute(f"DROP TABLE {partition['name']}")
+                result["dropped"].append(partition["name"])
+            else:
+                await conn.execute(f"ALTER TABLE {spec.table} DETACH PARTITION {partition['name']}")
+                result["detached"].append(partition["name"])
+        if self.retention_action == "drop":
+            result["default_rows_deleted"] = rows_affected(await conn.execute(
+                f"DELETE FROM {spec.default_partition} WHERE {spec.column} < $1", spec.bound_value(cutoff)
+            ))
+        return result
+
+    # ==================== 관리 주기 ====================
+
+    async def maintain(self, conn: asyncpg.Connection) -> Optional[Dict[str, Any]]:
+        """현재부터 premake 기간 뒤까지 파티션을 만들고 보존 기간 정리 (다른 워커가 처리 중이면 None)"""
+        if not await conn.fetchval(PARTITION_TRY_LOCK_QUERY):
+            return None
+        try:
+            today = date.today()
+            horizon = self.period_start(today)
+            for _ in range(self.premake):
+                horizon = self.next_period(horizon)
+            result = {}
+            for spec in self.tables:
+                if not await is_partitioned(conn, spec.table):
+                    result[spec.table] = {"partitioned": False}
+                    continue
+                result[spec.table] = {
+                    **await self.ensure_partitions(conn, spec, today, horizon),
+                    **await self.apply_retention(conn, spec, today)
+                }
+            return result
+        finally:
+            await conn.execute(PARTITION_UNLOCK_QUERY)
+
+    async def run_once(self) -> Optional[Dict[str, Any]]:
+        async with db.lease() as conn:
+            result = await self.maintain(conn)
+        if result is not None:
+            self._last_result = result
+            self._last_run_at = datetime.now().isoformat()
+            self._last_error = None
+            changed = {table: r for table, r in result.items()
+                       if r.get("created") or r.get("detached") or r.get("dropped")}
+            if changed:
+                logger.info(f"Analytics 파티션 관리: {changed}")
+            unpartitioned = [table for table, r in result.items() if r.get("partitioned") is False]
+            if unpartitioned:
+                logger.warning(f"파티션 없는 테이블 {unpartitioned} - scripts/partition_analytics_tables.py 로 옮기세요")
+        return result
+
+    async def _run_forever(self):
+        while True:
+            await asyncio.sleep(self.maintenance_interval)
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                logger.warning(f"Analytics 파티션 관리 실패: {e}")
+
+    async def status(self, conn: asyncpg.Connection) -> Dict[str, Any]:
+        tables = {}
+        for spec in self.tables:
+            partitioned = await is_partitioned(conn, spec.table)
+            partitions = await self.list_partitions(conn, spec) if partitioned else []
+            tables[spec.table] = {
+                "partitioned": partitioned,
+                "column": spec.column,
+                "retention_days": spec.retention_days or None,
+                "partitions": [
+                    {**p, "from": p["from"].isoformat() if p["from"] else None,
+                     "to": p["to"].isoformat() if p["to"] else None}
+                    for p in partitions
+                ]
+            }
+        return {"tables": tables, **self.stats()}
+
+    # ==================== 수명주기 ====================
+
+    async def start(self):
+        """서비스 컨테이너 시작 훅: 파티션을 바로 한 번 맞추고 주기적 관리 시작"""
+        try:
+            await self.run_once()
+        except Exception as e:
+            self._last_error = str(e)
+            logger.warning(f"Analytics 파티션 관리 실패: {e}")
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def close(self):
+        """서비스 컨테이너 종료 훅: 주기적 관리 중지"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "premake": self.premake,
+            "retention_action": self.retention_action,
+            "last_result": self._last_result,
+            "last_run_at": self._last_run_at,
+            "last_error": self._last_error
+        }
+
+# 프로세스 전역 관리자
+analytics_partitions = AnalyticsPartitionManager()
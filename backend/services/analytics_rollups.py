@@ -0,0 +1,555 @@
+"""
+HEAL7 Analytics 롤업 집계
+대시보드 엔드포인트가 page_analytics / saju_analysis_sessions 원본 대신 읽는 시간별/일별 롤업 관리
+
+- page_analytics / saju_analysis_sessions 의 문장 단위 트리거가 바뀐 행을 (시간, 페이지, 기기 …) 단위
+  증감분으로 묶어 대기열(analytics_pageview_queue / analytics_saju_queue)에 적는다.
+  UPDATE/DELETE 는 이전 행을 음수로 빼므로 상태가 바뀐 사주 세션도 롤업에 그대로 반영된다.
+- 백그라운드 집계기가 대기열을 배치 단위로 비우며 롤업에 더한다 (DELETE ... RETURNING 이라
+  아직 커밋되지 않은 트랜잭션의 증감분은 다음 주기에 처리되고 빠지는 행이 없다).
+  여러 워커가 동시에 돌아도 advisory lock 으로 한 곳만 비운다.
+- ANALYTICS_DISTINCT_MODE=approx 면 같은 구성원으로 (날짜, 값)별 HLL 스케치도 쌓아
+  고유 수를 근사로 답한다 (services/analytics_sketches.py).
+- 전환 퍼널은 같은 배치에서 세션별 단계 비트마스크(analytics_session_funnels)로 반영한다
+  (services/analytics_funnels.py).
+- COUNT(DISTINCT ...) 는 합산할 수 없으므로 analytics_rollup_members 에 (차원, 값, 구성원)별 마지막
+  방문일만 남긴다. 기간 내 고유 수 = last_seen 이 기간 시작 이후인 구성원 수 (정확한 값).
+  ANALYTICS_ROLLUP_MEMBER_DAYS 가 지난 구성원은 정리한다.
+  page_analytics 는 추가만 되는 이벤트 로그라 구성원은 새 행으로만 늘어난다
+  (원본 행을 직접 고치거나 지우면 고유 수는 백필로 다시 맞춘다. 합계 롤업은 그대로 맞음).
+
+롤업이 처음 만들어질 때(또는 backfill_analytics_rollups.py 실행 시) 원본 전체를 대기열에 다시 넣는다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from .analytics_funnels import FUNNEL_DDL, funnel_registry
+from .analytics_sketches import DistinctSketches, distinct_sketches, sketch_upsert
+from .database_manager import db, rows_affected
+
+logger = logging.getLogger(__name__)
+
+# 고유 수 집계 차원 (analytics_rollup_members.dimension)
+MEMBER_SESSION = "session"            # 전체 고유 세션 (dim_value '')
+MEMBER_PAGE_SESSION = "page_session"  # 페이지별 고유 세션
+MEMBER_DEVICE_USER = "device_user"    # 기기별 고유 사용자
+
+ROLLUP_TRY_LOCK_QUERY = "SELECT pg_try_advisory_xact_lock(hashtext('analytics_rollups'))"
+ROLLUP_LOCK_QUERY = "SELECT pg_advisory_xact_lock(hashtext('analytics_rollups'))"
+
+ROLLUP_TABLES = (
+    "analytics_pageview_hourly", "analytics_pageview_daily",
+    "analytics_saju_hourly", "analytics_saju_daily", "analytics_rollup_members",
+    "analytics_session_funnels", "analytics_hll_sketches"
+)
+
+ROLLUP_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS analytics_pageview_queue (
+        seq BIGSERIAL PRIMARY KEY,
+        day DATE NOT NULL,
+        bucket_hour TIMESTAMP NOT NULL,
+        page_path VARCHAR(255) NOT NULL,
+        device_type VARCHAR(20) NOT NULL,
+        session_id VARCHAR(100),
+        user_id INTEGER,
+        pageviews INTEGER NOT NULL,
+        bounces INTEGER NOT NULL,
+        time_on_page_sum BIGINT NOT NULL,
+        time_on_page_count INTEGER NOT NULL,
+        session_duration_sum BIGINT NOT NULL,
+        session_duration_count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_saju_queue (
+        seq BIGSERIAL PRIMARY KEY,
+        bucket_hour TIMESTAMP NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        ai_reviewed BOOLEAN NOT NULL,
+        requests INTEGER NOT NULL,
+        processed INTEGER NOT NULL,
+        processing_seconds DOUBLE PRECISION NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_pageview_hourly (
+        bucket_hour TIMESTAMP NOT NULL,
+        page_path VARCHAR(255) NOT NULL,
+        device_type VARCHAR(20) NOT NULL,
+        pageviews BIGINT NOT NULL DEFAULT 0,
+        bounces BIGINT NOT NULL DEFAULT 0,
+        time_on_page_sum BIGINT NOT NULL DEFAULT 0,
+        time_on_page_count BIGINT NOT NULL DEFAULT 0,
+        session_duration_sum BIGINT NOT NULL DEFAULT 0,
+        session_duration_count BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (bucket_hour, page_path, device_type)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_pageview_daily (
+        day DATE NOT NULL,
+        page_path VARCHAR(255) NOT NULL,
+        device_type VARCHAR(20) NOT NULL,
+        pageviews BIGINT NOT NULL DEFAULT 0,
+        bounces BIGINT NOT NULL DEFAULT 0,
+        time_on_page_sum BIGINT NOT NULL DEFAULT 0,
+        time_on_page_count BIGINT NOT NULL DEFAULT 0,
+        session_duration_sum BIGINT NOT NULL DEFAULT 0,
+        session_duration_count BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, page_path, device_type)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_saju_hourly (
+        bucket_hour TIMESTAMP NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        ai_reviewed BOOLEAN NOT NULL,
+        requests BIGINT NOT NULL DEFAULT 0,
+        processed BIGINT NOT NULL DEFAULT 0,
+        processing_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+        PRIMARY KEY (bucket_hour, status, ai_reviewed)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_saju_daily (
+        day DATE NOT NULL,
+        status VARCHAR(20) NOT NULL,
+        ai_reviewed BOOLEAN NOT NULL,
+        requests BIGINT NOT NULL DEFAULT 0,
+        processed BIGINT NOT NULL DEFAULT 0,
+        processing_seconds DOUBLE PRECISION NOT NULL DEFAULT 0,
+        PRIMARY KEY (day, status, ai_reviewed)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS analytics_rollup_members (
+        dimension VARCHAR(20) NOT NULL,
+        dim_value VARCHAR(255) NOT NULL,
+        member VARCHAR(100) NOT NULL,
+        last_seen DATE NOT NULL,
+        PRIMARY KEY (dimension, dim_value, member)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_rollup_members_seen ON analytics_rollup_members (dimension, last_seen, dim_value)",
+    """
+    CREATE TABLE IF NOT EXISTS analytics_rollup_state (
+        id BOOLEAN PRIMARY KEY DEFAULT true CHECK (id),
+        backfilled_at TIMESTAMP,
+        drained_at TIMESTAMP,
+        members_pruned_on DATE
+    )
+    """,
+    "ALTER TABLE analytics_rollup_state ADD COLUMN IF NOT EXISTS sketches_built_at TIMESTAMP",
+    "INSERT INTO analytics_rollup_state (id) VALUES (true) ON CONFLICT (id) DO NOTHING",
+]
+
+# 원본 행 → 대기열 증감분 ({source}: 전이 테이블 또는 원본 테이블, {sign}: 1 / -1)
+PAGEVIEW_KEYS = "day, bucket_hour, page_path, device_type, session_id, user_id"
+PAGEVIEW_MEASURES = ("pageviews", "bounces", "time_on_page_sum", "time_on_page_count",
+                     "session_duration_sum", "session_duration_count")
+PAGEVIEW_DELTA_SELECT = """
+    SELECT COALESCE(date, timestamp::date, CURRENT_DATE) AS day,
+           COALESCE(date_trunc('hour', timestamp), date::timestamp, date_trunc('hour', LOCALTIMESTAMP)) AS bucket_hour,
+           COALESCE(page_path, '') AS page_path,
+           COALESCE(device_type, '') AS device_type,
+           session_id, user_id,
+           {sign} * COUNT(*) AS pageviews,
+           {sign} * COUNT(*) FILTER (WHERE bounce) AS bounces,
+           {sign} * COALESCE(SUM(time_on_page), 0) AS time_on_page_sum,
+           {sign} * COUNT(time_on_page) AS time_on_page_count,
+           {sign} * COALESCE(SUM(session_duration), 0) AS session_duration_sum,
+           {sign} * COUNT(session_duration) AS session_duration_count
+    FROM {source}
+    GROUP BY 1, 2, 3, 4, 5, 6
+"""
+
+SAJU_KEYS = "bucket_hour, status, ai_reviewed"
+SAJU_MEASURES = ("requests", "processed", "processing_seconds")
+SAJU_DELTA_SELECT = """
+    SELECT date_trunc('hour', created_at) AS bucket_hour,
+           COALESCE(status, '') AS status,
+           COALESCE(ai_reviewed, false) AS ai_reviewed,
+           {sign} * COUNT(*) AS requests,
+           {sign} * COUNT(completed_at) AS processed,
+           {sign} * COALESCE(SUM(EXTRACT(EPOCH FROM (completed_at - created_at))), 0) AS processing_seconds
+    FROM {source}
+    WHERE created_at IS NOT NULL
+    GROUP BY 1, 2, 3
+"""
+
+def _queue_insert(queue: str, keys: str, measures: tuple, delta_select: str, source: str, sign: int) -> str:
+    columns = f"{keys}, {', '.join(measures)}"
+    return f"INSERT INTO {queue} ({columns}) {delta_select.format(source=source, sign=sign)}"
+
+def _queue_update(queue: str, keys: str, measures: tuple, delta_select: str) -> str:
+    """UPDATE: 이전 행은 빼고 새 행은 더하되, 집계 값이 그대로인 묶음은 적지 않음"""
+    columns = f"{keys}, {', '.join(measures)}"
+    sums = ", ".join(f"SUM({m})" for m in measures)
+    changed = " OR ".join(f"SUM({m}) <> 0" for m in measures)
+    return f"""
+        INSERT INTO {queue} ({columns})
+        SELECT {keys}, {sums}
+        FROM ({delta_select.format(source='old_rows', sign=-1)}
+              UNION ALL {delta_select.format(source='new_rows', sign=1)}) d
+        GROUP BY {keys}
+        HAVING {changed}
+    """
+
+def _trigger_function(name: str, queue: str, keys: str, measures: tuple, delta_select: str) -> str:
+    return f"""
+    CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            {_queue_insert(queue, keys, measures, delta_select, 'new_rows', 1)};
+        ELSIF TG_OP = 'DELETE' THEN
+            {_queue_insert(queue, keys, measures, delta_select, 'old_rows', -1)};
+        ELSE
+            {_queue_update(queue, keys, measures, delta_select)};
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+
+def _trigger_ddl(table: str, function: str) -> list:
+    base = f"trg_{table}_rollup"
+    return [
+        f"DROP TRIGGER IF EXISTS {base}_ins ON {table}",
+        f"DROP TRIGGER IF EXISTS {base}_upd ON {table}",
+        f"DROP TRIGGER IF EXISTS {base}_del ON {table}",
+        f"""CREATE TRIGGER {base}_ins AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()""",
+        f"""CREATE TRIGGER {base}_upd AFTER UPDATE ON {table} REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()""",
+        f"""CREATE TRIGGER {base}_del AFTER DELETE ON {table} REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()""",
+    ]
+
+ROLLUP_TRIGGER_DDL = [
+    _trigger_function("analytics_queue_pageviews", "analytics_pageview_queue",
+                      PAGEVIEW_KEYS, PAGEVIEW_MEASURES, PAGEVIEW_DELTA_SELECT),
+    _trigger_function("analytics_queue_saju", "analytics_saju_queue",
+                      SAJU_KEYS, SAJU_MEASURES, SAJU_DELTA_SELECT),
+    *_trigger_ddl("page_analytics", "analytics_queue_pageviews"),
+    *_trigger_ddl("saju_analysis_sessions", "analytics_queue_saju"),
+]
+
+def _member_rows(source: str, day: str, where: str) -> str:
+    """고유 수 차원별 (날짜, 차원, 값, 구성원) 행 (정확 모드 구성원과 근사 모드 스케치가 같이 씀)"""
+    return f"""
+        SELECT {day}, '{MEMBER_SESSION}', '', session_id
+        FROM {source} WHERE {where} AND session_id IS NOT NULL
+        UNION ALL
+        SELECT {day}, '{MEMBER_PAGE_SESSION}', COALESCE(page_path, ''), session_id
+        FROM {source} WHERE {where} AND session_id IS NOT NULL
+        UNION ALL
+        SELECT {day}, '{MEMBER_DEVICE_USER}', COALESCE(device_type, ''), user_id::text
+        FROM {source} WHERE {where} AND user_id IS NOT NULL
+    """
+
+def _additive_upsert(table: str, bucket_column: str, bucket: str, dims: str, measures: tuple) -> str:
+    """대기열 묶음(drained)을 롤업에 더하는 INSERT ... ON CONFLICT (bucket: 시간 키 표현식)"""
+    sums = ", ".join(f"SUM({m})" for m in measures)
+    updates = ", ".join(f"{m} = r.{m} + EXCLUDED.{m}" for m in measures)
+    return f"""
+        INSERT INTO {table} AS r ({bucket_column}, {dims}, {', '.join(measures)})
+        SELECT {bucket}, {dims}, {sums} FROM drained GROUP BY 1, {dims}
+        ON CONFLICT ({bucket_column}, {dims}) DO UPDATE SET {updates}
+        RETURNING 1
+    """
+
+def _drain_pageviews_query(sketches: bool) -> str:
+    """대기열 한 배치를 비우며 시간별/일별 롤업, 고유 구성원(또는 HLL 스케치), 세션 퍼널에 반영
+    ($1: 배치 크기, $2/$3/$4: 컴파일된 퍼널 이름/비트/패턴)
+    """
+    member_rows = _member_rows("drained", "day", "pageviews > 0")
+    distinct = f"sketches AS ({sketch_upsert(member_rows)})," if sketches else ""
+    return f"""
+WITH drained AS (
+    DELETE FROM analytics_pageview_queue
+    WHERE seq IN (SELECT seq FROM analytics_pageview_queue ORDER BY seq LIMIT $1)
+    RETURNING *
+),
+hourly AS ({_additive_upsert("analytics_pageview_hourly", "bucket_hour", "bucket_hour",
+                             "page_path, device_type", PAGEVIEW_MEASURES)}),
+daily AS ({_additive_upsert("analytics_pageview_daily", "day", "day",
+                            "page_path, device_type", PAGEVIEW_MEASURES)}),
+members AS (
+    INSERT INTO analytics_rollup_members AS m (dimension, dim_value, member, last_seen)
+    SELECT dimension, dim_value, member, MAX(day)
+    FROM ({member_rows}) s (day, dimension, dim_value, member)
+    GROUP BY 1, 2, 3
+    ON CONFLICT (dimension, dim_value, member) DO UPDATE SET last_seen = GREATEST(m.last_seen, EXCLUDED.last_seen)
+    RETURNING 1
+),
+{distinct}
+funnels AS (
+    INSERT INTO analytics_session_funnels AS f (funnel, day, session_id, steps)
+    SELECT s.funnel, d.day, d.session_id, BIT_OR(1 << s.bit)
+    FROM drained d
+    JOIN unnest($2::text[], $3::int[], $4::text[]) AS s(funnel, bit, pattern) ON d.page_path LIKE s.pattern
+    WHERE d.pageviews > 0 AND d.session_id IS NOT NULL
+    GROUP BY 1, 2, 3
+    ON CONFLICT (funnel, day, session_id) DO UPDATE SET steps = f.steps | EXCLUDED.steps
+    WHERE f.steps | EXCLUDED.steps <> f.steps
+    RETURNING 1
+)
+SELECT COUNT(*) FROM drained
+"""
+
+DRAIN_PAGEVIEWS_QUERY = _drain_pageviews_query(sketches=False)
+DRAIN_PAGEVIEWS_SKETCH_QUERY = _drain_pageviews_query(sketches=True)
+
+# 원본에서 HLL 스케치 만들기 ($1: 보관 일수) - 대기열과 겹쳐도 레지스터 MAX 라 그대로
+SKETCH_BUILD_QUERY = f"""
+WITH built AS ({sketch_upsert(_member_rows("page_analytics", "date", "date >= CURRENT_DATE - $1::int"))})
+SELECT COUNT(*) FROM built
+"""
+
+DRAIN_SAJU_QUERY = f"""
+WITH drained AS (
+    DELETE FROM analytics_saju_queue
+    WHERE seq IN (SELECT seq FROM analytics_saju_queue ORDER BY seq LIMIT $1)
+    RETURNING *
+),
+hourly AS ({_additive_upsert("analytics_saju_hourly", "bucket_hour", "bucket_hour",
+                             "status, ai_reviewed", SAJU_MEASURES)}),
+daily AS ({_additive_upsert("analytics_saju_daily", "day", "bucket_hour::date",
+                            "status, ai_reviewed", SAJU_MEASURES)})
+SELECT COUNT(*) FROM drained
+"""
+
+QUEUE_DEPTH_QUERY = """
+SELECT (SELECT COUNT(*) FROM analytics_pageview_queue) AS pageview_queue,
+       (SELECT COUNT(*) FROM analytics_saju_queue) AS saju_queue
+"""
+
+class AnalyticsRollupAggregator:
+    """대기열을 주기적으로 비워 롤업을 갱신하는 백그라운드 집계기 (서비스 컨테이너에 등록)"""
+
+    def __init__(self,
+                 interval: float = float(os.getenv('ANALYTICS_ROLLUP_INTERVAL', 15)),
+                 batch_size: int = int(os.getenv('ANALYTICS_ROLLUP_BATCH', 5000)),
+                 member_days: int = int(os.getenv('ANALYTICS_ROLLUP_MEMBER_DAYS', 31)),
+                 sketches: DistinctSketches = distinct_sketches):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.member_days = member_days
+        self.sketches = sketches
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._drained_pageviews = 0
+        self._drained_saju = 0
+        self._last_run_ms: Optional[float] = None
+        self._last_run_at: Optional[str] = None
+        self._last_error: Optional[str] = None
+
+    # ==================== 스키마 / 백필 ====================
+
+    @staticmethod
+    async def ensure_tables(conn: asyncpg.Connection):
+        """롤업 테이블과 원본 테이블 트리거 생성 (여러 번 실행해도 안전)"""
+        async with conn.transaction():
+            # 워커 여러 개가 동시에 시작해도 트리거를 한 곳씩 다시 만든다
+            await conn.execute(ROLLUP_LOCK_QUERY)
+            for sql in ROLLUP_DDL + FUNNEL_DDL + ROLLUP_TRIGGER_DDL:
+                await conn.execute(sql)
+            if await DistinctSketches.ensure_tables(conn):
+                await conn.execute("UPDATE analytics_rollup_state SET sketches_built_at = NULL")
+
+    async def backfill(self, conn: asyncpg.Connection, force: bool = True) -> Optional[Dict[str, int]]:
+        """롤업을 비우고 원본 전체에서 다시 계산 (force=False 면 아직 백필하지 않은 경우에만)
+
+        원본 테이블에 SHARE 잠금을 건 짧은 트랜잭션에서 원본을 대기열로 옮기고 (그동안 쓰기는 대기),
+        잠금을 푼 뒤 대기열을 배치 단위로 비운다. 이후 들어온 행은 트리거가 같은 대기열에 이어 적는다.
+        """
+        started = time.perf_counter()
+        async with conn.transaction():
+            await conn.execute(ROLLUP_LOCK_QUERY)
+            if not force and await conn.fetchval("SELECT backfilled_at IS NOT NULL FROM analytics_rollup_state"):
+                return None
+            await conn.execute("LOCK TABLE page_analytics, saju_analysis_sessions IN SHARE MODE")
+            await conn.execute(
+                f"TRUNCATE analytics_pageview_queue, analytics_saju_queue, {', '.join(ROLLUP_TABLES)}"
+            )
+            await conn.execute(_queue_insert("analytics_pageview_queue", PAGEVIEW_KEYS, PAGEVIEW_MEASURES,
+                                             PAGEVIEW_DELTA_SELECT, "page_analytics", 1))
+            await conn.execute(_queue_insert("analytics_saju_queue", SAJU_KEYS, SAJU_MEASURES,
+                                             SAJU_DELTA_SELECT, "saju_analysis_sessions", 1))
+            await funnel_registry.mark_synced(conn)
+            # 스케치는 근사 모드일 때만 대기열과 함께 다시 쌓인다
+            await conn.execute(
+                "UPDATE analytics_rollup_state SET backfilled_at = LOCALTIMESTAMP, "
+                "sketches_built_at = CASE WHEN $1 THEN LOCALTIMESTAMP END", self.sketches.enabled
+            )
+
+        result = await self.drain(conn, wait_for_lock=True)
+        result["backfill_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Analytics 롤업 백필 완료: {result}")
+        return result
+
+    # ==================== 집계 ====================
+
+    async def drain(self, conn: asyncpg.Connection, wait_for_lock: bool = False) -> Dict[str, int]:
+        """대기열이 빌 때까지 배치 단위로 롤업에 반영 (다른 워커가 처리 중이면 건너뜀)"""
+        result = {"pageview_rows": 0, "saju_rows": 0, "batches": 0, "members_pruned": 0}
+
+        while True:
+            async with conn.transaction():
+                if wait_for_lock:
+                    await conn.execute(ROLLUP_LOCK_QUERY)
+                elif not await conn.fetchval(ROLLUP_TRY_LOCK_QUERY):
+                    result["skipped"] = 1
+                    return result
+
+                pageview_rows = await conn.fetchval(
+                    DRAIN_PAGEVIEWS_SKETCH_QUERY if self.sketches.enabled else DRAIN_PAGEVIEWS_QUERY, self.batch_size,
+                    funnel_registry.names, funnel_registry.bits, funnel_registry.patterns
+                )
+                saju_rows = await conn.fetchval(DRAIN_SAJU_QUERY, self.batch_size)
+                await conn.execute("UPDATE analytics_rollup_state SET drained_at = LOCALTIMESTAMP")
+
+                # 하루 한 번 오래된 고유 구성원 정리
+                if await conn.fetchval(
+                    "SELECT members_pruned_on IS DISTINCT FROM CURRENT_DATE FROM analytics_rollup_state"
+                ):
+                    status = await conn.execute(
+                        "DELETE FROM analytics_rollup_members WHERE last_seen < CURRENT_DATE - $1::int",
+                        self.member_days
+                    )
+                    result["members_pruned"] += rows_affected(status)
+                    await conn.execute(
+                        "DELETE FROM analytics_session_funnels WHERE day < CURRENT_DATE - $1::int", self.member_days
+                    )
+                    if self.sketches.enabled:
+                        await self.sketches.prune(conn)
+                    await conn.execute("UPDATE analytics_rollup_state SET members_pruned_on = CURRENT_DATE")
+
+            result["pageview_rows"] += pageview_rows
+            result["saju_rows"] += saju_rows
+            result["batches"] += 1
+            if pageview_rows < self.batch_size and saju_rows < self.batch_size:
+                return result
+
+    async def sync_funnels(self, conn: asyncpg.Connection) -> Dict[str, Any]:
+        """정의가 바뀐 퍼널만 원본에서 다시 채움 (다른 워커와 겹치지 않게 롤업 잠금 안에서)"""
+        async with conn.transaction():
+            await conn.execute(ROLLUP_LOCK_QUERY)
+            return await funnel_registry.sync(conn, self.member_days)
+
+    async def sync_sketches(self, conn: asyncpg.Connection) -> Optional[Dict[str, Any]]:
+        """근사 모드인데 스케치가 없으면 원본에서 만들고, 정확 모드면 스케치를 오래된 것으로 표시
+
+        정확 모드로 도는 동안은 스케치가 갱신되지 않으므로 다시 근사 모드로 켜면 원본에서 새로 만든다.
+        """
+        async with conn.transaction():
+            await conn.execute(ROLLUP_LOCK_QUERY)
+            built = await conn.fetchval("SELECT sketches_built_at IS NOT NULL FROM analytics_rollup_state")
+            if not self.sketches.enabled:
+                if built:
+                    await conn.execute("UPDATE analytics_rollup_state SET sketches_built_at = NULL")
+                return None
+            if built:
+                return None
+            started = time.perf_counter()
+            await conn.execute("TRUNCATE analytics_hll_sketches")
+            sketches = await conn.fetchval(SKETCH_BUILD_QUERY, self.sketches.retention_days)
+            await conn.execute("UPDATE analytics_rollup_state SET sketches_built_at = LOCALTIMESTAMP")
+        result = {"sketches": sketches, "build_ms": round((time.perf_counter() - started) * 1000, 1)}
+        logger.info(f"HLL 스케치 생성 완료: {result}")
+        return result
+
+    async def run_once(self) -> Dict[str, int]:
+        started = time.perf_counter()
+        async with db.lease() as conn:
+            result = await self.drain(conn)
+
+        self._runs += 1
+        self._drained_pageviews += result["pageview_rows"]
+        self._drained_saju += result["saju_rows"]
+        self._last_run_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._last_run_at = datetime.now().isoformat()
+        self._last_error = None
+        if result["pageview_rows"] or result["saju_rows"]:
+            logger.debug(f"Analytics 롤업 갱신: {result} ({self._last_run_ms}ms)")
+        return result
+
+    async def _run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                logger.warning(f"Analytics 롤업 갱신 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def status(self, conn: asyncpg.Connection) -> Dict[str, Any]:
+        """대기열 깊이와 마지막 백필/갱신 시각"""
+        depth = await conn.fetchrow(QUEUE_DEPTH_QUERY)
+        state = await conn.fetchrow(
+            "SELECT backfilled_at, drained_at, sketches_built_at FROM analytics_rollup_state"
+        )
+        return {
+            **dict(depth),
+            "backfilled_at": state['backfilled_at'].isoformat() if state['backfilled_at'] else None,
+            "drained_at": state['drained_at'].isoformat() if state['drained_at'] else None,
+            "distinct_counts": {
+                **self.sketches.describe(),
+                "sketches_built_at": state['sketches_built_at'].isoformat() if state['sketches_built_at'] else None
+            },
+            **self.stats()
+        }
+
+    # ==================== 수명주기 ====================
+
+    async def start(self):
+        """서비스 컨테이너 시작 훅: 롤업이 없으면 만들고 백필한 뒤 주기적 갱신 시작"""
+        async with db.lease() as conn:
+            raw_tables = await conn.fetchval(
+                "SELECT to_regclass('page_analytics') IS NOT NULL AND to_regclass('saju_analysis_sessions') IS NOT NULL"
+            )
+            if not raw_tables:
+                logger.warning("Analytics 원본 테이블이 없어 롤업 집계기를 시작하지 않습니다")
+                return
+            await self.ensure_tables(conn)
+            # 처음 만들어진 롤업은 기존 데이터로 채움 (다른 워커가 이미 했으면 건너뜀)
+            await self.backfill(conn, force=False)
+            await self.sync_funnels(conn)
+            await self.sync_sketches(conn)
+
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def close(self):
+        """서비스 컨테이너 종료 훅: 주기적 갱신 중지"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "runs": self._runs,
+            "drained_pageview_rows": self._drained_pageviews,
+            "drained_saju_rows": self._drained_saju,
+            "last_run_ms": self._last_run_ms,
+            "last_run_at": self._last_run_at,
+            "last_error": self._last_error
+        }
+
+# 프로세스 전역 집계기
+analytics_rollups = AnalyticsRollupAggregator()
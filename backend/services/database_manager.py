@@ -5,94 +5,208 @@ PostgreSQL 연결 관리 및 공통 데이터베이스 작업 처리
 
 import asyncio
 import asyncpg
+import json
 import logging
 import os
-from typing import Optional, Dict, Any, List
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, List, AsyncIterator
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-# Database connection pool
-_connection_pool: Optional[asyncpg.Pool] = None
+def get_db_configs() -> List[Dict[str, Any]]:
+    """환경변수 기반 연결 설정 목록 (앞에서부터 순서대로 시도)
+
+    DB_HOST가 지정되면 해당 TCP 설정만 사용하고,
+    지정되지 않으면 로컬 peer authentication 소켓을 먼저 시도한다.
+    """
+    pool_size = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 5)),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 20))
+    }
+
+    # TCP connection with environment variables
+    tcp_config = {
+        'host': os.getenv('DB_HOST', 'localhost'),
+        'port': int(os.getenv('DB_PORT', 5432)),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'password': os.getenv('DB_PASSWORD', ''),
+        'database': os.getenv('DB_NAME', 'livedb'),
+        **pool_size
+    }
+
+    if os.getenv('DB_HOST'):
+        return [tcp_config]
+
+    # Peer authentication (Unix domain socket)
+    peer_config = {
+        'host': os.getenv('DB_SOCKET_DIR', '/var/run/postgresql'),
+        'user': os.getenv('DB_USER', 'postgres'),
+        'database': os.getenv('DB_NAME', 'livedb'),
+        **pool_size
+    }
+    return [peer_config, tcp_config]
+
+async def _init_connection(conn: asyncpg.Connection):
+    """풀에 새 연결이 추가될 때 실행 - json/jsonb를 파이썬 객체로 주고받도록 설정"""
+    for json_type in ('json', 'jsonb'):
+        await conn.set_type_codec(
+            json_type,
+            encoder=json.dumps,
+            decoder=json.loads,
+            schema='pg_catalog'
+        )
+
+def rows_affected(status: str) -> int:
+    """execute() 결과 상태 문자열(예: 'UPDATE 3')에서 처리된 행 수 추출"""
+    try:
+        return int(status.rsplit(' ', 1)[-1])
+    except (AttributeError, ValueError):
+        return 0
+
+class DatabasePool:
+    """asyncpg 연결 풀 래퍼
+
+    연결은 ``async with db.lease() as conn`` 으로 빌려 쓰고 블록을 벗어나면
+    풀로 반환된다. 대기 시간/타임아웃 등 풀 사용 통계를 함께 수집한다.
+    """
+
+    def __init__(self, acquire_timeout: float = float(os.getenv('DB_ACQUIRE_TIMEOUT', 10))):
+        self.acquire_timeout = acquire_timeout
+        self._pool: Optional[asyncpg.Pool] = None
+        self._init_lock = asyncio.Lock()
+        self._in_use = 0
+        self._acquire_count = 0
+        self._acquire_timeouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    @property
+    def pool(self) -> Optional[asyncpg.Pool]:
+        return self._pool
+
+    async def init(self) -> asyncpg.Pool:
+        """데이터베이스 연결 풀 초기화"""
+        if self._pool is not None:
+            return self._pool
+
+        async with self._init_lock:
+            if self._pool is not None:
+                return self._pool
+
+            db_configs = get_db_configs()
 
-async def init_db_pool():
-    """데이터베이스 연결 풀 초기화"""
-    global _connection_pool
-    
-    if _connection_pool is None:
-        try:
-            # PostgreSQL peer authentication 우선 시도
-            db_configs = [
-                # 1. Peer authentication (Unix domain socket)
-                {
-                    'host': '/var/run/postgresql',
-                    'user': 'postgres',
-                    'database': 'livedb',
-                    'min_size': 5,
-                    'max_size': 20
-                },
-                # 2. TCP connection with environment variables
-                {
-                    'host': os.getenv('DB_HOST', 'localhost'),
-                    'port': int(os.getenv('DB_PORT', 5432)),
-                    'user': os.getenv('DB_USER', 'postgres'),
-                    'password': os.getenv('DB_PASSWORD', ''),
-                    'database': os.getenv('DB_NAME', 'livedb'),
-                    'min_size': 5,
-                    'max_size': 20
-                }
-            ]
-            
             last_error = None
             for i, db_config in enumerate(db_configs, 1):
                 try:
-                    _connection_pool = await asyncpg.create_pool(**db_config)
+                    self._pool = await asyncpg.create_pool(**db_config, init=_init_connection)
                     logger.info(f"Database connection pool initialized successfully using config {i}")
                     break
                 except Exception as e:
                     last_error = e
                     logger.warning(f"Database config {i} failed: {e}")
                     continue
-            
-            if _connection_pool is None:
+
+            if self._pool is None:
+                logger.error(f"Failed to initialize database pool: {last_error}")
                 raise last_error or Exception("All database configurations failed")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize database pool: {e}")
-            _connection_pool = None
-            raise
-    
-    return _connection_pool
 
-async def get_db_connection():
-    """데이터베이스 연결 획득"""
-    global _connection_pool
-    
-    if _connection_pool is None:
-        await init_db_pool()
-    
-    try:
-        connection = await _connection_pool.acquire()
-        return connection
-    except Exception as e:
-        logger.error(f"Failed to get database connection: {e}")
-        # 재시도
+        return self._pool
+
+    @asynccontextmanager
+    async def lease(self, timeout: Optional[float] = None) -> AsyncIterator[asyncpg.Connection]:
+        """풀에서 연결을 빌리고 블록 종료 시 반환"""
+        pool = await self.init()
+
+        started = time.perf_counter()
         try:
-            await init_db_pool()
-            connection = await _connection_pool.acquire()
-            return connection
-        except Exception as retry_error:
-            logger.error(f"Failed to reconnect to database: {retry_error}")
+            conn = await pool.acquire(timeout=timeout or self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self._acquire_timeouts += 1
+            logger.error(f"Database connection acquire timed out ({self.stats()})")
             raise
+        waited = time.perf_counter() - started
+
+        self._acquire_count += 1
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._in_use += 1
+        try:
+            yield conn
+        finally:
+            self._in_use -= 1
+            await pool.release(conn)
+
+    def stats(self) -> Dict[str, Any]:
+        """풀 사용 통계"""
+        pool = self._pool
+        return {
+            "initialized": pool is not None,
+            "size": pool.get_size() if pool else 0,
+            "min_size": pool.get_min_size() if pool else 0,
+            "max_size": pool.get_max_size() if pool else 0,
+            "in_use": self._in_use,
+            "idle": pool.get_idle_size() if pool else 0,
+            "acquire_count": self._acquire_count,
+            "acquire_timeouts": self._acquire_timeouts,
+            "avg_wait_ms": round(self._wait_total * 1000 / max(self._acquire_count, 1), 3),
+            "max_wait_ms": round(self._wait_max * 1000, 3)
+        }
+
+    async def close(self):
+        """데이터베이스 연결 풀 종료"""
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+            logger.info("Database connection pool closed")
+
+# 프로세스 전역 풀
+db = DatabasePool()
+
+async def init_db_pool():
+    """데이터베이스 연결 풀 초기화"""
+    return await db.init()
+
+async def get_db_connection():
+    """데이터베이스 연결 획득
+
+    반환된 연결은 반드시 release_db_connection()으로 반환해야 한다.
+    새 코드에서는 ``async with db.lease()`` 를 사용할 것.
+    """
+    pool = await db.init()
+    return await pool.acquire(timeout=db.acquire_timeout)
+
+async def release_db_connection(connection: asyncpg.Connection):
+    """get_db_connection()으로 얻은 연결을 풀로 반환"""
+    if db.pool is not None:
+        await db.pool.release(connection)
+
+async def get_leased_connection() -> AsyncIterator[asyncpg.Connection]:
+    """FastAPI 의존성: 요청 처리 동안 연결을 빌리고 응답 후 반환
+
+    사용 예: ``conn: asyncpg.Connection = Depends(get_leased_connection)``
+    """
+    async with db.lease() as conn:
+        yield conn
 
 async def close_db_pool():
     """데이터베이스 연결 풀 종료"""
-    global _connection_pool
-    
-    if _connection_pool:
-        await _connection_pool.close()
-        _connection_pool = None
-        logger.info("Database connection pool closed")
+    await db.close()
+
+async def connect_direct() -> asyncpg.Connection:
+    """풀과 별개인 전용 연결 생성 (LISTEN 등 장시간 점유하는 용도)
+
+    풀과 같은 설정 순서로 시도하며, 호출자가 직접 close() 해야 한다.
+    """
+    last_error = None
+    for db_config in get_db_configs():
+        config = {k: v for k, v in db_config.items() if k not in ('min_size', 'max_size')}
+        try:
+            return await asyncpg.connect(**config, timeout=db.acquire_timeout)
+        except Exception as e:
+            last_error = e
+    raise last_error or Exception("All database configurations failed")
 
 class DatabaseManager:
     """데이터베이스 관리 클래스"""
@@ -100,214 +214,183 @@ class DatabaseManager:
     @staticmethod
     async def ensure_analytics_tables():
         """Analytics용 테이블들이 존재하는지 확인하고 없으면 생성"""
-        conn = await get_db_connection()
-        
-        try:
-            # Users 테이블
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id SERIAL PRIMARY KEY,
-                    email VARCHAR(255) UNIQUE,
-                    username VARCHAR(100),
-                    age INTEGER,
-                    gender VARCHAR(10),
-                    region VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    last_login TIMESTAMP,
-                    status VARCHAR(20) DEFAULT 'active'
-                )
-            """)
+        async with db.lease() as conn:
+            try:
+                # Users 테이블
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS users (
+                        id SERIAL PRIMARY KEY,
+                        email VARCHAR(255) UNIQUE,
+                        username VARCHAR(100),
+                        age INTEGER,
+                        gender VARCHAR(10),
+                        region VARCHAR(50),
+                        created_at TIMESTAMP DEFAULT NOW(),
+                        last_login TIMESTAMP,
+                        status VARCHAR(20) DEFAULT 'active'
+                    )
+                """)
             
-            # Page Analytics 테이블  
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS page_analytics (
-                    id SERIAL PRIMARY KEY,
-                    session_id VARCHAR(100),
-                    user_id INTEGER REFERENCES users(id),
-                    page_path VARCHAR(255),
-                    device_type VARCHAR(20),
-                    timestamp TIMESTAMP DEFAULT NOW(),
-                    date DATE DEFAULT CURRENT_DATE,
-                    time_on_page INTEGER DEFAULT 0,
-                    bounce BOOLEAN DEFAULT FALSE,
-                    session_duration INTEGER DEFAULT 0
-                )
-            """)
+                # Page Analytics / Saju Analysis Sessions 테이블 (시간 RANGE 파티션 - services/analytics_partitions.py)
+                from .analytics_partitions import PARTITIONED_INDEX_DDL, PARTITIONED_TABLE_DDL, analytics_partitions
+                for ddl in PARTITIONED_TABLE_DDL.values():
+                    await conn.execute(ddl)
+                await analytics_partitions.maintain(conn)
             
-            # Saju Analysis Sessions 테이블
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS saju_analysis_sessions (
-                    id SERIAL PRIMARY KEY,
-                    user_id INTEGER REFERENCES users(id),
-                    session_id VARCHAR(100),
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    completed_at TIMESTAMP,
-                    status VARCHAR(20) DEFAULT 'pending',
-                    ai_reviewed BOOLEAN DEFAULT FALSE,
-                    processing_time INTERVAL,
-                    result_data JSONB
-                )
-            """)
+                # Keyword Usage Stats 테이블
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS keyword_usage_stats (
+                        id SERIAL PRIMARY KEY,
+                        keyword_id INTEGER,
+                        date DATE DEFAULT CURRENT_DATE,
+                        usage_count INTEGER DEFAULT 1,
+                        status VARCHAR(20) DEFAULT 'active',
+                        UNIQUE(keyword_id, date)
+                    )
+                """)
             
-            # Keyword Usage Stats 테이블
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS keyword_usage_stats (
-                    id SERIAL PRIMARY KEY,
-                    keyword_id INTEGER,
-                    date DATE DEFAULT CURRENT_DATE,
-                    usage_count INTEGER DEFAULT 1,
-                    status VARCHAR(20) DEFAULT 'active',
-                    UNIQUE(keyword_id, date)
-                )
-            """)
+                # Sessions 테이블
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS sessions (
+                        id VARCHAR(100) PRIMARY KEY,
+                        user_id INTEGER REFERENCES users(id),
+                        created_at TIMESTAMP DEFAULT NOW(),
+                        last_activity TIMESTAMP DEFAULT NOW(),
+                        device_info JSONB,
+                        ip_address INET
+                    )
+                """)
             
-            # Sessions 테이블
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS sessions (
-                    id VARCHAR(100) PRIMARY KEY,
-                    user_id INTEGER REFERENCES users(id),
-                    created_at TIMESTAMP DEFAULT NOW(),
-                    last_activity TIMESTAMP DEFAULT NOW(),
-                    device_info JSONB,
-                    ip_address INET
-                )
-            """)
+                # System Workers 테이블
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS system_workers (
+                        id SERIAL PRIMARY KEY,
+                        worker_name VARCHAR(100) UNIQUE,
+                        worker_type VARCHAR(50),
+                        last_heartbeat TIMESTAMP DEFAULT NOW(),
+                        status VARCHAR(20) DEFAULT 'active',
+                        config JSONB
+                    )
+                """)
             
-            # System Workers 테이블
-            await conn.execute("""
-                CREATE TABLE IF NOT EXISTS system_workers (
-                    id SERIAL PRIMARY KEY,
-                    worker_name VARCHAR(100) UNIQUE,
-                    worker_type VARCHAR(50),
-                    last_heartbeat TIMESTAMP DEFAULT NOW(),
-                    status VARCHAR(20) DEFAULT 'active',
-                    config JSONB
-                )
-            """)
+                # 인덱스 생성
+                indexes = [
+                    *[sql for table_indexes in PARTITIONED_INDEX_DDL.values() for sql in table_indexes],
+                    "CREATE INDEX IF NOT EXISTS idx_keyword_stats_date ON keyword_usage_stats(date)",
+                    "CREATE INDEX IF NOT EXISTS idx_users_created ON users(created_at)",
+                    "CREATE INDEX IF NOT EXISTS idx_sessions_activity ON sessions(last_activity)"
+                ]
             
-            # 인덱스 생성
-            indexes = [
-                "CREATE INDEX IF NOT EXISTS idx_page_analytics_date ON page_analytics(date)",
-                "CREATE INDEX IF NOT EXISTS idx_page_analytics_user ON page_analytics(user_id)",
-                "CREATE INDEX IF NOT EXISTS idx_page_analytics_page ON page_analytics(page_path)",
-                "CREATE INDEX IF NOT EXISTS idx_saju_sessions_user ON saju_analysis_sessions(user_id)",
-                "CREATE INDEX IF NOT EXISTS idx_saju_sessions_date ON saju_analysis_sessions(created_at)",
-                "CREATE INDEX IF NOT EXISTS idx_keyword_stats_date ON keyword_usage_stats(date)",
-                "CREATE INDEX IF NOT EXISTS idx_users_created ON users(created_at)",
-                "CREATE INDEX IF NOT EXISTS idx_sessions_activity ON sessions(last_activity)"
-            ]
+                for index_sql in indexes:
+                    await conn.execute(index_sql)
             
-            for index_sql in indexes:
-                await conn.execute(index_sql)
+                # 대시보드용 시간별/일별 롤업 테이블과 원본 테이블 트리거
+                from .analytics_rollups import AnalyticsRollupAggregator
+                await AnalyticsRollupAggregator.ensure_tables(conn)
+                # /realtime-stats 분 단위 지표 대기열과 INSERT 트리거
+                from .realtime_metrics import RealtimeMetrics
+                await RealtimeMetrics.ensure_tables(conn)
             
-            logger.info("Analytics tables and indexes ensured")
+                logger.info("Analytics tables and indexes ensured")
             
-        except Exception as e:
-            logger.error(f"Failed to ensure analytics tables: {e}")
-        finally:
-            await conn.close()
+            except Exception as e:
+                logger.error(f"Failed to ensure analytics tables: {e}")
     
     @staticmethod
     async def seed_sample_data():
         """샘플 데이터 삽입 (개발/테스트용)"""
-        conn = await get_db_connection()
-        
-        try:
-            # 사용자 데이터 확인
-            user_count = await conn.fetchval("SELECT COUNT(*) FROM users")
+        async with db.lease() as conn:
+            try:
+                # 사용자 데이터 확인
+                user_count = await conn.fetchval("SELECT COUNT(*) FROM users")
             
-            if user_count == 0:
-                # 샘플 사용자 데이터 생성
-                sample_users = []
-                for i in range(100):
-                    sample_users.append((
-                        f"user{i}@heal7.com",
-                        f"user{i}",
-                        20 + (i % 50),  # 20-70세
-                        "여성" if i % 2 == 0 else "남성",
-                        ["서울", "부산", "대구", "인천", "광주"][i % 5],
-                        datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                    ))
+                if user_count == 0:
+                    # 샘플 사용자 데이터 생성
+                    sample_users = []
+                    for i in range(100):
+                        sample_users.append((
+                            f"user{i}@heal7.com",
+                            f"user{i}",
+                            20 + (i % 50),  # 20-70세
+                            "여성" if i % 2 == 0 else "남성",
+                            ["서울", "부산", "대구", "인천", "광주"][i % 5],
+                            datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                        ))
                 
-                await conn.executemany("""
-                    INSERT INTO users (email, username, age, gender, region, created_at)
-                    VALUES ($1, $2, $3, $4, $5, $6)
-                """, sample_users)
+                    await conn.executemany("""
+                        INSERT INTO users (email, username, age, gender, region, created_at)
+                        VALUES ($1, $2, $3, $4, $5, $6)
+                    """, sample_users)
                 
-                logger.info("Sample user data inserted")
+                    logger.info("Sample user data inserted")
             
-            # 페이지 분석 데이터 확인
-            pageview_count = await conn.fetchval("SELECT COUNT(*) FROM page_analytics")
+                # 페이지 분석 데이터 확인
+                pageview_count = await conn.fetchval("SELECT COUNT(*) FROM page_analytics")
             
-            if pageview_count == 0:
-                # 샘플 페이지뷰 데이터
-                sample_pageviews = []
-                pages = ["/", "/saju/free", "/saju/detail", "/keywords", "/profile", "/community"]
-                devices = ["mobile", "desktop", "tablet"]
+                if pageview_count == 0:
+                    # 샘플 페이지뷰 데이터
+                    sample_pageviews = []
+                    pages = ["/", "/saju/free", "/saju/detail", "/keywords", "/profile", "/community"]
+                    devices = ["mobile", "desktop", "tablet"]
                 
-                for i in range(1000):
-                    sample_pageviews.append((
-                        f"session_{i % 200}",  # 200개 세션
-                        (i % 100) + 1,       # user_id
-                        pages[i % len(pages)],
-                        devices[i % len(devices)],
-                        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                        60 + (i % 300),      # time_on_page
-                        i % 10 == 0          # bounce (10% bounce rate)
-                    ))
+                    for i in range(1000):
+                        sample_pageviews.append((
+                            f"session_{i % 200}",  # 200개 세션
+                            (i % 100) + 1,       # user_id
+                            pages[i % len(pages)],
+                            devices[i % len(devices)],
+                            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            60 + (i % 300),      # time_on_page
+                            i % 10 == 0          # bounce (10% bounce rate)
+                        ))
                 
-                await conn.executemany("""
-                    INSERT INTO page_analytics 
-                    (session_id, user_id, page_path, device_type, timestamp, time_on_page, bounce)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7)
-                """, sample_pageviews)
+                    await conn.executemany("""
+                        INSERT INTO page_analytics 
+                        (session_id, user_id, page_path, device_type, timestamp, time_on_page, bounce)
+                        VALUES ($1, $2, $3, $4, $5, $6, $7)
+                    """, sample_pageviews)
                 
-                logger.info("Sample pageview data inserted")
+                    logger.info("Sample pageview data inserted")
             
-        except Exception as e:
-            logger.error(f"Failed to seed sample data: {e}")
-        finally:
-            await conn.close()
+            except Exception as e:
+                logger.error(f"Failed to seed sample data: {e}")
     
     @staticmethod
     async def get_table_info(table_name: str) -> Dict[str, Any]:
         """테이블 정보 조회"""
-        conn = await get_db_connection()
-        
-        try:
-            # 테이블 존재 여부 확인
-            exists = await conn.fetchval("""
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables 
-                    WHERE table_name = $1
-                )
-            """, table_name)
+        async with db.lease() as conn:
+            try:
+                # 테이블 존재 여부 확인
+                exists = await conn.fetchval("""
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables 
+                        WHERE table_name = $1
+                    )
+                """, table_name)
             
-            if not exists:
-                return {"exists": False}
+                if not exists:
+                    return {"exists": False}
             
-            # 컬럼 정보 조회
-            columns = await conn.fetch("""
-                SELECT column_name, data_type, is_nullable
-                FROM information_schema.columns
-                WHERE table_name = $1
-                ORDER BY ordinal_position
-            """, table_name)
+                # 컬럼 정보 조회
+                columns = await conn.fetch("""
+                    SELECT column_name, data_type, is_nullable
+                    FROM information_schema.columns
+                    WHERE table_name = $1
+                    ORDER BY ordinal_position
+                """, table_name)
             
-            # 레코드 수 조회
-            count = await conn.fetchval(f"SELECT COUNT(*) FROM {table_name}")
+                # 레코드 수 조회
+                count = await conn.fetchval(f"SELECT COUNT(*) FROM {table_name}")
             
-            return {
-                "exists": True,
-                "columns": [dict(col) for col in columns],
-                "record_count": count
-            }
+                return {
+                    "exists": True,
+                    "columns": [dict(col) for col in columns],
+                    "record_count": count
+                }
             
-        except Exception as e:
-            logger.error(f"Failed to get table info for {table_name}: {e}")
-            return {"exists": False, "error": str(e)}
-        finally:
-            await conn.close()
+            except Exception as e:
+                logger.error(f"Failed to get table info for {table_name}: {e}")
+                return {"exists": False, "error": str(e)}
 
 # 초기화 함수
 async def initialize_analytics_db():
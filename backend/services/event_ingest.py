@@ -0,0 +1,293 @@
+"""
+HEAL7 페이지뷰 / 세션 이벤트 수집 버퍼
+POST /admin-api/analytics/events 로 들어온 이벤트를 워커 메모리에 모았다가 COPY 로 한 번에 적는다.
+
+- 버퍼 행 수가 INGEST_FLUSH_ROWS 에 닿거나 INGEST_FLUSH_INTERVAL 초가 지나면 백그라운드 플러셔가 비운다.
+- 플러시 한 번 = 트랜잭션 하나: 임시 테이블 두 개에 copy_records_to_table 로 넣고
+    page_analytics 에 INSERT ... SELECT 한 번 (없는 user_id 는 NULL 로 - 배치 전체가 FK 로 실패하지 않게),
+    sessions 에 세션별로 묶은 upsert 한 번 (last_activity 는 더 최근 값만, 세션 id 순서로 잠가 워커 간 교착을 피함).
+  page_analytics 의 문장 트리거(롤업 / 실시간 지표)는 플러시마다 한 번만 돈다.
+- 메모리 상한(INGEST_BUFFER_MAX_ROWS, 플러시 중인 행 포함)을 넘으면 자리가 날 때까지
+  INGEST_ENQUEUE_TIMEOUT 초 기다리고, 그래도 없으면 IngestBackpressure (엔드포인트는 429 + Retry-After).
+- 플러시가 실패하면 행을 버퍼 앞에 되돌려 다음 주기에 다시 시도하고,
+  INGEST_MAX_RETRIES 번 연속 실패한 배치는 버린다 (dropped 카운터).
+- 수락(202)은 메모리 버퍼에 들어갔다는 뜻이다. 워커가 비정상 종료하면 아직 플러시하지 않은 이벤트는 잃는다.
+  저장까지 기다려야 하면 submit 이 돌려주는 future 를 기다린다 (엔드포인트의 wait=true).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from .database_manager import db
+
+logger = logging.getLogger(__name__)
+
+PAGEVIEW_COLUMNS = ("session_id", "user_id", "page_path", "device_type", "timestamp", "date",
+                    "time_on_page", "bounce", "session_duration")
+SESSION_COLUMNS = ("session_id", "user_id", "created_at", "last_activity", "device_info", "ip_address")
+
+STAGING_DDL = """
+    CREATE TEMP TABLE ingest_pageviews (
+        session_id VARCHAR(100),
+        user_id INTEGER,
+        page_path VARCHAR(255),
+        device_type VARCHAR(20),
+        timestamp TIMESTAMP,
+        date DATE,
+        time_on_page INTEGER,
+        bounce BOOLEAN,
+        session_duration INTEGER
+    ) ON COMMIT DROP;
+    CREATE TEMP TABLE ingest_sessions (
+        session_id VARCHAR(100),
+        user_id INTEGER,
+        created_at TIMESTAMP,
+        last_activity TIMESTAMP,
+        device_info TEXT,
+        ip_address TEXT
+    ) ON COMMIT DROP
+"""
+
+INSERT_PAGEVIEWS_QUERY = f"""
+    INSERT INTO page_analytics ({', '.join(PAGEVIEW_COLUMNS)})
+    SELECT p.session_id, u.id, p.page_path, p.device_type, p.timestamp, p.date,
+           p.time_on_page, p.bounce, p.session_duration
+    FROM ingest_pageviews p
+    LEFT JOIN users u ON u.id = p.user_id
+"""
+
+# 세션 이벤트 + 페이지뷰에서 본 세션을 세션별로 묶어 반영
+UPSERT_SESSIONS_QUERY = """
+    INSERT INTO sessions AS s (id, user_id, created_at, last_activity, device_info, ip_address)
+    SELECT e.session_id,
+           MAX(u.id),
+           MIN(e.created_at),
+           MAX(e.last_activity),
+           ((array_agg(e.device_info) FILTER (WHERE e.device_info IS NOT NULL))[1])::jsonb,
+           ((array_agg(e.ip_address) FILTER (WHERE e.ip_address IS NOT NULL))[1])::inet
+    FROM (
+        SELECT session_id, user_id, created_at, last_activity, device_info, ip_address
+        FROM ingest_sessions
+        UNION ALL
+        SELECT session_id, user_id, MIN(timestamp), MAX(timestamp), NULL, NULL
+        FROM ingest_pageviews
+        WHERE session_id IS NOT NULL
+        GROUP BY session_id, user_id
+    ) e
+    LEFT JOIN users u ON u.id = e.user_id
+    GROUP BY e.session_id
+    ORDER BY e.session_id
+    ON CONFLICT (id) DO UPDATE SET
+        last_activity = GREATEST(s.last_activity, EXCLUDED.last_activity),
+        user_id = COALESCE(s.user_id, EXCLUDED.user_id),
+        device_info = COALESCE(EXCLUDED.device_info, s.device_info),
+        ip_address = COALESCE(EXCLUDED.ip_address, s.ip_address)
+    WHERE EXCLUDED.last_activity > s.last_activity
+       OR (s.user_id IS NULL AND EXCLUDED.user_id IS NOT NULL)
+       OR EXCLUDED.device_info IS NOT NULL
+       OR EXCLUDED.ip_address IS NOT NULL
+"""
+
+class IngestBackpressure(Exception):
+    """버퍼가 가득 차 이벤트를 받을 수 없음"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"event buffer full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class PageViewIngestBuffer:
+    """워커별 이벤트 버퍼 + 백그라운드 COPY 플러셔 (서비스 컨테이너에 등록)"""
+
+    def __init__(self,
+                 flush_rows: int = int(os.getenv('INGEST_FLUSH_ROWS', 5000)),
+                 flush_interval: float = float(os.getenv('INGEST_FLUSH_INTERVAL', 1.0)),
+                 max_rows: int = int(os.getenv('INGEST_BUFFER_MAX_ROWS', 50000)),
+                 enqueue_timeout: float = float(os.getenv('INGEST_ENQUEUE_TIMEOUT', 1.0)),
+                 max_retries: int = int(os.getenv('INGEST_MAX_RETRIES', 5))):
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.enqueue_timeout = enqueue_timeout
+        self.max_retries = max_retries
+        self._pageviews: List[tuple] = []
+        self._sessions: List[tuple] = []
+        self._waiters: List[asyncio.Future] = []
+        self._failures = 0
+        # 버퍼 + 플러시 중인 행 수 (메모리 상한 기준)
+        self._pending = 0
+        self._wake = asyncio.Event()
+        self._space = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._counters: Dict[str, float] = {}
+        self._last_flush_ms: Optional[float] = None
+        self._last_flush_at: Optional[str] = None
+        self._last_error: Optional[str] = None
+
+    def _count(self, counter: str, amount: float = 1):
+        self._counters[counter] = self._counters.get(counter, 0) + amount
+
+    # ==================== 수락 ====================
+
+    async def submit(self, pageviews: List[tuple], sessions: List[tuple],
+                     wait: bool = False) -> Optional[asyncio.Future]:
+        """이벤트를 버퍼에 넣음 (wait=True 면 이 이벤트가 저장되면 끝나는 future 를 돌려줌)
+
+        버퍼에 자리가 없으면 enqueue_timeout 초까지 기다린 뒤 IngestBackpressure.
+        """
+        rows = len(pageviews) + len(sessions)
+        if rows > self.max_rows:
+            raise ValueError(f"batch of {rows} events exceeds buffer capacity {self.max_rows}")
+
+        if self._pending + rows > self.max_rows:
+            self._count("backpressure_waits")
+            self._wake.set()
+            try:
+                async with self._space:
+                    await asyncio.wait_for(
+                        self._space.wait_for(lambda: self._pending + rows <= self.max_rows),
+                        timeout=self.enqueue_timeout
+                    )
+            except asyncio.TimeoutError:
+                self._count("rejected_events", rows)
+                raise IngestBackpressure(retry_after=max(self.flush_interval, 1.0))
+
+        self._pageviews.extend(pageviews)
+        self._sessions.extend(sessions)
+        self._pending += rows
+        self._count("accepted_pageviews", len(pageviews))
+        self._count("accepted_sessions", len(sessions))
+
+        waiter = None
+        if wait:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        if len(self._pageviews) + len(self._sessions) >= self.flush_rows:
+            self._wake.set()
+        return waiter
+
+    # ==================== 플러시 ====================
+
+    async def _write(self, conn: asyncpg.Connection, pageviews: List[tuple], sessions: List[tuple]):
+        async with conn.transaction():
+            await conn.execute(STAGING_DDL)
+            if pageviews:
+                await conn.copy_records_to_table("ingest_pageviews", records=pageviews, columns=PAGEVIEW_COLUMNS)
+            if sessions:
+                await conn.copy_records_to_table("ingest_sessions", records=sessions, columns=SESSION_COLUMNS)
+            if pageviews:
+                await conn.execute(INSERT_PAGEVIEWS_QUERY)
+            await conn.execute(UPSERT_SESSIONS_QUERY)
+
+    async def flush(self) -> Dict[str, Any]:
+        """지금 버퍼에 있는 이벤트를 한 트랜잭션으로 저장"""
+        pageviews, self._pageviews = self._pageviews, []
+        sessions, self._sessions = self._sessions, []
+        waiters, self._waiters = self._waiters, []
+        rows = len(pageviews) + len(sessions)
+        if not rows:
+            return {"pageviews": 0, "sessions": 0}
+
+        started = time.perf_counter()
+        try:
+            async with db.lease() as conn:
+                await self._write(conn, pageviews, sessions)
+        except Exception as e:
+            self._failures += 1
+            self._count("flush_errors")
+            self._last_error = str(e)
+            if self._failures < self.max_retries:
+                # 버퍼 앞에 되돌려 다음 주기에 다시 시도 (기다리는 요청도 그대로)
+                logger.warning(f"이벤트 플러시 실패 ({self._failures}/{self.max_retries}), 재시도 예정: {e}")
+                self._pageviews[:0] = pageviews
+                self._sessions[:0] = sessions
+                self._waiters[:0] = waiters
+                raise
+            logger.error(f"이벤트 플러시 {self._failures}회 연속 실패, 이벤트 {rows}건 버림: {e}")
+            self._failures = 0
+            self._count("dropped_events", rows)
+            await self._release(rows)
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(e)
+            raise
+
+        self._failures = 0
+        self._last_flush_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._last_flush_at = datetime.now().isoformat()
+        self._last_error = None
+        self._count("flushes")
+        self._count("flushed_pageviews", len(pageviews))
+        self._count("flushed_sessions", len(sessions))
+        self._count("flush_ms", self._last_flush_ms)
+        await self._release(rows)
+
+        result = {"pageviews": len(pageviews), "sessions": len(sessions), "flush_ms": self._last_flush_ms}
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(result)
+        return result
+
+    async def _release(self, rows: int):
+        self._pending -= rows
+        async with self._space:
+            self._space.notify_all()
+
+    async def _run_forever(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # 실패는 flush 에서 기록 - 다음 주기까지 기다렸다가 재시도
+                await asyncio.sleep(self.flush_interval)
+
+    # ==================== 수명주기 / 통계 ====================
+
+    async def start(self):
+        """서비스 컨테이너 시작 훅: 플러셔 시작"""
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def close(self):
+        """서비스 컨테이너 종료 훅: 플러셔를 멈추고 남은 이벤트를 저장"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error(f"종료 시 이벤트 플러시 실패, {self._pending}건 유실: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        flushes = self._counters.get("flushes", 0)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "buffered": len(self._pageviews) + len(self._sessions),
+            "pending": self._pending,
+            "flush_rows": self.flush_rows,
+            "flush_interval": self.flush_interval,
+            "max_rows": self.max_rows,
+            **{k: round(v, 1) if k == "flush_ms" else int(v) for k, v in self._counters.items()},
+            "avg_flush_ms": round(self._counters.get("flush_ms", 0) / flushes, 1) if flushes else None,
+            "last_flush_ms": self._last_flush_ms,
+            "last_flush_at": self._last_flush_at,
+            "last_error": self._last_error
+        }
+
+# 프로세스(워커) 전역 버퍼
+event_ingest = PageViewIngestBuffer()
@@ -3,106 +3,147 @@ HEAL7 키워드 점수 계산기
 설문 응답 기반 실시간 키워드 점수 계산 및 관리
 """
 
-import json
 import logging
+import time
+from collections.abc import Mapping
 from typing import Dict, List, Optional, Any
-from datetime import datetime
-import redis
-import psycopg2
-from psycopg2.extras import RealDictCursor
+
+import numpy as np
+
+from .database_manager import db
+from .option_keyword_index import OptionKeywordIndex, option_keyword_index
+from .keyword_dependency_graph import KeywordDependencyIndex, keyword_dependency_index
+from .keyword_vector import (
+    FLOAT32_DIGITS, LEGACY_SCORES_PENDING, UPDATE_VECTOR_SCRIPT, SessionKeywordVector,
+    legacy_session_scores_key, session_vector_key
+)
+from .redis_manager import get_redis, get_raw
 
 logger = logging.getLogger("heal7.keyword.calculator")
 
+# 전파로만 점수를 얻은 키워드는 이 절대값 이상일 때만 결과에 추가
+PROPAGATION_MIN_SCORE = 1e-3
+
+SESSION_RESPONSES_QUERY = """
+SELECT sr.id, sr.question_id, sr.selected_option_ids, sr.response_time_seconds
+FROM survey_responses sr
+JOIN survey_sessions ss ON sr.session_id = ss.id
+WHERE ss.session_uuid = $1
+ORDER BY sr.id
+"""
+
+# 재채점 결과 일괄 반영: $1 = {응답 ID(문자열): keyword_impacts}
+UPDATE_RESPONSE_IMPACTS_QUERY = """
+UPDATE survey_responses sr
+SET keyword_impacts = $1::jsonb -> sr.id::text
+WHERE sr.id = ANY($2::int[])
+"""
+
 class KeywordScoreCalculator:
-    def __init__(self):
-        self.db_config = {
-            "host": "localhost",
-            "database": "devdb", 
-            "user": "devuser",
-            "password": "devpass"
-        }
-        self.redis_client = redis.Redis(host='localhost', port=6379, db=0, decode_responses=True)
-        
-    def get_db_connection(self):
-        """데이터베이스 연결"""
-        return psycopg2.connect(**self.db_config)
+    def __init__(self, mapping_index: Optional[OptionKeywordIndex] = None,
+                 dependency_index: Optional[KeywordDependencyIndex] = None):
+        self.redis_client = get_redis()
+        self.mapping_index = mapping_index or option_keyword_index
+        self.dependency_index = dependency_index or keyword_dependency_index
+        self._update_vector_script = self.redis_client.register_script(UPDATE_VECTOR_SCRIPT)
     
     async def calculate_keyword_impact(self, response_data: dict) -> dict:
         """단일 응답의 키워드 영향 계산"""
         
-        keyword_impacts = {}
-        
         try:
-            # 1. 선택된 옵션들의 키워드 매핑 정보 수집
-            for option_id in response_data.get('selected_option_ids', []):
-                option_mappings = await self.get_option_keyword_mappings(option_id)
-                
-                for mapping in option_mappings:
-                    keyword_id = mapping['keyword_id']
-                    base_impact = mapping['score_impact']  # 0.0 ~ 1.0
-                    impact_type = mapping['impact_type']   # 'positive', 'negative', 'neutral'
-                    
-                    # 2. 질문별 가중치 적용
-                    question_weight = await self.get_question_importance_weight(
-                        response_data['question_id']
-                    )
-                    
-                    # 3. 응답 신뢰도 적용
-                    confidence_factor = self.calculate_response_confidence(response_data)
-                    
-                    # 4. 최종 키워드 영향 점수 계산
-                    final_impact = base_impact * question_weight * confidence_factor
-                    
-                    # 5. 영향 유형에 따른 부호 결정
-                    if impact_type == 'negative':
-                        final_impact = -final_impact
-                    elif impact_type == 'neutral':
-                        final_impact = final_impact * 0.5
-                    
-                    keyword_impacts[keyword_id] = {
-                        'impact_score': final_impact,
-                        'confidence': confidence_factor,
-                        'source_question': response_data['question_id'],
-                        'impact_type': impact_type
-                    }
-            
-            return keyword_impacts
-            
+            return (await self.calculate_keyword_impacts([response_data]))[0]
         except Exception as e:
             logger.error(f"키워드 영향 계산 실패: {e}")
             return {}
     
-    async def get_option_keyword_mappings(self, option_id: int) -> List[Dict]:
-        """옵션의 키워드 매핑 정보 조회"""
-        
-        # 임시 구현 - 실제로는 survey_question_options 테이블에서 조회
-        return [
-            {
-                'keyword_id': 1,
-                'score_impact': 0.8,
-                'impact_type': 'positive'
+    async def calculate_keyword_impacts(self, responses: List[dict]) -> List[dict]:
+        """여러 응답의 키워드 영향 일괄 계산 (입력 순서대로 응답별 결과 반환)
+        
+        옵션→키워드 매핑과 질문 가중치는 메모리 인덱스(option_keyword_index)에서 가져오고
+        최종 영향 = 유형 배율이 적용된 기본 영향 × 질문 가중치 × 응답 신뢰도
+        를 매핑 행 전체에 대해 벡터 연산으로 계산한다.
+        """
+        
+        results: List[dict] = [{} for _ in responses]
+        index = await self.mapping_index.snapshot()
+        
+        # 1. 선택된 옵션들의 컴파일된 매핑 수집
+        entries = []
+        for idx, response_data in enumerate(responses):
+            question_weight = index.question_weight(response_data['question_id'])
+            for option_id in response_data.get('selected_option_ids') or []:
+                entry = index.options.get(int(option_id))
+                if entry is not None:
+                    entries.append((idx, question_weight, entry))
+        
+        if not entries:
+            return results
+        
+        # 2. 벡터 연산
+        lengths = [len(entry[0]) for _, _, entry in entries]
+        row_response = np.repeat(np.fromiter((idx for idx, _, _ in entries), dtype=np.int64), lengths)
+        question_weight = np.repeat(np.fromiter((weight for _, weight, _ in entries), dtype=np.float64), lengths)
+        keyword_ids = np.concatenate([entry[0] for _, _, entry in entries])
+        signed_impact = np.concatenate([entry[1] for _, _, entry in entries])
+        impact_types = [impact_type for _, _, entry in entries for impact_type in entry[2]]
+        
+        confidences = self.calculate_response_confidences(
+            [response_data.get('response_time_seconds') for response_data in responses]
+        )
+        row_confidence = confidences[row_response]
+        final_impact = signed_impact * question_weight * row_confidence
+        
+        # 3. 응답별 결과 구성 (같은 키워드는 나중 매핑이 덮어씀)
+        for i, keyword_id in enumerate(keyword_ids.tolist()):
+            idx = int(row_response[i])
+            results[idx][keyword_id] = {
+                'impact_score': float(final_impact[i]),
+                'confidence': float(row_confidence[i]),
+                'source_question': responses[idx]['question_id'],
+                'impact_type': impact_types[i]
             }
-        ]
+        
+        return results
+    
+    async def rescore_session(self, session_uuid: str) -> Dict[int, dict]:
+        """세션의 모든 응답을 한 번에 재채점하고 저장된 keyword_impacts 갱신"""
+        
+        async with db.lease() as conn:
+            rows = await conn.fetch(SESSION_RESPONSES_QUERY, session_uuid)
+        
+        responses = [dict(row) for row in rows]
+        impacts = await self.calculate_keyword_impacts(responses)
+        rescored = {response['id']: impact for response, impact in zip(responses, impacts)}
+        
+        if rescored:
+            async with db.lease() as conn:
+                await conn.execute(
+                    UPDATE_RESPONSE_IMPACTS_QUERY,
+                    {str(response_id): impact for response_id, impact in rescored.items()},
+                    list(rescored)
+                )
+        
+        logger.info(f"세션 {session_uuid} 재채점 완료: 응답 {len(rescored)}개")
+        return rescored
     
-    async def get_question_importance_weight(self, question_id: int) -> float:
-        """질문의 중요도 가중치 조회"""
+    @staticmethod
+    def calculate_response_confidences(response_times: List[Optional[float]]) -> np.ndarray:
+        """응답 시간 배열로부터 응답 신뢰도 배열 계산"""
         
-        # 임시 구현 - 실제로는 survey_questions 테이블에서 조회
-        return 1.0
+        # 응답 시간이 없으면 보통 속도(10초)로 간주
+        times = np.array([10 if t is None else t for t in response_times], dtype=np.float64)
+        
+        # 너무 빠른 응답(2초 미만) 0.7, 너무 느린 응답(120초 초과) 0.8
+        confidence = np.where(times < 2, 0.7, np.where(times > 120, 0.8, 1.0))
+        
+        return np.clip(confidence, 0.1, 1.0)
     
     def calculate_response_confidence(self, response_data: dict) -> float:
         """응답 신뢰도 계산"""
         
-        confidence = 1.0
-        
-        # 응답 시간 기반 신뢰도 조정
-        response_time = response_data.get('response_time_seconds', 10)
-        if response_time < 2:  # 너무 빠른 응답
-            confidence *= 0.7
-        elif response_time > 120:  # 너무 느린 응답
-            confidence *= 0.8
-            
-        return max(0.1, min(1.0, confidence))
+        return float(self.calculate_response_confidences(
+            [response_data.get('response_time_seconds')]
+        )[0])
     
     async def update_session_scores(self, session_uuid: str, response_data: dict):
         """세션의 키워드 점수 업데이트 (백그라운드 작업)"""
@@ -111,64 +152,56 @@ class KeywordScoreCalculator:
             # 키워드 영향 계산
             keyword_impacts = await self.calculate_keyword_impact(response_data)
             
-            # Redis에 누적 점수 업데이트
-            current_scores = self.redis_client.hgetall(
-                f"heal7:survey:session:{session_uuid}:keywords"
-            )
-            
-            updated_scores = {}
-            
-            for keyword_id, impact_data in keyword_impacts.items():
-                current_score = float(current_scores.get(f"keyword_{keyword_id}", 0.0))
-                impact_score = impact_data['impact_score']
-                
-                # 누적 점수 계산 (가중 평균 방식)
-                if current_score == 0.0:
-                    new_score = impact_score
-                else:
-                    weight_decay = 0.9  # 기존 점수 가중치
-                    new_score = (current_score * weight_decay) + (impact_score * (1 - weight_decay))
-                
-                # 점수 범위 정규화 (-1.0 ~ 1.0)
-                new_score = max(-1.0, min(1.0, new_score))
+            if keyword_impacts:
+                # 누적 점수 계산 (가중 평균 방식, -1.0 ~ 1.0 정규화)은
+                # Lua 스크립트가 Redis 안에서 벡터 블롭을 풀고 다시 묶어 왕복 1회로 끝낸다
+                weight_decay = 0.9  # 기존 점수 가중치
+                args = [weight_decay, int(time.time())]
+                for keyword_id, impact_data in keyword_impacts.items():
+                    args.extend([keyword_id, impact_data['impact_score'], impact_data['confidence']])
                 
-                updated_scores[f"keyword_{keyword_id}"] = json.dumps({
-                    'score': new_score,
-                    'confidence': impact_data['confidence'],
-                    'last_updated': datetime.now().isoformat(),
-                    'update_count': int(current_scores.get(f"keyword_{keyword_id}_count", 0)) + 1
-                })
-            
-            # Redis 업데이트
-            if updated_scores:
-                self.redis_client.hmset(
-                    f"heal7:survey:session:{session_uuid}:keywords",
-                    updated_scores
-                )
+                keys = [session_vector_key(session_uuid), legacy_session_scores_key(session_uuid)]
+                if await self._update_vector_script(keys=keys, args=args) == LEGACY_SCORES_PENDING:
+                    await self.migrate_legacy_scores(session_uuid)
+                    await self._update_vector_script(keys=keys, args=args)
             
             logger.info(f"세션 {session_uuid} 키워드 점수 업데이트 완료")
             
         except Exception as e:
             logger.error(f"세션 키워드 점수 업데이트 실패: {e}")
     
-    async def get_session_scores(self, session_uuid: str) -> dict:
-        """세션의 현재 키워드 점수 조회"""
+    async def get_session_scores(self, session_uuid: str) -> SessionKeywordVector:
+        """세션의 현재 키워드 점수 조회 (keyword_{id} → 점수 딕셔너리 매핑으로 사용 가능)"""
         
         try:
-            scores_data = self.redis_client.hgetall(
-                f"heal7:survey:session:{session_uuid}:keywords"
-            )
-            
-            scores = {}
-            for key, value in scores_data.items():
-                if key.startswith('keyword_') and not key.endswith('_count'):
-                    scores[key] = json.loads(value)
-            
-            return scores
+            blob = await get_raw(self.redis_client, session_vector_key(session_uuid))
+            if blob is None:
+                return await self.migrate_legacy_scores(session_uuid) or SessionKeywordVector()
+            return SessionKeywordVector.from_bytes(blob)
             
         except Exception as e:
             logger.error(f"세션 키워드 점수 조회 실패: {e}")
-            return {}
+            return SessionKeywordVector()
+    
+    async def migrate_legacy_scores(self, session_uuid: str) -> Optional[SessionKeywordVector]:
+        """이전 형식 해시(...:keywords)의 세션 점수를 벡터 블롭으로 옮기고 해시 삭제 (해시가 없으면 None)
+
+        블롭이 이미 있으면(다른 요청이 먼저 옮겼거나 갱신함) 덮어쓰지 않고 그 블롭을 돌려준다.
+        """
+        legacy_key = legacy_session_scores_key(session_uuid)
+        fields = await self.redis_client.hgetall(legacy_key)
+        if not fields:
+            return None
+        
+        vector = SessionKeywordVector.from_legacy_hash(fields)
+        async with self.redis_client.pipeline(transaction=True) as pipe:
+            pipe.set(session_vector_key(session_uuid), vector.to_bytes(), nx=True)
+            pipe.delete(legacy_key)
+            created, _ = await pipe.execute()
+        if not created:
+            return SessionKeywordVector.from_bytes(await get_raw(self.redis_client, session_vector_key(session_uuid)))
+        logger.info(f"세션 {session_uuid} 키워드 점수를 이전 해시 형식에서 옮김 ({len(vector)}개)")
+        return vector
     
     async def finalize_session_scores(self, session_uuid: str) -> dict:
         """세션 완료 시 최종 키워드 점수 계산"""
@@ -177,11 +210,8 @@ class KeywordScoreCalculator:
             # 현재 점수 조회
             current_scores = await self.get_session_scores(session_uuid)
             
-            # 최종 점수 계산 (추가 로직 적용 가능)
-            final_scores = current_scores.copy()
-            
             # 키워드 의존성 네트워크 전파 효과 적용
-            final_scores = await self.apply_dependency_effects(final_scores)
+            final_scores = await self.apply_dependency_effects(current_scores)
             
             return final_scores
             
@@ -189,15 +219,69 @@ class KeywordScoreCalculator:
             logger.error(f"최종 키워드 점수 계산 실패: {e}")
             return {}
     
-    async def apply_dependency_effects(self, scores: dict) -> dict:
+    async def apply_dependency_effects(self, scores: Mapping) -> dict:
         """키워드 의존성 네트워크 효과 적용"""
         
-        # 임시 구현 - 실제로는 keyword_dependencies 테이블 활용
-        return scores
+        return (await self.apply_dependency_effects_batch([scores]))[0]
+    
+    async def apply_dependency_effects_batch(self, sessions: List[Mapping]) -> List[dict]:
+        """여러 세션 점수에 의존성 전파를 한 번의 희소 행렬 곱으로 적용
+        
+        직접 응답으로 점수가 있던 키워드는 score 가 전파 점수로 바뀌고 direct_score 에 원래 점수가 남는다.
+        전파로만 점수를 얻은 키워드는 propagated=True 항목으로 추가된다.
+        """
+        
+        vectors = [
+            scores if isinstance(scores, SessionKeywordVector) else SessionKeywordVector.from_mapping(scores)
+            for scores in sessions
+        ]
+        results = [vector.to_dict() for vector in vectors]
+        
+        graph = await self.dependency_index.snapshot()
+        if not graph.size or not vectors:
+            return results
+        
+        # 1. 세션 점수를 그래프 순서의 세션 × 키워드 행렬로 배치
+        direct = np.zeros((len(vectors), graph.size), dtype=np.float32)
+        confidences = np.zeros_like(direct)
+        session_positions = []
+        for row, vector in enumerate(vectors):
+            positions, in_graph = graph.positions(vector.keyword_ids)
+            direct[row, positions] = vector.scores[in_graph]
+            confidences[row, positions] = vector.confidences[in_graph]
+            session_positions.append(positions)
+        
+        # 2. k단계 전파
+        propagated = graph.propagate(direct)
+        inferred_confidences = graph.propagate_confidence(confidences)
+        
+        # 3. 바뀐 키워드만 결과 딕셔너리에 반영
+        for row, result in enumerate(results):
+            changed = np.abs(propagated[row]) >= PROPAGATION_MIN_SCORE
+            changed[session_positions[row]] = True
+            for position in np.flatnonzero(changed).tolist():
+                key = f"keyword_{int(graph.keyword_ids[position])}"
+                score = round(float(propagated[row, position]), FLOAT32_DIGITS)
+                entry = result.get(key)
+                if entry is None:
+                    result[key] = {
+                        'score': score,
+                        'confidence': round(float(inferred_confidences[row, position]), FLOAT32_DIGITS),
+                        'update_count': 0,
+                        'propagated': True
+                    }
+                elif entry['score'] != score:
+                    entry['direct_score'] = entry['score']
+                    entry['score'] = score
+        
+        return results
     
     def get_top_keywords(self, keyword_scores: dict, limit: int = 10) -> List[Dict]:
         """상위 키워드 추출"""
         
+        if isinstance(keyword_scores, SessionKeywordVector):
+            return keyword_scores.top(limit)
+        
         scored_keywords = []
         for keyword_id, data in keyword_scores.items():
             if isinstance(data, dict) and 'score' in data:
@@ -0,0 +1,234 @@
+"""
+HEAL7 키워드 의존성 전파 엔진
+keyword_dependencies 그래프를 CSR 희소 행렬로 한 번 읽어 두고 세션 점수 벡터에 k단계 전파 적용
+
+행렬 A 는 행 = 종속 키워드, 열 = 부모 키워드, 값 = weight × strength 이며
+행마다 절대값 합이 1이 되도록 정규화한다 (종속 키워드는 부모 점수의 가중 평균을 받는다).
+
+    전파 점수 = clip(s + Σ_{t=1..k} damping^t · A^t · s, -1, 1)
+
+단일 세션(1차원)과 여러 세션 묶음(2차원, 세션 × 키워드) 모두 같은 행렬 곱으로 처리한다.
+행렬 밀도가 DENSE_KERNEL_DENSITY 이상이면(442개 키워드 × 26k 간선은 약 13%) CSR 을 밀집 행렬로
+한 번 펼쳐 BLAS 곱을 쓰는 편이 빠르므로 커널을 밀도에 따라 고른다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from .database_manager import db
+
+logger = logging.getLogger("heal7.keyword.dependency")
+
+DEPENDENCIES_QUERY = """
+SELECT kd.parent_keyword_id, kd.dependent_keyword_id,
+       COALESCE(kd.weight, 1.0)::float8 * COALESCE(kd.strength, 1.0)::float8 AS edge_weight
+FROM keyword_dependencies kd
+JOIN keywords k1 ON kd.parent_keyword_id = k1.id
+JOIN keywords k2 ON kd.dependent_keyword_id = k2.id
+WHERE kd.is_active = true
+AND k1.is_active = true
+AND k2.is_active = true
+"""
+
+DEFAULT_PROPAGATION_STEPS = int(os.getenv('KEYWORD_PROPAGATION_STEPS', 2))
+DEFAULT_PROPAGATION_DAMPING = float(os.getenv('KEYWORD_PROPAGATION_DAMPING', 0.5))
+
+# 묶음 전파 시 한 번에 곱하는 세션 수 (CSR 커널의 간선 수 × 세션 수 임시 배열 제한)
+PROPAGATION_CHUNK_SIZE = 256
+
+# 이 밀도 이상이면 밀집 행렬 커널 사용
+DENSE_KERNEL_DENSITY = 0.02
+
+class KeywordDependencyGraph:
+    """CSR 형식의 키워드 의존성 행렬 (읽기 전용, 교체 방식으로 갱신)"""
+
+    def __init__(self, keyword_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 data: np.ndarray, load_ms: float = 0.0, kernel: Optional[str] = None):
+        self.keyword_ids = keyword_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.abs_data = np.abs(data)
+        self.load_ms = load_ms
+        self.loaded_at = time.time()
+
+        # reduceat 은 빈 구간을 처리하지 못하므로 간선이 있는 행만 합산한다
+        self._rows = np.flatnonzero(np.diff(indptr)).astype(np.int32)
+        self._row_starts = indptr[self._rows]
+
+        self.kernel = kernel or ("dense" if self.density >= DENSE_KERNEL_DENSITY else "csr")
+        self._dense: Optional[np.ndarray] = None
+        self._dense_abs: Optional[np.ndarray] = None
+        if self.kernel == "dense":
+            self._dense = self.to_dense()
+            self._dense_abs = np.abs(self._dense)
+
+    @classmethod
+    def from_edges(cls, parent_ids, dependent_ids, weights, load_ms: float = 0.0,
+                   kernel: Optional[str] = None) -> "KeywordDependencyGraph":
+        """간선 목록(부모, 종속, 가중치)으로 CSR 행렬 구성 (중복 간선은 합산)"""
+        parent_ids = np.asarray(parent_ids, dtype=np.int64)
+        dependent_ids = np.asarray(dependent_ids, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.float64)
+
+        keyword_ids = np.union1d(parent_ids, dependent_ids).astype(np.int32)
+        size = len(keyword_ids)
+        rows = np.searchsorted(keyword_ids, dependent_ids)
+        cols = np.searchsorted(keyword_ids, parent_ids)
+
+        # (행, 열) 순 정렬 후 중복 간선 합산
+        flat = rows * size + cols
+        unique_flat, inverse = np.unique(flat, return_inverse=True)
+        summed = np.bincount(inverse, weights=weights, minlength=len(unique_flat))
+        rows, cols = np.divmod(unique_flat, size)
+
+        # 행 정규화: 종속 키워드가 받는 가중치의 절대값 합을 1로
+        row_norm = np.bincount(rows, weights=np.abs(summed), minlength=size)
+        data = summed / np.where(row_norm[rows] > 0, row_norm[rows], 1.0)
+
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=size), out=indptr[1:])
+
+        return cls(keyword_ids, indptr, cols.astype(np.int32), data.astype(np.float32), load_ms, kernel)
+
+    @property
+    def size(self) -> int:
+        return len(self.keyword_ids)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices)
+
+    @property
+    def density(self) -> float:
+        return self.edge_count / (self.size * self.size) if self.size else 0.0
+
+    def to_dense(self) -> np.ndarray:
+        """CSR 행렬을 밀집 행렬(종속 × 부모)로 펼침"""
+        matrix = np.zeros((self.size, self.size), dtype=np.float32)
+        rows = np.repeat(np.arange(self.size), np.diff(self.indptr))
+        matrix[rows, self.indices] = self.data
+        return matrix
+
+    def _matvec(self, values: np.ndarray, data: np.ndarray) -> np.ndarray:
+        """행렬 × 벡터 (키워드 × 세션 배치는 2차원, 첫 축이 키워드 축)"""
+        if self._dense is not None:
+            return (self._dense if data is self.data else self._dense_abs) @ values
+
+        result = np.zeros(values.shape, dtype=np.float32)
+        if len(self._rows):
+            # 2차원일 때 간선별 곱이 (간선 × 세션) 연속 메모리가 되도록 키워드 축을 앞에 둔다
+            products = values[self.indices] * (data if values.ndim == 1 else data[:, None])
+            result[self._rows] = np.add.reduceat(products, self._row_starts, axis=0)
+        return result
+
+    def propagate(self, scores: np.ndarray, steps: int = DEFAULT_PROPAGATION_STEPS,
+                  damping: float = DEFAULT_PROPAGATION_DAMPING) -> np.ndarray:
+        """그래프 순서의 점수 벡터(또는 세션 × 키워드 행렬)에 k단계 전파 적용"""
+        scores = np.asarray(scores, dtype=np.float32)
+        if self._dense is None and scores.ndim == 2 and len(scores) > PROPAGATION_CHUNK_SIZE:
+            return np.concatenate([
+                self.propagate(scores[start:start + PROPAGATION_CHUNK_SIZE], steps, damping)
+                for start in range(0, len(scores), PROPAGATION_CHUNK_SIZE)
+            ])
+
+        # 묶음은 키워드 × 세션 배치로 바꿔 곱한 뒤 되돌린다
+        term = np.ascontiguousarray(scores.T)
+        total = term.copy()
+        for _ in range(steps):
+            term = self._matvec(term, self.data) * np.float32(damping)
+            total += term
+        return np.clip(total.T, -1.0, 1.0)
+
+    def propagate_confidence(self, confidences: np.ndarray,
+                             steps: int = DEFAULT_PROPAGATION_STEPS) -> np.ndarray:
+        """전파로 점수를 받은 키워드의 신뢰도 (단계마다 아직 신뢰도가 없는 키워드에 부모 신뢰도의 가중 평균)"""
+        confidences = np.asarray(confidences, dtype=np.float32)
+        if self._dense is None and confidences.ndim == 2 and len(confidences) > PROPAGATION_CHUNK_SIZE:
+            return np.concatenate([
+                self.propagate_confidence(confidences[start:start + PROPAGATION_CHUNK_SIZE], steps)
+                for start in range(0, len(confidences), PROPAGATION_CHUNK_SIZE)
+            ])
+
+        current = np.ascontiguousarray(confidences.T)
+        for _ in range(steps):
+            current = np.where(current > 0, current, self._matvec(current, self.abs_data))
+        return current.T
+
+    def positions(self, keyword_ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """키워드 ID의 그래프 내 위치 (그래프에 있는 키워드만, 입력 쪽 마스크 함께 반환)"""
+        keyword_ids = np.asarray(keyword_ids)
+        if not self.size:
+            return np.empty(0, dtype=np.int64), np.zeros(len(keyword_ids), dtype=bool)
+
+        positions = np.minimum(np.searchsorted(self.keyword_ids, keyword_ids), self.size - 1)
+        in_graph = self.keyword_ids[positions] == keyword_ids
+        return positions[in_graph], in_graph
+
+class KeywordDependencyIndex:
+    """의존성 그래프 로더 (키워드 그래프는 일괄 동기화로만 바뀌므로 max_age 주기로 다시 읽음)"""
+
+    def __init__(self, max_age: float = float(os.getenv('DEPENDENCY_GRAPH_MAX_AGE', 600))):
+        self.max_age = max_age
+        self._graph: Optional[KeywordDependencyGraph] = None
+        self._lock = asyncio.Lock()
+        self._reload_count = 0
+
+    def invalidate(self):
+        """그래프 무효화 (다음 snapshot() 에서 다시 읽음)"""
+        self._graph = None
+
+    def _is_stale(self) -> bool:
+        graph = self._graph
+        return graph is None or time.time() - graph.loaded_at > self.max_age
+
+    async def snapshot(self) -> KeywordDependencyGraph:
+        """현재 유효한 의존성 그래프 반환"""
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    await self.refresh()
+        return self._graph
+
+    async def refresh(self) -> KeywordDependencyGraph:
+        """DB에서 활성 의존성 간선을 읽어 CSR 행렬로 다시 구성"""
+        started = time.perf_counter()
+
+        async with db.lease() as conn:
+            rows = await conn.fetch(DEPENDENCIES_QUERY)
+
+        graph = KeywordDependencyGraph.from_edges(
+            [row['parent_keyword_id'] for row in rows],
+            [row['dependent_keyword_id'] for row in rows],
+            [row['edge_weight'] for row in rows]
+        )
+        graph.load_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._graph = graph
+        self._reload_count += 1
+
+        logger.info(
+            f"키워드 의존성 그래프 로드: 키워드 {graph.size}개, 간선 {graph.edge_count}개 ({graph.load_ms}ms)"
+        )
+        return graph
+
+    async def start(self):
+        """서비스 컨테이너 시작 훅: 그래프를 미리 읽어 둠"""
+        await self.refresh()
+
+    def stats(self) -> Dict[str, Any]:
+        graph = self._graph
+        return {
+            "keywords": graph.size if graph else 0,
+            "edges": graph.edge_count if graph else 0,
+            "kernel": graph.kernel if graph else None,
+            "load_ms": graph.load_ms if graph else None,
+            "reload_count": self._reload_count
+        }
+
+# 프로세스 전역 의존성 그래프
+keyword_dependency_index = KeywordDependencyIndex()
@@ -0,0 +1,279 @@
+"""
+HEAL7 세션 키워드 점수 벡터
+세션별 키워드 점수를 고정 순서 배열로 보관하고 Redis에는 바이너리 블롭 하나로 저장
+
+블롭 구조 (리틀 엔디언):
+    헤더     : magic(3s) + 포맷 버전(B) + 키워드 수 n(I)
+    keyword_ids : int32[n]   (오름차순 정렬 - 배열 순서의 기준)
+    scores      : float32[n] (-1.0 ~ 1.0)
+    confidences : float32[n]
+    counts      : uint32[n]  (키워드별 갱신 횟수)
+    updated_at  : uint32[n]  (키워드별 마지막 갱신 시각, epoch 초)
+
+키워드 ID를 블롭 안에 함께 저장하므로 키워드가 추가되어도 기존 세션 블롭을 그대로 읽을 수 있다.
+점수 갱신은 UPDATE_VECTOR_SCRIPT 가 Redis 안에서 바뀐 키워드만 고쳐 다시 묶어 왕복 1회(EVALSHA)로 끝내고,
+파이썬 쪽 numpy 배열은 조회용이다 (numpy 갱신과의 비교: scripts/bench_keyword_vector_update.py).
+응답 조회용 딕셔너리(keyword_{id} → {score, confidence, ...})는 필요할 때만 만들어진다.
+
+이전 형식(heal7:survey:session:{uuid}:keywords 해시, 필드마다 JSON)은 블롭이 없는 세션을 처음 읽거나
+갱신할 때 from_legacy_hash 로 한 번 옮기고 지운다 (KeywordScoreCalculator.migrate_legacy_scores).
+갱신 스크립트는 해시가 남아 있으면 빈 블롭을 만들지 않고 LEGACY_SCORES_PENDING 을 돌려준다.
+SCAN heal7:survey:session:*:keywords 결과가 비면 이 대체 경로는 지워도 된다.
+"""
+
+import json
+import struct
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+VECTOR_MAGIC = b"HKV"
+VECTOR_FORMAT_VERSION = 1
+VECTOR_HEADER = struct.Struct("<3sBI")
+
+# 블롭 안 배열 순서와 dtype
+VECTOR_FIELDS = (
+    ("keyword_ids", np.dtype("<i4")),
+    ("scores", np.dtype("<f4")),
+    ("confidences", np.dtype("<f4")),
+    ("counts", np.dtype("<u4")),
+    ("updated_at", np.dtype("<u4")),
+)
+
+KEYWORD_FIELD_PREFIX = "keyword_"
+
+# float32 유효 자릿수 내에서 응답용 값 반올림
+FLOAT32_DIGITS = 6
+
+# 갱신 스크립트 반환값: 블롭이 없고 이전 형식 해시가 남아 있음 (먼저 옮긴 뒤 다시 실행)
+LEGACY_SCORES_PENDING = -1
+
+# 세션 벡터 블롭의 읽기-계산-쓰기를 서버에서 한 번에 처리하는 스크립트 (Redis 내장 struct 라이브러리)
+# KEYS[1]: 세션 키워드 벡터, KEYS[2]: 이전 형식 해시 (블롭이 없는데 남아 있으면 LEGACY_SCORES_PENDING 반환)
+# ARGV[1]: 기존 점수 가중치, ARGV[2]: 갱신 시각(epoch 초), 이후 (키워드 ID, 영향 점수, 신뢰도) 반복 (ID 중복 없음)
+# 기존 점수가 0이면 영향 점수를 그대로 쓰고, 아니면 기존 점수 × decay + 영향 점수 × (1 - decay) 를 -1.0 ~ 1.0 으로 자른다
+# 갱신할 키워드만 이진 탐색으로 찾아 풀고, 나머지 구간은 배열별 바이트 조각(string.sub)으로 그대로 옮긴다
+# (Lua 연산은 응답의 키워드 수에 비례, 세션 키워드 수에는 복사 바이트만 비례)
+UPDATE_VECTOR_SCRIPT = """
+local decay = tonumber(ARGV[1])
+local updated_at = tonumber(ARGV[2])
+local size, base = 0, 1
+
+local blob = redis.call('GET', KEYS[1])
+if blob then
+    local magic, version
+    magic, version, size, base = struct.unpack('<c3BI4', blob)
+    if magic ~= '%(magic)s' or version ~= %(version)d then
+        return redis.error_reply('unknown keyword vector format')
+    end
+elseif redis.call('EXISTS', KEYS[2]) == 1 then
+    return %(legacy_pending)d
+else
+    blob = ''
+end
+
+local function id_at(index)
+    return (struct.unpack('<i4', blob, base + 4 * index))
+end
+
+local changes = {}
+for i = 3, #ARGV, 3 do
+    changes[#changes + 1] = {id = tonumber(ARGV[i]), impact = tonumber(ARGV[i + 1]), confidence = tonumber(ARGV[i + 2])}
+end
+table.sort(changes, function(a, b) return a.id < b.id end)
+
+local added = 0
+for _, change in ipairs(changes) do
+    local low, high = 0, size
+    while low < high do
+        local middle = math.floor((low + high) / 2)
+        if id_at(middle) < change.id then low = middle + 1 else high = middle end
+    end
+    change.index = low
+    change.exists = low < size and id_at(low) == change.id
+
+    local score, count = 0.0, 0
+    if change.exists then
+        score = struct.unpack('<f', blob, base + 4 * size + 4 * low)
+        count = struct.unpack('<I4', blob, base + 12 * size + 4 * low)
+    else
+        added = added + 1
+    end
+    if score ~= 0.0 then
+        score = score * decay + change.impact * (1 - decay)
+    else
+        score = change.impact
+    end
+    change.fields = {
+        struct.pack('<i4', change.id),
+        struct.pack('<f', math.max(-1.0, math.min(1.0, score))),
+        struct.pack('<f', change.confidence),
+        struct.pack('<I4', count + 1),
+        struct.pack('<I4', updated_at)
+    }
+end
+
+local parts = {struct.pack('<c3BI4', '%(magic)s', %(version)d, size + added)}
+for field = 1, 5 do
+    local start = base + 4 * size * (field - 1)
+    local copied = 0
+    for _, change in ipairs(changes) do
+        if change.index > copied then
+            parts[#parts + 1] = string.sub(blob, start + 4 * copied, start + 4 * change.index - 1)
+        end
+        parts[#parts + 1] = change.fields[field]
+        copied = change.exists and change.index + 1 or change.index
+    end
+    if size > copied then
+        parts[#parts + 1] = string.sub(blob, start + 4 * copied, start + 4 * size - 1)
+    end
+end
+redis.call('SET', KEYS[1], table.concat(parts))
+return #changes
+""" % {"magic": VECTOR_MAGIC.decode(), "version": VECTOR_FORMAT_VERSION, "legacy_pending": LEGACY_SCORES_PENDING}
+
+def session_vector_key(session_uuid: str) -> str:
+    """세션 키워드 점수 벡터 키"""
+    return f"heal7:survey:session:{session_uuid}:keyword_vector"
+
+def legacy_session_scores_key(session_uuid: str) -> str:
+    """이전 형식의 세션 키워드 점수 해시 키 (keyword_{id} → JSON)"""
+    return f"heal7:survey:session:{session_uuid}:keywords"
+
+def _epoch_seconds(value: Any) -> int:
+    """ISO 시각 문자열 → epoch 초 (없거나 형식이 다르면 0)"""
+    if not value:
+        return 0
+    try:
+        return max(0, int(datetime.fromisoformat(str(value)).timestamp()))
+    except ValueError:
+        return 0
+
+class SessionKeywordVector(Mapping):
+    """세션 키워드 점수 벡터
+
+    기존 해시 형식과 같은 ``keyword_{id}`` 키의 읽기 전용 매핑으로도 동작하며,
+    항목 딕셔너리는 접근할 때 만들어진다.
+    """
+
+    def __init__(self, keyword_ids: Optional[np.ndarray] = None, scores: Optional[np.ndarray] = None,
+                 confidences: Optional[np.ndarray] = None, counts: Optional[np.ndarray] = None,
+                 updated_at: Optional[np.ndarray] = None):
+        self.keyword_ids = keyword_ids if keyword_ids is not None else np.empty(0, dtype=np.int32)
+        size = len(self.keyword_ids)
+        self.scores = scores if scores is not None else np.zeros(size, dtype=np.float32)
+        self.confidences = confidences if confidences is not None else np.zeros(size, dtype=np.float32)
+        self.counts = counts if counts is not None else np.zeros(size, dtype=np.uint32)
+        self.updated_at = updated_at if updated_at is not None else np.zeros(size, dtype=np.uint32)
+
+    # ==================== 직렬화 ====================
+
+    @classmethod
+    def from_bytes(cls, blob: Optional[bytes]) -> "SessionKeywordVector":
+        """Redis 블롭에서 벡터 복원 (배열은 블롭 버퍼를 그대로 참조, 없으면 빈 벡터)"""
+        if not blob:
+            return cls()
+
+        magic, version, size = VECTOR_HEADER.unpack_from(blob)
+        if magic != VECTOR_MAGIC or version != VECTOR_FORMAT_VERSION:
+            raise ValueError(f"알 수 없는 키워드 벡터 형식입니다: {magic!r} v{version}")
+
+        arrays = {}
+        offset = VECTOR_HEADER.size
+        for name, dtype in VECTOR_FIELDS:
+            arrays[name] = np.frombuffer(blob, dtype=dtype, count=size, offset=offset)
+            offset += dtype.itemsize * size
+
+        return cls(**arrays)
+
+    @classmethod
+    def from_mapping(cls, scores: Mapping) -> "SessionKeywordVector":
+        """keyword_{id} → 점수 딕셔너리 매핑에서 벡터 구성 (형식이 다른 항목은 무시)"""
+        entries = {}
+        for key, data in scores.items():
+            if not isinstance(data, Mapping) or not str(key).startswith(KEYWORD_FIELD_PREFIX):
+                continue
+            try:
+                entries[int(str(key)[len(KEYWORD_FIELD_PREFIX):])] = data
+            except ValueError:
+                continue
+
+        keyword_ids = np.array(sorted(entries), dtype=np.int32)
+        ordered = [entries[keyword_id] for keyword_id in keyword_ids.tolist()]
+        return cls(
+            keyword_ids,
+            np.array([float(data.get('score') or 0.0) for data in ordered], dtype=np.float32),
+            np.array([float(data.get('confidence') or 0.0) for data in ordered], dtype=np.float32),
+            np.array([int(data.get('update_count') or 0) for data in ordered], dtype=np.uint32),
+            np.array([_epoch_seconds(data.get('last_updated')) for data in ordered], dtype=np.uint32)
+        )
+
+    @classmethod
+    def from_legacy_hash(cls, fields: Mapping) -> "SessionKeywordVector":
+        """이전 형식 해시(HGETALL 결과)에서 벡터 구성 (JSON 이 아닌 값과 keyword_{id}_count 필드는 무시)"""
+        scores = {}
+        for key, value in fields.items():
+            key = key.decode() if isinstance(key, bytes) else key
+            try:
+                scores[key] = json.loads(value)
+            except (TypeError, ValueError):
+                continue
+        return cls.from_mapping(scores)
+
+    def to_bytes(self) -> bytes:
+        """Redis 저장용 블롭으로 직렬화"""
+        parts = [VECTOR_HEADER.pack(VECTOR_MAGIC, VECTOR_FORMAT_VERSION, len(self.keyword_ids))]
+        for name, dtype in VECTOR_FIELDS:
+            parts.append(np.ascontiguousarray(getattr(self, name), dtype=dtype).tobytes())
+        return b"".join(parts)
+
+    # ==================== 조회 ====================
+
+    def _position(self, key: str) -> int:
+        if not isinstance(key, str) or not key.startswith(KEYWORD_FIELD_PREFIX):
+            raise KeyError(key)
+        try:
+            keyword_id = int(key[len(KEYWORD_FIELD_PREFIX):])
+        except ValueError:
+            raise KeyError(key)
+
+        position = int(np.searchsorted(self.keyword_ids, keyword_id))
+        if position >= len(self.keyword_ids) or self.keyword_ids[position] != keyword_id:
+            raise KeyError(key)
+        return position
+
+    def _entry(self, position: int) -> Dict[str, Any]:
+        updated_at = int(self.updated_at[position])
+        return {
+            'score': round(float(self.scores[position]), FLOAT32_DIGITS),
+            'confidence': round(float(self.confidences[position]), FLOAT32_DIGITS),
+            'last_updated': datetime.fromtimestamp(updated_at).isoformat() if updated_at else None,
+            'update_count': int(self.counts[position])
+        }
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self._entry(self._position(key))
+
+    def __iter__(self) -> Iterator[str]:
+        return (f"{KEYWORD_FIELD_PREFIX}{keyword_id}" for keyword_id in self.keyword_ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self.keyword_ids)
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """API 응답/저장용 딕셔너리 (기존 해시 형식과 동일)"""
+        return {key: self._entry(position) for position, key in enumerate(self)}
+
+    def top(self, limit: int = 10) -> List[Dict[str, Any]]:
+        """절대값 기준 상위 키워드"""
+        order = np.argsort(-np.abs(self.scores), kind="stable")[:limit]
+        return [
+            {
+                'keyword_id': f"{KEYWORD_FIELD_PREFIX}{int(self.keyword_ids[position])}",
+                'score': round(float(self.scores[position]), FLOAT32_DIGITS),
+                'confidence': round(float(self.confidences[position]), FLOAT32_DIGITS)
+            }
+            for position in order
+        ]
@@ -0,0 +1,210 @@
+"""
+HEAL7 옵션→키워드 매핑 인덱스
+설문 응답 채점 시 DB 조회 없이 사용하는 프로세스 내 컴파일된 매핑 인덱스
+
+survey_question_options.keyword_mappings 와 survey_questions.importance_weight 를
+한 번 읽어 옵션별 numpy 배열로 컴파일해 둔다. 영향 유형 배율(positive/negative/neutral)은
+컴파일 시점에 미리 곱해 둔다.
+
+무효화:
+- 같은 프로세스의 템플릿/질문/옵션 수정 → invalidate() 가 버전 카운터 증가
+- 다른 프로세스(워커)의 수정 → Postgres NOTIFY(survey_mapping_changed) 수신 시 invalidate()
+버전이 바뀐 뒤 처음 snapshot() 을 부를 때 다시 컴파일한다.
+LISTEN 연결이 없으면 MAPPING_INDEX_MAX_AGE 초가 지난 인덱스를 다시 읽는다.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import asyncpg
+import numpy as np
+
+from .database_manager import db, connect_direct
+
+logger = logging.getLogger("heal7.keyword.index")
+
+MAPPING_CHANGED_CHANNEL = "survey_mapping_changed"
+
+# 영향 유형별 부호/배율
+IMPACT_TYPE_FACTORS = {
+    'positive': 1.0,
+    'negative': -1.0,
+    'neutral': 0.5
+}
+
+OPTION_MAPPINGS_QUERY = """
+SELECT id AS option_id, keyword_mappings
+FROM survey_question_options
+WHERE keyword_mappings IS NOT NULL
+"""
+
+QUESTION_WEIGHTS_QUERY = """
+SELECT id AS question_id, COALESCE(importance_weight, 1.0)::float8 AS importance_weight
+FROM survey_questions
+"""
+
+# 옵션 하나의 컴파일 결과: (키워드 ID 배열, 유형 배율이 적용된 영향 배열, 영향 유형 튜플)
+OptionEntry = Tuple[np.ndarray, np.ndarray, Tuple[str, ...]]
+
+class CompiledOptionIndex:
+    """한 시점의 컴파일된 인덱스 (읽기 전용, 교체 방식으로 갱신)"""
+
+    def __init__(self, version: int, options: Dict[int, OptionEntry],
+                 question_weights: Dict[int, float], load_ms: float):
+        self.version = version
+        self.options = options
+        self.question_weights = question_weights
+        self.load_ms = load_ms
+        self.loaded_at = time.time()
+        self.mapping_count = sum(len(entry[0]) for entry in options.values())
+
+    def question_weight(self, question_id: int) -> float:
+        return self.question_weights.get(question_id, 1.0)
+
+def compile_option_mappings(keyword_mappings: Any) -> Optional[OptionEntry]:
+    """keyword_mappings JSON 배열을 옵션 항목으로 컴파일 (매핑이 없으면 None)"""
+    if not isinstance(keyword_mappings, list):
+        return None
+
+    keyword_ids, impacts, impact_types = [], [], []
+    for mapping in keyword_mappings:
+        if not isinstance(mapping, dict) or mapping.get('keyword_id') is None:
+            continue
+        impact_type = mapping.get('impact_type') or 'positive'
+        keyword_ids.append(int(mapping['keyword_id']))
+        impacts.append(float(mapping.get('score_impact') or 0.0) * IMPACT_TYPE_FACTORS.get(impact_type, 1.0))
+        impact_types.append(impact_type)
+
+    if not keyword_ids:
+        return None
+
+    return (
+        np.asarray(keyword_ids, dtype=np.int64),
+        np.asarray(impacts, dtype=np.float64),
+        tuple(impact_types)
+    )
+
+class OptionKeywordIndex:
+    """옵션→키워드 매핑 인덱스 관리자"""
+
+    def __init__(self, max_age: float = float(os.getenv('MAPPING_INDEX_MAX_AGE', 300))):
+        self.max_age = max_age
+        self._compiled: Optional[CompiledOptionIndex] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+        self._listener: Optional[asyncpg.Connection] = None
+        self._reload_count = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self, reason: str = ""):
+        """인덱스 무효화 (다음 snapshot() 에서 다시 컴파일)"""
+        self._version += 1
+        logger.debug(f"옵션 매핑 인덱스 무효화 v{self._version} {reason}")
+
+    def _is_stale(self) -> bool:
+        compiled = self._compiled
+        if compiled is None or compiled.version != self._version:
+            return True
+        return self._listener is None and time.time() - compiled.loaded_at > self.max_age
+
+    async def snapshot(self) -> CompiledOptionIndex:
+        """현재 유효한 컴파일 인덱스 반환 (무효화된 경우에만 다시 읽음)"""
+        if self._is_stale():
+            async with self._lock:
+                if self._is_stale():
+                    await self.refresh()
+        return self._compiled
+
+    async def refresh(self) -> CompiledOptionIndex:
+        """DB에서 매핑과 질문 가중치를 읽어 인덱스를 다시 컴파일"""
+        version = self._version
+        started = time.perf_counter()
+
+        async with db.lease() as conn:
+            option_rows = await conn.fetch(OPTION_MAPPINGS_QUERY)
+            weight_rows = await conn.fetch(QUESTION_WEIGHTS_QUERY)
+
+        options: Dict[int, OptionEntry] = {}
+        for row in option_rows:
+            entry = compile_option_mappings(row['keyword_mappings'])
+            if entry is not None:
+                options[row['option_id']] = entry
+
+        question_weights = {row['question_id']: row['importance_weight'] for row in weight_rows}
+
+        load_ms = round((time.perf_counter() - started) * 1000, 3)
+        # 읽는 도중 무효화가 들어오면 version 이 달라져 다음 호출에서 다시 읽는다
+        self._compiled = CompiledOptionIndex(version, options, question_weights, load_ms)
+        self._reload_count += 1
+
+        # LISTEN 연결이 끊겨 있으면 재연결 시도
+        if self._listener is None:
+            await self._start_listener()
+
+        logger.info(
+            f"옵션 매핑 인덱스 로드: 옵션 {len(options)}개, 매핑 {self._compiled.mapping_count}개 ({load_ms}ms)"
+        )
+        return self._compiled
+
+    # ==================== LISTEN/NOTIFY ====================
+
+    async def _start_listener(self):
+        try:
+            conn = await connect_direct()
+            await conn.add_listener(MAPPING_CHANGED_CHANNEL, self._on_notify)
+            conn.add_termination_listener(self._on_listener_terminated)
+            self._listener = conn
+        except Exception as e:
+            self._listener = None
+            logger.warning(f"옵션 매핑 LISTEN 연결 실패 (max_age {self.max_age}s 주기로 재로딩): {e}")
+
+    def _on_notify(self, conn, pid, channel, payload):
+        self.invalidate(f"notify from pid {pid}: {payload}")
+
+    def _on_listener_terminated(self, conn):
+        logger.warning("옵션 매핑 LISTEN 연결 종료")
+        self._listener = None
+        self.invalidate("listener terminated")
+
+    # ==================== 수명주기 ====================
+
+    async def start(self):
+        """서비스 컨테이너 시작 훅: 인덱스를 미리 컴파일하고 LISTEN 시작"""
+        await self.refresh()
+
+    async def close(self):
+        """서비스 컨테이너 종료 훅: LISTEN 연결 정리"""
+        listener, self._listener = self._listener, None
+        if listener is not None and not listener.is_closed():
+            listener.remove_termination_listener(self._on_listener_terminated)
+            await listener.close()
+
+    def stats(self) -> Dict[str, Any]:
+        compiled = self._compiled
+        return {
+            "version": self._version,
+            "loaded_version": compiled.version if compiled else None,
+            "options": len(compiled.options) if compiled else 0,
+            "mappings": compiled.mapping_count if compiled else 0,
+            "questions": len(compiled.question_weights) if compiled else 0,
+            "load_ms": compiled.load_ms if compiled else None,
+            "reload_count": self._reload_count,
+            "listening": self._listener is not None
+        }
+
+# 프로세스 전역 인덱스
+option_keyword_index = OptionKeywordIndex()
+
+async def notify_mapping_changed(conn: asyncpg.Connection, reason: str = ""):
+    """매핑/가중치 변경 알림 (현재 프로세스 즉시 무효화 + 다른 워커에 NOTIFY)
+
+    트랜잭션 안에서 호출하면 커밋 시점에 NOTIFY 가 전달된다.
+    """
+    option_keyword_index.invalidate(reason)
+    await conn.execute("SELECT pg_notify($1, $2)", MAPPING_CHANGED_CHANNEL, reason)
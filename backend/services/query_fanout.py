@@ -0,0 +1,100 @@
+"""
+HEAL7 대시보드 쿼리 팬아웃
+서로 독립적인 집계 쿼리(섹션)를 각자 풀 연결을 빌려 동시에 실행하고 엔드포인트 시간 예산 안에 모은다.
+
+- 섹션 함수는 ``async def section(conn) -> 값`` 형태로, 연결 하나를 받아 그 섹션의 쿼리만 실행한다.
+- 예산(budget) 안에 끝나지 않거나 실패한 섹션은 취소하고 stale 로 표시한다.
+  partial=True 면 끝난 섹션은 새 값, stale 섹션은 같은 프로세스에서 마지막으로 성공한 값(없으면 None)을 돌려주고,
+  partial=False 면 예외를 올려 호출하는 쪽이 기존 기본 응답을 쓰게 한다.
+- 응답 지연은 섹션 지연의 합이 아니라 가장 느린 섹션(또는 예산)이 된다.
+  요청 하나가 섹션 수만큼 연결을 동시에 쓰므로 DB_POOL_MAX_SIZE 를 함께 고려할 것.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from .database_manager import db
+
+logger = logging.getLogger(__name__)
+
+Section = Callable[[Any], Awaitable[Any]]
+
+DEFAULT_SECTION_BUDGET = float(os.getenv('DASHBOARD_QUERY_BUDGET', 2.0))
+
+class SectionsUnavailable(Exception):
+    """partial=False 에서 일부 섹션이 예산 안에 끝나지 않음"""
+
+class FanOutResult:
+    """섹션별 값과 stale 섹션 목록"""
+
+    def __init__(self, values: Dict[str, Any], stale: Dict[str, Dict[str, Any]], elapsed_ms: float, budget: float):
+        self.values = values
+        self.stale = stale
+        self.elapsed_ms = elapsed_ms
+        self.budget = budget
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values.get(name)
+
+    def meta(self) -> Dict[str, Any]:
+        """응답에 붙이는 실행 정보 (stale 섹션별 사유와 대신 쓴 값의 나이)"""
+        return {
+            "stale": self.stale,
+            "elapsed_ms": self.elapsed_ms,
+            "budget_ms": round(self.budget * 1000)
+        }
+
+# (엔드포인트, 섹션) → (마지막 성공 값, 시각)
+_last_good: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+
+def endpoint_budget(endpoint: str, default: float = DEFAULT_SECTION_BUDGET) -> float:
+    """엔드포인트별 시간 예산 (초) - DASHBOARD_BUDGET_<ENDPOINT> 환경변수로 조정"""
+    return float(os.getenv(f"DASHBOARD_BUDGET_{endpoint.upper().replace('-', '_')}", default))
+
+async def _run_section(section: Section) -> Any:
+    async with db.lease() as conn:
+        return await section(conn)
+
+async def fan_out(endpoint: str, sections: Dict[str, Section], budget: Optional[float] = None,
+                  partial: bool = True) -> FanOutResult:
+    """섹션들을 각자의 풀 연결에서 동시에 실행"""
+    budget = endpoint_budget(endpoint) if budget is None else budget
+    started = time.perf_counter()
+    tasks = {name: asyncio.ensure_future(_run_section(section)) for name, section in sections.items()}
+    try:
+        await asyncio.wait(tasks.values(), timeout=budget)
+    finally:
+        pending = [task for task in tasks.values() if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    values: Dict[str, Any] = {}
+    stale: Dict[str, Dict[str, Any]] = {}
+    for name, task in tasks.items():
+        if task.cancelled():
+            stale[name] = {"reason": "timeout"}
+        elif task.exception() is not None:
+            stale[name] = {"reason": f"{type(task.exception()).__name__}: {task.exception()}"}
+        else:
+            values[name] = task.result()
+            _last_good[(endpoint, name)] = (values[name], time.time())
+
+    elapsed_ms = round((time.perf_counter() - started) * 1000, 1)
+    if stale:
+        logger.warning(f"Dashboard '{endpoint}' stale sections ({elapsed_ms}ms / budget {budget}s): {stale}")
+        if not partial:
+            raise SectionsUnavailable(f"{endpoint}: {stale}")
+        now = time.time()
+        for name in stale:
+            last = _last_good.get((endpoint, name))
+            values[name] = last[0] if last else None
+            stale[name]["age_seconds"] = round(now - last[1], 1) if last else None
+
+    # 응답 필드 순서는 섹션 등록 순서대로
+    values = {name: values[name] for name in tasks}
+    return FanOutResult(values, stale, elapsed_ms, budget)
@@ -0,0 +1,318 @@
+"""
+HEAL7 실시간 지표 (슬라이딩 윈도우)
+/realtime-stats 가 원본 테이블 조인 대신 읽는 최근 N분(기본 60분) 페이지뷰 / 사주 요청 / 활성 세션 / 고유 방문자.
+
+- page_analytics / saju_analysis_sessions 의 INSERT 문장 트리거가 새 행을 (분, 세션, 사용자) 단위로 묶어
+  analytics_realtime_queue 에 적는다 (윈도우보다 오래된 시각의 행은 적지 않음).
+- 백그라운드 피더가 대기열을 REALTIME_METRICS_INTERVAL 초마다 비워 Redis 의 분 단위 버킷에 더한다.
+  버킷 키는 heal7:realtime:<지표>:<epoch 분> 이고 윈도우가 지나면 TTL 로 사라지므로 분 단위 링 버퍼가 된다.
+    pageviews / saju_requests : 카운터 (INCRBY)
+    sessions / visitors       : HyperLogLog (PFADD, 고유 수 표준 오차 약 0.81%)
+  Redis 에 넣은 뒤에 대기열 삭제를 커밋하므로 Redis 장애 중에는 행이 대기열에 남는다.
+- 읽기는 윈도우 버킷에 대한 MGET / PFCOUNT 한 번씩이라 트래픽과 무관하게 일정하다.
+- Redis 가 비어 있으면 (첫 시작, Redis 재시작) 원본 테이블의 최근 윈도우로 버킷을 다시 만든다.
+  대기열 삭제와 원본 조회를 같은 REPEATABLE READ 스냅샷에서 하므로 빠지거나 두 번 세는 행이 없다.
+- 실시간 지표는 새 이벤트만 센다 (원본 행 UPDATE/DELETE 는 반영하지 않음, 윈도우가 지나면 사라진다).
+"""
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from .database_manager import db, rows_affected
+from .redis_manager import get_redis
+
+logger = logging.getLogger(__name__)
+
+REALTIME_WINDOW_MINUTES = int(os.getenv('REALTIME_WINDOW_MINUTES', 60))
+
+METRIC_PAGEVIEWS = "pageviews"
+METRIC_SAJU_REQUESTS = "saju_requests"
+METRIC_SESSIONS = "sessions"
+METRIC_VISITORS = "visitors"
+
+KIND_PAGEVIEW = "pageview"
+KIND_SAJU = "saju"
+
+REALTIME_KEY_PREFIX = "heal7:realtime"
+REALTIME_READY_KEY = f"{REALTIME_KEY_PREFIX}:ready"
+BUCKET_GRACE_SECONDS = 300
+
+REALTIME_TRY_LOCK_QUERY = "SELECT pg_try_advisory_xact_lock(hashtext('analytics_realtime'))"
+REALTIME_LOCK_QUERY = "SELECT pg_advisory_xact_lock(hashtext('analytics_realtime'))"
+
+# 원본 시각(TIMESTAMP, 세션 시간대) → epoch 분
+EPOCH_MINUTE = "(EXTRACT(EPOCH FROM date_trunc('minute', {column})::timestamptz)::bigint / 60)"
+
+REALTIME_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS analytics_realtime_queue (
+        seq BIGSERIAL PRIMARY KEY,
+        kind VARCHAR(10) NOT NULL,
+        minute BIGINT NOT NULL,
+        session_id VARCHAR(100),
+        user_id INTEGER,
+        events INTEGER NOT NULL
+    )
+    """,
+]
+
+# 원본 행 → (분, 세션, 사용자)별 이벤트 수 ({source}: 전이 테이블 또는 원본 테이블, {prune}: 파티션 조건)
+PAGEVIEW_EVENTS_SELECT = f"""
+    SELECT '{KIND_PAGEVIEW}', {EPOCH_MINUTE.format(column='timestamp')}, session_id, user_id, COUNT(*)
+    FROM {{source}}
+    WHERE timestamp >= LOCALTIMESTAMP - make_interval(mins => {{window}}){{prune}}
+    GROUP BY 2, 3, 4
+"""
+
+SAJU_EVENTS_SELECT = f"""
+    SELECT '{KIND_SAJU}', {EPOCH_MINUTE.format(column='created_at')}, NULL::varchar, NULL::int, COUNT(*)
+    FROM {{source}}
+    WHERE created_at >= LOCALTIMESTAMP - make_interval(mins => {{window}})
+    GROUP BY 2
+"""
+
+def _trigger_sql(table: str, function: str, events_select: str) -> list:
+    trigger = f"trg_{table}_realtime"
+    return [
+        f"""
+        CREATE OR REPLACE FUNCTION {function}() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO analytics_realtime_queue (kind, minute, session_id, user_id, events)
+            {events_select.format(source='new_rows', window=REALTIME_WINDOW_MINUTES, prune='')};
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {trigger} ON {table}",
+        f"""CREATE TRIGGER {trigger} AFTER INSERT ON {table} REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION {function}()""",
+    ]
+
+REALTIME_TRIGGER_DDL = [
+    *_trigger_sql("page_analytics", "analytics_realtime_pageviews", PAGEVIEW_EVENTS_SELECT),
+    *_trigger_sql("saju_analysis_sessions", "analytics_realtime_saju", SAJU_EVENTS_SELECT),
+]
+
+# 대기열 한 배치 ($1: 배치 크기)
+DRAIN_REALTIME_QUERY = """
+DELETE FROM analytics_realtime_queue
+WHERE seq IN (SELECT seq FROM analytics_realtime_queue ORDER BY seq LIMIT $1)
+RETURNING kind, minute, session_id, user_id, events
+"""
+
+# 원본 테이블의 최근 윈도우 ($1: 윈도우 분 수, date 조건으로 필요한 파티션만 읽음)
+REBUILD_PAGEVIEW_PRUNE = "\n    AND date >= (LOCALTIMESTAMP - make_interval(mins => $1::int))::date"
+
+REBUILD_REALTIME_QUERY = f"""
+SELECT kind, minute, session_id, user_id, events
+FROM ({PAGEVIEW_EVENTS_SELECT.format(source='page_analytics', window='$1::int', prune=REBUILD_PAGEVIEW_PRUNE)}
+      UNION ALL {SAJU_EVENTS_SELECT.format(source='saju_analysis_sessions', window='$1::int')})
+     AS e (kind, minute, session_id, user_id, events)
+"""
+
+def current_minute() -> int:
+    return int(time.time() // 60)
+
+def bucket_key(metric: str, minute: int) -> str:
+    return f"{REALTIME_KEY_PREFIX}:{metric}:{minute}"
+
+class RealtimeMetrics:
+    """실시간 지표 피더 + 읽기 (서비스 컨테이너에 등록)"""
+
+    def __init__(self,
+                 window: int = REALTIME_WINDOW_MINUTES,
+                 interval: float = float(os.getenv('REALTIME_METRICS_INTERVAL', 2)),
+                 batch_size: int = int(os.getenv('REALTIME_METRICS_BATCH', 5000))):
+        self.window = window
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._fed_rows = 0
+        self._rebuilds = 0
+        self._last_run_ms: Optional[float] = None
+        self._last_rebuild_at: Optional[str] = None
+        self._last_error: Optional[str] = None
+
+    # ==================== 스키마 ====================
+
+    @staticmethod
+    async def ensure_tables(conn: asyncpg.Connection):
+        """실시간 대기열과 원본 테이블 INSERT 트리거 생성 (여러 번 실행해도 안전)"""
+        async with conn.transaction():
+            await conn.execute(REALTIME_LOCK_QUERY)
+            for sql in REALTIME_DDL + REALTIME_TRIGGER_DDL:
+                await conn.execute(sql)
+
+    # ==================== Redis 버킷 ====================
+
+    async def _push(self, rows: List[asyncpg.Record]) -> int:
+        """(종류, 분, 세션, 사용자, 이벤트 수) 행을 분 단위 버킷에 더함 (윈도우 밖 행은 버림)"""
+        oldest = current_minute() - self.window + 1
+        touched: Dict[str, int] = {}
+        pushed = 0
+        async with get_redis().pipeline(transaction=False) as pipe:
+            for row in rows:
+                minute = row['minute']
+                if minute < oldest:
+                    continue
+                pushed += 1
+                if row['kind'] == KIND_SAJU:
+                    key = bucket_key(METRIC_SAJU_REQUESTS, minute)
+                    pipe.incrby(key, row['events'])
+                    touched[key] = minute
+                    continue
+                key = bucket_key(METRIC_PAGEVIEWS, minute)
+                pipe.incrby(key, row['events'])
+                touched[key] = minute
+                if row['session_id'] is not None:
+                    key = bucket_key(METRIC_SESSIONS, minute)
+                    pipe.pfadd(key, row['session_id'])
+                    touched[key] = minute
+                if row['user_id'] is not None:
+                    key = bucket_key(METRIC_VISITORS, minute)
+                    pipe.pfadd(key, row['user_id'])
+                    touched[key] = minute
+            # 버킷은 윈도우에서 빠지고 조금 더 지나면 사라진다
+            for key, minute in touched.items():
+                pipe.expireat(key, (minute + self.window) * 60 + BUCKET_GRACE_SECONDS)
+            if touched:
+                await pipe.execute()
+        return pushed
+
+    def _window_keys(self, metric: str, now: int) -> List[str]:
+        return [bucket_key(metric, minute) for minute in range(now - self.window + 1, now + 1)]
+
+    async def snapshot(self) -> Dict[str, Any]:
+        """최근 윈도우 지표 (Redis 명령 네 번, 버킷 수는 윈도우 분 수로 고정)"""
+        now = current_minute()
+        async with get_redis().pipeline(transaction=False) as pipe:
+            pipe.mget(self._window_keys(METRIC_PAGEVIEWS, now))
+            pipe.mget(self._window_keys(METRIC_SAJU_REQUESTS, now))
+            pipe.pfcount(*self._window_keys(METRIC_SESSIONS, now))
+            pipe.pfcount(*self._window_keys(METRIC_VISITORS, now))
+            pageviews, saju_requests, sessions, visitors = await pipe.execute()
+
+        per_minute = [int(v or 0) for v in pageviews]
+        return {
+            "active_sessions": sessions,
+            "saju_requests_1h": sum(int(v or 0) for v in saju_requests),
+            "page_views_1h": sum(per_minute),
+            "unique_visitors_1h": visitors,
+            "page_views_per_minute": per_minute,
+            "window_minutes": self.window
+        }
+
+    # ==================== 피드 / 재구성 ====================
+
+    async def feed(self, conn: asyncpg.Connection) -> Dict[str, int]:
+        """대기열이 빌 때까지 Redis 버킷에 반영 (다른 워커가 처리 중이면 건너뜀)"""
+        result = {"rows": 0, "pushed": 0, "batches": 0}
+        while True:
+            async with conn.transaction():
+                if not await conn.fetchval(REALTIME_TRY_LOCK_QUERY):
+                    result["skipped"] = 1
+                    return result
+                rows = await conn.fetch(DRAIN_REALTIME_QUERY, self.batch_size)
+                # Redis 에 넣지 못하면 예외로 삭제를 되돌려 다음 주기에 다시 시도
+                result["pushed"] += await self._push(rows)
+            result["rows"] += len(rows)
+            result["batches"] += 1
+            if len(rows) < self.batch_size:
+                return result
+
+    async def rebuild(self, conn: asyncpg.Connection) -> Optional[Dict[str, int]]:
+        """원본 테이블의 최근 윈도우로 버킷을 다시 만듦 (다른 워커가 처리 중이면 None)"""
+        started = time.perf_counter()
+        async with conn.transaction(isolation='repeatable_read'):
+            if not await conn.fetchval(REALTIME_TRY_LOCK_QUERY):
+                return None
+            # 이 스냅샷에 보이는 대기열 행은 아래 원본 조회에 이미 포함된다
+            discarded = rows_affected(await conn.execute("DELETE FROM analytics_realtime_queue"))
+            rows = await conn.fetch(REBUILD_REALTIME_QUERY, self.window)
+
+            redis = get_redis()
+            now = current_minute()
+            stale_keys = [key for metric in (METRIC_PAGEVIEWS, METRIC_SAJU_REQUESTS, METRIC_SESSIONS, METRIC_VISITORS)
+                          for key in self._window_keys(metric, now)]
+            await redis.delete(*stale_keys)
+            pushed = await self._push(rows)
+            await redis.set(REALTIME_READY_KEY, datetime.now().isoformat())
+
+        self._rebuilds += 1
+        self._last_rebuild_at = datetime.now().isoformat()
+        result = {"rows": pushed, "discarded_queue_rows": discarded,
+                  "rebuild_ms": round((time.perf_counter() - started) * 1000, 1)}
+        logger.info(f"실시간 지표 재구성: {result}")
+        return result
+
+    async def run_once(self) -> Dict[str, int]:
+        started = time.perf_counter()
+        async with db.lease() as conn:
+            if not await get_redis().exists(REALTIME_READY_KEY):
+                await self.rebuild(conn)
+            result = await self.feed(conn)
+
+        self._runs += 1
+        self._fed_rows += result["rows"]
+        self._last_run_ms = round((time.perf_counter() - started) * 1000, 3)
+        self._last_error = None
+        return result
+
+    async def _run_forever(self):
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._last_error = str(e)
+                logger.warning(f"실시간 지표 갱신 실패: {e}")
+            await asyncio.sleep(self.interval)
+
+    # ==================== 수명주기 ====================
+
+    async def start(self):
+        """서비스 컨테이너 시작 훅: 대기열/트리거를 만들고 주기적 피드 시작"""
+        async with db.lease() as conn:
+            raw_tables = await conn.fetchval(
+                "SELECT to_regclass('page_analytics') IS NOT NULL AND to_regclass('saju_analysis_sessions') IS NOT NULL"
+            )
+            if not raw_tables:
+                logger.warning("Analytics 원본 테이블이 없어 실시간 지표 피더를 시작하지 않습니다")
+                return
+            await self.ensure_tables(conn)
+
+        self._task = asyncio.create_task(self._run_forever())
+
+    async def close(self):
+        """서비스 컨테이너 종료 훅: 주기적 피드 중지"""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "window_minutes": self.window,
+            "interval": self.interval,
+            "runs": self._runs,
+            "fed_rows": self._fed_rows,
+            "rebuilds": self._rebuilds,
+            "last_run_ms": self._last_run_ms,
+            "last_rebuild_at": self._last_rebuild_at,
+            "last_error": self._last_error
+        }
+
+# 프로세스 전역 인스턴스
+realtime_metrics = RealtimeMetrics()
@@ -0,0 +1,92 @@
+"""
+HEAL7 Redis 연결 관리자
+서비스 전반에서 공유하는 asyncio Redis 클라이언트와 연결 풀
+"""
+
+import logging
+import os
+from typing import Any, Dict, Optional
+
+import redis.asyncio as aioredis
+from redis.asyncio import BlockingConnectionPool
+from redis.client import NEVER_DECODE
+
+logger = logging.getLogger(__name__)
+
+def get_redis_config() -> Dict[str, Any]:
+    """환경변수 기반 Redis 연결 설정"""
+    return {
+        'host': os.getenv('REDIS_HOST', 'localhost'),
+        'port': int(os.getenv('REDIS_PORT', 6379)),
+        'db': int(os.getenv('REDIS_DB', 0)),
+        'password': os.getenv('REDIS_PASSWORD') or None,
+        'max_connections': int(os.getenv('REDIS_POOL_MAX_SIZE', 32)),
+        # 풀이 모두 사용 중이면 이 시간만큼 빈 연결을 기다린다
+        'timeout': float(os.getenv('REDIS_ACQUIRE_TIMEOUT', 5)),
+        'socket_timeout': float(os.getenv('REDIS_SOCKET_TIMEOUT', 5)),
+        'decode_responses': True
+    }
+
+class RedisPool:
+    """redis.asyncio 클라이언트 래퍼
+
+    연결 수가 제한된 BlockingConnectionPool 하나를 프로세스 전체가 공유한다.
+    클라이언트 생성은 소켓을 열지 않으므로 처음 접근할 때 만들어진다.
+    """
+
+    def __init__(self):
+        self._pool: Optional[BlockingConnectionPool] = None
+        self._client: Optional[aioredis.Redis] = None
+
+    @property
+    def client(self) -> aioredis.Redis:
+        """공유 Redis 클라이언트 (최초 접근 시 생성)"""
+        if self._client is None:
+            config = get_redis_config()
+            self._pool = BlockingConnectionPool(**config)
+            self._client = aioredis.Redis(connection_pool=self._pool)
+            logger.info(
+                f"Redis connection pool created: {config['host']}:{config['port']}/{config['db']} "
+                f"(max_connections={config['max_connections']})"
+            )
+        return self._client
+
+    def stats(self) -> Dict[str, Any]:
+        """연결 풀 사용 통계"""
+        pool = self._pool
+        if pool is None:
+            return {"initialized": False, "max_connections": 0, "in_use": 0, "idle": 0}
+        return {
+            "initialized": True,
+            "max_connections": pool.max_connections,
+            "in_use": len(pool._in_use_connections),
+            "idle": len(pool._available_connections)
+        }
+
+    async def close(self):
+        """Redis 연결 풀 종료"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._pool is not None:
+            await self._pool.disconnect()
+            self._pool = None
+            logger.info("Redis connection pool closed")
+
+# 프로세스 전역 Redis 풀
+redis_pool = RedisPool()
+
+def get_redis() -> aioredis.Redis:
+    """공유 Redis 클라이언트 반환"""
+    return redis_pool.client
+
+def get_raw(client, key: str):
+    """decode_responses 설정과 무관하게 값을 bytes 그대로 조회 (바이너리 블롭용)
+
+    클라이언트에서는 awaitable 을, 파이프라인에서는 명령을 쌓은 파이프라인을 반환한다.
+    """
+    return client.execute_command('GET', key, **{NEVER_DECODE: True})
+
+async def close_redis_pool():
+    """Redis 연결 풀 종료"""
+    await redis_pool.close()
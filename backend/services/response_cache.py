@@ -0,0 +1,335 @@
+"""
+HEAL7 응답 캐시 (stale-while-revalidate)
+자주 폴링되는 집계 응답을 프로세스 내 L1(LRU)과 워커 간에 공유하는 Redis L2 에 저장한다.
+
+- 엔드포인트별 (fresh, stale) TTL: fresh 안이면 그대로, stale 안이면 저장된 값을 바로 돌려주고
+  백그라운드에서 한 번만 다시 계산한다. stale 도 지나면 미스로 보고 계산이 끝날 때까지 기다린다.
+- 같은 키의 동시 미스는 워커 안에서 하나의 계산으로 합친다 (single-flight).
+  워커 사이에서는 Redis SET NX 잠금을 잡은 쪽만 계산하고, 나머지는 L2 에 값이 올라오기를 잠시 기다린다.
+- Redis 가 없거나 오류가 나면 L1 만으로 동작한다 (redis_errors 카운터 증가).
+- 계산 중 do_not_cache() 가 호출됐거나 cacheable 조건을 통과하지 못한 응답(기본값 대체, 일부 섹션 stale 등)은
+  저장하지 않는다.
+
+L2 항목은 {"t": 계산 시각, "v": 응답} JSON 이라 어느 워커가 읽어도 같은 나이로 판단한다.
+"""
+
+import asyncio
+import contextvars
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from .redis_manager import get_redis
+
+logger = logging.getLogger(__name__)
+
+# 캐시 상태 (X-Cache 응답 헤더)
+CACHE_HIT = "HIT"          # fresh 값 (L1 또는 L2)
+CACHE_STALE = "STALE"      # stale 값을 주고 백그라운드 갱신
+CACHE_MISS = "MISS"        # 이번 요청에서 계산 (또는 다른 요청의 계산을 기다림)
+
+# 잠금을 잡지 못한 워커가 L2 를 다시 확인하는 간격
+PEER_POLL_INTERVAL = 0.05
+
+RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then return redis.call('del', KEYS[1]) end
+return 0
+"""
+
+_no_store: contextvars.ContextVar[bool] = contextvars.ContextVar("response_cache_no_store", default=False)
+
+def do_not_cache():
+    """현재 계산 중인 응답을 캐시에 저장하지 않음 (기본값으로 대체한 응답 등)"""
+    _no_store.set(True)
+
+class CachePolicy:
+    """엔드포인트별 캐시 시간 (초)"""
+
+    def __init__(self, fresh: float, stale: float):
+        self.fresh = fresh
+        self.stale = max(stale, fresh)
+
+    @classmethod
+    def from_env(cls, namespace: str, name: str, fresh: float, stale: float) -> "CachePolicy":
+        """<NAMESPACE>_CACHE_<NAME>="fresh:stale" 환경변수로 조정 (0:0 이면 캐시하지 않음)"""
+        override = os.getenv(f"{namespace}_CACHE_{name}".upper().replace('-', '_'))
+        if override:
+            fresh_value, _, stale_value = override.partition(":")
+            fresh, stale = float(fresh_value), float(stale_value or fresh_value)
+        return cls(fresh, stale)
+
+class CacheEntry:
+    def __init__(self, value: Any, created: float):
+        self.value = value
+        self.created = created
+
+    def age(self) -> float:
+        return max(time.time() - self.created, 0.0)
+
+    def dumps(self) -> str:
+        return json.dumps({"t": self.created, "v": self.value}, ensure_ascii=False, separators=(",", ":"))
+
+    @classmethod
+    def loads(cls, raw: str) -> "CacheEntry":
+        data = json.loads(raw)
+        return cls(data["v"], data["t"])
+
+class StaleWhileRevalidateCache:
+    """L1(프로세스) + L2(Redis) 응답 캐시"""
+
+    def __init__(self, namespace: str, policies: Dict[str, CachePolicy],
+                 cacheable: Optional[Callable[[Any], bool]] = None,
+                 l1_size: int = int(os.getenv('RESPONSE_CACHE_L1_SIZE', 256)),
+                 lock_timeout: float = float(os.getenv('RESPONSE_CACHE_LOCK_TIMEOUT', 10)),
+                 use_redis: bool = os.getenv('RESPONSE_CACHE_REDIS', 'true').lower() != 'false'):
+        self.namespace = namespace
+        self.policies = policies
+        self.cacheable = cacheable or (lambda value: True)
+        self.l1_size = l1_size
+        self.lock_timeout = lock_timeout
+        self.use_redis = use_redis
+        self._l1: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._counters: Dict[str, Dict[str, float]] = {}
+
+    # ==================== 키 / 카운터 ====================
+
+    def cache_key(self, name: str, params: Dict[str, Any]) -> str:
+        query = urlencode(sorted((k, str(v)) for k, v in params.items() if v is not None))
+        return f"heal7:{self.namespace}:cache:{name}?{query}"
+
+    def _count(self, name: str, counter: str, amount: float = 1):
+        counters = self._counters.setdefault(name, {})
+        counters[counter] = counters.get(counter, 0) + amount
+
+    # ==================== L1 / L2 ====================
+
+    def _l1_get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._l1.get(key)
+        if entry is not None:
+            self._l1.move_to_end(key)
+        return entry
+
+    def _l1_put(self, key: str, entry: CacheEntry):
+        self._l1[key] = entry
+        self._l1.move_to_end(key)
+        while len(self._l1) > self.l1_size:
+            self._l1.popitem(last=False)
+
+    async def _l2_get(self, name: str, key: str) -> Optional[CacheEntry]:
+        if not self.use_redis:
+            return None
+        try:
+            raw = await get_redis().get(key)
+        except Exception as e:
+            self._count(name, "redis_errors")
+            logger.debug(f"Response cache L2 get failed ({key}): {e}")
+            return None
+        return CacheEntry.loads(raw) if raw else None
+
+    async def _l2_put(self, name: str, key: str, entry: CacheEntry, policy: CachePolicy):
+        if not self.use_redis:
+            return
+        try:
+            await get_redis().set(key, entry.dumps(), px=max(int(policy.stale * 1000), 1))
+        except Exception as e:
+            self._count(name, "redis_errors")
+            logger.debug(f"Response cache L2 set failed ({key}): {e}")
+
+    async def _acquire_lock(self, name: str, key: str) -> Optional[str]:
+        """워커 간 계산 잠금 (Redis 를 못 쓰면 잠금 없이 진행)"""
+        token = uuid.uuid4().hex
+        if not self.use_redis:
+            return token
+        try:
+            acquired = await get_redis().set(f"{key}:lock", token, nx=True, px=int(self.lock_timeout * 1000))
+        except Exception as e:
+            self._count(name, "redis_errors")
+            logger.debug(f"Response cache lock failed ({key}): {e}")
+            return token
+        return token if acquired else None
+
+    async def _lock_held(self, name: str, key: str) -> bool:
+        try:
+            return bool(await get_redis().exists(f"{key}:lock"))
+        except Exception as e:
+            self._count(name, "redis_errors")
+            logger.debug(f"Response cache lock check failed ({key}): {e}")
+            return False
+
+    async def _release_lock(self, name: str, key: str, token: str):
+        if not self.use_redis:
+            return
+        try:
+            await get_redis().eval(RELEASE_LOCK_SCRIPT, 1, f"{key}:lock", token)
+        except Exception as e:
+            self._count(name, "redis_errors")
+            logger.debug(f"Response cache unlock failed ({key}): {e}")
+
+    # ==================== 계산 ====================
+
+    async def _compute(self, name: str, key: str, policy: CachePolicy,
+                       compute: Callable[[], Awaitable[Any]], wait_for_peer: bool) -> Optional[CacheEntry]:
+        """잠금을 잡고 계산해 L1/L2 에 저장
+
+        다른 워커가 잠금을 갖고 있으면 미스(wait_for_peer)는 L2 에 새 값이 올라오기를 기다리고,
+        백그라운드 갱신은 그 워커에 맡기고 None 을 돌려준다.
+        """
+        token = await self._acquire_lock(name, key)
+        if token is None:
+            if not wait_for_peer:
+                self._count(name, "refresh_skipped")
+                return None
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(PEER_POLL_INTERVAL)
+                entry = await self._l2_get(name, key)
+                if entry is not None and entry.age() < policy.fresh:
+                    self._count(name, "coalesced_peer")
+                    self._l1_put(key, entry)
+                    return entry
+                if not await self._lock_held(name, key):
+                    break
+            # 잠금을 가진 워커가 끝냈지만 저장하지 않았거나 끝내지 못함 - 직접 계산
+            token = uuid.uuid4().hex
+
+        _no_store.set(False)
+        started = time.perf_counter()
+        try:
+            value = jsonable_encoder(await compute())
+        finally:
+            self._count(name, "compute_ms", (time.perf_counter() - started) * 1000)
+            self._count(name, "computes")
+            await self._release_lock(name, key, token)
+
+        entry = CacheEntry(value, time.time())
+        if _no_store.get() or not self.cacheable(value):
+            self._count(name, "not_stored")
+        else:
+            self._l1_put(key, entry)
+            await self._l2_put(name, key, entry, policy)
+        return entry
+
+    def _spawn(self, name: str, key: str, coro: Awaitable[Optional[CacheEntry]]) -> asyncio.Task:
+        """키별 진행 중 계산으로 등록 (끝나면 자동 제거)"""
+        task = asyncio.ensure_future(coro)
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(name, key, t))
+        return task
+
+    def _finish(self, name: str, key: str, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            self._count(name, "compute_errors")
+            logger.warning(f"Response cache compute failed ({key}): {task.exception()}")
+
+    async def _refresh(self, name: str, key: str, policy: CachePolicy, compute: Callable[[], Awaitable[Any]]):
+        """stale 항목 백그라운드 갱신 - 다른 워커가 이미 갱신했으면 L2 값을 가져옴"""
+        entry = await self._l2_get(name, key)
+        if entry is not None and entry.age() < policy.fresh:
+            self._l1_put(key, entry)
+            self._count(name, "refreshed_from_l2")
+            return entry
+        self._count(name, "refreshes")
+        return await self._compute(name, key, policy, compute, wait_for_peer=False)
+
+    async def get_or_compute(self, name: str, params: Dict[str, Any],
+                             compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, str, float]:
+        """(응답, 캐시 상태, 나이 초)"""
+        policy = self.policies.get(name)
+        if policy is None or policy.fresh <= 0:
+            return await compute(), CACHE_MISS, 0.0
+
+        key = self.cache_key(name, params)
+        entry = self._l1_get(key)
+        if entry is not None and entry.age() < policy.stale:
+            self._count(name, "l1_hits")
+        else:
+            entry = await self._l2_get(name, key)
+            if entry is not None and entry.age() < policy.stale:
+                self._count(name, "l2_hits")
+                self._l1_put(key, entry)
+            else:
+                entry = None
+
+        if entry is not None:
+            age = entry.age()
+            if age < policy.fresh:
+                return entry.value, CACHE_HIT, age
+            self._count(name, "stale_hits")
+            if key not in self._inflight:
+                self._spawn(name, key, self._refresh(name, key, policy, compute))
+            return entry.value, CACHE_STALE, age
+
+        self._count(name, "misses")
+        task = self._inflight.get(key)
+        if task is not None:
+            self._count(name, "coalesced")
+        else:
+            task = self._spawn(name, key, self._compute(name, key, policy, compute, wait_for_peer=True))
+        entry = await asyncio.shield(task)
+        if entry is None:
+            # 진행 중이던 것이 다른 워커에 맡긴 백그라운드 갱신이었음 - 직접 계산
+            entry = await self._compute(name, key, policy, compute, wait_for_peer=True)
+        return entry.value, CACHE_MISS, entry.age()
+
+    def cached(self, name: str):
+        """FastAPI 엔드포인트 데코레이터 (키: 엔드포인트 이름 + 쿼리 파라미터, X-Cache / Age 헤더)"""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                value, status, age = await self.get_or_compute(name, kwargs, lambda: func(*args, **kwargs))
+                return JSONResponse(value, headers={"X-Cache": status, "Age": str(int(age))})
+            return wrapper
+        return decorator
+
+    def invalidate(self, name: Optional[str] = None):
+        """L1 항목 제거 (L2 는 TTL 로 만료)"""
+        prefix = f"heal7:{self.namespace}:cache:{name}?" if name else f"heal7:{self.namespace}:cache:"
+        for key in [key for key in self._l1 if key.startswith(prefix)]:
+            del self._l1[key]
+
+    # ==================== 수명주기 / 통계 ====================
+
+    async def close(self):
+        """서비스 컨테이너 종료 훅: 진행 중인 백그라운드 갱신 취소"""
+        tasks = list(self._inflight.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        endpoints = {}
+        totals: Dict[str, float] = {}
+        for name, counters in self._counters.items():
+            hits = counters.get("l1_hits", 0) + counters.get("l2_hits", 0)
+            requests = hits + counters.get("misses", 0)
+            endpoints[name] = {
+                **{k: round(v, 1) if k == "compute_ms" else int(v) for k, v in counters.items()},
+                "hit_ratio": round(hits / requests, 3) if requests else None,
+                "avg_compute_ms": round(counters.get("compute_ms", 0) / max(counters.get("computes", 0), 1), 1)
+            }
+            for k, v in counters.items():
+                totals[k] = totals.get(k, 0) + v
+        return {
+            "namespace": self.namespace,
+            "redis": self.use_redis,
+            "l1_entries": len(self._l1),
+            "l1_size": self.l1_size,
+            "inflight": len(self._inflight),
+            "policies": {name: {"fresh": p.fresh, "stale": p.stale} for name, p in self.policies.items()},
+            "totals": {k: round(v, 1) if k == "compute_ms" else int(v) for k, v in totals.items()},
+            "endpoints": endpoints
+        }
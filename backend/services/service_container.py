@@ -0,0 +1,140 @@
+"""
+HEAL7 서비스 컨테이너
+애플리케이션 수명주기(lifespan) 동안 공유되는 서비스 인스턴스 관리
+"""
+
+import inspect
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict
+
+from .database_manager import db
+from .redis_manager import redis_pool
+
+logger = logging.getLogger(__name__)
+
+ServiceFactory = Callable[["ServiceContainer"], Any]
+
+class ServiceContainer:
+    """서비스 싱글톤 컨테이너
+
+    라우터는 모듈 로드 시 ``container.register(name, factory)`` 로 생성 방법만 등록하고,
+    실제 인스턴스는 lifespan 시작 시 등록 순서대로 한 번만 만들어진다.
+    factory는 컨테이너를 인자로 받으므로 ``c.get("...")`` 로 다른 서비스를 주입받을 수 있다.
+    서비스에 ``start()`` / ``close()`` 가 있으면 시작/종료 시 호출한다 (동기/비동기 모두 가능).
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, ServiceFactory] = {}
+        self._instances: Dict[str, Any] = {}
+        self._init_ms: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._started = False
+
+    def register(self, name: str, factory: ServiceFactory):
+        """서비스 생성 함수 등록 (이미 생성된 인스턴스는 유지)"""
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """서비스 인스턴스 반환 (아직 없으면 생성)"""
+        instance = self._instances.get(name)
+        if instance is None:
+            instance = self._create(name)
+        return instance
+
+    def _create(self, name: str) -> Any:
+        if name not in self._factories:
+            raise KeyError(f"등록되지 않은 서비스입니다: {name}")
+
+        started = time.perf_counter()
+        instance = self._factories[name](self)
+        self._init_ms[name] = round((time.perf_counter() - started) * 1000, 3)
+        self._instances[name] = instance
+        return instance
+
+    async def startup(self):
+        """환경변수 로드, 공유 풀 초기화, 등록된 서비스 생성"""
+        if self._started:
+            return
+
+        try:
+            from dotenv import load_dotenv
+            load_dotenv()
+        except ImportError:
+            logger.info("python-dotenv 미설치 - 프로세스 환경변수만 사용")
+
+        started = time.perf_counter()
+        try:
+            await db.init()
+        except Exception as e:
+            # DB가 없어도 서버는 뜨도록 하고, 첫 요청 시 다시 연결을 시도한다
+            self._errors["database_pool"] = str(e)
+            logger.warning(f"Database pool init failed at startup: {e}")
+        self._init_ms["database_pool"] = round((time.perf_counter() - started) * 1000, 3)
+
+        for name in list(self._factories):
+            try:
+                instance = self.get(name)
+                hook = getattr(instance, "start", None)
+                if hook is not None:
+                    result = hook()
+                    if inspect.isawaitable(result):
+                        await result
+            except Exception as e:
+                self._errors[name] = str(e)
+                logger.error(f"Service '{name}' init failed: {e}")
+
+        self._started = True
+        report = ", ".join(f"{name}={ms:.1f}ms" for name, ms in self._init_ms.items())
+        logger.info(f"Service container started: {report}")
+
+    async def shutdown(self):
+        """서비스 종료 훅 호출 후 공유 풀 정리 (생성의 역순)"""
+        for name in reversed(list(self._instances)):
+            hook = getattr(self._instances[name], "close", None)
+            if hook is None:
+                continue
+            try:
+                result = hook()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.warning(f"Service '{name}' close failed: {e}")
+
+        self._instances.clear()
+        self._started = False
+
+        await redis_pool.close()
+        await db.close()
+        logger.info("Service container stopped")
+
+    def stats(self) -> Dict[str, Any]:
+        """서비스별 초기화 비용 및 상태"""
+        return {
+            "started": self._started,
+            "services": {
+                name: {
+                    "initialized": name in self._instances,
+                    "init_ms": self._init_ms.get(name),
+                    "error": self._errors.get(name)
+                }
+                for name in self._factories
+            },
+            "database_pool": {
+                "init_ms": self._init_ms.get("database_pool"),
+                "error": self._errors.get("database_pool")
+            }
+        }
+
+# 프로세스 전역 컨테이너
+container = ServiceContainer()
+
+@asynccontextmanager
+async def lifespan(app):
+    """FastAPI lifespan: 시작 시 서비스 생성, 종료 시 정리"""
+    await container.startup()
+    try:
+        yield
+    finally:
+        await container.shutdown()
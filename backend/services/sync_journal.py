@@ -0,0 +1,369 @@
+"""
+HEAL7 동기화 작업 저널
+원격서버 동기화 실행을 작업(run) 단위로 SQLite 에 기록하고 배치 단위 체크포인트를 남김
+
+- sync_runs         : 실행 (모드, 상태, 파라미터, 진행 상황, 실제 실행 시간)
+- sync_run_sections : 구역(subcategories / keywords / dependencies ...)별 전체 항목/배치 수
+- sync_run_batches  : 원격서버가 확인(2xx)한 배치
+
+중단된 실행(running 으로 남았거나 failed)은 같은 모드/재개 키로 다시 시작하면 이어받고,
+이미 확인된 배치는 건너뛴다. 배치 경계가 같도록 실행 시작 시점의 동기화 데이터 스냅샷을
+실행 디렉토리({journal_dir}/{run_id}/)에 산출물로 저장해 두고 재개할 때 그대로 쓴다.
+
+동기화 클라이언트(advanced_remote_sync.py)가 쓰고, bulk-sync API 는 읽기만 한다.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+SYNC_JOURNAL_DIR = os.getenv(
+    "SYNC_JOURNAL_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".sync_runs")
+)
+JOURNAL_FILENAME = "journal.sqlite3"
+# 끝난 실행의 산출물 디렉토리는 최근 N개만 보관 (저널 행은 남김)
+SYNC_JOURNAL_KEEP_ARTIFACTS = int(os.getenv("SYNC_JOURNAL_KEEP_ARTIFACTS", 20))
+
+RUN_RUNNING = "running"
+RUN_COMPLETED = "completed"
+RUN_FAILED = "failed"
+RUN_ABANDONED = "abandoned"   # 이어받지 않고 새 실행을 시작해 버려진 실행
+
+RESUMABLE_STATUSES = (RUN_RUNNING, RUN_FAILED)
+
+JOURNAL_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_runs (
+    run_id TEXT PRIMARY KEY,
+    mode TEXT NOT NULL,
+    status TEXT NOT NULL,
+    resume_key TEXT NOT NULL,
+    params TEXT NOT NULL DEFAULT '{}',
+    artifacts TEXT NOT NULL DEFAULT '{}',
+    done_items INTEGER NOT NULL DEFAULT 0,
+    done_batches INTEGER NOT NULL DEFAULT 0,
+    retries INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    active_seconds REAL NOT NULL DEFAULT 0,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    finished_at REAL,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_sync_runs_started ON sync_runs (started_at);
+CREATE INDEX IF NOT EXISTS idx_sync_runs_resume ON sync_runs (mode, resume_key, status);
+
+CREATE TABLE IF NOT EXISTS sync_run_sections (
+    run_id TEXT NOT NULL,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    total_items INTEGER NOT NULL,
+    total_batches INTEGER NOT NULL,
+    PRIMARY KEY (run_id, section)
+);
+
+CREATE TABLE IF NOT EXISTS sync_run_batches (
+    run_id TEXT NOT NULL,
+    section TEXT NOT NULL,
+    batch_index INTEGER NOT NULL,
+    items INTEGER NOT NULL,
+    attempts INTEGER NOT NULL,
+    acked_at REAL NOT NULL,
+    PRIMARY KEY (run_id, section, batch_index)
+);
+"""
+
+def format_timestamp(value: Optional[float]) -> Optional[str]:
+    return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else None
+
+class SyncRun:
+    """진행 중인 동기화 실행 하나 (체크포인트 기록)"""
+
+    def __init__(self, journal: "SyncJournal", row: sqlite3.Row, resumed: bool):
+        self.journal = journal
+        self.run_id = row['run_id']
+        self.mode = row['mode']
+        self.params = json.loads(row['params'])
+        self.artifacts: Dict[str, str] = json.loads(row['artifacts'])
+        self.resumed = resumed
+        self._active_before = row['active_seconds']
+        self._session_started = time.time()
+
+    @property
+    def directory(self) -> str:
+        return os.path.join(self.journal.directory, self.run_id)
+
+    def _active_seconds(self) -> float:
+        return self._active_before + (time.time() - self._session_started)
+
+    # ==================== 산출물 ====================
+
+    def artifact_path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def save_artifact(self, name: str, content: Any) -> str:
+        """실행 디렉토리에 산출물 저장 (dict/list 는 JSON, 그 외는 문자열) 후 경로 반환"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.artifact_path(name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            if isinstance(content, (dict, list)):
+                json.dump(content, f, ensure_ascii=False)
+            else:
+                f.write(str(content))
+        os.replace(tmp_path, path)
+
+        self.artifacts[name] = path
+        self.journal.execute(
+            "UPDATE sync_runs SET artifacts = ?, updated_at = ? WHERE run_id = ?",
+            (json.dumps(self.artifacts, ensure_ascii=False), time.time(), self.run_id)
+        )
+        return path
+
+    def load_artifact_json(self, name: str) -> Optional[Any]:
+        try:
+            with open(self.artifact_path(name), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def update_params(self, **values: Any):
+        """실행 파라미터 추가 기록 (예: 스냅샷을 받은 시점의 ETag)"""
+        self.params.update(values)
+        self.journal.execute(
+            "UPDATE sync_runs SET params = ? WHERE run_id = ?",
+            (json.dumps(self.params, ensure_ascii=False), self.run_id)
+        )
+
+    # ==================== 체크포인트 ====================
+
+    def set_section(self, section: str, total_items: int, total_batches: int):
+        """구역 크기 기록 (재개 시에는 처음 기록한 값을 유지)"""
+        self.journal.execute(
+            "INSERT OR IGNORE INTO sync_run_sections (run_id, section, position, total_items, total_batches) "
+            "VALUES (?, ?, (SELECT COUNT(*) FROM sync_run_sections WHERE run_id = ?), ?, ?)",
+            (self.run_id, section, self.run_id, total_items, total_batches)
+        )
+
+    def completed_batches(self, section: str) -> Set[int]:
+        rows = self.journal.query(
+            "SELECT batch_index FROM sync_run_batches WHERE run_id = ? AND section = ?",
+            (self.run_id, section)
+        )
+        return {row['batch_index'] for row in rows}
+
+    def ack_batch(self, section: str, batch_index: int, items: int, attempts: int = 1):
+        """원격서버가 확인한 배치 기록 (같은 배치를 두 번 기록해도 한 번만 집계)"""
+        now = time.time()
+        with self.journal.transaction() as conn:
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO sync_run_batches (run_id, section, batch_index, items, attempts, acked_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.run_id, section, batch_index, items, attempts, now)
+            ).rowcount
+            if inserted:
+                conn.execute(
+                    "UPDATE sync_runs SET done_items = done_items + ?, done_batches = done_batches + 1, "
+                    "active_seconds = ?, updated_at = ? WHERE run_id = ?",
+                    (items, self._active_seconds(), now, self.run_id)
+                )
+
+    def add_retries(self, retries: int):
+        if retries:
+            self.journal.execute(
+                "UPDATE sync_runs SET retries = retries + ? WHERE run_id = ?", (retries, self.run_id)
+            )
+
+    def finish(self, status: str, error: Optional[str] = None):
+        now = time.time()
+        self.journal.execute(
+            "UPDATE sync_runs SET status = ?, error = ?, active_seconds = ?, updated_at = ?, finished_at = ? "
+            "WHERE run_id = ?",
+            (status, error, self._active_seconds(), now, now if status == RUN_COMPLETED else None, self.run_id)
+        )
+
+class SyncJournal:
+    """SQLite 동기화 작업 저널"""
+
+    def __init__(self, directory: str = SYNC_JOURNAL_DIR):
+        self.directory = directory
+        self.path = os.path.join(directory, JOURNAL_FILENAME)
+        self._conn: Optional[sqlite3.Connection] = None
+        # API 는 asyncio.to_thread 로 여러 스레드에서 조회하므로 연결 사용을 직렬화
+        self._lock = threading.RLock()
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(self.directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False, timeout=10)
+            conn.row_factory = sqlite3.Row
+            # WAL: API 읽기가 동기화 클라이언트 쓰기를 막지 않음, 배치마다 fsync 하지 않음
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(JOURNAL_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def transaction(self) -> "JournalTransaction":
+        return JournalTransaction(self)
+
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        with self._lock:
+            return self.conn.execute(sql, params).rowcount
+
+    def query(self, sql: str, params: tuple = ()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # ==================== 실행 시작/재개 ====================
+
+    def start_run(self, mode: str, resume_key: Optional[Dict[str, Any]] = None,
+                  params: Optional[Dict[str, Any]] = None, resume: bool = True,
+                  require_artifact: Optional[str] = None) -> SyncRun:
+        """실행 시작
+
+        resume 이면 같은 모드/재개 키의 끝나지 않은 최근 실행을 이어받는다
+        (require_artifact 가 실행 디렉토리에 없으면 이어받을 수 없음).
+        새 실행을 시작하면 같은 모드/재개 키의 끝나지 않은 실행은 abandoned 로 바꾼다.
+        """
+        key = json.dumps(resume_key or {}, sort_keys=True)
+        now = time.time()
+
+        with self.transaction() as conn:
+            candidates = conn.execute(
+                "SELECT * FROM sync_runs WHERE mode = ? AND resume_key = ? AND status IN (?, ?) "
+                "ORDER BY started_at DESC",
+                (mode, key, *RESUMABLE_STATUSES)
+            ).fetchall()
+
+            for row in candidates if resume else []:
+                if require_artifact and not os.path.exists(os.path.join(self.directory, row['run_id'], require_artifact)):
+                    continue
+                conn.execute(
+                    "UPDATE sync_runs SET status = ?, error = NULL, attempts = attempts + 1, updated_at = ? "
+                    "WHERE run_id = ?",
+                    (RUN_RUNNING, now, row['run_id'])
+                )
+                return SyncRun(self, conn.execute(
+                    "SELECT * FROM sync_runs WHERE run_id = ?", (row['run_id'],)
+                ).fetchone(), resumed=True)
+
+            if candidates:
+                conn.execute(
+                    f"UPDATE sync_runs SET status = ?, updated_at = ? "
+                    f"WHERE run_id IN ({','.join('?' * len(candidates))})",
+                    (RUN_ABANDONED, now, *[row['run_id'] for row in candidates])
+                )
+
+            run_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+            conn.execute(
+                "INSERT INTO sync_runs (run_id, mode, status, resume_key, params, started_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (run_id, mode, RUN_RUNNING, key, json.dumps(params or {}, ensure_ascii=False), now, now)
+            )
+            row = conn.execute("SELECT * FROM sync_runs WHERE run_id = ?", (run_id,)).fetchone()
+        self.prune_artifacts()
+        return SyncRun(self, row, resumed=False)
+
+    def prune_artifacts(self, keep: int = SYNC_JOURNAL_KEEP_ARTIFACTS):
+        """이어받을 일이 없는 오래된 실행의 산출물 디렉토리 삭제 (최근 keep 개 보관)"""
+        stale = self.query(
+            "SELECT run_id FROM sync_runs WHERE status NOT IN (?, ?) AND artifacts <> '{}' "
+            "ORDER BY started_at DESC LIMIT -1 OFFSET ?",
+            (*RESUMABLE_STATUSES, keep)
+        )
+        for row in stale:
+            shutil.rmtree(os.path.join(self.directory, row['run_id']), ignore_errors=True)
+            self.execute("UPDATE sync_runs SET artifacts = '{}' WHERE run_id = ?", (row['run_id'],))
+
+    # ==================== 조회 ====================
+
+    @staticmethod
+    def _run_summary(row: sqlite3.Row) -> Dict[str, Any]:
+        active = row['active_seconds']
+        return {
+            "run_id": row['run_id'],
+            "mode": row['mode'],
+            "status": row['status'],
+            "params": json.loads(row['params']),
+            "done_items": row['done_items'],
+            "done_batches": row['done_batches'],
+            "retries": row['retries'],
+            "attempts": row['attempts'],
+            "active_seconds": round(active, 3),
+            "items_per_s": round(row['done_items'] / active, 1) if active > 0 else None,
+            "started_at": format_timestamp(row['started_at']),
+            "updated_at": format_timestamp(row['updated_at']),
+            "finished_at": format_timestamp(row['finished_at']),
+            "error": row['error']
+        }
+
+    def list_runs(self, limit: int = 20, mode: Optional[str] = None) -> List[Dict[str, Any]]:
+        """최근 실행 목록 (처리량 = 확인된 항목 / 실제 실행 시간)"""
+        if mode:
+            rows = self.query(
+                "SELECT * FROM sync_runs WHERE mode = ? ORDER BY started_at DESC LIMIT ?", (mode, limit)
+            )
+        else:
+            rows = self.query("SELECT * FROM sync_runs ORDER BY started_at DESC LIMIT ?", (limit,))
+        return [self._run_summary(row) for row in rows]
+
+    def get_run(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """실행 상세 (구역별 진행 상황과 산출물 포함)"""
+        rows = self.query("SELECT * FROM sync_runs WHERE run_id = ?", (run_id,))
+        if not rows:
+            return None
+
+        sections = self.query("""
+            SELECT s.section, s.total_items, s.total_batches,
+                   COUNT(b.batch_index) AS done_batches, COALESCE(SUM(b.items), 0) AS done_items,
+                   COALESCE(SUM(b.attempts - 1), 0) AS retried_attempts
+            FROM sync_run_sections s
+            LEFT JOIN sync_run_batches b ON b.run_id = s.run_id AND b.section = s.section
+            WHERE s.run_id = ?
+            GROUP BY s.section, s.total_items, s.total_batches, s.position
+            ORDER BY s.position
+        """, (run_id,))
+
+        return {
+            **self._run_summary(rows[0]),
+            "artifacts": json.loads(rows[0]['artifacts']),
+            "sections": [dict(section) for section in sections]
+        }
+
+class JournalTransaction:
+    """BEGIN IMMEDIATE ~ COMMIT/ROLLBACK (자동 커밋 연결에서 여러 문장을 묶음, 끝날 때까지 잠금 유지)"""
+
+    def __init__(self, journal: SyncJournal):
+        self.journal = journal
+        self.conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.journal._lock.acquire()
+        try:
+            self.conn = self.journal.conn
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.journal._lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+        finally:
+            self.journal._lock.release()
+        return False
@@ -0,0 +1,250 @@
+"""
+HEAL7 동기화 압축 전송 형식 (컬럼형, JSON 또는 msgpack)
+
+/admin-api/bulk-sync/keywords/export 의 JSON 은 키워드마다 분류 이름(category/subcategory)과 색상,
+항상 null 인 position 을 반복하고 의존성을 키워드별 dependencies 배열과 별도 목록으로 두 번 싣는다.
+컬럼형 형식은 테이블마다 컬럼 배열을 보내며
+
+- 분류 이름과 상태는 사전(dictionaries)의 번호로
+- 키워드 id, 의존성 부모 id 는 앞 행과의 차이(delta)로, 종속 id 는 같은 부모 안에서의 차이로
+- subcategory / color / position / 키워드별 dependencies 는 보내지 않고 받는 쪽에서 복원한다.
+
+같은 구조를 JSON(application/vnd.heal7.sync+json) 또는 msgpack(application/vnd.heal7.sync+msgpack)으로
+직렬화하고 Accept 헤더로 고른다. 해석 결과는 기존 JSON 내보내기와 같은 구조다.
+schema 가 SYNC_WIRE_SCHEMA_VERSION 과 다르면 해석하지 않는다 (받는 쪽은 기존 형식으로 다시 요청).
+"""
+
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:
+    # msgpack 미설치 시 컬럼형 JSON 만 사용
+    msgpack = None
+
+SYNC_WIRE_SCHEMA_VERSION = 1
+SYNC_SCHEMA_HEADER = "X-Sync-Schema"
+
+COLUMNAR_JSON_MEDIA_TYPE = "application/vnd.heal7.sync+json"
+COLUMNAR_MSGPACK_MEDIA_TYPE = "application/vnd.heal7.sync+msgpack"
+
+# 같은 q 값이면 앞쪽을 고른다
+COMPACT_MEDIA_TYPES = (COLUMNAR_MSGPACK_MEDIA_TYPE, COLUMNAR_JSON_MEDIA_TYPE)
+
+# 기존 형식으로 응답하는 미디어 타입 (Accept 에서 이쪽 q 가 더 높으면 압축 형식을 쓰지 않음)
+DEFAULT_MEDIA_TYPES = ("application/json", "application/x-ndjson", "application/*", "*/*")
+
+# representation 별 ETag 접미사
+ETAG_SUFFIXES = {COLUMNAR_JSON_MEDIA_TYPE: "c", COLUMNAR_MSGPACK_MEDIA_TYPE: "m"}
+
+SUBCATEGORY_COLUMNS = ("id", "name", "description", "category_group", "display_order", "is_active")
+
+class SyncWireFormatError(Exception):
+    """압축 형식으로 나타낼 수 없거나 해석할 수 없는 동기화 데이터"""
+
+def category_color(category: str) -> str:
+    """분류 이름별 색상 (SYNC_KEYWORDS_TEMPLATE 의 CASE 와 같음)"""
+    return {"A-": "#3B82F6", "B-": "#EF4444", "C-": "#06B6D4"}.get(category[:2], "#6366F1")
+
+def available_media_types() -> List[str]:
+    return [media for media in COMPACT_MEDIA_TYPES if media != COLUMNAR_MSGPACK_MEDIA_TYPE or msgpack]
+
+def base_media_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";", 1)[0].strip().lower()
+
+def is_compact_media_type(content_type: Optional[str]) -> bool:
+    return base_media_type(content_type) in COMPACT_MEDIA_TYPES
+
+def compact_accept_header() -> str:
+    """압축 형식을 우선 요청하는 Accept 헤더 (지원하지 않는 서버는 기존 형식으로 응답)"""
+    preferences = [f"{media};q={1.0 - 0.1 * index:.1f}" for index, media in enumerate(available_media_types())]
+    return ", ".join(preferences + ["application/x-ndjson;q=0.5", "application/json;q=0.5"])
+
+def negotiate_sync_media_type(accept: Optional[str]) -> Optional[str]:
+    """Accept 헤더로 압축 형식 선택 (없거나 기존 형식의 q 가 더 높으면 None)"""
+    compact_q: Dict[str, float] = {}
+    default_q = 0.0
+    for part in (accept or "").split(","):
+        fields = [field.strip() for field in part.split(";")]
+        media = fields[0].lower()
+        q = 1.0
+        for field in fields[1:]:
+            if field.startswith("q="):
+                try:
+                    q = float(field[2:])
+                except ValueError:
+                    q = 0.0
+        if media in COMPACT_MEDIA_TYPES:
+            compact_q[media] = q
+        elif media in DEFAULT_MEDIA_TYPES:
+            default_q = max(default_q, q)
+
+    best, best_q = None, 0.0
+    for media in available_media_types():
+        if compact_q.get(media, 0.0) > best_q:
+            best, best_q = media, compact_q[media]
+    return best if best and best_q >= default_q else None
+
+def representation_etag(version: str, media_type: Optional[str]) -> str:
+    """응답 형식별 ETag (압축 형식은 스키마 버전까지 포함)"""
+    if not media_type:
+        return f'"{version}"'
+    return f'"{version}-{ETAG_SUFFIXES[media_type]}{SYNC_WIRE_SCHEMA_VERSION}"'
+
+def delta_encode(values: List[int]) -> List[int]:
+    previous = 0
+    deltas = []
+    for value in values:
+        deltas.append(value - previous)
+        previous = value
+    return deltas
+
+def delta_decode(deltas: List[int]) -> List[int]:
+    value = 0
+    values = []
+    for delta in deltas:
+        value += delta
+        values.append(value)
+    return values
+
+def dictionary_encode(values: List[Any]) -> tuple:
+    """(사전, 번호 목록) - 사전은 처음 나온 순서"""
+    dictionary: Dict[Any, int] = {}
+    codes = [dictionary.setdefault(value, len(dictionary)) for value in values]
+    return list(dictionary), codes
+
+def dependency_pairs(sync_data: Dict[str, Any]) -> List[tuple]:
+    """의존성 (부모, 종속) 목록 - dependencies 목록이 없으면 키워드별 배열에서 만든다"""
+    if "dependencies" in sync_data:
+        return [(r["parent_keyword_id"], r["dependent_keyword_id"]) for r in sync_data["dependencies"]]
+    return sorted(
+        (keyword["id"], dependent)
+        for keyword in sync_data.get("keywords", [])
+        for dependent in keyword.get("dependencies", [])
+    )
+
+def encode_columnar(sync_data: Dict[str, Any]) -> Dict[str, Any]:
+    """내보내기 JSON 구조 → 컬럼형 구조
+
+    복원할 수 있는 필드만 생략하므로, 키워드의 subcategory/color/position/dependencies 가
+    내보내기 규칙과 다르면 SyncWireFormatError (호출하는 쪽은 기존 JSON 으로 보냄).
+    """
+    keywords = sync_data.get("keywords", [])
+    subcategories = sync_data.get("subcategories", [])
+    pairs = dependency_pairs(sync_data)
+
+    dependents_by_parent: Dict[int, List[int]] = {}
+    for parent, dependent in pairs:
+        dependents_by_parent.setdefault(parent, []).append(dependent)
+
+    for keyword in keywords:
+        if (keyword.get("subcategory") != keyword["category"]
+                or keyword.get("position") is not None
+                or keyword.get("color") != category_color(keyword["category"])
+                or list(keyword.get("dependencies", [])) != sorted(dependents_by_parent.get(keyword["id"], []))):
+            raise SyncWireFormatError(f"키워드 {keyword['id']} 는 압축 형식으로 복원할 수 없습니다")
+
+    categories, category_codes = dictionary_encode([keyword["category"] for keyword in keywords])
+    statuses, status_codes = dictionary_encode([keyword["status"] for keyword in keywords])
+
+    dependent_deltas = []
+    previous_parent = previous_dependent = None
+    for parent, dependent in pairs:
+        dependent_deltas.append(dependent - previous_dependent if parent == previous_parent else dependent)
+        previous_parent, previous_dependent = parent, dependent
+
+    return {
+        "schema": SYNC_WIRE_SCHEMA_VERSION,
+        "metadata": sync_data.get("metadata", {}),
+        "dictionaries": {"category": categories, "status": statuses},
+        "subcategories": {column: [r[column] for r in subcategories] for column in SUBCATEGORY_COLUMNS},
+        "keywords": {
+            "id": delta_encode([keyword["id"] for keyword in keywords]),
+            "name": [keyword["name"] for keyword in keywords],
+            "category": category_codes,
+            "subcategory_id": [keyword.get("subcategory_id") for keyword in keywords],
+            "weight": [keyword["weight"] for keyword in keywords],
+            "connections": [keyword["connections"] for keyword in keywords],
+            "status": status_codes
+        },
+        "dependencies": {
+            "parent_keyword_id": delta_encode([parent for parent, _ in pairs]),
+            "dependent_keyword_id": dependent_deltas
+        }
+    }
+
+def decode_columnar(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """컬럼형 구조 → 내보내기 JSON 구조 (metadata, keywords, subcategories, dependencies)"""
+    if payload.get("schema") != SYNC_WIRE_SCHEMA_VERSION:
+        raise SyncWireFormatError(
+            f"지원하지 않는 동기화 스키마 버전: {payload.get('schema')} (지원: {SYNC_WIRE_SCHEMA_VERSION})"
+        )
+
+    columns = payload["dependencies"]
+    parents = delta_decode(columns["parent_keyword_id"])
+    dependencies = []
+    dependents_by_parent: Dict[int, List[int]] = {}
+    previous_parent = previous_dependent = None
+    for parent, delta in zip(parents, columns["dependent_keyword_id"]):
+        dependent = previous_dependent + delta if parent == previous_parent else delta
+        dependencies.append({"parent_keyword_id": parent, "dependent_keyword_id": dependent})
+        dependents_by_parent.setdefault(parent, []).append(dependent)
+        previous_parent, previous_dependent = parent, dependent
+
+    columns = payload["keywords"]
+    categories = payload["dictionaries"]["category"]
+    statuses = payload["dictionaries"]["status"]
+    keywords = []
+    for keyword_id, name, category_code, subcategory_id, weight, connections, status_code in zip(
+        delta_decode(columns["id"]), columns["name"], columns["category"], columns["subcategory_id"],
+        columns["weight"], columns["connections"], columns["status"]
+    ):
+        category = categories[category_code]
+        keywords.append({
+            "id": keyword_id,
+            "name": name,
+            "category": category,
+            "subcategory": category,
+            "subcategory_id": subcategory_id,
+            "weight": weight,
+            "connections": connections,
+            "status": statuses[status_code],
+            "dependencies": sorted(dependents_by_parent.get(keyword_id, [])),
+            "position": None,
+            "color": category_color(category)
+        })
+
+    columns = payload["subcategories"]
+    subcategories = [dict(zip(SUBCATEGORY_COLUMNS, row)) for row in zip(*(columns[c] for c in SUBCATEGORY_COLUMNS))]
+
+    return {
+        "metadata": payload.get("metadata", {}),
+        "keywords": keywords,
+        "subcategories": subcategories,
+        "dependencies": dependencies
+    }
+
+def dump_sync_payload(sync_data: Dict[str, Any], media_type: str) -> bytes:
+    """내보내기 JSON 구조를 압축 형식으로 직렬화"""
+    columnar = encode_columnar(sync_data)
+    if base_media_type(media_type) == COLUMNAR_MSGPACK_MEDIA_TYPE:
+        if msgpack is None:
+            raise SyncWireFormatError("msgpack 미설치 - 컬럼형 JSON 을 사용하세요")
+        return msgpack.packb(columnar, use_bin_type=True)
+    return json.dumps(columnar, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def load_sync_payload(body: bytes, media_type: str) -> Dict[str, Any]:
+    """압축 형식 본문을 내보내기 JSON 구조로 해석"""
+    try:
+        if base_media_type(media_type) == COLUMNAR_MSGPACK_MEDIA_TYPE:
+            if msgpack is None:
+                raise SyncWireFormatError("msgpack 미설치 - msgpack 동기화 데이터를 읽을 수 없습니다")
+            payload = msgpack.unpackb(body, raw=False)
+        else:
+            payload = json.loads(body)
+        return decode_columnar(payload)
+    except SyncWireFormatError:
+        raise
+    except (ValueError, KeyError, TypeError, IndexError) as e:
+        raise SyncWireFormatError(f"압축 동기화 데이터 해석 실패: {type(e).__name__}: {e}")
@@ -68,11 +68,13 @@ class JSONSerializer:
         if row is None:
             return {}
             
-        # RealDictCursor의 결과를 딕셔너리로 변환
+        # RealDictCursor / asyncpg Record 결과를 딕셔너리로 변환
         if hasattr(row, '_asdict'):
             row_dict = dict(row)
         elif isinstance(row, dict):
             row_dict = row
+        elif hasattr(row, 'items'):
+            row_dict = dict(row.items())
         else:
             logger.warning(f"알 수 없는 행 타입: {type(row)}")
             return {}